@@ -3,11 +3,38 @@ Copyright © 2024  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
+from typing import Tuple
+
+import numpy as np
+
 # fmt: off
 
 
 # PS2 GS texture compression
 # Used in some EA games e.g. "Cricket 2005" (PS2), "Fight Night Round 3" (PS2) or "FIFA Street" (PS2)
+#
+# Every block (block_width x block_height pixels) has one 8-bit base value and every pixel
+# has 1-bit or 2-bit detail value. Decompressed value (palette index) is (base + detail) & 0xFF.
+# Detail bits are stored in rows, first pixel in the lowest bits of each byte.
+
+GST_ENCODER_CHUNK_PIXELS: int = 16384
+
+
+def _expand_gst_detail(detail_data: bytes, img_width: int, img_height: int, detail_bpp: int) -> np.ndarray:
+    detail_bytes = np.frombuffer(detail_data, dtype=np.uint8, count=img_width * img_height * detail_bpp // 8)
+    detail_values: np.ndarray
+    if detail_bpp == 2:
+        detail_values = (detail_bytes[:, None] >> np.array([0, 2, 4, 6], dtype=np.uint8)) & 3
+    else:
+        detail_values = np.unpackbits(detail_bytes, bitorder="little")
+    return detail_values.reshape(img_height, img_width)
+
+
+def _pack_gst_detail(detail_values: np.ndarray, detail_bpp: int) -> bytes:
+    if detail_bpp == 2:
+        return (detail_values.reshape(-1, 4) << np.array([0, 2, 4, 6], dtype=np.uint8)).sum(axis=1, dtype=np.uint8).tobytes()
+    return np.packbits(detail_values.reshape(-1, 8).astype(np.uint8), axis=1, bitorder="little").tobytes()
+
 
 def decompress_gst_image(
     base_data: bytes,
@@ -18,62 +45,60 @@ def decompress_gst_image(
     block_height: int,
     detail_bpp: int,
 ):
-    decompressed_texture_data = bytearray(img_width * img_height)
-    detail_current_offset: int = 0
-    output_current_offset: int = 0
-
-    if block_width == 4 and detail_bpp == 2:  # decompress GST 422
-        for y in range(img_height):
-            base_current_offset = (img_width // 4) * (y // block_height)
-            for block_x in range(0, img_width, 4):
-                detail_bits = detail_data[detail_current_offset]
-                detail_current_offset += 1
-                base_value = base_data[base_current_offset]
-                base_current_offset += 1
-                decompressed_texture_data[output_current_offset] = (base_value + ((detail_bits >> 0) & 3)) & 0xFF
-                decompressed_texture_data[output_current_offset + 1] = (base_value + ((detail_bits >> 2) & 3)) & 0xFF
-                decompressed_texture_data[output_current_offset + 2] = (base_value + ((detail_bits >> 4) & 3)) & 0xFF
-                decompressed_texture_data[output_current_offset + 3] = (base_value + ((detail_bits >> 6) & 3)) & 0xFF
-                output_current_offset += 4
-
-    elif block_width == 2 and detail_bpp == 2:  # decompress GST 222
-        for y in range(img_height):
-            base_current_offset = (img_width // 2) * (y // block_height)
-            for block_x in range(0, img_width, 4):
-                detail_bits = detail_data[detail_current_offset]
-                detail_current_offset += 1
-                base_value = base_data[base_current_offset]
-                base_current_offset += 1
-                decompressed_texture_data[output_current_offset] = (base_value + ((detail_bits >> 0) & 3)) & 0xFF
-                decompressed_texture_data[output_current_offset + 1] = (base_value + ((detail_bits >> 2) & 3)) & 0xFF
-                base_value = base_data[base_current_offset]
-                base_current_offset += 1
-                decompressed_texture_data[output_current_offset + 2] = (base_value + ((detail_bits >> 4) & 3)) & 0xFF
-                decompressed_texture_data[output_current_offset + 3] = (base_value + ((detail_bits >> 6) & 3)) & 0xFF
-                output_current_offset += 4
-
-    else:  # decompress other GST textures
-        for y in range(img_height):
-            if detail_bpp == 2:
-                for block_x in range(0, img_width, 4):
-                    for x in range(4):
-                        base_current_offset = (img_width // block_width) * (y // block_height) + ((block_x + x) // block_width)
-                        detail_value = detail_data[detail_current_offset]
-                        base_value = base_data[base_current_offset]
-                        calc_value = (detail_value >> (x * 2)) & 3
-                        decompressed_texture_data[output_current_offset] = (base_value + calc_value) & 0xFF
-                        output_current_offset += 1
-                    detail_current_offset += 1
-
-            else:
-                for block_x in range(0, img_width, 8):
-                    for x in range(8):
-                        base_current_offset = (img_width // block_width) * (y // block_height) + ((block_x + x) // block_width)
-                        detail_value = detail_data[detail_current_offset]
-                        base_value = base_data[base_current_offset]
-                        calc_value = (detail_value >> x) & 1
-                        decompressed_texture_data[output_current_offset] = (base_value + calc_value) & 0xFF
-                        output_current_offset += 1
-                    detail_current_offset += 1
-
-    return decompressed_texture_data
+    base_width: int = img_width // block_width
+    base_height: int = img_height // block_height
+    base_values = np.frombuffer(base_data, dtype=np.uint8, count=base_width * base_height).reshape(base_height, 1, base_width, 1)
+    detail_values = _expand_gst_detail(detail_data, img_width, img_height, detail_bpp)
+
+    # every base value is broadcast to its block, uint8 addition wraps like "& 0xFF"
+    detail_blocks = detail_values.reshape(base_height, block_height, base_width, block_width)
+    decompressed_texture_data = (base_values + detail_blocks).reshape(img_height, img_width)
+    return bytearray(decompressed_texture_data.tobytes())
+
+
+def compress_gst_image(
+    image_data: bytes,
+    palette: np.ndarray,
+    img_width: int,
+    img_height: int,
+    block_width: int,
+    block_height: int,
+    detail_bpp: int,
+) -> Tuple[bytes, bytes]:
+    """
+    RGBA8888 image and (256, 4) RGBA palette --> base data and detail data (not swizzled).
+    Palette should be sorted (e.g. by luminance), so neighbouring indices have similar colours.
+    """
+    detail_levels: int = 1 << detail_bpp
+    base_count: int = 256 - detail_levels + 1
+    base_width: int = img_width // block_width
+    base_height: int = img_height // block_height
+    block_size: int = block_width * block_height
+
+    pixels = np.frombuffer(image_data, dtype=np.uint8, count=img_width * img_height * 4).reshape(img_height, img_width, 4)
+    block_pixels = pixels.reshape(base_height, block_height, base_width, block_width, 4).transpose(0, 2, 1, 3, 4)
+    block_pixels = block_pixels.reshape(-1, block_size, 4).astype(np.int32)
+    palette = palette.astype(np.int32)
+    palette_norms = (palette ** 2).sum(axis=1)
+
+    # every possible base is checked, error of pixel for given base is the smallest
+    # distance to palette entries base...base + detail_levels - 1 (sliding window minimum)
+    base_values = np.empty(len(block_pixels), dtype=np.uint8)
+    detail_values = np.empty((len(block_pixels), block_size), dtype=np.uint8)
+    chunk_blocks: int = max(GST_ENCODER_CHUNK_PIXELS // block_size, 1)
+
+    for chunk_start in range(0, len(block_pixels), chunk_blocks):
+        chunk = block_pixels[chunk_start:chunk_start + chunk_blocks]
+        distances = palette_norms - 2 * (chunk @ palette.T)  # (blocks, pixels, 256) without constant pixel norms
+        window_distances = distances[:, :, :base_count].copy()
+        for detail_value in range(1, detail_levels):
+            np.minimum(window_distances, distances[:, :, detail_value:detail_value + base_count], out=window_distances)
+        best_bases = window_distances.sum(axis=1).argmin(axis=1)
+
+        entry_indices = best_bases[:, None, None] + np.arange(detail_levels)
+        entry_distances = np.take_along_axis(distances, np.broadcast_to(entry_indices, chunk.shape[:2] + (detail_levels, )), axis=2)
+        base_values[chunk_start:chunk_start + len(chunk)] = best_bases
+        detail_values[chunk_start:chunk_start + len(chunk)] = entry_distances.argmin(axis=2)
+
+    pixel_detail_values = detail_values.reshape(base_height, base_width, block_height, block_width).transpose(0, 2, 1, 3)
+    return base_values.tobytes(), _pack_gst_detail(pixel_detail_values, detail_bpp)
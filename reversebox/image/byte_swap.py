@@ -1,8 +1,10 @@
 """
-Copyright © 2025  Bartłomiej Duda
+Copyright © 2025-2026  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
+import numpy as np
+
 # fmt: off
 
 # Byte swapping functions
@@ -12,11 +14,7 @@ def swap_byte_order_x360(image_data: bytes) -> bytes:
     if len(image_data) % 2 != 0:
         raise Exception("Data size must be a multiple of 2 bytes!")
 
-    swapped_data: bytearray = bytearray()
-    for i in range(0, len(image_data), 2):
-        group = image_data[i: i + 2]
-        swapped_data.extend(group[::-1])
-    return swapped_data
+    return np.frombuffer(image_data, dtype="<u2").byteswap().tobytes()
 
 
 def swap_byte_order_gamecube(image_data: bytes, img_width: int, img_height: int) -> bytes:
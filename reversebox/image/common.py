@@ -1,8 +1,10 @@
 """
-Copyright © 2024-2025  Bartłomiej Duda
+Copyright © 2024-2026  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
+import numpy as np
+
 from reversebox.image.image_formats import ImageFormats
 
 # fmt: off
@@ -255,16 +257,24 @@ def get_block_data_size(img_format: ImageFormats) -> int:
                       ImageFormats.PSP_DXT1,
                       ImageFormats.BC4_UNORM,
                       ImageFormats.N64_CMPR,
+                      ImageFormats.ETC1,
+                      ImageFormats.ETC2_RGB,
+                      ImageFormats.ETC2_RGB_A1,
+                      ImageFormats.EAC_R11,
                       ):
         return 8
-    elif img_format in (ImageFormats.BC2_DXT3,
+    elif img_format in (ImageFormats.BC2_DXT2,
+                        ImageFormats.BC2_DXT3,
                         ImageFormats.PSP_DXT3,
+                        ImageFormats.DXT4,
                         ImageFormats.BC3_DXT5,
                         ImageFormats.PSP_DXT5,
                         ImageFormats.BC5_UNORM,
                         ImageFormats.BC6H_UF16,
                         ImageFormats.BC6H_SF16,
                         ImageFormats.BC7_UNORM,
+                        ImageFormats.ETC2_RGBA,
+                        ImageFormats.EAC_RG11,
                         ):
         return 16
     else:
@@ -329,3 +339,32 @@ def get_linear_image_data_size(image_bpp: int, image_width: int, image_height: i
     else:
         bytes_per_pixel: int = convert_bpp_to_bytes_per_pixel(image_bpp)
         return image_width * image_height * bytes_per_pixel
+
+
+def get_output_buffer_view(output_buffer, expected_size: int) -> np.ndarray:
+    """
+    Returns writable uint8 view of first "expected_size" bytes of output buffer (no data is copied).
+    Output buffer can be bytearray, writable memoryview (e.g. slice of bigger atlas), writable mmap,
+    C-contiguous NumPy array of any dtype or multiprocessing.shared_memory.SharedMemory block.
+    """
+    if isinstance(output_buffer, np.ndarray):
+        if not output_buffer.flags.c_contiguous:
+            raise ValueError("Output array is not C-contiguous!")
+        output_view = output_buffer.reshape(-1).view(np.uint8)
+    else:
+        output_buffer = getattr(output_buffer, "buf", output_buffer)  # SharedMemory block
+        output_view = np.frombuffer(memoryview(output_buffer).cast("B"), dtype=np.uint8)
+
+    if not output_view.flags.writeable:
+        raise ValueError("Output buffer is read-only!")
+    if len(output_view) < expected_size:
+        raise ValueError(f"Output buffer too small! Expected {expected_size} bytes, got {len(output_view)} bytes.")
+    return output_view[:expected_size]
+
+
+def copy_to_output_buffer(output_buffer, data: bytes) -> int:
+    """
+    Copies data to output buffer, returns number of written bytes
+    """
+    get_output_buffer_view(output_buffer, len(data))[:] = np.frombuffer(data, dtype=np.uint8)
+    return len(data)
@@ -0,0 +1,629 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+import numpy as np
+
+from reversebox.common.logger import get_logger
+from reversebox.image.image_formats import ImageFormats
+
+logger = get_logger(__name__)
+
+# fmt: off
+
+# Vectorized ASTC decoder (2D blocks, LDR profile, linear RGBA8888 output).
+#
+# 1. Identical blocks are decoded only once (np.unique on raw blocks).
+# 2. Unique blocks are grouped by block mode, partition count and colour endpoint modes.
+#    All blocks in a group share the same bit layout, so integer sequence decoding,
+#    unquantization, weight infill and interpolation are done for the whole group at once.
+# 3. Tables (block modes, partition patterns, weight infill) are built once and cached.
+#
+# Invalid blocks and partitions using HDR endpoint modes are decoded
+# to error colour (magenta), as required by LDR profile of ASTC specification.
+
+ASTC_BLOCK_DATA_SIZE: int = 16
+ASTC_ERROR_COLOUR: tuple = (0xFF, 0x00, 0xFF, 0xFF)
+
+astc_block_dimensions: dict = {
+    ImageFormats.ASTC_4x4: (4, 4),
+    ImageFormats.ASTC_5x4: (5, 4),
+    ImageFormats.ASTC_5x5: (5, 5),
+    ImageFormats.ASTC_6x5: (6, 5),
+    ImageFormats.ASTC_6x6: (6, 6),
+    ImageFormats.ASTC_8x5: (8, 5),
+    ImageFormats.ASTC_8x6: (8, 6),
+    ImageFormats.ASTC_8x8: (8, 8),
+    ImageFormats.ASTC_10x5: (10, 5),
+    ImageFormats.ASTC_10x6: (10, 6),
+    ImageFormats.ASTC_10x8: (10, 8),
+    ImageFormats.ASTC_10x10: (10, 10),
+    ImageFormats.ASTC_12x10: (12, 10),
+    ImageFormats.ASTC_12x12: (12, 12),
+}
+
+# number of levels --> (trits, quints, bits)
+ISE_ENCODINGS: dict = {
+    2: (0, 0, 1), 3: (1, 0, 0), 4: (0, 0, 2), 5: (0, 1, 0), 6: (1, 0, 1), 8: (0, 0, 3),
+    10: (0, 1, 1), 12: (1, 0, 2), 16: (0, 0, 4), 20: (0, 1, 2), 24: (1, 0, 3), 32: (0, 0, 5),
+    40: (0, 1, 3), 48: (1, 0, 4), 64: (0, 0, 6), 80: (0, 1, 4), 96: (1, 0, 5), 128: (0, 0, 7),
+    160: (0, 1, 5), 192: (1, 0, 6), 256: (0, 0, 8),
+}
+WEIGHT_LEVELS: tuple = (2, 3, 4, 5, 6, 8, 10, 12, 16, 20, 24, 32)
+COLOUR_LEVELS: tuple = (6, 8, 10, 12, 16, 20, 24, 32, 40, 48, 64, 80, 96, 128, 160, 192, 256)
+HDR_ENDPOINT_MODES: tuple = (2, 3, 7, 11, 14, 15)
+MAX_COLOUR_VALUES: int = 18
+
+
+def get_ise_bit_count(value_count: int, levels: int) -> int:
+    trits, quints, bits = ISE_ENCODINGS[levels]
+    if trits:
+        return value_count * bits + (8 * value_count + 4) // 5
+    if quints:
+        return value_count * bits + (7 * value_count + 2) // 3
+    return value_count * bits
+
+
+def _get_bit(value: int, bit_number: int) -> int:
+    return (value >> bit_number) & 1
+
+
+def _decode_trit_block(t: int) -> list:
+    if (t >> 2) & 7 == 7:
+        c = (((t >> 5) & 7) << 2) | (t & 3)
+        t4 = t3 = 2
+    else:
+        c = t & 0x1F
+        if (t >> 5) & 3 == 3:
+            t4, t3 = 2, _get_bit(t, 7)
+        else:
+            t4, t3 = _get_bit(t, 7), (t >> 5) & 3
+    if c & 3 == 3:
+        t2, t1 = 2, _get_bit(c, 4)
+        t0 = (_get_bit(c, 3) << 1) | (_get_bit(c, 2) & ~_get_bit(c, 3) & 1)
+    elif (c >> 2) & 3 == 3:
+        t2, t1, t0 = 2, 2, c & 3
+    else:
+        t2, t1 = _get_bit(c, 4), (c >> 2) & 3
+        t0 = (_get_bit(c, 1) << 1) | (_get_bit(c, 0) & ~_get_bit(c, 1) & 1)
+    return [t0, t1, t2, t3, t4]
+
+
+def _decode_quint_block(q: int) -> list:
+    if (q >> 1) & 3 == 3 and (q >> 5) & 3 == 0:
+        q0 = _get_bit(q, 0)
+        return [4, 4, (q0 << 2) | ((_get_bit(q, 4) & ~q0 & 1) << 1) | (_get_bit(q, 3) & ~q0 & 1)]
+    if (q >> 1) & 3 == 3:
+        q2 = 4
+        c = (((q >> 3) & 3) << 3) | ((~(q >> 5) & 3) << 1) | (q & 1)
+    else:
+        q2 = (q >> 5) & 3
+        c = q & 0x1F
+    if c & 7 == 5:
+        return [(c >> 3) & 3, 4, q2]
+    return [c & 7, (c >> 3) & 3, q2]
+
+
+TRIT_TABLE = np.array([_decode_trit_block(t) for t in range(256)], dtype=np.int32)
+QUINT_TABLE = np.array([_decode_quint_block(q) for q in range(128)], dtype=np.int32)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_ise_layout(value_count: int, levels: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns bit positions of every value's bits (value_count, bits)
+    and of trit/quint block bits (blocks_count, 8 or 7). Positions past
+    the end of the sequence are set to -1 (they are read as zeros).
+    """
+    trits, quints, bits = ISE_ENCODINGS[levels]
+    total_bits: int = get_ise_bit_count(value_count, levels)
+    value_positions = np.zeros((value_count, bits), dtype=np.int64)
+    if not trits and not quints:
+        for i in range(value_count):
+            value_positions[i] = np.arange(i * bits, (i + 1) * bits)
+        return value_positions, np.zeros((0, 0), dtype=np.int64)
+
+    group_size: int = 5 if trits else 3
+    # number of trit/quint bits following every value in a group
+    packed_bits_after_value: tuple = (2, 2, 1, 2, 1) if trits else (3, 2, 2)
+    groups_count: int = (value_count + group_size - 1) // group_size
+    packed_positions = np.zeros((groups_count, 8 if trits else 7), dtype=np.int64)
+    position: int = 0
+    for group in range(groups_count):
+        packed_bit_number: int = 0
+        for value_in_group in range(group_size):
+            value_number: int = group * group_size + value_in_group
+            if value_number < value_count:
+                value_positions[value_number] = np.arange(position, position + bits)
+            position += bits
+            for _ in range(packed_bits_after_value[value_in_group]):
+                packed_positions[group, packed_bit_number] = position
+                packed_bit_number += 1
+                position += 1
+    value_positions[value_positions >= total_bits] = -1
+    packed_positions[packed_positions >= total_bits] = -1
+    return value_positions, packed_positions
+
+
+def _read_bits(bits: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    # bits: (N, 129) array, last column is always zero --> position -1 reads zero
+    if positions.shape[-1] == 0:
+        return np.zeros((len(bits),) + positions.shape[:-1], dtype=np.int64)
+    weights = (1 << np.arange(positions.shape[-1], dtype=np.int64))
+    return (bits[:, positions].astype(np.int64) * weights).sum(axis=-1)
+
+
+def _read_field(bits: np.ndarray, start: int, bits_count: int) -> np.ndarray:
+    return _read_bits(bits, np.arange(start, start + bits_count))
+
+
+def decode_ise(bits: np.ndarray, value_count: int, levels: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decodes integer sequence for all blocks at once.
+    Returns (trit/quint values, bit values), both (N, value_count) arrays.
+    """
+    trits, quints, _ = ISE_ENCODINGS[levels]
+    value_positions, packed_positions = _get_ise_layout(value_count, levels)
+    low_bits = _read_bits(bits, value_positions)
+    if not trits and not quints:
+        return np.zeros_like(low_bits), low_bits
+
+    packed_values = _read_bits(bits, packed_positions)
+    table = TRIT_TABLE if trits else QUINT_TABLE
+    high_values = table[packed_values].reshape(len(bits), -1)[:, :value_count]
+    return high_values, low_bits
+
+
+def _get_pattern_value(pattern: str, low_bits: int) -> int:
+    # pattern like "b000b0bb0", letters are bits of low_bits ("a" is bit 0)
+    value: int = 0
+    for character in pattern:
+        value <<= 1
+        if character != "0":
+            value |= _get_bit(low_bits, ord(character) - ord("a"))
+    return value
+
+
+# (trits, quints, bits) --> (C, B pattern)
+COLOUR_UNQUANTIZATION_PARAMETERS: dict = {
+    (1, 0, 1): (204, "000000000"), (1, 0, 2): (93, "b000b0bb0"), (1, 0, 3): (44, "cb000cbcb"),
+    (1, 0, 4): (22, "dcb000dcb"), (1, 0, 5): (11, "edcb000ed"), (1, 0, 6): (5, "fedcb000f"),
+    (0, 1, 1): (113, "000000000"), (0, 1, 2): (54, "b0000bb00"), (0, 1, 3): (26, "cb0000cbc"),
+    (0, 1, 4): (13, "dcb0000dc"), (0, 1, 5): (6, "edcb0000e"),
+}
+WEIGHT_UNQUANTIZATION_PARAMETERS: dict = {
+    (1, 0, 1): (50, "0000000"), (1, 0, 2): (23, "b000b0b"), (1, 0, 3): (11, "cb000cb"),
+    (0, 1, 1): (28, "0000000"), (0, 1, 2): (13, "b0000b0"),
+}
+
+
+def _replicate_bits(value: int, bits: int, target_bits: int) -> int:
+    result: int = 0
+    position: int = target_bits - bits
+    while position > -bits:
+        result |= (value << position) if position >= 0 else (value >> -position)
+        position -= bits
+    return result & ((1 << target_bits) - 1)
+
+
+@functools.lru_cache(maxsize=None)
+def get_colour_unquantization_table(levels: int) -> np.ndarray:
+    """
+    (high_value, low_bits) --> 8-bit colour value, table indexed by (high_value << bits) | low_bits
+    """
+    trits, quints, bits = ISE_ENCODINGS[levels]
+    high_values_count: int = 3 if trits else 5 if quints else 1
+    table = np.zeros(high_values_count << bits, dtype=np.int32)
+    for high_value in range(high_values_count):
+        for low_bits in range(1 << bits):
+            if not trits and not quints:
+                value = _replicate_bits(low_bits, bits, 8)
+            else:
+                c, pattern = COLOUR_UNQUANTIZATION_PARAMETERS[(trits, quints, bits)]
+                a = 0x1FF if low_bits & 1 else 0
+                t = (high_value * c + _get_pattern_value(pattern, low_bits)) ^ a
+                value = (a & 0x80) | (t >> 2)
+            table[(high_value << bits) | low_bits] = value
+    return table
+
+
+@functools.lru_cache(maxsize=None)
+def get_weight_unquantization_table(levels: int) -> np.ndarray:
+    """
+    (high_value, low_bits) --> weight in range 0-64
+    """
+    trits, quints, bits = ISE_ENCODINGS[levels]
+    high_values_count: int = 3 if trits else 5 if quints else 1
+    table = np.zeros(high_values_count << bits, dtype=np.int32)
+    for high_value in range(high_values_count):
+        for low_bits in range(1 << bits):
+            if not trits and not quints:
+                value = _replicate_bits(low_bits, bits, 6)
+            elif bits == 0:
+                value = (0, 32, 63)[high_value] if trits else (0, 16, 32, 47, 63)[high_value]
+            else:
+                c, pattern = WEIGHT_UNQUANTIZATION_PARAMETERS[(trits, quints, bits)]
+                a = 0x7F if low_bits & 1 else 0
+                t = (high_value * c + _get_pattern_value(pattern, low_bits)) ^ a
+                value = (a & 0x20) | (t >> 2)
+            table[(high_value << bits) | low_bits] = value + 1 if value > 32 else value
+    return table
+
+
+def _decode_block_mode(block_mode: int) -> Optional[tuple]:
+    """
+    Returns (grid_width, grid_height, is_dual_plane, weight_levels) or None for reserved block modes
+    """
+    quant_mode: int = _get_bit(block_mode, 4)
+    h_bit: int = _get_bit(block_mode, 9)
+    d_bit: int = _get_bit(block_mode, 10)
+    a: int = (block_mode >> 5) & 3
+    if block_mode & 3:
+        quant_mode |= (block_mode & 3) << 1
+        b: int = (block_mode >> 7) & 3
+        layout: int = (block_mode >> 2) & 3
+        if layout == 0:
+            width, height = b + 4, a + 2
+        elif layout == 1:
+            width, height = b + 8, a + 2
+        elif layout == 2:
+            width, height = a + 2, b + 8
+        elif block_mode & 0x100:
+            width, height = (b & 1) + 2, a + 2
+        else:
+            width, height = a + 2, (b & 1) + 6
+    else:
+        quant_mode |= ((block_mode >> 2) & 3) << 1
+        if (block_mode >> 2) & 3 == 0:
+            return None
+        b: int = (block_mode >> 9) & 3
+        layout: int = (block_mode >> 7) & 3
+        if layout == 0:
+            width, height = 12, a + 2
+        elif layout == 1:
+            width, height = a + 2, 12
+        elif layout == 2:
+            width, height = a + 6, b + 6
+            d_bit = h_bit = 0
+        elif a == 0:
+            width, height = 6, 10
+        elif a == 1:
+            width, height = 10, 6
+        else:
+            return None
+    return width, height, bool(d_bit), WEIGHT_LEVELS[quant_mode - 2 + 6 * h_bit]
+
+
+@functools.lru_cache(maxsize=None)
+def get_block_mode_table(block_width: int, block_height: int) -> list:
+    """
+    Block mode --> (grid_width, grid_height, is_dual_plane, weight_levels, weight_bits) or None if invalid
+    """
+    block_modes: list = []
+    for block_mode in range(2048):
+        decoded_mode = _decode_block_mode(block_mode)
+        if decoded_mode is None:
+            block_modes.append(None)
+            continue
+        width, height, is_dual_plane, weight_levels = decoded_mode
+        weight_count: int = width * height * (2 if is_dual_plane else 1)
+        weight_bits: int = get_ise_bit_count(weight_count, weight_levels)
+        if weight_count > 64 or not 24 <= weight_bits <= 96 or width > block_width or height > block_height:
+            block_modes.append(None)
+            continue
+        block_modes.append((width, height, is_dual_plane, weight_levels, weight_bits))
+    return block_modes
+
+
+def _hash52(p: np.ndarray) -> np.ndarray:
+    p = p.astype(np.uint32)
+    p ^= p >> np.uint32(15)
+    p -= p << np.uint32(17)
+    p += p << np.uint32(7)
+    p += p << np.uint32(4)
+    p ^= p >> np.uint32(5)
+    p += p << np.uint32(16)
+    p ^= p >> np.uint32(7)
+    p ^= p >> np.uint32(3)
+    p ^= p << np.uint32(6)
+    p ^= p >> np.uint32(17)
+    return p
+
+
+@functools.lru_cache(maxsize=None)
+def get_partition_table(block_width: int, block_height: int, partition_count: int) -> np.ndarray:
+    """
+    Returns (1024, texels_count) table: partition seed --> partition of every texel
+    """
+    texel_y, texel_x = np.mgrid[0:block_height, 0:block_width]
+    x = texel_x.reshape(1, -1).astype(np.int64)
+    y = texel_y.reshape(1, -1).astype(np.int64)
+    if block_width * block_height < 31:
+        x <<= 1
+        y <<= 1
+
+    seed = np.arange(1024, dtype=np.int64)
+    random_number = _hash52(seed + (partition_count - 1) * 1024).astype(np.int64)[:, None]
+    seeds = [((random_number >> shift) & 0xF) for shift in (0, 4, 8, 12, 16, 20, 24, 28, 18, 22, 26)]
+    seeds.append(((random_number >> 30) | (random_number << 2)) & 0xF)
+    seeds = [value * value for value in seeds]
+
+    seed = seed[:, None]
+    shift_1 = np.where(seed & 1, np.where(seed & 2, 4, 5), 6 if partition_count == 3 else 5)
+    shift_2 = np.where(seed & 1, 6 if partition_count == 3 else 5, np.where(seed & 2, 4, 5))
+    shift_3 = np.where(seed & 0x10, shift_1, shift_2)
+    for i in range(8):
+        seeds[i] = seeds[i] >> (shift_1 if i % 2 == 0 else shift_2)
+    for i in range(8, 12):
+        seeds[i] = seeds[i] >> shift_3
+
+    # z coordinate is always 0 for 2D blocks
+    a = (seeds[0] * x + seeds[1] * y + (random_number >> 14)) & 0x3F
+    b = (seeds[2] * x + seeds[3] * y + (random_number >> 10)) & 0x3F
+    c = (seeds[4] * x + seeds[5] * y + (random_number >> 6)) & 0x3F
+    d = (seeds[6] * x + seeds[7] * y + (random_number >> 2)) & 0x3F
+    if partition_count < 4:
+        d = np.zeros_like(d)
+    if partition_count < 3:
+        c = np.zeros_like(c)
+    return np.where((a >= b) & (a >= c) & (a >= d), 0, np.where((b >= c) & (b >= d), 1, np.where(c >= d, 2, 3))).astype(np.int64)
+
+
+@functools.lru_cache(maxsize=None)
+def get_weight_infill_table(block_width: int, block_height: int, grid_width: int, grid_height: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns grid point indices (texels_count, 4) and bilinear factors (texels_count, 4) of every texel
+    """
+    texel_y, texel_x = np.mgrid[0:block_height, 0:block_width]
+    cs = ((1024 + block_width // 2) // (block_width - 1)) * texel_x.reshape(-1)
+    ct = ((1024 + block_height // 2) // (block_height - 1)) * texel_y.reshape(-1)
+    gs = (cs * (grid_width - 1) + 32) >> 6
+    gt = (ct * (grid_height - 1) + 32) >> 6
+    js, fs = gs >> 4, gs & 0xF
+    jt, ft = gt >> 4, gt & 0xF
+
+    v0 = js + jt * grid_width
+    w11 = (fs * ft + 8) >> 4
+    indices = np.stack((v0, v0 + 1, v0 + grid_width, v0 + grid_width + 1), axis=1)
+    factors = np.stack((16 - fs - ft + w11, fs - w11, ft - w11, w11), axis=1)
+    # points outside of the grid always have zero factor
+    indices = np.minimum(indices, grid_width * grid_height - 1)
+    return indices.astype(np.int64), factors.astype(np.int64)
+
+
+def _bit_transfer_signed(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    b = (b >> 1) | (a & 0x80)
+    a = (a >> 1) & 0x3F
+    a = np.where(a & 0x20, a - 0x40, a)
+    return a, b
+
+
+def _blue_contract(r: np.ndarray, g: np.ndarray, b: np.ndarray, a: np.ndarray) -> tuple:
+    return (r + b) >> 1, (g + b) >> 1, b, a
+
+
+def decode_colour_endpoints(values: np.ndarray, endpoint_mode: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (N, values_count) unquantized colour values --> two (N, 4) RGBA endpoints
+    """
+    v = [values[:, i] for i in range(values.shape[1])]
+    opaque = np.full(len(values), 0xFF, dtype=np.int64)
+    if endpoint_mode in HDR_ENDPOINT_MODES:
+        error_colour = np.broadcast_to(np.array(ASTC_ERROR_COLOUR, dtype=np.int64), (len(values), 4))
+        return error_colour, error_colour
+    endpoint_0: tuple
+    endpoint_1: tuple
+    if endpoint_mode == 0:
+        endpoint_0 = (v[0], v[0], v[0], opaque)
+        endpoint_1 = (v[1], v[1], v[1], opaque)
+    elif endpoint_mode == 1:
+        l0 = (v[0] >> 2) | (v[1] & 0xC0)
+        l1 = np.minimum(l0 + (v[1] & 0x3F), 0xFF)
+        endpoint_0 = (l0, l0, l0, opaque)
+        endpoint_1 = (l1, l1, l1, opaque)
+    elif endpoint_mode == 4:
+        endpoint_0 = (v[0], v[0], v[0], v[2])
+        endpoint_1 = (v[1], v[1], v[1], v[3])
+    elif endpoint_mode == 5:
+        v[1], v[0] = _bit_transfer_signed(v[1], v[0])
+        v[3], v[2] = _bit_transfer_signed(v[3], v[2])
+        endpoint_0 = (v[0], v[0], v[0], v[2])
+        endpoint_1 = (v[0] + v[1], v[0] + v[1], v[0] + v[1], v[2] + v[3])
+    elif endpoint_mode in (6, 10):
+        alpha_0 = v[4] if endpoint_mode == 10 else opaque
+        alpha_1 = v[5] if endpoint_mode == 10 else opaque
+        endpoint_0 = ((v[0] * v[3]) >> 8, (v[1] * v[3]) >> 8, (v[2] * v[3]) >> 8, alpha_0)
+        endpoint_1 = (v[0], v[1], v[2], alpha_1)
+    elif endpoint_mode in (8, 12):
+        alpha_0 = v[6] if endpoint_mode == 12 else opaque
+        alpha_1 = v[7] if endpoint_mode == 12 else opaque
+        normal_order = (v[1] + v[3] + v[5]) >= (v[0] + v[2] + v[4])
+        first = (v[0], v[2], v[4], alpha_0)
+        second = (v[1], v[3], v[5], alpha_1)
+        endpoint_0 = tuple(np.where(normal_order, x, y) for x, y in zip(first, _blue_contract(*second)))
+        endpoint_1 = tuple(np.where(normal_order, x, y) for x, y in zip(second, _blue_contract(*first)))
+    elif endpoint_mode in (9, 13):
+        for i in range(0, 8 if endpoint_mode == 13 else 6, 2):
+            v[i + 1], v[i] = _bit_transfer_signed(v[i + 1], v[i])
+        alpha_0 = v[6] if endpoint_mode == 13 else opaque
+        alpha_1 = v[6] + v[7] if endpoint_mode == 13 else opaque
+        normal_order = (v[1] + v[3] + v[5]) >= 0
+        base = (v[0], v[2], v[4], alpha_0)
+        offset = (v[0] + v[1], v[2] + v[3], v[4] + v[5], alpha_1)
+        endpoint_0 = tuple(np.where(normal_order, x, y) for x, y in zip(base, _blue_contract(*offset)))
+        endpoint_1 = tuple(np.where(normal_order, x, y) for x, y in zip(offset, _blue_contract(*base)))
+    else:
+        raise Exception(f"Not supported endpoint mode {endpoint_mode}!")
+    return np.clip(np.stack(endpoint_0, axis=1), 0, 255), np.clip(np.stack(endpoint_1, axis=1), 0, 255)
+
+
+class AstcNumpyDecoder:
+    """
+    Vectorized decoder for 2D ASTC compressed images
+    """
+
+    supported_formats: tuple = tuple(astc_block_dimensions.keys())
+
+    def __init__(self, workers: int = 1):
+        self.workers: int = workers
+
+    def _decode_void_extent_blocks(self, bits: np.ndarray) -> np.ndarray:
+        colours = np.stack([_read_field(bits, 64 + 16 * channel, 16) >> 8 for channel in range(4)], axis=1)
+        s_min, s_max, t_min, t_max = (_read_field(bits, start, 13) for start in (12, 25, 38, 51))
+        all_ones = (s_min == 0x1FFF) & (s_max == 0x1FFF) & (t_min == 0x1FFF) & (t_max == 0x1FFF)
+        is_invalid = (_read_field(bits, 10, 2) != 3) | (~all_ones & ((s_min >= s_max) | (t_min >= t_max)))
+        is_hdr = _read_field(bits, 9, 1).astype(bool)
+        colours[is_hdr | is_invalid] = ASTC_ERROR_COLOUR
+        return colours
+
+    def _decode_block_group(self, bits: np.ndarray, block_width: int, block_height: int, block_mode_entry: tuple,
+                            partition_count: int, endpoint_modes: tuple, extra_cem_bits: int) -> np.ndarray:
+        """
+        Decodes blocks sharing the same bit layout --> (N, texels_count, 4) RGBA array
+        """
+        texels_count: int = block_width * block_height
+        grid_width, grid_height, is_dual_plane, weight_levels, weight_bits = block_mode_entry
+        error_result = np.broadcast_to(np.array(ASTC_ERROR_COLOUR, dtype=np.int64), (len(bits), texels_count, 4))
+        if is_dual_plane and partition_count == 4:
+            return error_result
+
+        colour_values_count: int = sum(((endpoint_mode >> 2) + 1) * 2 for endpoint_mode in endpoint_modes)
+        colour_start: int = 17 if partition_count == 1 else 29
+        colour_bits: int = 128 - weight_bits - colour_start - extra_cem_bits - (2 if is_dual_plane else 0)
+        fitting_colour_levels: list = [levels for levels in COLOUR_LEVELS if get_ise_bit_count(colour_values_count, levels) <= colour_bits]
+        if colour_values_count > MAX_COLOUR_VALUES or not fitting_colour_levels:
+            return error_result
+        colour_levels: int = fitting_colour_levels[-1]
+
+        # colour endpoints
+        colour_bits_array = np.concatenate((bits[:, colour_start:128], np.zeros((len(bits), 1), dtype=np.uint8)), axis=1)
+        high_values, low_bits = decode_ise(colour_bits_array, colour_values_count, colour_levels)
+        colour_values = get_colour_unquantization_table(colour_levels)[(high_values << ISE_ENCODINGS[colour_levels][2]) | low_bits]
+
+        endpoints_0 = np.empty((len(bits), partition_count, 4), dtype=np.int64)
+        endpoints_1 = np.empty((len(bits), partition_count, 4), dtype=np.int64)
+        value_offset: int = 0
+        for partition, endpoint_mode in enumerate(endpoint_modes):
+            values_count: int = ((endpoint_mode >> 2) + 1) * 2
+            endpoints_0[:, partition], endpoints_1[:, partition] = decode_colour_endpoints(
+                colour_values[:, value_offset: value_offset + values_count].astype(np.int64), endpoint_mode)
+            value_offset += values_count
+
+        # weights are stored from the end of the block with reversed bit order
+        weight_bits_array = np.concatenate((bits[:, 127::-1], np.zeros((len(bits), 1), dtype=np.uint8)), axis=1)
+        weight_count: int = grid_width * grid_height * (2 if is_dual_plane else 1)
+        high_values, low_bits = decode_ise(weight_bits_array, weight_count, weight_levels)
+        weights = get_weight_unquantization_table(weight_levels)[(high_values << ISE_ENCODINGS[weight_levels][2]) | low_bits]
+
+        infill_indices, infill_factors = get_weight_infill_table(block_width, block_height, grid_width, grid_height)
+        planes: list = [weights[:, 0::2], weights[:, 1::2]] if is_dual_plane else [weights]
+        texel_weights = [(plane[:, infill_indices] * infill_factors).sum(axis=-1) + 8 >> 4 for plane in planes]
+
+        # partition of every texel
+        if partition_count > 1:
+            partition_seed = _read_field(bits, 13, 10)
+            texel_partitions = get_partition_table(block_width, block_height, partition_count)[partition_seed]
+        else:
+            texel_partitions = np.zeros((len(bits), texels_count), dtype=np.int64)
+        texel_endpoints_0 = np.take_along_axis(endpoints_0, texel_partitions[:, :, None], axis=1)
+        texel_endpoints_1 = np.take_along_axis(endpoints_1, texel_partitions[:, :, None], axis=1)
+
+        channel_weights = np.repeat(texel_weights[0][:, :, None], 4, axis=2)
+        if is_dual_plane:
+            component_selector = _read_field(bits, 128 - weight_bits - extra_cem_bits - 2, 2)
+            second_plane_channel = np.arange(4)[None, None, :] == component_selector[:, None, None]
+            channel_weights = np.where(second_plane_channel, texel_weights[1][:, :, None], channel_weights)
+
+        # endpoints are expanded to 16 bits, only top 8 bits of result are used
+        colour_0 = texel_endpoints_0 * 257
+        colour_1 = texel_endpoints_1 * 257
+        return ((colour_0 * (64 - channel_weights) + colour_1 * channel_weights + 32) >> 6) >> 8
+
+    def decode_blocks(self, blocks: np.ndarray, block_width: int, block_height: int) -> np.ndarray:
+        """
+        (blocks_count, 16) ASTC blocks --> (blocks_count, texels_count, 4) RGBA array
+        """
+        texels_count: int = block_width * block_height
+        result = np.empty((len(blocks), texels_count, 4), dtype=np.uint8)
+        result[:] = ASTC_ERROR_COLOUR
+        if len(blocks) == 0:
+            return result
+
+        bits = np.concatenate((np.unpackbits(blocks, axis=1, bitorder="little"), np.zeros((len(blocks), 1), dtype=np.uint8)), axis=1)
+        block_modes = _read_field(bits, 0, 11)
+        partition_counts = _read_field(bits, 11, 2) + 1
+
+        void_extent = (block_modes & 0x1FF) == 0x1FC
+        if void_extent.any():
+            result[void_extent] = self._decode_void_extent_blocks(bits[void_extent])[:, None, :]
+
+        block_mode_table: list = get_block_mode_table(block_width, block_height)
+        group_keys = np.where(void_extent, -1, block_modes * 4 + partition_counts - 1)
+        for group_key in np.unique(group_keys):
+            if group_key < 0:
+                continue
+            block_mode_entry = block_mode_table[group_key // 4]
+            if block_mode_entry is None:
+                continue
+            partition_count: int = int(group_key % 4) + 1
+            group_indices = np.nonzero(group_keys == group_key)[0]
+            group_bits = bits[group_indices]
+            weight_bits: int = block_mode_entry[4]
+
+            # colour endpoint modes of every partition
+            if partition_count == 1:
+                endpoint_modes = _read_field(group_bits, 13, 4)[:, None]
+                extra_bits_counts = np.zeros(len(group_bits), dtype=np.int64)
+            else:
+                selector = _read_field(group_bits, 23, 2)
+                extra_bits_count: int = 3 * partition_count - 4
+                extra_bits = _read_field(group_bits, 128 - weight_bits - extra_bits_count, extra_bits_count)
+                field = _read_field(group_bits, 25, 4) | (extra_bits << 4)
+                shared_modes = np.repeat(_read_field(group_bits, 25, 4)[:, None], partition_count, axis=1)
+                class_bits = np.stack([(field >> i) & 1 for i in range(partition_count)], axis=1)
+                mode_bits = np.stack([(field >> (partition_count + 2 * i)) & 3 for i in range(partition_count)], axis=1)
+                separate_modes = ((selector[:, None] - 1 + class_bits) << 2) | mode_bits
+                endpoint_modes = np.where(selector[:, None] == 0, shared_modes, separate_modes)
+                extra_bits_counts = np.where(selector == 0, 0, extra_bits_count)
+
+            layout_keys = (extra_bits_counts << 16) | (endpoint_modes * (16 ** np.arange(partition_count))).sum(axis=1)
+            for layout_key in np.unique(layout_keys):
+                layout_mask = layout_keys == layout_key
+                first_block: int = int(np.argmax(layout_mask))
+                result[group_indices[layout_mask]] = self._decode_block_group(
+                    group_bits[layout_mask], block_width, block_height, block_mode_entry, partition_count,
+                    tuple(int(mode) for mode in endpoint_modes[first_block]), int(extra_bits_counts[first_block]))
+        return result
+
+    def decode_astc_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
+        block_width, block_height = astc_block_dimensions[image_format]
+        blocks_x: int = (img_width + block_width - 1) // block_width
+        blocks_y: int = (img_height + block_height - 1) // block_height
+        expected_size: int = blocks_x * blocks_y * ASTC_BLOCK_DATA_SIZE
+        if len(image_data) < expected_size:
+            raise ValueError(f"Not enough image data! Expected {expected_size} bytes, got {len(image_data)} bytes.")
+        blocks = np.frombuffer(image_data, dtype=np.uint8, count=expected_size).reshape(-1, ASTC_BLOCK_DATA_SIZE)
+
+        # identical blocks (e.g. flat areas of atlases) are decoded only once
+        unique_blocks, inverse_indices = np.unique(blocks, axis=0, return_inverse=True)
+        if self.workers > 1 and len(unique_blocks) > self.workers:
+            chunks = np.array_split(unique_blocks, self.workers)
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                decoded_chunks = list(executor.map(_decode_astc_chunk, chunks, [block_width] * len(chunks), [block_height] * len(chunks)))
+            decoded_unique_blocks = np.concatenate(decoded_chunks)
+        else:
+            decoded_unique_blocks = self.decode_blocks(unique_blocks, block_width, block_height)
+
+        block_pixels = decoded_unique_blocks[inverse_indices.reshape(-1)]
+        image = block_pixels.reshape(blocks_y, blocks_x, block_height, block_width, 4).transpose(0, 2, 1, 3, 4)
+        image = image.reshape(blocks_y * block_height, blocks_x * block_width, 4)[:img_height, :img_width]
+        return bytearray(image.tobytes())
+
+
+def _decode_astc_chunk(blocks: np.ndarray, block_width: int, block_height: int) -> np.ndarray:
+    return AstcNumpyDecoder().decode_blocks(blocks, block_width, block_height)
@@ -0,0 +1,255 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import numpy as np
+from PIL import Image
+
+from reversebox.common.logger import get_logger
+from reversebox.image.common import get_bc_image_data_size, get_block_data_size
+from reversebox.image.image_formats import ImageFormats
+
+logger = get_logger(__name__)
+
+# fmt: off
+
+# Backends for decoding BC1-BC7 compressed images to RGBA8888.
+# Every backend has the same interface, so "CompressedImageDecoderEncoder"
+# can choose the first one available on current platform:
+# 1. "pillow"     - Pillow's native "bcn" decoder (BC1-BC7), runs without GIL
+# 2. "numpy"      - vectorized BC1-BC5 decoder, whole image decoded as one batch
+# 3. "directxtex" - DirectXTex.dll (Windows only), see "compressed_decoder_encoder.py"
+#
+# Channels missing in BC4 and BC5 formats are decoded the same way as in DirectXTex,
+# i.e. BC4 --> (R, 0, 0, 255) and BC5 --> (R, G, 0, 255).
+
+BC_BLOCK_SIZE: int = 4
+
+
+class BCnDecoderBackend:
+    """
+    Base class for all BCn decoder backends
+    """
+    name: str = ""
+    supported_formats: tuple = ()
+
+    def is_available(self, image_format: ImageFormats) -> bool:
+        return image_format in self.supported_formats
+
+    def decode(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
+        raise NotImplementedError()
+
+    def decode_into(self, output: np.ndarray, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> None:
+        """
+        Decodes image into (img_width * img_height * 4) uint8 array,
+        backends able to write output directly override this method
+        """
+        output[:] = np.frombuffer(self.decode(image_data, img_width, img_height, image_format), dtype=np.uint8)
+
+
+def _check_bc_data_size(image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> int:
+    expected_size: int = get_bc_image_data_size(img_width, img_height, image_format)
+    if len(image_data) < expected_size:
+        raise ValueError(f"Not enough image data! Expected {expected_size} bytes, got {len(image_data)} bytes.")
+    return expected_size
+
+
+def _expand_channels_to_rgba(channels: np.ndarray) -> np.ndarray:
+    # (height, width) or (height, width, channels) array --> (height, width, 4) array
+    if channels.ndim == 2:
+        channels = channels[:, :, None]
+    rgba = np.zeros(channels.shape[:2] + (4,), dtype=np.uint8)
+    rgba[:, :, :min(channels.shape[2], 3)] = channels[:, :, :3]
+    rgba[:, :, 3] = 0xFF if channels.shape[2] < 4 else channels[:, :, 3]
+    return rgba
+
+
+class PillowBCnDecoderBackend(BCnDecoderBackend):
+    name = "pillow"
+
+    # image_format: (bcn_decoder_number, pillow_mode, pixel_format)
+    pillow_bcn_formats = {
+        ImageFormats.BC1_DXT1: (1, "RGBA", ""),
+        ImageFormats.BC2_DXT2: (2, "RGBA", ""),
+        ImageFormats.BC2_DXT3: (2, "RGBA", ""),
+        ImageFormats.BC3_DXT5: (3, "RGBA", ""),
+        ImageFormats.BC4_UNORM: (4, "L", ""),
+        ImageFormats.BC5_UNORM: (5, "RGB", "BC5"),
+        ImageFormats.BC6H_UF16: (6, "RGB", "BC6H"),
+        ImageFormats.BC6H_SF16: (6, "RGB", "BC6HS"),
+        ImageFormats.BC7_UNORM: (7, "RGBA", ""),
+    }
+    supported_formats = tuple(pillow_bcn_formats.keys())
+
+    def is_available(self, image_format: ImageFormats) -> bool:
+        if image_format not in self.supported_formats:
+            return False
+        # older Pillow versions don't support all BCn variants, so check it with one empty block
+        try:
+            self.decode(bytes(get_block_data_size(image_format)), BC_BLOCK_SIZE, BC_BLOCK_SIZE, image_format)
+        except Exception as error:
+            logger.debug(f"Pillow BCn decoder not available for {image_format}. Error: {error}")
+            return False
+        return True
+
+    def decode(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
+        decoder_number, pillow_mode, pixel_format = self.pillow_bcn_formats[image_format]
+        expected_size: int = _check_bc_data_size(image_data, img_width, img_height, image_format)
+        pillow_image: Image.Image = Image.frombuffer(pillow_mode, (img_width, img_height), bytes(image_data[:expected_size]),
+                                                     "bcn", decoder_number, pixel_format)
+        if pillow_mode == "RGBA":
+            return bytearray(pillow_image.tobytes())
+        channels: np.ndarray = np.asarray(pillow_image)
+        if image_format in (ImageFormats.BC4_UNORM, ImageFormats.BC5_UNORM):
+            channels = channels if channels.ndim == 2 else channels[:, :, :2]
+        return bytearray(_expand_channels_to_rgba(channels).tobytes())
+
+
+def get_bc_blocks(image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> np.ndarray:
+    """
+    Returns (blocks_count, block_size) uint8 array with all blocks of an image
+    """
+    expected_size: int = _check_bc_data_size(image_data, img_width, img_height, image_format)
+    return np.frombuffer(image_data, dtype=np.uint8, count=expected_size).reshape(-1, get_block_data_size(image_format))
+
+
+def assemble_bc_blocks(block_pixels: np.ndarray, img_width: int, img_height: int) -> np.ndarray:
+    """
+    (blocks_count, 16, channels) array of decoded blocks --> (height, width, channels) image
+    """
+    blocks_x: int = (img_width + 3) // 4
+    blocks_y: int = (img_height + 3) // 4
+    channels: int = block_pixels.shape[-1]
+    image = block_pixels.reshape(blocks_y, blocks_x, 4, 4, channels).transpose(0, 2, 1, 3, 4)
+    return image.reshape(blocks_y * 4, blocks_x * 4, channels)[:img_height, :img_width]
+
+
+def _expand_rgb565(values: np.ndarray) -> np.ndarray:
+    # uint32 array --> (..., 3) array with bit-replicated channels
+    r = (values >> 11) & 0x1F
+    g = (values >> 5) & 0x3F
+    b = values & 0x1F
+    return np.stack(((r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)), axis=-1)
+
+
+def get_bc1_palette(colour_0: np.ndarray, colour_1: np.ndarray, four_colour_mode: np.ndarray) -> np.ndarray:
+    """
+    RGB565 endpoints (uint32 arrays) --> (blocks_count, 4, 4) RGBA palettes (uint32)
+    """
+    rgb_0 = _expand_rgb565(colour_0)
+    rgb_1 = _expand_rgb565(colour_1)
+    palette = np.empty((len(colour_0), 4, 4), dtype=np.uint32)
+    palette[:, 0, :3] = rgb_0
+    palette[:, 1, :3] = rgb_1
+    palette[:, :, 3] = 0xFF
+
+    mask = four_colour_mode[:, None]
+    palette[:, 2, :3] = np.where(mask, (2 * rgb_0 + rgb_1) // 3, (rgb_0 + rgb_1) // 2)
+    palette[:, 3, :3] = np.where(mask, (rgb_0 + 2 * rgb_1) // 3, 0)
+    palette[:, 3, 3] = np.where(four_colour_mode, 0xFF, 0x00)
+    return palette
+
+
+def decode_bc1_colour_blocks(colour_blocks: np.ndarray, four_colour_mode_only: bool) -> np.ndarray:
+    """
+    (blocks_count, 8) array of BC1 colour blocks --> (blocks_count, 16, 4) RGBA array.
+    Colour blocks of BC2/BC3 formats always use four colour mode.
+    """
+    colour_0 = colour_blocks[:, 0].astype(np.uint32) | (colour_blocks[:, 1].astype(np.uint32) << 8)
+    colour_1 = colour_blocks[:, 2].astype(np.uint32) | (colour_blocks[:, 3].astype(np.uint32) << 8)
+    indices = colour_blocks[:, 4:8].copy().view("<u4")[:, 0]
+
+    four_colour_mode = np.ones(len(colour_blocks), dtype=bool) if four_colour_mode_only else colour_0 > colour_1
+    palette = get_bc1_palette(colour_0, colour_1, four_colour_mode)
+
+    pixel_indices = (indices[:, None] >> (2 * np.arange(16, dtype=np.uint32))) & 0x03
+    return np.take_along_axis(palette, pixel_indices[:, :, None].astype(np.intp), axis=1).astype(np.uint8)
+
+
+def decode_bc2_alpha_blocks(alpha_blocks: np.ndarray) -> np.ndarray:
+    """
+    (blocks_count, 8) array of explicit 4-bit alpha blocks --> (blocks_count, 16) alpha array
+    """
+    alpha = np.empty((len(alpha_blocks), 16), dtype=np.uint8)
+    alpha[:, 0::2] = (alpha_blocks & 0x0F) * 0x11
+    alpha[:, 1::2] = (alpha_blocks >> 4) * 0x11
+    return alpha
+
+
+def get_bc3_alpha_palette(alpha_0: np.ndarray, alpha_1: np.ndarray) -> np.ndarray:
+    """
+    Alpha endpoints (uint32 arrays) --> (blocks_count, 8) palettes (uint32)
+    """
+    eight_values_mode = (alpha_0 > alpha_1)[:, None]
+
+    steps = np.arange(1, 7, dtype=np.uint32)
+    palette = np.empty((len(alpha_0), 8), dtype=np.uint32)
+    palette[:, 0] = alpha_0
+    palette[:, 1] = alpha_1
+    eight_values = ((7 - steps) * alpha_0[:, None] + steps * alpha_1[:, None]) // 7
+    six_values = ((5 - steps[:4]) * alpha_0[:, None] + steps[:4] * alpha_1[:, None]) // 5
+    six_values = np.concatenate((six_values, np.tile(np.array([0x00, 0xFF], dtype=np.uint32), (len(alpha_0), 1))), axis=1)
+    palette[:, 2:] = np.where(eight_values_mode, eight_values, six_values)
+    return palette
+
+
+def decode_bc3_alpha_blocks(alpha_blocks: np.ndarray) -> np.ndarray:
+    """
+    (blocks_count, 8) array of interpolated alpha blocks (BC3 alpha, BC4, BC5 channels)
+    --> (blocks_count, 16) array of 8-bit values
+    """
+    palette = get_bc3_alpha_palette(alpha_blocks[:, 0].astype(np.uint32), alpha_blocks[:, 1].astype(np.uint32))
+
+    index_bits = np.zeros(len(alpha_blocks), dtype=np.uint64)
+    for i in range(6):
+        index_bits |= alpha_blocks[:, 2 + i].astype(np.uint64) << np.uint64(8 * i)
+    pixel_indices = (index_bits[:, None] >> (np.uint64(3) * np.arange(16, dtype=np.uint64))) & np.uint64(0x07)
+    return np.take_along_axis(palette, pixel_indices.astype(np.intp), axis=1).astype(np.uint8)
+
+
+class NumpyBCnDecoderBackend(BCnDecoderBackend):
+    name = "numpy"
+    supported_formats = (
+        ImageFormats.BC1_DXT1,
+        ImageFormats.BC2_DXT2,
+        ImageFormats.BC2_DXT3,
+        ImageFormats.BC3_DXT5,
+        ImageFormats.BC4_UNORM,
+        ImageFormats.BC5_UNORM,
+    )
+
+    def decode_blocks(self, blocks: np.ndarray, image_format: ImageFormats) -> np.ndarray:
+        """
+        (blocks_count, block_size) array --> (blocks_count, 16, 4) RGBA array
+        """
+        if image_format == ImageFormats.BC1_DXT1:
+            return decode_bc1_colour_blocks(blocks, False)
+        elif image_format in (ImageFormats.BC2_DXT2, ImageFormats.BC2_DXT3):
+            block_pixels = decode_bc1_colour_blocks(blocks[:, 8:16], True)
+            block_pixels[:, :, 3] = decode_bc2_alpha_blocks(blocks[:, 0:8])
+            return block_pixels
+        elif image_format == ImageFormats.BC3_DXT5:
+            block_pixels = decode_bc1_colour_blocks(blocks[:, 8:16], True)
+            block_pixels[:, :, 3] = decode_bc3_alpha_blocks(blocks[:, 0:8])
+            return block_pixels
+
+        block_pixels = np.zeros((len(blocks), 16, 4), dtype=np.uint8)
+        block_pixels[:, :, 3] = 0xFF
+        if image_format == ImageFormats.BC4_UNORM:
+            block_pixels[:, :, 0] = decode_bc3_alpha_blocks(blocks)
+        elif image_format == ImageFormats.BC5_UNORM:
+            block_pixels[:, :, 0] = decode_bc3_alpha_blocks(blocks[:, 0:8])
+            block_pixels[:, :, 1] = decode_bc3_alpha_blocks(blocks[:, 8:16])
+        else:
+            raise Exception(f"Not supported image format! Image_format: {image_format}")
+        return block_pixels
+
+    def decode(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
+        blocks = get_bc_blocks(image_data, img_width, img_height, image_format)
+        image = assemble_bc_blocks(self.decode_blocks(blocks, image_format), img_width, img_height)
+        return bytearray(image.tobytes())
+
+    def decode_into(self, output: np.ndarray, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> None:
+        blocks = get_bc_blocks(image_data, img_width, img_height, image_format)
+        output.reshape(img_height, img_width, 4)[:] = assemble_bc_blocks(self.decode_blocks(blocks, image_format), img_width, img_height)
@@ -0,0 +1,530 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple
+
+import numpy as np
+
+from reversebox.common.logger import get_logger
+from reversebox.image.common import get_block_data_size
+from reversebox.image.decoders.bcn_decoder_backends import (
+    get_bc1_palette,
+    get_bc3_alpha_palette,
+)
+from reversebox.image.image_formats import ImageFormats
+
+logger = get_logger(__name__)
+
+# fmt: off
+
+# Vectorized BC1/BC2/BC3/BC4/BC5/BC6H/BC7 encoder. All 4x4 blocks of an image are encoded
+# as one batch (split into chunks to limit memory usage):
+# 1. endpoint selection
+# 2. index assignment (nearest palette entry, palettes are built exactly like in decoder)
+# 3. bit packing
+#
+# Presets:
+# "fast"   - bounding box of block colours (inset by 1/16 of range), min/max for alpha channels
+# "normal" - PCA range fit for colours, alpha channels also try 6-value mode with explicit 0 and 255
+# "high"   - "normal" + bounding box candidate + least squares endpoint refinement,
+#            the candidate with the lowest squared error is chosen for every block
+#
+# BC1 pixels with alpha lower than 128 are encoded as transparent (3-colour mode).
+#
+# BC7 and BC6H are limited to the cheapest modes:
+# BC7  - mode 6 (RGBA 7.7.7.7 + p-bits, 4-bit indices) and mode 5 (RGB 7.7.7 + A 8.8,
+#        separate 2-bit colour and alpha indices), mode with lower error is used for every block
+# BC6H - mode 11 (single region, 10-bit RGB endpoints, 4-bit indices).
+#        RGBA8888 input is converted to half floats (value / 255), alpha is ignored
+#
+# Error bound for "normal" preset on sample textures and gradients (RMSE of 8-bit channels
+# decoded by Pillow, checked in tests): BC7 <= 1.0 (RGBA), BC6H_UF16/BC6H_SF16 <= 3.0 (RGB).
+# BC6H interpolates half float bits, so blocks mixing very dark and bright pixels have higher error.
+
+BC_ENCODER_PRESETS: tuple = ("fast", "normal", "high")
+BC_ENCODER_CHUNK_BLOCKS: int = 16384
+BC1_ALPHA_THRESHOLD: int = 128
+LEAST_SQUARES_ITERATIONS: int = 2
+
+# palette index --> weight of first endpoint
+BC1_FOUR_COLOUR_WEIGHTS = np.array([1.0, 0.0, 2.0 / 3.0, 1.0 / 3.0])
+BC1_THREE_COLOUR_WEIGHTS = np.array([1.0, 0.0, 0.5, 0.0])
+BC3_EIGHT_VALUES_WEIGHTS = np.array([1.0, 0.0, 6.0 / 7.0, 5.0 / 7.0, 4.0 / 7.0, 3.0 / 7.0, 2.0 / 7.0, 1.0 / 7.0])
+
+# BC7/BC6H interpolation weights (x / 64 of second endpoint)
+BC7_INDEX_WEIGHTS_2 = np.array([0, 21, 43, 64], dtype=np.int64)
+BC7_INDEX_WEIGHTS_4 = np.array([0, 4, 9, 13, 17, 21, 26, 30, 34, 38, 43, 47, 51, 55, 60, 64], dtype=np.int64)
+
+
+def get_bc_block_pixels(image_data: bytes, img_width: int, img_height: int) -> np.ndarray:
+    """
+    RGBA8888 image --> (blocks_count, 16, 4) uint8 array.
+    Partial blocks are filled by repeating edge pixels, so they don't affect endpoint selection.
+    """
+    pixel_count: int = img_width * img_height
+    if len(image_data) < pixel_count * 4:
+        raise ValueError(f"Not enough image data! Expected {pixel_count * 4} bytes, got {len(image_data)} bytes.")
+    pixels = np.frombuffer(image_data, dtype=np.uint8, count=pixel_count * 4).reshape(img_height, img_width, 4)
+
+    blocks_x: int = (img_width + 3) // 4
+    blocks_y: int = (img_height + 3) // 4
+    if blocks_x * 4 != img_width or blocks_y * 4 != img_height:
+        pixels = np.pad(pixels, ((0, blocks_y * 4 - img_height), (0, blocks_x * 4 - img_width), (0, 0)), mode="edge")
+    return pixels.reshape(blocks_y, 4, blocks_x, 4, 4).transpose(0, 2, 1, 3, 4).reshape(-1, 16, 4)
+
+
+def _quantize_rgb565(endpoints: np.ndarray) -> np.ndarray:
+    endpoints = np.clip(endpoints, 0, 255)
+    r = np.rint(endpoints[:, 0] * 31 / 255).astype(np.uint32)
+    g = np.rint(endpoints[:, 1] * 63 / 255).astype(np.uint32)
+    b = np.rint(endpoints[:, 2] * 31 / 255).astype(np.uint32)
+    return (r << 11) | (g << 5) | b
+
+
+def _get_bounding_box_endpoints(colours: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    used = weights[:, :, None] > 0
+    min_colour = np.where(used, colours, np.inf).min(axis=1)
+    max_colour = np.where(used, colours, -np.inf).max(axis=1)
+    empty_blocks = ~np.isfinite(min_colour)
+    min_colour[empty_blocks] = 0
+    max_colour[empty_blocks] = 0
+    inset = (max_colour - min_colour) / 16
+    return max_colour - inset, min_colour + inset
+
+
+def _get_pca_endpoints(colours: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    pixel_count = np.maximum(weights.sum(axis=1), 1)[:, None]
+    mean = (colours * weights[:, :, None]).sum(axis=1) / pixel_count
+    centered = (colours - mean[:, None, :]) * weights[:, :, None]
+    covariance = np.einsum("nij,nik->njk", centered, centered)
+    _, eigenvectors = np.linalg.eigh(covariance)
+    axis = eigenvectors[:, :, -1]  # eigenvector of the largest eigenvalue
+
+    projection = np.einsum("nij,nj->ni", colours - mean[:, None, :], axis)
+    used = weights > 0
+    projection_min = np.where(used, projection, np.inf).min(axis=1)
+    projection_max = np.where(used, projection, -np.inf).max(axis=1)
+    empty_blocks = ~used.any(axis=1)
+    projection_min[empty_blocks] = 0
+    projection_max[empty_blocks] = 0
+    return mean + axis * projection_max[:, None], mean + axis * projection_min[:, None]
+
+
+def _solve_least_squares_endpoints(values: np.ndarray, pixel_weights: np.ndarray,
+                                   endpoint_weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Finds endpoints minimizing squared error for fixed indices.
+    values: (N, 16, C), pixel_weights: (N, 16), endpoint_weights: (N, 16) weights of first endpoint
+    """
+    a = endpoint_weights * pixel_weights
+    b = (1.0 - endpoint_weights) * pixel_weights
+    aa = (a * endpoint_weights).sum(axis=1)
+    ab = (a * (1.0 - endpoint_weights)).sum(axis=1)
+    bb = (b * (1.0 - endpoint_weights)).sum(axis=1)
+    ax = (a[:, :, None] * values).sum(axis=1)
+    bx = (b[:, :, None] * values).sum(axis=1)
+
+    determinant = aa * bb - ab * ab
+    valid = np.abs(determinant) > 1e-6
+    safe_determinant = np.where(valid, determinant, 1.0)[:, None]
+    endpoint_0 = (bb[:, None] * ax - ab[:, None] * bx) / safe_determinant
+    endpoint_1 = (aa[:, None] * bx - ab[:, None] * ax) / safe_determinant
+    return endpoint_0, endpoint_1, valid
+
+
+def _assign_palette_indices(values: np.ndarray, palette_entries: list) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    values: (N, 16, C), palette_entries: list of (N, C) arrays
+    --> indices of nearest palette entries (N, 16) and squared error of every block (N,)
+    """
+    best_errors = np.full(values.shape[:2], np.inf)
+    indices = np.zeros(values.shape[:2], dtype=np.int64)
+    for palette_index, palette_entry in enumerate(palette_entries):
+        errors = ((values - palette_entry[:, None, :]) ** 2).sum(axis=-1)
+        better = errors < best_errors
+        best_errors = np.where(better, errors, best_errors)
+        indices[better] = palette_index
+    return indices, best_errors.sum(axis=1)
+
+
+class BlockBitWriter:
+    """
+    Writes bit fields (LSB first) to 128-bit blocks of all blocks at once
+    """
+
+    def __init__(self, blocks_count: int):
+        self.low_bits = np.zeros(blocks_count, dtype=np.uint64)
+        self.high_bits = np.zeros(blocks_count, dtype=np.uint64)
+        self.position: int = 0
+
+    def write(self, values: np.ndarray, bits_count: int) -> None:
+        values = np.asarray(values).astype(np.uint64) & np.uint64((1 << bits_count) - 1)
+        if self.position >= 64:
+            self.high_bits |= values << np.uint64(self.position - 64)
+        elif self.position + bits_count <= 64:
+            self.low_bits |= values << np.uint64(self.position)
+        else:
+            low_bits_count: int = 64 - self.position
+            self.low_bits |= (values & np.uint64((1 << low_bits_count) - 1)) << np.uint64(self.position)
+            self.high_bits |= values >> np.uint64(low_bits_count)
+        self.position += bits_count
+
+    def write_indices(self, indices: np.ndarray, bits_count: int) -> None:
+        # index of anchor pixel (first pixel) has implicit zero on the most significant bit
+        for pixel_number in range(16):
+            self.write(indices[:, pixel_number], bits_count - 1 if pixel_number == 0 else bits_count)
+
+    def get_blocks(self) -> np.ndarray:
+        return np.stack((self.low_bits, self.high_bits), axis=1).astype("<u8").view(np.uint8).reshape(-1, 16)
+
+
+def _swap_for_anchor(indices: np.ndarray, endpoint_0: np.ndarray, endpoint_1: np.ndarray, bits_count: int) -> tuple:
+    # first pixel must use index with zero on the most significant bit,
+    # swapping endpoints and inverting indices gives the same decoded block
+    max_index: int = (1 << bits_count) - 1
+    swap = indices[:, 0] > (max_index >> 1)
+    swap_mask = swap.reshape((-1,) + (1,) * (endpoint_0.ndim - 1))
+    return (np.where(swap[:, None], max_index - indices, indices),
+            np.where(swap_mask, endpoint_1, endpoint_0),
+            np.where(swap_mask, endpoint_0, endpoint_1))
+
+
+class BCnNumpyEncoder:
+    """
+    Vectorized encoder for BC1-BC5, BC6H (mode 11 only) and BC7 (modes 6 and 5 only) compressed images
+    """
+
+    supported_formats: tuple = (
+        ImageFormats.BC1_DXT1,
+        ImageFormats.BC2_DXT3,
+        ImageFormats.BC3_DXT5,
+        ImageFormats.BC4_UNORM,
+        ImageFormats.BC5_UNORM,
+        ImageFormats.BC6H_UF16,
+        ImageFormats.BC6H_SF16,
+        ImageFormats.BC7_UNORM,
+    )
+
+    def __init__(self, preset: str = "normal", workers: int = 1, use_bc7_mode_5: bool = True):
+        if preset not in BC_ENCODER_PRESETS:
+            raise ValueError(f"Encoder preset not supported! Preset: {preset}")
+        self.preset: str = preset
+        self.workers: int = workers
+        self.use_bc7_mode_5: bool = use_bc7_mode_5
+
+    # colour blocks ############################################################################################
+
+    def _evaluate_colour_endpoints(self, colours: np.ndarray, transparent: np.ndarray, has_transparency: np.ndarray,
+                                   endpoint_0: np.ndarray, endpoint_1: np.ndarray) -> tuple:
+        colour_0 = _quantize_rgb565(endpoint_0)
+        colour_1 = _quantize_rgb565(endpoint_1)
+        # four colour mode needs colour_0 > colour_1, three colour mode (transparency) needs colour_0 <= colour_1
+        swap = np.where(has_transparency, colour_0 > colour_1, colour_0 < colour_1)
+        colour_0, colour_1 = np.where(swap, colour_1, colour_0), np.where(swap, colour_0, colour_1)
+        four_colour_mode = colour_0 > colour_1
+
+        palette = get_bc1_palette(colour_0, colour_1, four_colour_mode)[:, :, :3].astype(np.int32)
+        distances = ((colours.astype(np.int32)[:, :, None, :] - palette[:, None, :, :]) ** 2).sum(axis=-1)
+        # index 3 is transparent black in three colour mode
+        distances[:, :, 3] = np.where(four_colour_mode[:, None], distances[:, :, 3], np.iinfo(np.int32).max)
+        indices = distances.argmin(axis=-1)
+        indices[transparent] = 3
+
+        pixel_errors = np.take_along_axis(distances, indices[:, :, None], axis=-1)[:, :, 0]
+        errors = np.where(transparent, 0, pixel_errors).sum(axis=1, dtype=np.int64)
+        return colour_0, colour_1, four_colour_mode, indices, errors
+
+    def _select_better_candidate(self, best: tuple, candidate: tuple) -> tuple:
+        better = candidate[-1] < best[-1]
+        return tuple(np.where(better.reshape((-1,) + (1,) * (best_value.ndim - 1)), candidate_value, best_value)
+                     for best_value, candidate_value in zip(best, candidate))
+
+    def encode_colour_blocks(self, block_pixels: np.ndarray, allow_transparency: bool) -> np.ndarray:
+        """
+        (blocks_count, 16, 4) RGBA blocks --> (blocks_count, 8) BC1 colour blocks
+        """
+        colours = block_pixels[:, :, :3].astype(np.float64)
+        if allow_transparency:
+            transparent = block_pixels[:, :, 3] < BC1_ALPHA_THRESHOLD
+        else:
+            transparent = np.zeros(block_pixels.shape[:2], dtype=bool)
+        has_transparency: np.ndarray = np.any(transparent, axis=1)
+        weights = (~transparent).astype(np.float64)
+
+        if self.preset == "fast":
+            best = self._evaluate_colour_endpoints(colours, transparent, has_transparency, *_get_bounding_box_endpoints(colours, weights))
+        else:
+            best = self._evaluate_colour_endpoints(colours, transparent, has_transparency, *_get_pca_endpoints(colours, weights))
+
+        if self.preset == "high":
+            candidate = self._evaluate_colour_endpoints(colours, transparent, has_transparency, *_get_bounding_box_endpoints(colours, weights))
+            best = self._select_better_candidate(best, candidate)
+            for _ in range(LEAST_SQUARES_ITERATIONS):
+                colour_0, colour_1, four_colour_mode, indices, _ = best
+                endpoint_weights = np.where(four_colour_mode[:, None], BC1_FOUR_COLOUR_WEIGHTS[indices], BC1_THREE_COLOUR_WEIGHTS[indices])
+                pixel_weights = weights * np.where(four_colour_mode[:, None], 1.0, indices != 3)
+                endpoint_0, endpoint_1, valid = _solve_least_squares_endpoints(colours, pixel_weights, endpoint_weights)
+                candidate = self._evaluate_colour_endpoints(colours, transparent, has_transparency, endpoint_0, endpoint_1)
+                candidate = candidate[:4] + (np.where(valid, candidate[4], np.iinfo(np.int64).max),)
+                best = self._select_better_candidate(best, candidate)
+
+        colour_0, colour_1, _, indices, _ = best
+        index_bits = (indices.astype(np.uint32) << (2 * np.arange(16, dtype=np.uint32))).sum(axis=1, dtype=np.uint32)
+        encoded_blocks = np.empty((len(block_pixels), 8), dtype=np.uint8)
+        encoded_blocks[:, 0] = colour_0 & 0xFF
+        encoded_blocks[:, 1] = colour_0 >> 8
+        encoded_blocks[:, 2] = colour_1 & 0xFF
+        encoded_blocks[:, 3] = colour_1 >> 8
+        encoded_blocks[:, 4:8] = index_bits.astype("<u4").view(np.uint8).reshape(-1, 4)
+        return encoded_blocks
+
+    # alpha blocks #############################################################################################
+
+    def _evaluate_alpha_endpoints(self, values: np.ndarray, alpha_0: np.ndarray, alpha_1: np.ndarray) -> tuple:
+        alpha_0 = np.clip(alpha_0, 0, 255).astype(np.uint32)
+        alpha_1 = np.clip(alpha_1, 0, 255).astype(np.uint32)
+        palette = get_bc3_alpha_palette(alpha_0, alpha_1).astype(np.int32)
+        distances = (values[:, :, None] - palette[:, None, :]) ** 2
+        indices = distances.argmin(axis=-1)
+        errors = np.take_along_axis(distances, indices[:, :, None], axis=-1)[:, :, 0].sum(axis=1, dtype=np.int64)
+        return alpha_0, alpha_1, indices, errors
+
+    def encode_alpha_blocks(self, values: np.ndarray) -> np.ndarray:
+        """
+        (blocks_count, 16) array of 8-bit values --> (blocks_count, 8) interpolated alpha blocks (BC3 alpha, BC4, BC5)
+        """
+        values = values.astype(np.int32)
+        min_value = values.min(axis=1)
+        max_value = values.max(axis=1)
+        best = self._evaluate_alpha_endpoints(values, max_value, min_value)  # eight values mode
+
+        if self.preset != "fast":
+            # six values mode, 0 and 255 are available as extra palette entries
+            inner = (values > 0) & (values < 255)
+            inner_min = np.where(inner, values, 255).min(axis=1)
+            inner_max = np.where(inner, values, 0).max(axis=1)
+            no_inner_values = ~inner.any(axis=1)
+            inner_min[no_inner_values] = 0
+            inner_max[no_inner_values] = 0
+            candidate = self._evaluate_alpha_endpoints(values, inner_min, inner_max)
+            best = self._select_better_candidate(best, candidate)
+
+        if self.preset == "high":
+            for _ in range(LEAST_SQUARES_ITERATIONS):
+                alpha_0, alpha_1, indices, _ = best
+                eight_values_mode = alpha_0 > alpha_1
+                endpoint_0, endpoint_1, valid = _solve_least_squares_endpoints(
+                    values[:, :, None].astype(np.float64), np.ones(values.shape), BC3_EIGHT_VALUES_WEIGHTS[indices])
+                endpoint_0 = np.rint(endpoint_0[:, 0])
+                endpoint_1 = np.rint(endpoint_1[:, 0])
+                candidate = self._evaluate_alpha_endpoints(values, np.maximum(endpoint_0, endpoint_1), np.minimum(endpoint_0, endpoint_1))
+                valid &= eight_values_mode
+                candidate = candidate[:3] + (np.where(valid, candidate[3], np.iinfo(np.int64).max),)
+                best = self._select_better_candidate(best, candidate)
+
+        alpha_0, alpha_1, indices, _ = best
+        index_bits = (indices.astype(np.uint64) << (np.uint64(3) * np.arange(16, dtype=np.uint64))).sum(axis=1, dtype=np.uint64)
+        encoded_blocks = np.empty((len(values), 8), dtype=np.uint8)
+        encoded_blocks[:, 0] = alpha_0
+        encoded_blocks[:, 1] = alpha_1
+        encoded_blocks[:, 2:8] = index_bits.astype("<u8").view(np.uint8).reshape(-1, 8)[:, :6]
+        return encoded_blocks
+
+    def encode_bc2_alpha_blocks(self, alpha: np.ndarray) -> np.ndarray:
+        """
+        (blocks_count, 16) alpha array --> (blocks_count, 8) explicit 4-bit alpha blocks
+        """
+        quantized = (alpha.astype(np.uint32) * 15 + 127) // 255
+        return (quantized[:, 0::2] | (quantized[:, 1::2] << 4)).astype(np.uint8)
+
+    # BC7 and BC6H blocks ######################################################################################
+
+    def _fit_interpolated_endpoints(self, values: np.ndarray, evaluate_endpoints, index_weights: np.ndarray) -> tuple:
+        """
+        Common endpoint search for BC7/BC6H modes. "evaluate_endpoints" quantizes float endpoints
+        and returns tuple ending with (indices, errors).
+        """
+        weights = np.ones(values.shape[:2])
+        if self.preset == "fast":
+            return evaluate_endpoints(*_get_bounding_box_endpoints(values, weights))
+
+        best = evaluate_endpoints(*_get_pca_endpoints(values, weights))
+        if self.preset == "high":
+            best = self._select_better_candidate(best, evaluate_endpoints(*_get_bounding_box_endpoints(values, weights)))
+            for _ in range(LEAST_SQUARES_ITERATIONS):
+                endpoint_weights = (64 - index_weights[best[-2]]) / 64
+                endpoint_0, endpoint_1, valid = _solve_least_squares_endpoints(values, weights, endpoint_weights)
+                candidate = evaluate_endpoints(endpoint_0, endpoint_1)
+                candidate = candidate[:-1] + (np.where(valid, candidate[-1], np.inf),)
+                best = self._select_better_candidate(best, candidate)
+        return best
+
+    def _quantize_bc7_mode_6_endpoint(self, endpoint: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # 7-bit channels + one p-bit shared by all channels of an endpoint
+        quantized_values: list = [np.clip(np.rint((endpoint - p_bit) / 2), 0, 127).astype(np.int64) for p_bit in (0, 1)]
+        errors: list = [((quantized * 2 + p_bit - endpoint) ** 2).sum(axis=1) for p_bit, quantized in enumerate(quantized_values)]
+        use_p_bit_1 = errors[1] < errors[0]
+        return np.where(use_p_bit_1[:, None], quantized_values[1], quantized_values[0]), use_p_bit_1.astype(np.int64)
+
+    def _encode_bc7_mode_6(self, block_pixels: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        values = block_pixels.astype(np.float64)
+
+        def evaluate_endpoints(endpoint_0: np.ndarray, endpoint_1: np.ndarray) -> tuple:
+            colour_0, p_bit_0 = self._quantize_bc7_mode_6_endpoint(endpoint_0)
+            colour_1, p_bit_1 = self._quantize_bc7_mode_6_endpoint(endpoint_1)
+            unquantized_0 = colour_0 * 2 + p_bit_0[:, None]
+            unquantized_1 = colour_1 * 2 + p_bit_1[:, None]
+            palette_entries = [((64 - weight) * unquantized_0 + weight * unquantized_1 + 32) >> 6 for weight in BC7_INDEX_WEIGHTS_4]
+            indices, errors = _assign_palette_indices(values, palette_entries)
+            endpoints = np.concatenate((colour_0, p_bit_0[:, None], colour_1, p_bit_1[:, None]), axis=1)
+            return endpoints, indices, errors
+
+        endpoints, indices, errors = self._fit_interpolated_endpoints(values, evaluate_endpoints, BC7_INDEX_WEIGHTS_4)
+        indices, endpoint_0, endpoint_1 = _swap_for_anchor(indices, endpoints[:, :5], endpoints[:, 5:], 4)
+
+        writer = BlockBitWriter(len(block_pixels))
+        writer.write(np.full(len(block_pixels), 1 << 6), 7)  # mode 6
+        for channel in range(4):
+            writer.write(endpoint_0[:, channel], 7)
+            writer.write(endpoint_1[:, channel], 7)
+        writer.write(endpoint_0[:, 4], 1)
+        writer.write(endpoint_1[:, 4], 1)
+        writer.write_indices(indices, 4)
+        return writer.get_blocks(), errors
+
+    def _encode_bc7_mode_5(self, block_pixels: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        colours = block_pixels[:, :, :3].astype(np.float64)
+        alpha = block_pixels[:, :, 3:].astype(np.float64)
+
+        def evaluate_colour_endpoints(endpoint_0: np.ndarray, endpoint_1: np.ndarray) -> tuple:
+            colour_0 = np.clip(np.rint(endpoint_0 * 127 / 255), 0, 127).astype(np.int64)
+            colour_1 = np.clip(np.rint(endpoint_1 * 127 / 255), 0, 127).astype(np.int64)
+            unquantized_0 = (colour_0 << 1) | (colour_0 >> 6)
+            unquantized_1 = (colour_1 << 1) | (colour_1 >> 6)
+            palette_entries = [((64 - weight) * unquantized_0 + weight * unquantized_1 + 32) >> 6 for weight in BC7_INDEX_WEIGHTS_2]
+            indices, errors = _assign_palette_indices(colours, palette_entries)
+            return np.concatenate((colour_0, colour_1), axis=1), indices, errors
+
+        def evaluate_alpha_endpoints(endpoint_0: np.ndarray, endpoint_1: np.ndarray) -> tuple:
+            alpha_0 = np.clip(np.rint(endpoint_0), 0, 255).astype(np.int64)
+            alpha_1 = np.clip(np.rint(endpoint_1), 0, 255).astype(np.int64)
+            palette_entries = [((64 - weight) * alpha_0 + weight * alpha_1 + 32) >> 6 for weight in BC7_INDEX_WEIGHTS_2]
+            indices, errors = _assign_palette_indices(alpha, palette_entries)
+            return np.concatenate((alpha_0, alpha_1), axis=1), indices, errors
+
+        colour_endpoints, colour_indices, colour_errors = self._fit_interpolated_endpoints(colours, evaluate_colour_endpoints, BC7_INDEX_WEIGHTS_2)
+        alpha_endpoints, alpha_indices, alpha_errors = self._fit_interpolated_endpoints(alpha, evaluate_alpha_endpoints, BC7_INDEX_WEIGHTS_2)
+        colour_indices, colour_0, colour_1 = _swap_for_anchor(colour_indices, colour_endpoints[:, :3], colour_endpoints[:, 3:], 2)
+        alpha_indices, alpha_0, alpha_1 = _swap_for_anchor(alpha_indices, alpha_endpoints[:, 0], alpha_endpoints[:, 1], 2)
+
+        writer = BlockBitWriter(len(block_pixels))
+        writer.write(np.full(len(block_pixels), 1 << 5), 6)  # mode 5
+        writer.write(np.zeros(len(block_pixels)), 2)  # no channel rotation
+        for channel in range(3):
+            writer.write(colour_0[:, channel], 7)
+            writer.write(colour_1[:, channel], 7)
+        writer.write(alpha_0, 8)
+        writer.write(alpha_1, 8)
+        writer.write_indices(colour_indices, 2)
+        writer.write_indices(alpha_indices, 2)
+        return writer.get_blocks(), colour_errors + alpha_errors
+
+    def encode_bc7_blocks(self, block_pixels: np.ndarray) -> np.ndarray:
+        """
+        (blocks_count, 16, 4) RGBA blocks --> (blocks_count, 16) BC7 blocks (mode 6 or mode 5)
+        """
+        encoded_blocks, errors = self._encode_bc7_mode_6(block_pixels)
+        if self.use_bc7_mode_5:
+            mode_5_blocks, mode_5_errors = self._encode_bc7_mode_5(block_pixels)
+            encoded_blocks = np.where((mode_5_errors < errors)[:, None], mode_5_blocks, encoded_blocks)
+        return encoded_blocks
+
+    def encode_bc6h_blocks(self, block_pixels: np.ndarray, is_signed: bool) -> np.ndarray:
+        """
+        (blocks_count, 16, 4) RGBA blocks --> (blocks_count, 16) BC6H blocks (mode 11)
+        """
+        source_values = block_pixels[:, :, :3].astype(np.float32) / 255
+        half_float_bits = source_values.astype(np.float16).view(np.uint16).astype(np.float64)
+
+        # decoder: endpoint --> unquantized value x --> interpolation --> half float bits (x * 31) >> finish_shift
+        finish_shift: int = 5 if is_signed else 6
+        max_endpoint: int = 510 if is_signed else 1022  # highest values are reserved for max half float value
+        unquantized_values = half_float_bits * (1 << finish_shift) / 31
+
+        def evaluate_endpoints(endpoint_0: np.ndarray, endpoint_1: np.ndarray) -> tuple:
+            quantized_0 = np.clip(np.rint((endpoint_0 - 32) / 64), 0, max_endpoint).astype(np.int64)
+            quantized_1 = np.clip(np.rint((endpoint_1 - 32) / 64), 0, max_endpoint).astype(np.int64)
+            unquantized_0 = np.where(quantized_0 == 0, 0, quantized_0 * 64 + 32)
+            unquantized_1 = np.where(quantized_1 == 0, 0, quantized_1 * 64 + 32)
+            palette_entries = []
+            for weight in BC7_INDEX_WEIGHTS_4:
+                interpolated = ((64 - weight) * unquantized_0 + weight * unquantized_1 + 32) >> 6
+                palette_half_floats = ((interpolated * 31) >> finish_shift).astype(np.uint16).view(np.float16)
+                palette_entries.append(palette_half_floats.astype(np.float32))
+            indices, errors = _assign_palette_indices(source_values, palette_entries)
+            return np.concatenate((quantized_0, quantized_1), axis=1), indices, errors
+
+        endpoints, indices, _ = self._fit_interpolated_endpoints(unquantized_values, evaluate_endpoints, BC7_INDEX_WEIGHTS_4)
+        indices, endpoint_0, endpoint_1 = _swap_for_anchor(indices, endpoints[:, :3], endpoints[:, 3:], 4)
+
+        writer = BlockBitWriter(len(block_pixels))
+        writer.write(np.full(len(block_pixels), 0x03), 5)  # mode 11
+        for endpoint in (endpoint_0, endpoint_1):
+            for channel in range(3):
+                writer.write(endpoint[:, channel], 10)
+        writer.write_indices(indices, 4)
+        return writer.get_blocks()
+
+    # images ###################################################################################################
+
+    def encode_blocks(self, block_pixels: np.ndarray, image_format: ImageFormats) -> np.ndarray:
+        """
+        (blocks_count, 16, 4) RGBA blocks --> (blocks_count, block_size) encoded blocks
+        """
+        if image_format not in self.supported_formats:
+            raise Exception(f"Not supported image format! Image_format: {image_format}")
+
+        encoded_blocks = np.empty((len(block_pixels), get_block_data_size(image_format)), dtype=np.uint8)
+        for start in range(0, len(block_pixels), BC_ENCODER_CHUNK_BLOCKS):
+            chunk = block_pixels[start: start + BC_ENCODER_CHUNK_BLOCKS]
+            output = encoded_blocks[start: start + BC_ENCODER_CHUNK_BLOCKS]
+            if image_format == ImageFormats.BC1_DXT1:
+                output[:] = self.encode_colour_blocks(chunk, True)
+            elif image_format == ImageFormats.BC2_DXT3:
+                output[:, 0:8] = self.encode_bc2_alpha_blocks(chunk[:, :, 3])
+                output[:, 8:16] = self.encode_colour_blocks(chunk, False)
+            elif image_format == ImageFormats.BC3_DXT5:
+                output[:, 0:8] = self.encode_alpha_blocks(chunk[:, :, 3])
+                output[:, 8:16] = self.encode_colour_blocks(chunk, False)
+            elif image_format == ImageFormats.BC4_UNORM:
+                output[:] = self.encode_alpha_blocks(chunk[:, :, 0])
+            elif image_format == ImageFormats.BC5_UNORM:
+                output[:, 0:8] = self.encode_alpha_blocks(chunk[:, :, 0])
+                output[:, 8:16] = self.encode_alpha_blocks(chunk[:, :, 1])
+            elif image_format in (ImageFormats.BC6H_UF16, ImageFormats.BC6H_SF16):
+                output[:] = self.encode_bc6h_blocks(chunk, image_format == ImageFormats.BC6H_SF16)
+            elif image_format == ImageFormats.BC7_UNORM:
+                output[:] = self.encode_bc7_blocks(chunk)
+        return encoded_blocks
+
+    def encode_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
+        block_pixels = get_bc_block_pixels(image_data, img_width, img_height)
+        blocks_y: int = (img_height + 3) // 4
+        if self.workers <= 1 or blocks_y < 2:
+            return bytearray(self.encode_blocks(block_pixels, image_format).tobytes())
+
+        # blocks are stored row by row, so bands of block rows can be encoded independently
+        blocks_x: int = (img_width + 3) // 4
+        band_rows = np.array_split(np.arange(blocks_y), min(self.workers, blocks_y))
+        bands = [block_pixels[rows[0] * blocks_x: (rows[-1] + 1) * blocks_x] for rows in band_rows]
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            encoded_bands = list(executor.map(_encode_bcn_band, bands, [image_format] * len(bands),
+                                              [self.preset] * len(bands), [self.use_bc7_mode_5] * len(bands)))
+        return bytearray(b"".join(encoded_band.tobytes() for encoded_band in encoded_bands))
+
+
+def _encode_bcn_band(block_pixels: np.ndarray, image_format: ImageFormats, preset: str, use_bc7_mode_5: bool) -> np.ndarray:
+    return BCnNumpyEncoder(preset, use_bc7_mode_5=use_bc7_mode_5).encode_blocks(block_pixels, image_format)
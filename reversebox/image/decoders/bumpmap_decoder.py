@@ -5,55 +5,75 @@ License: GPL-3.0 License
 
 import math
 
+import numpy as np
+
 from reversebox.common.logger import get_logger
+from reversebox.image.common import get_output_buffer_view
+from reversebox.image.decoders.decode_table_cache import decode_table_cache
 from reversebox.image.image_formats import ImageFormats
 
 logger = get_logger(__name__)
 
 # fmt: off
 
+# 16-bit normal map. Each texel consist of a pair of 8-bit values (S and R)
+# which represent a normal in spherical coordinates.
+# S = polar angle. 0-255 maps to 0-89 degrees.
+# R = azimuthal angle. 0-255 maps to 0-359 degrees.
+# Used in DTEX Texconv Tool
+BUMPMAP_SR_MAX_POLAR_ANGLE: float = 89.0
+BUMPMAP_SR_MAX_AZIMUTHAL_ANGLE: float = 359.0
 
-class BumpmapDecoder:
-
-    def __init__(self):
-        pass
 
-    # 16-bit normal map. Each texel consist of a pair of 8-bit values (S and R)
-    # which represent a normal in spherical coordinates.
-    # S = polar angle. 0-255 maps to 0-89 degrees.
-    # R = azimuthal angle. 0-255 maps to 0-359 degrees.
-    # Used in DTEX Texconv Tool
-    def _decode_bumpmap_sr_image(self, image_data: bytes, img_width: int, img_height: int) -> bytes:
-        rgba_data = bytearray(img_width * img_height * 4)
+def _get_bumpmap_sr_angles(max_angle: float) -> np.ndarray:
+    return np.array([math.radians(value * max_angle / 255.0) for value in range(256)])
 
-        for i in range(img_width * img_height):
-            S = image_data[i * 2]
-            R = image_data[i * 2 + 1]
 
-            polar_angle = S * 89.0 / 255.0
-            azimuthal_angle = R * 359.0 / 255.0
+def _decode_bumpmap_sr_values(raw_values: np.ndarray) -> np.ndarray:
+    """
+    Kernel for decode table, raw value is little endian (S in low byte, R in high byte)
+    """
+    polar_radians = _get_bumpmap_sr_angles(BUMPMAP_SR_MAX_POLAR_ANGLE)
+    azimuthal_radians = _get_bumpmap_sr_angles(BUMPMAP_SR_MAX_AZIMUTHAL_ANGLE)
+    # sin/cos of 256 angles are computed with "math" functions, so table is the same as per texel results
+    polar_sin = np.array([math.sin(value) for value in polar_radians])
+    polar_cos = np.array([math.cos(value) for value in polar_radians])
+    azimuthal_sin = np.array([math.sin(value) for value in azimuthal_radians])
+    azimuthal_cos = np.array([math.cos(value) for value in azimuthal_radians])
 
-            polar_radians = math.radians(polar_angle)
-            azimuthal_radians = math.radians(azimuthal_angle)
+    s = raw_values & 0xFF
+    r = raw_values >> 8
+    normals = np.stack((polar_sin[s] * azimuthal_cos[r], polar_sin[s] * azimuthal_sin[r], polar_cos[s]), axis=-1)
+    output = np.full((len(raw_values), 4), 0xFF, dtype=np.uint8)
+    output[:, :3] = np.trunc((normals + 1.0) * 127.5)
+    return output
 
-            nx = math.sin(polar_radians) * math.cos(azimuthal_radians)
-            ny = math.sin(polar_radians) * math.sin(azimuthal_radians)
-            nz = math.cos(polar_radians)
 
-            r_value = int((nx + 1.0) * 127.5)
-            g_value = int((ny + 1.0) * 127.5)
-            b_value = int((nz + 1.0) * 127.5)
+class BumpmapDecoder:
 
-            rgba_data[i * 4] = r_value
-            rgba_data[i * 4 + 1] = g_value
-            rgba_data[i * 4 + 2] = b_value
-            rgba_data[i * 4 + 3] = 0xFF
+    def __init__(self):
+        pass
 
-        return rgba_data
+    def _decode_bumpmap_sr_image_into(self, output: np.ndarray, image_data: bytes, img_width: int, img_height: int) -> None:
+        pixel_count: int = img_width * img_height
+        if len(image_data) < pixel_count * 2:
+            raise ValueError(f"Not enough image data! Expected {pixel_count * 2} bytes, got {len(image_data)} bytes.")
+        decode_table = decode_table_cache.get_decode_table(ImageFormats.BUMPMAP_SR, "little", _decode_bumpmap_sr_values, 16)
+        raw_values = np.frombuffer(image_data, dtype="<u2", count=pixel_count)
+        np.take(decode_table, raw_values, axis=0, out=output)
+
+    def decode_bumpmap_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> int:
+        """
+        Decodes image into caller-supplied buffer (see "get_output_buffer_view"),
+        returns number of written bytes (img_width * img_height * 4)
+        """
+        if image_format != ImageFormats.BUMPMAP_SR:
+            raise Exception(f"Image format not supported by BUMPMAP decoder! Image_format: {image_format}")
+        output = get_output_buffer_view(output_buffer, img_width * img_height * 4)
+        self._decode_bumpmap_sr_image_into(output.reshape(-1, 4), image_data, img_width, img_height)
+        return len(output)
 
     def decode_bumpmap_image_main(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
-
-        if image_format == ImageFormats.BUMPMAP_SR:
-            return self._decode_bumpmap_sr_image(image_data, img_width, img_height)
-        else:
-            raise Exception(f"Image format not supported by BUMPMAP decoder! Image_format: {image_format}")
+        texture_data = bytearray(img_width * img_height * 4)
+        self.decode_bumpmap_image_into(texture_data, image_data, img_width, img_height, image_format)
+        return texture_data
@@ -0,0 +1,68 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import numpy as np
+
+from reversebox.common.logger import get_logger
+from reversebox.image.common import get_output_buffer_view
+from reversebox.image.decoders.bumpmap_decoder import (
+    BUMPMAP_SR_MAX_AZIMUTHAL_ANGLE,
+    BUMPMAP_SR_MAX_POLAR_ANGLE,
+)
+from reversebox.image.image_formats import ImageFormats
+
+logger = get_logger(__name__)
+
+# fmt: off
+
+# RGB normal map --> BUMPMAP_SR encoder, reverse of "bumpmap_decoder.py".
+# Normals are read from RGB (alpha is ignored), normalized and converted to spherical
+# coordinates. Polar angles above 89 degrees (normals pointing sideways or into
+# the surface) are clamped. Normals too short to have a direction are encoded as (0, 0, 1).
+
+MIN_NORMAL_LENGTH: float = 0.01
+
+
+class BumpmapEncoder:
+
+    def __init__(self):
+        pass
+
+    def _encode_bumpmap_sr_image_into(self, output: np.ndarray, image_data: bytes, img_width: int, img_height: int) -> None:
+        pixel_count: int = img_width * img_height
+        if len(image_data) < pixel_count * 4:
+            raise ValueError(f"Not enough image data! Expected {pixel_count * 4} bytes, got {len(image_data)} bytes.")
+        pixels = np.frombuffer(image_data, dtype=np.uint8, count=pixel_count * 4).reshape(-1, 4)
+
+        normals = pixels[:, :3] / 127.5 - 1.0
+        lengths = np.linalg.norm(normals, axis=1)
+        normals[lengths < MIN_NORMAL_LENGTH] = (0.0, 0.0, 1.0)
+        normals /= np.maximum(lengths, MIN_NORMAL_LENGTH)[:, None]
+        normals /= np.linalg.norm(normals, axis=1)[:, None]
+
+        polar_angles = np.degrees(np.arccos(np.clip(normals[:, 2], -1.0, 1.0)))
+        azimuthal_angles = np.degrees(np.arctan2(normals[:, 1], normals[:, 0])) % 360.0
+        s = np.rint(np.minimum(polar_angles, BUMPMAP_SR_MAX_POLAR_ANGLE) * 255.0 / BUMPMAP_SR_MAX_POLAR_ANGLE)
+        # angles above 359 degrees are closer to 0 than to 359
+        r = np.rint(azimuthal_angles * 255.0 / BUMPMAP_SR_MAX_AZIMUTHAL_ANGLE) % 256
+
+        output[:, 0] = s
+        output[:, 1] = r
+
+    def encode_bumpmap_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> int:
+        """
+        Encodes image into caller-supplied buffer (see "get_output_buffer_view"),
+        returns number of written bytes (img_width * img_height * 2)
+        """
+        if image_format != ImageFormats.BUMPMAP_SR:
+            raise Exception(f"Image format not supported by BUMPMAP encoder! Image_format: {image_format}")
+        output = get_output_buffer_view(output_buffer, img_width * img_height * 2)
+        self._encode_bumpmap_sr_image_into(output.reshape(-1, 2), image_data, img_width, img_height)
+        return len(output)
+
+    def encode_bumpmap_image_main(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
+        texture_data = bytearray(img_width * img_height * 2)
+        self.encode_bumpmap_image_into(texture_data, image_data, img_width, img_height, image_format)
+        return texture_data
@@ -17,11 +17,24 @@ from ctypes import (
     cast,
     create_string_buffer,
 )
+from typing import Optional
+
+import numpy as np
 
 from reversebox.common.common import get_dll_path
 from reversebox.common.constants import DLL_LOG_FILE_NAME
 from reversebox.common.logger import get_logger
-from reversebox.image.common import get_bc_image_data_size
+from reversebox.image.common import (
+    copy_to_output_buffer,
+    get_bc_image_data_size,
+    get_output_buffer_view,
+)
+from reversebox.image.decoders.bcn_decoder_backends import (
+    BCnDecoderBackend,
+    NumpyBCnDecoderBackend,
+    PillowBCnDecoderBackend,
+)
+from reversebox.image.decoders.bcn_numpy_encoder import BCnNumpyEncoder
 from reversebox.image.image_formats import ImageFormats
 
 logger = get_logger(__name__)
@@ -100,9 +113,11 @@ class CompressedImageDecoderEncoder:
         else:
             raise Exception(f"Not supported image format! Image_format: {image_format}")
 
-    def _convert_directxtex_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats, encode_flag: bool) -> bytes:
+    def _convert_directxtex_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats, encode_flag: bool,
+                                  output: Optional[np.ndarray] = None) -> bytes:
         """
-        Function used for decoding/encoding compressed BC formats
+        Function used for decoding/encoding compressed BC formats.
+        If output uint8 array is passed, converted data is copied straight from DLL memory to that array.
         """
         dll_path: str = get_dll_path("DirectXTex.dll")
         if encode_flag:
@@ -159,19 +174,53 @@ class CompressedImageDecoderEncoder:
             converted_data_size: int = get_bc_image_data_size(img_height, img_width, image_format)
         else:
             converted_data_size: int = img_height * img_width * 4
-        converted_data = bytearray((c_uint8 * converted_data_size).from_address(ctypes.addressof(output_dxgi_image.pixels.contents)))
+        dll_output_data = (c_uint8 * converted_data_size).from_address(ctypes.addressof(output_dxgi_image.pixels.contents))
+        if output is not None:
+            output[:converted_data_size] = np.ctypeslib.as_array(dll_output_data)
+            return output
+        converted_data = bytearray(dll_output_data)
 
         # TODO - make it work
         # if image_format == ImageFormats.BC2_DXT2:
         #     converted_data = self.unpremultiply_rgba(converted_data)
         return converted_data
 
-    def decode_compressed_image_main(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
-        return self._convert_directxtex_image(image_data, img_width, img_height, image_format, False)
+    def decode_compressed_image_main(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                                     backend_name: Optional[str] = None) -> bytes:
+        backend: BCnDecoderBackend = get_bcn_decoder_backend(image_format, backend_name)
+        return backend.decode(image_data, img_width, img_height, image_format)
+
+    def decode_compressed_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                                     backend_name: Optional[str] = None) -> int:
+        """
+        Decodes image into caller-supplied buffer (see "get_output_buffer_view"),
+        returns number of written bytes (img_width * img_height * 4)
+        """
+        backend: BCnDecoderBackend = get_bcn_decoder_backend(image_format, backend_name)
+        output = get_output_buffer_view(output_buffer, img_width * img_height * 4)
+        backend.decode_into(output, image_data, img_width, img_height, image_format)
+        return len(output)
 
-    def encode_compressed_image_main(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
+    def encode_compressed_image_main(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                                     encoder_preset: str = "normal", workers: int = 1, backend_name: Optional[str] = None) -> bytes:
+        """
+        "encoder_preset" and "workers" are used only by NumPy encoder (see "get_bcn_encoder_backend_name")
+        """
+        if get_bcn_encoder_backend_name(image_format, backend_name) == "numpy":
+            return BCnNumpyEncoder(encoder_preset, workers).encode_image(image_data, img_width, img_height, image_format)
         return self._convert_directxtex_image(image_data, img_width, img_height, image_format, True)
 
+    def encode_compressed_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                                     encoder_preset: str = "normal", workers: int = 1, backend_name: Optional[str] = None) -> int:
+        """
+        Encodes image into caller-supplied buffer (see "get_output_buffer_view"), returns number of written bytes
+        """
+        if get_bcn_encoder_backend_name(image_format, backend_name) == "numpy":
+            return copy_to_output_buffer(output_buffer, BCnNumpyEncoder(encoder_preset, workers).encode_image(image_data, img_width, img_height, image_format))
+        output = get_output_buffer_view(output_buffer, get_bc_image_data_size(img_height, img_width, image_format))
+        self._convert_directxtex_image(image_data, img_width, img_height, image_format, True, output)
+        return len(output)
+
     # TODO - make it work
     def unpremultiply_rgba(self, data: bytes) -> bytes:
         result = bytearray(len(data))
@@ -220,3 +269,116 @@ class CompressedImageDecoderEncoder:
             result[i + 3] = a
 
         return bytes(result)
+
+
+class DirectXTexBCnDecoderBackend(BCnDecoderBackend):
+    name = "directxtex"
+    supported_formats = (
+        ImageFormats.BC1_DXT1,
+        ImageFormats.BC2_DXT2,
+        ImageFormats.BC2_DXT3,
+        ImageFormats.BC3_DXT5,
+        ImageFormats.BC4_UNORM,
+        ImageFormats.BC5_UNORM,
+        ImageFormats.BC6H_UF16,
+        ImageFormats.BC6H_SF16,
+        ImageFormats.BC7_UNORM,
+    )
+
+    def is_available(self, image_format: ImageFormats) -> bool:
+        if image_format not in self.supported_formats:
+            return False
+        try:
+            ctypes.CDLL(get_dll_path("DirectXTex.dll"))
+        except OSError as error:
+            logger.debug(f"DirectXTex backend not available. Error: {error}")
+            return False
+        return True
+
+    def decode(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
+        return CompressedImageDecoderEncoder()._convert_directxtex_image(image_data, img_width, img_height, image_format, False)
+
+    def decode_into(self, output: np.ndarray, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> None:
+        CompressedImageDecoderEncoder()._convert_directxtex_image(image_data, img_width, img_height, image_format, False, output)
+
+
+# backends in order of preference
+BCN_DECODER_BACKENDS: tuple = (
+    PillowBCnDecoderBackend(),
+    NumpyBCnDecoderBackend(),
+    DirectXTexBCnDecoderBackend(),
+)
+
+# (image_format, backend_name) --> backend, selected only once per process
+_selected_bcn_decoder_backends: dict = {}
+
+
+def get_bcn_decoder_backend(image_format: ImageFormats, backend_name: Optional[str] = None) -> BCnDecoderBackend:
+    """
+    Returns first available decoder backend for given format.
+    If "backend_name" is set, only backend with that name is checked.
+    """
+    selection_key: tuple = (image_format, backend_name)
+    backend: Optional[BCnDecoderBackend] = _selected_bcn_decoder_backends.get(selection_key)
+    if backend is not None:
+        return backend
+
+    candidates: list = [entry for entry in BCN_DECODER_BACKENDS if backend_name is None or entry.name == backend_name]
+    if not candidates:
+        raise Exception(f"Unknown BCn decoder backend! Backend name: {backend_name}")
+    for candidate in candidates:
+        if candidate.is_available(image_format):
+            backend = candidate
+            break
+    else:
+        raise Exception(f"No BCn decoder backend available for image format {image_format}!")
+
+    logger.debug(f"Selected \"{backend.name}\" backend for decoding {image_format}")
+    _selected_bcn_decoder_backends[selection_key] = backend
+    return backend
+
+
+def clear_bcn_decoder_backend_selection() -> None:
+    _selected_bcn_decoder_backends.clear()
+
+
+# BCn encoders in order of preference. DirectXTex searches all BC6H/BC7 modes,
+# NumPy encoder ("bcn_numpy_encoder.py") is used when DirectXTex library can't be loaded (e.g. outside of Windows).
+BCN_ENCODER_BACKEND_NAMES: tuple = ("directxtex", "numpy")
+
+# (image_format, backend_name) --> backend name, selected only once per process
+_selected_bcn_encoder_backends: dict = {}
+
+
+def _is_bcn_encoder_backend_available(candidate_name: str, image_format: ImageFormats) -> bool:
+    if candidate_name == "directxtex":
+        return DirectXTexBCnDecoderBackend().is_available(image_format)
+    return image_format in BCnNumpyEncoder.supported_formats
+
+
+def get_bcn_encoder_backend_name(image_format: ImageFormats, backend_name: Optional[str] = None) -> str:
+    """
+    Returns name of first available encoder backend for given format.
+    If "backend_name" is set, only backend with that name is checked.
+    """
+    selection_key: tuple = (image_format, backend_name)
+    selected_name: Optional[str] = _selected_bcn_encoder_backends.get(selection_key)
+    if selected_name is not None:
+        return selected_name
+
+    if backend_name is not None and backend_name not in BCN_ENCODER_BACKEND_NAMES:
+        raise Exception(f"Unknown BCn encoder backend! Backend name: {backend_name}")
+    for candidate_name in BCN_ENCODER_BACKEND_NAMES:
+        if backend_name in (None, candidate_name) and _is_bcn_encoder_backend_available(candidate_name, image_format):
+            selected_name = candidate_name
+            break
+    else:
+        raise Exception(f"No BCn encoder backend available for image format {image_format}!")
+
+    logger.debug(f"Selected \"{selected_name}\" backend for encoding {image_format}")
+    _selected_bcn_encoder_backends[selection_key] = selected_name
+    return selected_name
+
+
+def clear_bcn_encoder_backend_selection() -> None:
+    _selected_bcn_encoder_backends.clear()
@@ -0,0 +1,137 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import numpy as np
+
+from reversebox.common.logger import get_logger
+from reversebox.image.image_formats import ImageFormats
+
+logger = get_logger(__name__)
+
+# fmt: off
+
+# Formats with 4, 8 or 16 bits per pixel have at most 65536 possible input values,
+# so whole value-to-RGBA table can be built once and decoding becomes single "take()".
+#
+# Tables are indexed by raw little endian value read from memory, so endianess
+# (and nibble order for 4-bit formats) is already applied inside of the table:
+# 4-bit  --> (256, 8) table, one byte gives two RGBA pixels
+# 8-bit  --> (256, 4) table
+# 16-bit --> (65536, 4) table
+#
+# Tables are kept in memory with LRU eviction. If "cache_directory" is set,
+# tables are also stored as .npy files and memory-mapped on later runs,
+# so worker processes share the same pages instead of rebuilding tables.
+# Cache is guarded by lock, so one instance can be shared by decoding threads.
+
+DECODE_TABLE_VERSION: int = 1
+DECODE_TABLE_BITS: tuple = (4, 8, 16)
+
+
+def build_decode_table(decode_kernel: Callable, bits_per_pixel: int, image_endianess: str) -> np.ndarray:
+    if image_endianess not in ("little", "big"):
+        raise Exception(f"Endianess not supported! Endianess: {image_endianess}")
+
+    if bits_per_pixel == 4:
+        byte_values = np.arange(256, dtype=np.uint32)
+        nibbles = np.empty((256, 2), dtype=np.uint32)
+        if image_endianess == "little":
+            nibbles[:, 0] = byte_values & 0x0F
+            nibbles[:, 1] = byte_values >> 4
+        else:
+            nibbles[:, 0] = byte_values >> 4
+            nibbles[:, 1] = byte_values & 0x0F
+        return decode_kernel(nibbles.reshape(-1)).reshape(256, 8)
+    elif bits_per_pixel == 8:
+        return decode_kernel(np.arange(256, dtype=np.uint32))
+    elif bits_per_pixel == 16:
+        raw_values: np.ndarray = np.arange(65536, dtype=np.uint32)
+        if image_endianess == "big":
+            raw_values = ((raw_values & 0xFF) << 8) | (raw_values >> 8)
+        return decode_kernel(raw_values)
+    else:
+        raise Exception(f"Decode table not supported for bpp {bits_per_pixel}!")
+
+
+class DecodeTableCache:
+
+    def __init__(self, max_tables: int = 64, cache_directory: Optional[str] = None):
+        self.max_tables: int = max_tables
+        self.cache_directory: Optional[str] = cache_directory
+        self._tables: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_table_file_path(cache_directory: str, image_format: ImageFormats, image_endianess: str) -> str:
+        file_name: str = f"reversebox_decode_table_v{DECODE_TABLE_VERSION}_{image_format.value}_{image_endianess}.npy"
+        return os.path.join(cache_directory, file_name)
+
+    def _load_table(self, file_path: str, expected_shape: tuple) -> Optional[np.ndarray]:
+        try:
+            table = np.load(file_path, mmap_mode="r")
+        except (OSError, ValueError) as error:
+            logger.warning(f"Can't load decode table from {file_path}. Error: {error}")
+            return None
+        if table.shape != expected_shape or table.dtype != np.uint8:
+            logger.warning(f"Wrong decode table in {file_path}! It will be rebuilt.")
+            return None
+        return table
+
+    @staticmethod
+    def _save_table(table: np.ndarray, cache_directory: str, file_path: str) -> None:
+        temp_file_path: Optional[str] = None
+        try:
+            os.makedirs(cache_directory, exist_ok=True)
+            # write to temporary file first, so other processes never see partial tables
+            file_descriptor, temp_file_path = tempfile.mkstemp(suffix=".npy", dir=cache_directory)
+            with os.fdopen(file_descriptor, "wb") as temp_file:
+                np.save(temp_file, table)
+            os.replace(temp_file_path, file_path)
+        except OSError as error:
+            logger.warning(f"Can't save decode table to {file_path}. Error: {error}")
+        finally:
+            # temporary file is left only if saving failed
+            if temp_file_path is not None and os.path.isfile(temp_file_path):
+                os.remove(temp_file_path)
+
+    def get_decode_table(self, image_format: ImageFormats, image_endianess: str,
+                         decode_kernel: Callable, bits_per_pixel: int) -> np.ndarray:
+        table_key: tuple = (image_format, image_endianess)
+        with self._lock:
+            table = self._tables.get(table_key)
+            if table is not None:
+                self._tables.move_to_end(table_key)
+                return table
+
+            expected_shape: tuple = (256, 8) if bits_per_pixel == 4 else (1 << bits_per_pixel, 4)
+            cache_directory: Optional[str] = self.cache_directory
+            if cache_directory:
+                file_path: str = self._get_table_file_path(cache_directory, image_format, image_endianess)
+                if os.path.isfile(file_path):
+                    table = self._load_table(file_path, expected_shape)
+                if table is None:
+                    table = build_decode_table(decode_kernel, bits_per_pixel, image_endianess)
+                    self._save_table(table, cache_directory, file_path)
+            else:
+                table = build_decode_table(decode_kernel, bits_per_pixel, image_endianess)
+
+            self._tables[table_key] = table
+            while len(self._tables) > self.max_tables:
+                self._tables.popitem(last=False)
+            return table
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tables.clear()
+
+
+# shared cache used by decoders
+decode_table_cache = DecodeTableCache()
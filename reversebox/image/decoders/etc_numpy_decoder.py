@@ -0,0 +1,240 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import numpy as np
+
+from reversebox.common.logger import get_logger
+from reversebox.image.decoders.bcn_decoder_backends import (
+    assemble_bc_blocks,
+    get_bc_blocks,
+)
+from reversebox.image.image_formats import ImageFormats
+
+logger = get_logger(__name__)
+
+# fmt: off
+
+# Vectorized ETC1/ETC2/EAC decoder. All 4x4 blocks are decoded at once:
+# every mode (individual, differential, T, H, planar) is computed for all blocks
+# and the right result is selected per block with masks.
+#
+# ETC blocks are stored as big endian 64-bit values and pixel indices
+# are stored column by column (pixel 1 is x=0, y=1).
+#
+# EAC_R11 and EAC_RG11 are decoded to (R, 0, 0, 255) and (R, G, 0, 255),
+# only top 8 bits of 11-bit values are used.
+# Transparent pixels of ETC2_RGB_A1 are decoded as (0, 0, 0, 0), as in ETC2 specification.
+
+ETC1_MODIFIER_TABLES = np.array([
+    [2, 8], [5, 17], [9, 29], [13, 42], [18, 60], [24, 80], [33, 106], [47, 183]
+], dtype=np.int32)
+
+ETC2_DISTANCE_TABLE = np.array([3, 6, 11, 16, 23, 32, 41, 64], dtype=np.int32)
+
+EAC_MODIFIER_TABLES = np.array([
+    [-3, -6, -9, -15, 2, 5, 8, 14],
+    [-3, -7, -10, -13, 2, 6, 9, 12],
+    [-2, -5, -8, -13, 1, 4, 7, 12],
+    [-2, -4, -6, -13, 1, 3, 5, 12],
+    [-3, -6, -8, -12, 2, 5, 7, 11],
+    [-3, -7, -9, -11, 2, 6, 8, 10],
+    [-4, -7, -8, -11, 3, 6, 7, 10],
+    [-3, -5, -8, -11, 2, 4, 7, 10],
+    [-2, -6, -8, -10, 1, 5, 7, 9],
+    [-2, -5, -8, -10, 1, 4, 7, 9],
+    [-2, -4, -8, -10, 1, 3, 7, 9],
+    [-2, -5, -7, -10, 1, 4, 6, 9],
+    [-3, -4, -7, -10, 2, 3, 6, 9],
+    [-1, -2, -3, -10, 0, 1, 2, 9],
+    [-4, -6, -8, -9, 3, 5, 7, 8],
+    [-3, -5, -7, -9, 2, 4, 6, 8],
+], dtype=np.int32)
+
+# row by row pixel number --> column by column pixel number
+ETC_PIXEL_ORDER = np.array([(i % 4) * 4 + i // 4 for i in range(16)], dtype=np.uint32)
+ETC_PIXEL_X = np.arange(16, dtype=np.int32) % 4
+ETC_PIXEL_Y = np.arange(16, dtype=np.int32) // 4
+
+
+def _expand4(x: np.ndarray) -> np.ndarray:
+    return (x << 4) | x
+
+
+def _expand5(x: np.ndarray) -> np.ndarray:
+    return (x << 3) | (x >> 2)
+
+
+def _expand6(x: np.ndarray) -> np.ndarray:
+    return (x << 2) | (x >> 4)
+
+
+def _expand7(x: np.ndarray) -> np.ndarray:
+    return (x << 1) | (x >> 6)
+
+
+def _clamp(x: np.ndarray) -> np.ndarray:
+    return np.clip(x, 0, 255)
+
+
+class EtcNumpyDecoder:
+    """
+    Vectorized decoder for ETC1, ETC2 and EAC compressed images
+    """
+
+    supported_formats: tuple = (
+        ImageFormats.ETC1,
+        ImageFormats.ETC2_RGB,
+        ImageFormats.ETC2_RGBA,
+        ImageFormats.ETC2_RGB_A1,
+        ImageFormats.EAC_R11,
+        ImageFormats.EAC_RG11,
+    )
+
+    def _get_colour_indices(self, blocks: np.ndarray) -> np.ndarray:
+        # (N, 8) blocks --> (N, 16) 2-bit indices, pixels row by row
+        index_bits = blocks[:, 4:8].copy().view(">u4")[:, 0].astype(np.uint32)
+        most_significant_bits = (index_bits[:, None] >> (ETC_PIXEL_ORDER + 16)) & 1
+        least_significant_bits = (index_bits[:, None] >> ETC_PIXEL_ORDER) & 1
+        return (most_significant_bits * 2 + least_significant_bits).astype(np.int32)
+
+    def _get_t_mode_colours(self, b: np.ndarray) -> np.ndarray:
+        colour_1 = _expand4(np.stack(((((b[:, 0] >> 3) & 3) << 2) | (b[:, 0] & 3), b[:, 1] >> 4, b[:, 1] & 0x0F), axis=1))
+        colour_2 = _expand4(np.stack((b[:, 2] >> 4, b[:, 2] & 0x0F, b[:, 3] >> 4), axis=1))
+        distance = ETC2_DISTANCE_TABLE[(((b[:, 3] >> 2) & 3) << 1) | (b[:, 3] & 1)][:, None]
+        return np.stack((colour_1, _clamp(colour_2 + distance), colour_2, _clamp(colour_2 - distance)), axis=1)
+
+    def _get_h_mode_colours(self, b: np.ndarray) -> np.ndarray:
+        colour_1 = np.stack(((b[:, 0] >> 3) & 0x0F,
+                             ((b[:, 0] & 7) << 1) | ((b[:, 1] >> 4) & 1),
+                             (b[:, 1] & 8) | ((b[:, 1] & 3) << 1) | (b[:, 2] >> 7)), axis=1)
+        colour_2 = np.stack(((b[:, 2] >> 3) & 0x0F,
+                             ((b[:, 2] & 7) << 1) | (b[:, 3] >> 7),
+                             (b[:, 3] >> 3) & 0x0F), axis=1)
+        # lowest bit of distance index is given by order of base colours
+        order_bit = ((colour_1[:, 0] << 8) | (colour_1[:, 1] << 4) | colour_1[:, 2]) >= \
+                    ((colour_2[:, 0] << 8) | (colour_2[:, 1] << 4) | colour_2[:, 2])
+        distance = ETC2_DISTANCE_TABLE[(((b[:, 3] >> 2) & 1) << 2) | ((b[:, 3] & 1) << 1) | order_bit][:, None]
+        colour_1 = _expand4(colour_1)
+        colour_2 = _expand4(colour_2)
+        return np.stack((_clamp(colour_1 + distance), _clamp(colour_1 - distance),
+                         _clamp(colour_2 + distance), _clamp(colour_2 - distance)), axis=1)
+
+    def _get_planar_mode_colours(self, b: np.ndarray) -> np.ndarray:
+        origin = np.stack((_expand6((b[:, 0] >> 1) & 0x3F),
+                           _expand7(((b[:, 0] & 1) << 6) | ((b[:, 1] >> 1) & 0x3F)),
+                           _expand6(((b[:, 1] & 1) << 5) | (((b[:, 2] >> 3) & 3) << 3) | ((b[:, 2] & 3) << 1) | (b[:, 3] >> 7))), axis=1)
+        horizontal = np.stack((_expand6((((b[:, 3] >> 2) & 0x1F) << 1) | (b[:, 3] & 1)),
+                               _expand7(b[:, 4] >> 1),
+                               _expand6(((b[:, 4] & 1) << 5) | (b[:, 5] >> 3))), axis=1)
+        vertical = np.stack((_expand6(((b[:, 5] & 7) << 3) | (b[:, 6] >> 5)),
+                             _expand7(((b[:, 6] & 0x1F) << 2) | (b[:, 7] >> 6)),
+                             _expand6(b[:, 7] & 0x3F)), axis=1)
+        colours = (ETC_PIXEL_X[None, :, None] * (horizontal - origin)[:, None, :]
+                   + ETC_PIXEL_Y[None, :, None] * (vertical - origin)[:, None, :]
+                   + 4 * origin[:, None, :] + 2) >> 2
+        return _clamp(colours)
+
+    def decode_colour_blocks(self, blocks: np.ndarray, image_format: ImageFormats) -> np.ndarray:
+        """
+        (blocks_count, 8) ETC1/ETC2 colour blocks --> (blocks_count, 16, 4) RGBA array
+        """
+        b = blocks.astype(np.int32)
+        punch_through: bool = image_format == ImageFormats.ETC2_RGB_A1
+        indices = self._get_colour_indices(blocks)
+
+        # in punch-through format "differential" bit is used as "opaque" bit
+        differential_bit = ((b[:, 3] >> 1) & 1).astype(bool)
+        differential_mode = np.ones(len(b), dtype=bool) if punch_through else differential_bit
+        opaque = differential_bit if punch_through else np.ones(len(b), dtype=bool)
+        flip = (b[:, 3] & 1).astype(bool)
+
+        # individual and differential modes
+        base_5 = b[:, 0:3] >> 3
+        delta = b[:, 0:3] & 7
+        second_5 = base_5 + np.where(delta >= 4, delta - 8, delta)
+        colour_1 = np.where(differential_mode[:, None], _expand5(base_5), _expand4(b[:, 0:3] >> 4))
+        colour_2 = np.where(differential_mode[:, None], _expand5(second_5 & 0x1F), _expand4(b[:, 0:3] & 0x0F))
+
+        second_subblock = np.where(flip[:, None], ETC_PIXEL_Y[None, :] >= 2, ETC_PIXEL_X[None, :] >= 2)
+        table_index = np.where(second_subblock, ((b[:, 3] >> 2) & 7)[:, None], (b[:, 3] >> 5)[:, None])
+        modifier = ETC1_MODIFIER_TABLES[table_index, indices & 1]
+        modifier = np.where(indices >= 2, -modifier, modifier)
+        if punch_through:
+            modifier = np.where(~opaque[:, None] & (indices == 0), 0, modifier)
+        base_colours = np.where(second_subblock[:, :, None], colour_2[:, None, :], colour_1[:, None, :])
+        colours = _clamp(base_colours + modifier[:, :, None])
+
+        if image_format != ImageFormats.ETC1:
+            # ETC2 modes are signalled by overflow of differential colours
+            overflow = differential_mode[:, None] & ((second_5 < 0) | (second_5 > 31))
+            t_mode = overflow[:, 0]
+            h_mode = ~t_mode & overflow[:, 1]
+            planar_mode = ~t_mode & ~h_mode & overflow[:, 2]
+            if t_mode.any() or h_mode.any():
+                paint_colours = np.where(t_mode[:, None, None], self._get_t_mode_colours(b), self._get_h_mode_colours(b))
+                paint_pixels = np.take_along_axis(paint_colours, indices[:, :, None], axis=1)
+                colours = np.where((t_mode | h_mode)[:, None, None], paint_pixels, colours)
+            if planar_mode.any():
+                colours = np.where(planar_mode[:, None, None], self._get_planar_mode_colours(b), colours)
+        else:
+            planar_mode = np.zeros(len(b), dtype=bool)
+
+        block_pixels = np.empty((len(b), 16, 4), dtype=np.uint8)
+        block_pixels[:, :, :3] = colours
+        block_pixels[:, :, 3] = 0xFF
+        if punch_through:
+            transparent = (~opaque & ~planar_mode)[:, None] & (indices == 2)
+            block_pixels[transparent] = 0
+        return block_pixels
+
+    def decode_eac_blocks(self, blocks: np.ndarray, is_eleven_bit: bool) -> np.ndarray:
+        """
+        (blocks_count, 8) EAC blocks --> (blocks_count, 16) array of values (8-bit or 11-bit)
+        """
+        base = blocks[:, 0].astype(np.int32)
+        multiplier = (blocks[:, 1] >> 4).astype(np.int32)
+        table_index = (blocks[:, 1] & 0x0F).astype(np.int32)
+
+        index_bits = np.zeros(len(blocks), dtype=np.uint64)
+        for i in range(6):
+            index_bits = (index_bits << np.uint64(8)) | blocks[:, 2 + i].astype(np.uint64)
+        shifts = (np.uint64(45) - np.uint64(3) * ETC_PIXEL_ORDER.astype(np.uint64))
+        indices = ((index_bits[:, None] >> shifts) & np.uint64(7)).astype(np.int32)
+        modifier = EAC_MODIFIER_TABLES[table_index[:, None], indices]
+
+        if not is_eleven_bit:
+            return np.clip(base[:, None] + modifier * multiplier[:, None], 0, 255)
+        scaled_modifier = np.where(multiplier[:, None] == 0, modifier, modifier * multiplier[:, None] * 8)
+        return np.clip(base[:, None] * 8 + 4 + scaled_modifier, 0, 2047)
+
+    def _decode_eac_11_bit_channel(self, blocks: np.ndarray) -> np.ndarray:
+        return (self.decode_eac_blocks(blocks, True) >> 3).astype(np.uint8)
+
+    def decode_blocks(self, blocks: np.ndarray, image_format: ImageFormats) -> np.ndarray:
+        """
+        (blocks_count, block_size) array --> (blocks_count, 16, 4) RGBA array
+        """
+        if image_format in (ImageFormats.ETC1, ImageFormats.ETC2_RGB, ImageFormats.ETC2_RGB_A1):
+            return self.decode_colour_blocks(blocks, image_format)
+        elif image_format == ImageFormats.ETC2_RGBA:
+            block_pixels = self.decode_colour_blocks(blocks[:, 8:16], image_format)
+            block_pixels[:, :, 3] = self.decode_eac_blocks(blocks[:, 0:8], False)
+            return block_pixels
+
+        block_pixels = np.zeros((len(blocks), 16, 4), dtype=np.uint8)
+        block_pixels[:, :, 3] = 0xFF
+        if image_format == ImageFormats.EAC_R11:
+            block_pixels[:, :, 0] = self._decode_eac_11_bit_channel(blocks)
+        elif image_format == ImageFormats.EAC_RG11:
+            block_pixels[:, :, 0] = self._decode_eac_11_bit_channel(blocks[:, 0:8])
+            block_pixels[:, :, 1] = self._decode_eac_11_bit_channel(blocks[:, 8:16])
+        else:
+            raise Exception(f"Not supported image format! Image_format: {image_format}")
+        return block_pixels
+
+    def decode_etc_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
+        blocks = get_bc_blocks(image_data, img_width, img_height, image_format)
+        image = assemble_bc_blocks(self.decode_blocks(blocks, image_format), img_width, img_height)
+        return bytearray(image.tobytes())
@@ -0,0 +1,547 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import numpy as np
+
+from reversebox.common.logger import get_logger
+from reversebox.image.common import get_output_buffer_view
+from reversebox.image.decoders.decode_table_cache import (
+    DECODE_TABLE_BITS,
+    decode_table_cache,
+)
+from reversebox.image.image_formats import ImageFormats
+
+logger = get_logger(__name__)
+
+# fmt: off
+
+# Vectorized version of the generic decoder from "image_decoder.py".
+# Whole image buffer is read as typed NumPy array and every kernel below
+# works on all pixels at once. Output is byte-identical to the "_decode_*_pixel" functions.
+
+
+def _rgba(r, g, b, a) -> np.ndarray:
+    out = np.empty((len(r), 4), dtype=np.uint8)
+    out[:, 0] = r & 0xFF
+    out[:, 1] = g & 0xFF
+    out[:, 2] = b & 0xFF
+    out[:, 3] = a & 0xFF
+    return out
+
+
+def _full(v: np.ndarray, value: int) -> np.ndarray:
+    return np.full(v.shape, value, dtype=np.uint32)
+
+
+def _expand4(x: np.ndarray) -> np.ndarray:
+    return (x << 4) | x
+
+
+def _expand5(x: np.ndarray) -> np.ndarray:
+    return (x << 3) | (x >> 2)
+
+
+def _scale(x: np.ndarray, max_value: int) -> np.ndarray:
+    return x * 0xFF // max_value
+
+
+def _alpha_t(v: np.ndarray) -> np.ndarray:  # transparency and translucency
+    return np.where(v & 0x8000, 0x80, np.where(v == 0, 0x00, 0xFF)).astype(np.uint32)
+
+
+def _alpha_key(v: np.ndarray, key: int) -> np.ndarray:
+    return np.where(v == key, 0x00, 0xFF).astype(np.uint32)
+
+
+def _decode_rgb121_byte(v):
+    return _rgba((v >> 3) * 255, ((v >> 1) & 3) * 85, (v & 1) * 255, _full(v, 0xFF))
+
+
+def _decode_rgbx2222(v):
+    return _rgba((v & 3) * 85, ((v >> 2) & 3) * 85, ((v >> 4) & 3) * 85, _full(v, 0xFF))
+
+
+def _decode_rgba2222(v):
+    return _rgba((v & 3) * 85, ((v >> 2) & 3) * 85, ((v >> 4) & 3) * 85, ((v >> 6) & 3) * 85)
+
+
+def _decode_alpha_17x(v):
+    return _rgba(_full(v, 0xFF), _full(v, 0xFF), _full(v, 0xFF), v * 17)
+
+
+def _decode_alpha_only(v):
+    return _rgba(_full(v, 0xFF), _full(v, 0xFF), _full(v, 0xFF), v)
+
+
+def _decode_la44(v):
+    lum = (v & 0x0F) * 0x11
+    return _rgba(lum, lum, lum, (v >> 4) * 0x11)
+
+
+def _decode_gray8a(v):
+    lum = v & 0xFF
+    return _rgba(lum, lum, lum, (v >> 8) & 0xFF)
+
+
+def _decode_gray16(v):
+    lum = (v & 0xFFFF) >> 8
+    return _rgba(lum, lum, lum, _full(v, 0xFF))
+
+
+def _decode_rg88(v):
+    return _rgba(v, v >> 8, _full(v, 0x00), _full(v, 0xFF))
+
+
+def _decode_rgb332(v):
+    return _rgba((v >> 5) * 36, ((v >> 2) & 7) * 36, (v & 3) * 85, _full(v, 0xFF))
+
+
+def _decode_bgr332(v):
+    return _rgba((v & 7) * 36, ((v >> 3) & 7) * 36, (v >> 6) * 85, _full(v, 0xFF))
+
+
+def _decode_bgrx5551(v):
+    return _rgba(_expand5((v >> 10) & 0x1F), _expand5((v >> 5) & 0x1F), _expand5(v & 0x1F), _full(v, 0xFF))
+
+
+def _decode_bgra5551(v):
+    return _rgba(_expand5((v >> 10) & 0x1F), _expand5((v >> 5) & 0x1F), _expand5(v & 0x1F), ((v >> 15) & 1) * 0xFF)
+
+
+def _decode_bgra5551_tzar(v):
+    return _rgba(_expand5((v >> 10) & 0x1F), _expand5((v >> 5) & 0x1F), _expand5(v & 0x1F), _alpha_key(v, 0x6F))
+
+
+def _decode_bgrt5551(v):
+    return _rgba(_expand5((v >> 10) & 0x1F), _expand5((v >> 5) & 0x1F), _expand5(v & 0x1F), _alpha_t(v))
+
+
+def _decode_rgbx5551(v):
+    return _rgba(_expand5(v & 0x1F), _expand5((v >> 5) & 0x1F), _expand5((v >> 10) & 0x1F), _full(v, 0xFF))
+
+
+def _decode_rgba5551(v):
+    return _rgba(_expand5(v & 0x1F), _expand5((v >> 5) & 0x1F), _expand5((v >> 10) & 0x1F), ((v >> 15) & 1) * 0xFF)
+
+
+def _decode_rgbt5551(v):
+    return _rgba(_expand5(v & 0x1F), _expand5((v >> 5) & 0x1F), _expand5((v >> 10) & 0x1F), _alpha_t(v))
+
+
+def _decode_xrgb1555(v):
+    return _rgba(_scale((v >> 1) & 0x1F, 0x1F), _scale((v >> 6) & 0x1F, 0x1F), _scale((v >> 11) & 0x1F, 0x1F), _full(v, 0xFF))
+
+
+def _decode_argb1555(v):
+    return _rgba(_scale((v >> 1) & 0x1F, 0x1F), _scale((v >> 6) & 0x1F, 0x1F), _scale((v >> 11) & 0x1F, 0x1F), (v & 1) * 0xFF)
+
+
+def _decode_xbgr1555(v):
+    return _rgba(_scale((v >> 11) & 0x1F, 0x1F), _scale((v >> 6) & 0x1F, 0x1F), _scale((v >> 1) & 0x1F, 0x1F), _full(v, 0xFF))
+
+
+def _decode_abgr1555(v):
+    return _rgba(_scale((v >> 11) & 0x1F, 0x1F), _scale((v >> 6) & 0x1F, 0x1F), _scale((v >> 1) & 0x1F, 0x1F), (v & 1) * 0xFF)
+
+
+def _decode_bgr565(v):
+    return _rgba(_scale((v >> 11) & 0x1F, 0x1F), _scale((v >> 5) & 0x3F, 0x3F), _scale(v & 0x1F, 0x1F), _full(v, 0xFF))
+
+
+def _decode_rgb565(v):
+    return _rgba(_scale(v & 0x1F, 0x1F), _scale((v >> 5) & 0x3F, 0x3F), _scale((v >> 11) & 0x1F, 0x1F), _full(v, 0xFF))
+
+
+def _decode_rgb5a3(v):
+    opaque = (v & 0x8000) != 0
+    r = np.where(opaque, _scale(v & 0x1F, 0x1F), _scale(v & 0x0F, 0x0F))
+    g = np.where(opaque, _scale((v >> 5) & 0x1F, 0x1F), _scale((v >> 4) & 0x0F, 0x0F))
+    b = np.where(opaque, _scale((v >> 10) & 0x1F, 0x1F), _scale((v >> 8) & 0x0F, 0x0F))
+    a = np.where(opaque, 0xFF, _scale((v >> 12) & 0x07, 0x07))
+    return _rgba(r, g, b, a)
+
+
+def _decode_bgr5a3(v):
+    opaque = (v & 0x8000) != 0
+    r = np.where(opaque, _scale((v >> 10) & 0x1F, 0x1F), _scale((v >> 8) & 0x0F, 0x0F))
+    g = np.where(opaque, _scale((v >> 5) & 0x1F, 0x1F), _scale((v >> 4) & 0x0F, 0x0F))
+    b = np.where(opaque, _scale(v & 0x1F, 0x1F), _scale(v & 0x0F, 0x0F))
+    a = np.where(opaque, 0xFF, _scale((v >> 12) & 0x07, 0x07))
+    return _rgba(r, g, b, a)
+
+
+def _decode_rgb888(v):
+    return _rgba(v, v >> 8, v >> 16, _full(v, 0xFF))
+
+
+def _decode_bgr888(v):
+    return _rgba(v >> 16, v >> 8, v, _full(v, 0xFF))
+
+
+def _decode_rgba8888(v):
+    return _rgba(v, v >> 8, v >> 16, v >> 24)
+
+
+def _decode_bgrx8888(v):
+    return _rgba(v >> 16, v >> 8, v, _full(v, 0xFF))
+
+
+def _decode_bgrt8888(v):
+    return _rgba(v >> 16, v >> 8, v, _alpha_t(v))
+
+
+def _decode_rgbm8888(v):
+    max_range = 65025
+    m_normalized = ((v >> 24) & 0xFF) / 255.0
+    channels = []
+    for shift in (0, 8, 16):
+        c_final = np.trunc(((v >> shift) & 0xFF) / 255.0 * (m_normalized * max_range) * 255)
+        channels.append(np.clip(c_final, 0, 255).astype(np.uint32))
+    return _rgba(channels[0], channels[1], channels[2], _full(v, 0xFF))
+
+
+def _decode_bgra8888(v):
+    return _rgba(v >> 16, v >> 8, v, v >> 24)
+
+
+def _decode_bgra8888_tzar(v):
+    return _rgba(v >> 16, v >> 8, v, _alpha_key(v, 0x6F))
+
+
+def _decode_abgr8888(v):
+    return _rgba(v >> 24, v >> 16, v >> 8, v)
+
+
+def _decode_argb8888(v):
+    return _rgba(v >> 8, v >> 16, v >> 24, v)
+
+
+def _decode_xrgb8888(v):
+    return _rgba(v >> 8, v >> 16, v >> 24, _full(v, 0xFF))
+
+
+def _decode_rgbx8888(v):
+    return _rgba(v, v >> 8, v >> 16, _full(v, 0xFF))
+
+
+def _decode_xrgb4444(v):
+    return _rgba(_expand4((v >> 4) & 0x0F), _expand4((v >> 8) & 0x0F), _expand4((v >> 12) & 0xFF), _full(v, 0xFF))
+
+
+def _decode_argb4444(v):
+    return _rgba(_expand4((v >> 4) & 0x0F), _expand4((v >> 8) & 0x0F), _expand4((v >> 12) & 0xFF), _expand4(v & 0x0F))
+
+
+def _decode_xbgr4444(v):
+    return _rgba(_expand4((v >> 12) & 0xFF), _expand4((v >> 8) & 0x0F), _expand4((v >> 4) & 0x0F), _full(v, 0xFF))
+
+
+def _decode_abgr4444(v):
+    return _rgba(_expand4((v >> 12) & 0xFF), _expand4((v >> 8) & 0x0F), _expand4((v >> 4) & 0x0F), _expand4(v & 0x0F))
+
+
+def _decode_bgrx4444(v):
+    return _rgba(_expand4((v >> 8) & 0x0F), _expand4((v >> 4) & 0x0F), _expand4(v & 0x0F), _full(v, 0xFF))
+
+
+def _decode_bgra4444(v):
+    return _rgba(_expand4((v >> 8) & 0x0F), _expand4((v >> 4) & 0x0F), _expand4(v & 0x0F), _expand4((v >> 12) & 0xFF))
+
+
+def _decode_bgra4444_leapster(v):
+    return _rgba(_expand4((v >> 8) & 0x0F), _expand4((v >> 4) & 0x0F), _expand4(v & 0x0F), _alpha_key(v, 0xF0))
+
+
+def _decode_rgbx4444(v):
+    return _rgba(_expand4(v & 0x0F), _expand4((v >> 4) & 0x0F), _expand4((v >> 8) & 0x0F), _full(v, 0xFF))
+
+
+def _decode_rgba4444(v):
+    return _rgba(_expand4(v & 0x0F), _expand4((v >> 4) & 0x0F), _expand4((v >> 8) & 0x0F), _expand4((v >> 12) & 0x0F))
+
+
+def _expand6(x: np.ndarray) -> np.ndarray:
+    return (x * 255 + 32) // 63
+
+
+def _decode_rgbx6666(v):
+    return _rgba(_expand6(v & 63), _expand6((v >> 8) & 63), _expand6((v >> 16) & 63), _full(v, 0xFF))
+
+
+def _decode_rgba6666(v):
+    a = np.where(_expand6((v >> 24) & 63) != 0, 0xFF, 0x00).astype(np.uint32)
+    return _rgba(_expand6(v & 63), _expand6((v >> 8) & 63), _expand6((v >> 16) & 63), a)
+
+
+def _decode_rgb48(v):
+    return _rgba((v & 0xFFFF) >> 8, ((v >> 16) & 0xFFFF) >> 8, ((v >> 32) & 0xFFFF) >> 8, _full(v, 0xFF))
+
+
+def _decode_bgr48(v):
+    return _rgba(((v >> 32) & 0xFFFF) >> 8, ((v >> 16) & 0xFFFF) >> 8, (v & 0xFFFF) >> 8, _full(v, 0xFF))
+
+
+def _decode_gray4(v):
+    lum = v * 0x11
+    return _rgba(lum, lum, lum, _full(v, 0xFF))
+
+
+def _decode_gray8(v):
+    return _rgba(v, v, v, _full(v, 0xFF))
+
+
+def _decode_ia8(v):
+    return _rgba(v, v, v, v >> 8)
+
+
+def _decode_r8_only(v):
+    return _rgba(v, _full(v, 0x00), _full(v, 0x00), _full(v, 0xFF))
+
+
+def _decode_r16_only(v):
+    return _rgba((v & 0xFFFF) >> 8, _full(v, 0x00), _full(v, 0x00), _full(v, 0xFF))
+
+
+def _decode_r32_only(v):
+    return _rgba(v >> 24, _full(v, 0x00), _full(v, 0x00), _full(v, 0xFF))
+
+
+def _decode_g8_only(v):
+    return _rgba(_full(v, 0x00), v, _full(v, 0x00), _full(v, 0xFF))
+
+
+def _decode_g16_only(v):
+    return _rgba(_full(v, 0x00), (v & 0xFFFF) >> 8, _full(v, 0x00), _full(v, 0xFF))
+
+
+def _decode_g32_only(v):
+    return _rgba(_full(v, 0x00), v >> 24, _full(v, 0x00), _full(v, 0xFF))
+
+
+def _decode_b8_only(v):
+    return _rgba(_full(v, 0x00), _full(v, 0x00), v, _full(v, 0xFF))
+
+
+def _decode_b16_only(v):
+    return _rgba(_full(v, 0x00), _full(v, 0x00), (v & 0xFFFF) >> 8, _full(v, 0xFF))
+
+
+def _decode_b32_only(v):
+    return _rgba(_full(v, 0x00), _full(v, 0x00), v >> 24, _full(v, 0xFF))
+
+
+def _decode_null(v):
+    return _rgba(_full(v, 0xFF), _full(v, 0xFF), _full(v, 0xFF), _full(v, 0xFF))
+
+
+def read_pixel_values(image_data: bytes, bits_per_pixel: int, image_endianess: str, pixel_count: int) -> np.ndarray:
+    """
+    Reads up to "pixel_count" raw pixel values from image data.
+    Values are returned as uint32 array (uint64 for 48-bit formats).
+    """
+    if image_endianess not in ("little", "big"):
+        raise Exception(f"Endianess not supported! Endianess: {image_endianess}")
+    endianess_format: str = "<" if image_endianess == "little" else ">"
+    raw = np.frombuffer(image_data, dtype=np.uint8)
+
+    if bits_per_pixel == 4:
+        raw = raw[:(pixel_count + 1) // 2]
+        nibbles = np.empty((len(raw), 2), dtype=np.uint32)
+        if image_endianess == "little":
+            nibbles[:, 0] = raw & 0x0F
+            nibbles[:, 1] = raw >> 4
+        else:
+            nibbles[:, 0] = raw >> 4
+            nibbles[:, 1] = raw & 0x0F
+        return nibbles.reshape(-1)
+    elif bits_per_pixel == 8:
+        return raw[:pixel_count].astype(np.uint32)
+    elif bits_per_pixel in (16, 32):
+        bytes_per_pixel: int = bits_per_pixel // 8
+        count: int = min(pixel_count, len(raw) // bytes_per_pixel)
+        values = np.frombuffer(image_data, dtype=f"{endianess_format}u{bytes_per_pixel}", count=count)
+        return values.astype(np.uint32)
+    elif bits_per_pixel in (24, 48):
+        bytes_per_pixel: int = bits_per_pixel // 8
+        count: int = min(pixel_count, len(raw) // bytes_per_pixel)
+        packed = raw[:count * bytes_per_pixel].reshape(count, bytes_per_pixel).astype(np.uint64)
+        if image_endianess == "big":
+            packed = packed[:, ::-1]
+        values = np.zeros(count, dtype=np.uint64)
+        for i in range(bytes_per_pixel):
+            values |= packed[:, i] << np.uint64(8 * i)
+        return values if bits_per_pixel == 48 else values.astype(np.uint32)
+    else:
+        raise Exception(f"Bpp {bits_per_pixel} not supported!")
+
+
+class GenericNumpyDecoder:
+
+    def __init__(self):
+        pass
+
+    # image_format: (decode_kernel, bits_per_pixel)
+    generic_data_formats = {
+        ImageFormats.RGB121: (_decode_rgb121_byte, 4),
+        ImageFormats.GRAY4: (_decode_gray4, 4),
+        ImageFormats.ALPHA4: (_decode_alpha_only, 4),
+        ImageFormats.ALPHA4_17X: (_decode_alpha_17x, 4),
+
+        ImageFormats.RGB121_BYTE: (_decode_rgb121_byte, 8),
+        ImageFormats.ALPHA8: (_decode_alpha_only, 8),
+        ImageFormats.ALPHA8_17X: (_decode_alpha_17x, 8),
+        ImageFormats.LA44: (_decode_la44, 8),
+        ImageFormats.RGBX2222: (_decode_rgbx2222, 8),
+        ImageFormats.RGBA2222: (_decode_rgba2222, 8),
+        ImageFormats.RGB332: (_decode_rgb332, 8),
+        ImageFormats.BGR332: (_decode_bgr332, 8),
+        ImageFormats.GRAY8: (_decode_gray8, 8),
+        ImageFormats.N64_IA4: (_decode_la44, 8),
+        ImageFormats.R8: (_decode_r8_only, 8),
+        ImageFormats.G8: (_decode_g8_only, 8),
+        ImageFormats.B8: (_decode_b8_only, 8),
+
+        ImageFormats.GRAY8A: (_decode_gray8a, 16),
+        ImageFormats.GRAY16: (_decode_gray16, 16),
+        ImageFormats.RG88: (_decode_rg88, 16),
+        ImageFormats.RGB565: (_decode_rgb565, 16),
+        ImageFormats.BGR565: (_decode_bgr565, 16),
+        ImageFormats.RGBX5551: (_decode_rgbx5551, 16),
+        ImageFormats.RGBT5551: (_decode_rgbt5551, 16),
+        ImageFormats.BGRT5551: (_decode_bgrt5551, 16),
+        ImageFormats.RGBA5551: (_decode_rgba5551, 16),
+        ImageFormats.BGRA5551: (_decode_bgra5551, 16),
+        ImageFormats.BGRA5551_TZAR: (_decode_bgra5551_tzar, 16),
+        ImageFormats.BGRX5551: (_decode_bgrx5551, 16),
+        ImageFormats.RGBA4444: (_decode_rgba4444, 16),
+        ImageFormats.ARGB4444: (_decode_argb4444, 16),
+        ImageFormats.XRGB4444: (_decode_xrgb4444, 16),
+        ImageFormats.ABGR4444: (_decode_abgr4444, 16),
+        ImageFormats.XBGR4444: (_decode_xbgr4444, 16),
+        ImageFormats.RGBX4444: (_decode_rgbx4444, 16),
+        ImageFormats.BGRA4444: (_decode_bgra4444, 16),
+        ImageFormats.BGRA4444_LEAPSTER: (_decode_bgra4444_leapster, 16),
+        ImageFormats.BGRX4444: (_decode_bgrx4444, 16),
+        ImageFormats.XRGB1555: (_decode_xrgb1555, 16),
+        ImageFormats.XBGR1555: (_decode_xbgr1555, 16),
+        ImageFormats.ARGB1555: (_decode_argb1555, 16),
+        ImageFormats.ABGR1555: (_decode_abgr1555, 16),
+        ImageFormats.N64_IA8: (_decode_ia8, 16),
+        ImageFormats.N64_RGB5A3: (_decode_rgb5a3, 16),
+        ImageFormats.N64_BGR5A3: (_decode_bgr5a3, 16),
+        ImageFormats.R16: (_decode_r16_only, 16),
+        ImageFormats.G16: (_decode_g16_only, 16),
+        ImageFormats.B16: (_decode_b16_only, 16),
+
+        ImageFormats.RGBX6666: (_decode_rgbx6666, 24),
+        ImageFormats.RGBA6666: (_decode_rgba6666, 24),
+        ImageFormats.RGB888: (_decode_rgb888, 24),
+        ImageFormats.BGR888: (_decode_bgr888, 24),
+
+        ImageFormats.ARGB8888: (_decode_argb8888, 32),
+        ImageFormats.ABGR8888: (_decode_abgr8888, 32),
+        ImageFormats.RGBA8888: (_decode_rgba8888, 32),
+        ImageFormats.BGRA8888: (_decode_bgra8888, 32),
+        ImageFormats.BGRA8888_TZAR: (_decode_bgra8888_tzar, 32),
+        ImageFormats.XRGB8888: (_decode_xrgb8888, 32),
+        ImageFormats.RGBX8888: (_decode_rgbx8888, 32),
+        ImageFormats.BGRX8888: (_decode_bgrx8888, 32),
+        ImageFormats.BGRT8888: (_decode_bgrt8888, 32),
+        ImageFormats.RGBM8888: (_decode_rgbm8888, 32),
+        ImageFormats.R32: (_decode_r32_only, 32),
+        ImageFormats.G32: (_decode_g32_only, 32),
+        ImageFormats.B32: (_decode_b32_only, 32),
+        ImageFormats.IA_X2_ARGB: (_decode_null, 32),
+        ImageFormats.IA_X2_GRAB: (_decode_null, 32),
+
+        ImageFormats.RGB48: (_decode_rgb48, 48),
+        ImageFormats.BGR48: (_decode_bgr48, 48),
+    }
+
+    def decode_pixel_values(self, pixel_values: np.ndarray, image_format: ImageFormats) -> np.ndarray:
+        """
+        Decodes array of raw pixel values to (N, 4) RGBA8888 array.
+        """
+        decode_kernel, _ = self.generic_data_formats[image_format]
+        return decode_kernel(pixel_values)
+
+    def decode_palette(self, palette_data: bytes, palette_format: ImageFormats, palette_endianess: str, scale_value: int = 1) -> np.ndarray:
+        """
+        Decodes palette data to (N, 4) RGBA8888 array.
+        Each palette entry takes whole number of bytes, so 4-bit formats are read as 8-bit values.
+        """
+        decode_kernel, bits_per_pixel = self.generic_data_formats[palette_format]
+        entry_bits: int = max(8, bits_per_pixel)
+        palette_values: np.ndarray = read_pixel_values(palette_data, entry_bits, palette_endianess, len(palette_data))
+        if scale_value != 1:
+            palette_values = palette_values.astype(np.uint64) * np.uint64(scale_value)
+        return decode_kernel(palette_values)
+
+    def _decode_generic_image_into(self, output: np.ndarray, image_data: bytes, pixel_count: int,
+                                   image_format: ImageFormats, image_endianess: str) -> None:
+        """
+        Decodes "pixel_count" pixels into (pixel_count, 4) uint8 array.
+        Pixels missing in image data are set to zeros.
+        """
+        decode_kernel, bits_per_pixel = self.generic_data_formats[image_format]
+
+        if bits_per_pixel in DECODE_TABLE_BITS:
+            decode_table: np.ndarray = decode_table_cache.get_decode_table(image_format, image_endianess, decode_kernel, bits_per_pixel)
+            if bits_per_pixel == 16:
+                table_indices = np.frombuffer(image_data, dtype="<u2", count=min(pixel_count, len(image_data) // 2))
+            elif bits_per_pixel == 4:
+                table_indices = np.frombuffer(image_data, dtype=np.uint8, count=min((pixel_count + 1) // 2, len(image_data)))
+            else:
+                table_indices = np.frombuffer(image_data, dtype=np.uint8, count=min(pixel_count, len(image_data)))
+
+            if bits_per_pixel == 4:
+                # one table entry is two pixels, last pixel of odd images is copied separately
+                pair_count: int = min(pixel_count // 2, len(table_indices))
+                np.take(decode_table, table_indices[:pair_count], axis=0, out=output[:pair_count * 2].reshape(-1, 8))
+                if pair_count < len(table_indices):
+                    output[pair_count * 2] = decode_table[table_indices[pair_count], :4]
+                decoded_count: int = min(pixel_count, len(table_indices) * 2)
+            else:
+                np.take(decode_table, table_indices, axis=0, out=output[:len(table_indices)])
+                decoded_count: int = len(table_indices)
+        else:
+            pixel_values: np.ndarray = read_pixel_values(image_data, bits_per_pixel, image_endianess, pixel_count)
+            output[:len(pixel_values)] = decode_kernel(pixel_values)
+            decoded_count: int = len(pixel_values)
+
+        output[decoded_count:] = 0
+
+    def decode_generic_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int,
+                                  image_format: ImageFormats, image_endianess: str) -> int:
+        """
+        Decodes image into caller-supplied buffer (see "get_output_buffer_view"),
+        returns number of written bytes (img_width * img_height * 4)
+        """
+        _, bits_per_pixel = self.generic_data_formats[image_format]
+        pixel_count: int = img_width * img_height
+        if bits_per_pixel == 4 and len(image_data) < (pixel_count + 1) // 2:
+            raise ValueError(f"Image data too short! Expected at least {(pixel_count + 1) // 2} bytes.")
+
+        output = get_output_buffer_view(output_buffer, pixel_count * 4).reshape(-1, 4)
+        self._decode_generic_image_into(output, image_data, pixel_count, image_format, image_endianess)
+        return pixel_count * 4
+
+    def decode_generic_image_main(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats, image_endianess: str) -> bytes:
+        _, bits_per_pixel = self.generic_data_formats[image_format]
+        pixel_count: int = img_width * img_height
+
+        if bits_per_pixel == 4:
+            pixel_count = (pixel_count + 1) // 2 * 2
+            if len(image_data) < pixel_count // 2:
+                raise ValueError(f"Image data too short! Expected at least {pixel_count // 2} bytes.")
+        else:
+            # the same behaviour as in per-pixel decoder: all full pixels
+            # from input are decoded, missing pixels are left as zeros
+            pixel_count = max(pixel_count, len(image_data) // (bits_per_pixel // 8))
+
+        texture_data = bytearray(pixel_count * 4)
+        output = np.frombuffer(texture_data, dtype=np.uint8).reshape(-1, 4)
+        self._decode_generic_image_into(output, image_data, pixel_count, image_format, image_endianess)
+        return texture_data
@@ -0,0 +1,235 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+from typing import List
+
+import numpy as np
+import PIL.Image
+
+from reversebox.common.logger import get_logger
+from reversebox.image.common import get_output_buffer_view
+from reversebox.image.image_formats import ImageFormats
+from reversebox.image.pillow_wrapper import PillowWrapper
+from reversebox.image.pixel_layout import compile_pixel_layout
+
+logger = get_logger(__name__)
+
+# fmt: off
+
+# Vectorized version of the generic encoder from "image_encoder.py".
+# Every kernel gets R, G, B, A channels of all pixels (uint32 arrays)
+# and returns packed pixel values. Little endian bytes of those values
+# are the same as output of the "_encode_*_pixel" functions.
+
+
+def _quantize_17(x: np.ndarray) -> np.ndarray:
+    return ((x + 8) // 17) & 0x0F
+
+
+def _encode_i4(r, g, b, a):
+    return (r // 0x11) & 0x0F
+
+
+def _encode_alpha_17x(r, g, b, a):
+    return a // 17
+
+
+def _encode_ia4(r, g, b, a):
+    return (_quantize_17(a) << 4) | _quantize_17(r)
+
+
+def _encode_i8(r, g, b, a):
+    return r
+
+
+def _encode_ia8(r, g, b, a):
+    return r | (a << 8)
+
+
+def _encode_rgb565(r, g, b, a):
+    return ((b >> 3) << 11) | ((g >> 2) << 5) | (r >> 3)
+
+
+def _encode_bgr565(r, g, b, a):
+    return ((r >> 3) << 11) | ((g >> 2) << 5) | (b >> 3)
+
+
+def _encode_bgr5a3(r, g, b, a):
+    rgb555 = (0x8000 | (((r * 31 + 127) // 255) << 10) | (((g * 31 + 127) // 255) << 5) | ((b * 31 + 127) // 255))
+    rgba4443 = ((((a * 7 + 127) // 255) << 12) | (((r * 15 + 127) // 255) << 8) | (((g * 15 + 127) // 255) << 4) | ((b * 15 + 127) // 255))
+    return np.where(a >= 248, rgb555, rgba4443)
+
+
+def _encode_abgr4444(r, g, b, a):
+    value = ((b >> 4) << 12) | ((a >> 4) << 8) | ((r >> 4) << 4) | (g >> 4)
+    return ((value & 0xFF) << 8) | (value >> 8)  # stored as big endian
+
+
+def _encode_bgra4444(r, g, b, a):
+    return ((a >> 4) << 12) | ((r >> 4) << 8) | ((g >> 4) << 4) | (b >> 4)
+
+
+def _encode_rgbx4444(r, g, b, a):
+    return (0x0F << 12) | ((b >> 4) << 8) | ((g >> 4) << 4) | (r >> 4)
+
+
+def _encode_rgba5551(r, g, b, a):
+    return ((a >= 128).astype(np.uint32) << 15) | ((b >> 3) << 10) | ((g >> 3) << 5) | (r >> 3)
+
+
+def _encode_bgra5551(r, g, b, a):
+    return ((a >= 128).astype(np.uint32) << 15) | ((r >> 3) << 10) | ((g >> 3) << 5) | (b >> 3)
+
+
+def _encode_rgbx5551(r, g, b, a):
+    return ((0xFF << 15) | ((b >> 3) << 10) | ((g >> 3) << 5) | (r >> 3)) & 0xFFFF
+
+
+def _encode_rgbt5551(r, g, b, a):
+    value = ((b >> 3) << 10) | ((g >> 3) << 5) | (r >> 3)
+    opaque = np.where(value == 0, 1 << 10, value)
+    return np.where(a < 25 * 255 // 100, 0, np.where(a >= 75 * 255 // 100, opaque, value | 0x8000))
+
+
+def _encode_rgb888(r, g, b, a):
+    return r | (g << 8) | (b << 16)
+
+
+def _encode_bgr888(r, g, b, a):
+    return b | (g << 8) | (r << 16)
+
+
+def _encode_rgba8888(r, g, b, a):
+    return r | (g << 8) | (b << 16) | (a << 24)
+
+
+def _encode_bgra8888(r, g, b, a):
+    return b | (g << 8) | (r << 16) | (a << 24)
+
+
+def _encode_argb8888(r, g, b, a):
+    return a | (r << 8) | (g << 16) | (b << 24)
+
+
+class GenericNumpyEncoder:
+
+    def __init__(self):
+        pass
+
+    # image_format: (encode_kernel, bits_per_pixel)
+    generic_data_formats = {
+        ImageFormats.GRAY4: (_encode_i4, 4),
+        ImageFormats.ALPHA4_17X: (_encode_alpha_17x, 4),
+        ImageFormats.N64_IA4: (_encode_ia4, 8),
+        ImageFormats.GRAY8: (_encode_i8, 8),
+        ImageFormats.N64_IA8: (_encode_ia8, 16),
+        ImageFormats.RGB565: (_encode_rgb565, 16),
+        ImageFormats.BGR565: (_encode_bgr565, 16),
+        ImageFormats.N64_BGR5A3: (_encode_bgr5a3, 16),
+        ImageFormats.ABGR4444: (_encode_abgr4444, 16),
+        ImageFormats.BGRA4444: (_encode_bgra4444, 16),
+        ImageFormats.RGBX4444: (_encode_rgbx4444, 16),
+        ImageFormats.RGBA5551: (_encode_rgba5551, 16),
+        ImageFormats.BGRA5551: (_encode_bgra5551, 16),
+        ImageFormats.RGBX5551: (_encode_rgbx5551, 16),
+        ImageFormats.RGBT5551: (_encode_rgbt5551, 16),
+        ImageFormats.RGBX6666: (compile_pixel_layout("X2B6X2G6X2R6", "scale_round").encode, 24),
+        ImageFormats.RGB888: (_encode_rgb888, 24),
+        ImageFormats.BGR888: (_encode_bgr888, 24),
+        ImageFormats.RGBA8888: (_encode_rgba8888, 32),
+        ImageFormats.BGRA8888: (_encode_bgra8888, 32),
+        ImageFormats.ARGB8888: (_encode_argb8888, 32),
+    }
+
+    def _get_encoded_size(self, rgba_data_size: int, img_width: int, img_height: int, bits_per_pixel: int) -> int:
+        if bits_per_pixel == 4:
+            return img_width * img_height // 2
+        # all full RGBA pixels from input are encoded, missing pixels are left as zeros
+        return max(img_width * img_height, rgba_data_size // 4) * bits_per_pixel // 8
+
+    def encode_pixel_values(self, rgba_data: bytes, image_format: ImageFormats) -> np.ndarray:
+        """
+        Encodes RGBA8888 data to array of packed pixel values (uint32).
+        """
+        encode_kernel, _ = self.generic_data_formats[image_format]
+        pixels = np.frombuffer(rgba_data, dtype=np.uint8, count=len(rgba_data) // 4 * 4).reshape(-1, 4).astype(np.uint32)
+        return encode_kernel(pixels[:, 0], pixels[:, 1], pixels[:, 2], pixels[:, 3]).astype(np.uint32)
+
+    def _encode_generic_image_into(self, output: np.ndarray, rgba_data: bytes, img_width: int, img_height: int,
+                                   image_format: ImageFormats, image_endianess: str) -> None:
+        _, bits_per_pixel = self.generic_data_formats[image_format]
+        if image_endianess not in ("little", "big"):
+            raise Exception("Not supported endianess!")
+
+        if bits_per_pixel == 4:
+            pixel_count: int = img_width * img_height // 2 * 2
+            if len(rgba_data) < pixel_count * 4:
+                raise ValueError(f"RGBA data too short! Expected at least {pixel_count * 4} bytes.")
+            nibbles = self.encode_pixel_values(rgba_data[:pixel_count * 4], image_format).reshape(-1, 2)
+            if image_endianess == "little":
+                output[:] = (nibbles[:, 1] << 4) | nibbles[:, 0]
+            else:
+                output[:] = (nibbles[:, 0] << 4) | nibbles[:, 1]
+            return
+
+        bytes_per_pixel: int = bits_per_pixel // 8
+        values = self.encode_pixel_values(rgba_data, image_format)
+        encoded = np.empty((len(values), bytes_per_pixel), dtype=np.uint8)
+        for i in range(bytes_per_pixel):
+            encoded[:, i] = (values >> (8 * i)) & 0xFF
+        if image_endianess == "big":
+            encoded = encoded[:, ::-1]
+        output[:encoded.size] = encoded.reshape(-1)
+
+    def _get_mipmap_levels(self, image_data: bytes, img_width: int, img_height: int, number_of_mipmaps: int,
+                           mipmaps_resampling_type: PIL.Image.Resampling) -> List[tuple]:
+        """
+        Returns (rgba_data, width, height) of all mip levels
+        """
+        levels: List[tuple] = [(image_data, img_width, img_height)]
+        if number_of_mipmaps > 0:
+            base_img: PIL.Image.Image = PillowWrapper().get_pillow_image_from_rgba8888_data(image_data, img_width, img_height)
+            mip_width: int = img_width
+            mip_height: int = img_height
+            for _ in range(number_of_mipmaps):
+                mip_width //= 2
+                mip_height //= 2
+                mip_pillow_img: PIL.Image.Image = base_img.resize((mip_width, mip_height), resample=mipmaps_resampling_type)
+                levels.append((PillowWrapper().get_image_data_from_pillow_image(mip_pillow_img), mip_width, mip_height))
+        return levels
+
+    def _encode_mipmap_levels_into(self, output: np.ndarray, levels: List[tuple], level_sizes: List[int],
+                                   image_format: ImageFormats, image_endianess: str) -> None:
+        offset: int = 0
+        for (data, width, height), level_size in zip(levels, level_sizes):
+            self._encode_generic_image_into(output[offset: offset + level_size], data, width, height, image_format, image_endianess)
+            offset += level_size
+
+    def encode_generic_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                                  image_endianess: str, number_of_mipmaps: int = 0,
+                                  mipmaps_resampling_type: PIL.Image.Resampling = PIL.Image.Resampling.NEAREST) -> int:
+        """
+        Encodes image (and its mipmaps) into caller-supplied buffer (see "get_output_buffer_view"),
+        returns number of written bytes
+        """
+        _, bits_per_pixel = self.generic_data_formats[image_format]
+        levels: List[tuple] = self._get_mipmap_levels(image_data, img_width, img_height, number_of_mipmaps, mipmaps_resampling_type)
+        level_sizes: List[int] = [self._get_encoded_size(len(data), width, height, bits_per_pixel) for data, width, height in levels]
+        output = get_output_buffer_view(output_buffer, sum(level_sizes))
+        output[:] = 0
+        self._encode_mipmap_levels_into(output, levels, level_sizes, image_format, image_endianess)
+        return len(output)
+
+    def encode_generic_image_main(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                                  image_endianess: str, number_of_mipmaps: int = 0,
+                                  mipmaps_resampling_type: PIL.Image.Resampling = PIL.Image.Resampling.NEAREST) -> bytes:
+        _, bits_per_pixel = self.generic_data_formats[image_format]
+
+        # collect RGBA data of all mip levels first, so output can be allocated only once
+        levels: List[tuple] = self._get_mipmap_levels(image_data, img_width, img_height, number_of_mipmaps, mipmaps_resampling_type)
+        level_sizes: List[int] = [self._get_encoded_size(len(data), width, height, bits_per_pixel) for data, width, height in levels]
+        texture_data = bytearray(sum(level_sizes))
+        self._encode_mipmap_levels_into(np.frombuffer(texture_data, dtype=np.uint8), levels, level_sizes, image_format, image_endianess)
+        return texture_data
@@ -5,10 +5,20 @@ License: GPL-3.0 License
 
 from typing import Tuple
 
+import libimagequant as liq  # type: ignore[import-untyped]
+import numpy as np
+
 from reversebox.common.logger import get_logger
-from reversebox.compression.compression_gst import decompress_gst_image
+from reversebox.compression.compression_gst import (
+    compress_gst_image,
+    decompress_gst_image,
+)
+from reversebox.image.decoders.generic_numpy_encoder import GenericNumpyEncoder
 from reversebox.image.image_formats import ImageFormats
 from reversebox.image.swizzling.swizzle_gst import (
+    swizzle_gst_base,
+    swizzle_gst_detail1,
+    swizzle_gst_detail2,
     unswizzle_gst_base,
     unswizzle_gst_detail1,
     unswizzle_gst_detail2,
@@ -21,7 +31,7 @@ logger = get_logger(__name__)
 
 class GSTImageDecoderEncoder:
     """
-    Decoder for any PS2 GST images
+    Decoder and encoder for any PS2 GST images
     """
 
     def __init__(self):
@@ -39,6 +49,8 @@ class GSTImageDecoderEncoder:
         ImageFormats.GST822: (8, 2, 2),
     }
 
+    gst_palette_refine_passes: int = 4
+
     def _get_size_of_base(self, img_width: int, img_height: int, image_format: ImageFormats) -> int:
         block_width, block_height, detail_bpp = self.get_gst_params(image_format)
         size_of_base: int = (img_width // block_width) * (img_height // block_height)
@@ -87,16 +99,70 @@ class GSTImageDecoderEncoder:
 
         return decompressed_texture_data
 
-    # converts RGBA8888 to GST
+    def _get_gst_palette(self, image_data: bytes, img_width: int, img_height: int) -> np.ndarray:
+        """
+        Quantizes image to 256 colours --> (256, 4) RGBA palette ordered as nearest neighbour chain
+        (starting from the darkest colour), so neighbouring palette indices (base + detail values)
+        have similar colours
+        """
+        attr = liq.Attr()
+        attr.max_colors = 256
+        attr.speed = 1  # 1 = best quality (slow), 10 = worst quality (fast)
+        attr.min_quality = 1
+        attr.max_quality = 100
+        liq_image: liq.Image = attr.create_rgba(image_data, img_width, img_height, gamma=0.0)
+        out_palette = liq_image.quantize(attr).get_palette()
+
+        palette = np.array([(color.r, color.g, color.b, color.a) for color in out_palette], dtype=np.uint8).reshape(-1, 4)
+        palette[palette[:, 3] == 0] = 0  # RGB of fully transparent colour is undefined
+        colours = palette.astype(np.int64)
+        distances = ((colours[:, None, :] - colours[None, :, :]) ** 2).sum(axis=-1)
+        order = [int((colours[:, :3] @ np.array([299, 587, 114]) + colours[:, 3] * 1000).argmin())]
+        distances[:, order[0]] = np.iinfo(np.int64).max
+        for _ in range(len(palette) - 1):
+            order.append(int(distances[order[-1]].argmin()))
+            distances[:, order[-1]] = np.iinfo(np.int64).max
+        palette = palette[order]
+
+        # unused entries repeat the last colour
+        return np.concatenate((palette, np.repeat(palette[-1:], 256 - len(palette), axis=0)))
+
+    # converts RGBA8888 to GST, returns image data (base + detail) and palette data
     def encode_gst_image_main(self, image_data: bytes, img_width: int, img_height: int,
-                              gst_format: ImageFormats,  is_swizzled: bool) -> Tuple[bytes, bytes]:
+                              gst_format: ImageFormats, is_swizzled: bool,
+                              palette_format: ImageFormats = ImageFormats.BGRA8888) -> Tuple[bytes, bytes]:
         block_width, block_height, detail_bpp = self.gst_data_formats[gst_format]
+        pixel_count: int = img_width * img_height
+        if len(image_data) < pixel_count * 4:
+            raise ValueError(f"Not enough image data! Expected {pixel_count * 4} bytes, got {len(image_data)} bytes.")
+        image_data = bytes(image_data[:pixel_count * 4])
 
         # compress GST
-        # TODO
+        palette = self._get_gst_palette(image_data, img_width, img_height)
+        base_data, detail_data = compress_gst_image(image_data, palette, img_width, img_height, block_width, block_height, detail_bpp)
+
+        # refine palette (palette order is kept), every used colour is moved to mean of its pixels
+        pixels = np.frombuffer(image_data, dtype=np.uint8).reshape(-1, 4)
+        for _ in range(self.gst_palette_refine_passes):
+            indices = np.frombuffer(decompress_gst_image(base_data, detail_data, img_width, img_height,
+                                                         block_width, block_height, detail_bpp), dtype=np.uint8)
+            counts = np.bincount(indices, minlength=256)
+            used = counts > 0
+            colour_sums = np.stack([np.bincount(indices, weights=pixels[:, channel], minlength=256) for channel in range(4)], axis=-1)
+            palette = palette.copy()
+            palette[used] = np.rint(colour_sums[used] / counts[used, None]).astype(np.uint8)
+            base_data, detail_data = compress_gst_image(image_data, palette, img_width, img_height, block_width, block_height, detail_bpp)
 
         # swizzle GST data
         if is_swizzled:
-            pass  # TODO
+            base_data = swizzle_gst_base(base_data, img_width, img_height, block_width, block_height)
+            if detail_bpp == 2:
+                detail_data = swizzle_gst_detail2(detail_data, img_width, img_height)
+            else:
+                detail_data = swizzle_gst_detail1(detail_data, img_width, img_height)
 
-        return b'',  b''
+        # detail data starts at 16-byte aligned offset (see "get_detail_data")
+        detail_offset: int = (len(base_data) + (16 - 1)) & ~(16 - 1)
+        gst_image_data: bytes = bytes(base_data) + bytes(detail_offset - len(base_data)) + bytes(detail_data)
+        palette_data: bytes = GenericNumpyEncoder().encode_generic_image_main(palette.tobytes(), 256, 1, palette_format, "little")
+        return gst_image_data, palette_data
@@ -0,0 +1,143 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import numpy as np
+
+from reversebox.common.logger import get_logger
+from reversebox.image.common import get_output_buffer_view
+from reversebox.image.decoders.generic_numpy_decoder import GenericNumpyDecoder
+from reversebox.image.image_formats import ImageFormats
+
+logger = get_logger(__name__)
+
+# fmt: off
+
+# Vectorized version of the indexed decoder from "image_decoder.py".
+# Palette is decoded only once into (N, 4) RGBA table
+# and then image is built with fancy indexing.
+
+
+class IndexedNumpyDecoder:
+
+    def __init__(self):
+        pass
+
+    # image_format: bits_per_pixel
+    indexed_data_formats = {
+        ImageFormats.PAL4: 4,
+        ImageFormats.PAL8: 8,
+        ImageFormats.PAL8_TZAR: 8,
+        ImageFormats.PAL16: 16,
+        ImageFormats.PAL_I8A8: 16,
+        ImageFormats.PAL32: 32,
+    }
+
+    def _get_image_bytes(self, image_data: bytes, expected_size: int) -> np.ndarray:
+        # missing bytes are read as zeros (palette index 0)
+        image_bytes = np.frombuffer(image_data, dtype=np.uint8)[:expected_size]
+        if len(image_bytes) < expected_size:
+            image_bytes = np.concatenate((image_bytes, np.zeros(expected_size - len(image_bytes), dtype=np.uint8)))
+        return image_bytes
+
+    def _get_ia_x2_palette(self, palette_data: bytes, palette_format: ImageFormats) -> np.ndarray:
+        colours: int = len(palette_data) // 4 if len(palette_data) <= 1024 else 256
+        aligned_offset: int = (colours * 2 + 31) & ~31
+        first_palette = np.frombuffer(palette_data, dtype=np.uint8, count=colours * 2).reshape(colours, 2)
+        second_palette = np.frombuffer(palette_data, dtype=np.uint8, count=colours * 2, offset=aligned_offset).reshape(colours, 2)
+
+        palette = np.empty((colours, 4), dtype=np.uint8)
+        if palette_format == ImageFormats.IA_X2_ARGB:
+            palette[:, 0] = first_palette[:, 1]
+            palette[:, 1] = second_palette[:, 0]
+            palette[:, 2] = second_palette[:, 1]
+            palette[:, 3] = first_palette[:, 0]
+        elif palette_format == ImageFormats.IA_X2_GRAB:
+            palette[:, 0] = first_palette[:, 1]
+            palette[:, 1] = first_palette[:, 0]
+            palette[:, 2] = second_palette[:, 1]
+            palette[:, 3] = second_palette[:, 0]
+        else:
+            raise Exception(f"No supported palette format {palette_format}!")
+        return palette
+
+    def _get_palette_indices(self, image_data: bytes, pixel_count: int, img_bits_per_pixel: int, image_endianess: str) -> np.ndarray:
+        if img_bits_per_pixel == 4:
+            image_bytes = self._get_image_bytes(image_data, (pixel_count + 1) // 2)
+            indices = np.empty((len(image_bytes), 2), dtype=np.uint8)
+            if image_endianess == "little":
+                indices[:, 0] = image_bytes & 0x0F
+                indices[:, 1] = image_bytes >> 4
+            elif image_endianess == "big":
+                indices[:, 0] = image_bytes >> 4
+                indices[:, 1] = image_bytes & 0x0F
+            else:
+                raise Exception(f"Endianess not supported! Endianess: {image_endianess}")
+            return indices.reshape(-1)
+
+        bytes_per_pixel: int = img_bits_per_pixel // 8
+        image_bytes = self._get_image_bytes(image_data, pixel_count * bytes_per_pixel).reshape(pixel_count, bytes_per_pixel)
+        if image_endianess == "little":
+            return image_bytes[:, 0]
+        elif image_endianess == "big":
+            return image_bytes[:, bytes_per_pixel - 1]
+        else:
+            raise Exception(f"Endianess not supported! Endianess: {image_endianess}")
+
+    def _decode_indexed_image_into(self, output: np.ndarray, image_data: bytes, palette_data: bytes, pixel_count: int,
+                                   image_format: ImageFormats, palette_format: ImageFormats,
+                                   image_endianess: str, palette_endianess: str, scale_value: int) -> None:
+        """
+        Decodes "pixel_count" pixels into (pixel_count, 4) uint8 array
+        """
+        img_bits_per_pixel: int = self.indexed_data_formats[image_format]
+
+        # handle special cases first
+        if palette_format in (ImageFormats.IA_X2_ARGB, ImageFormats.IA_X2_GRAB):  # two IA palettes (16 bit + 16 bit)
+            if img_bits_per_pixel not in (4, 8):
+                raise Exception(f"bpp {img_bits_per_pixel} not supported!")
+            palette = self._get_ia_x2_palette(palette_data, palette_format)
+            indices = self._get_palette_indices(image_data, pixel_count, img_bits_per_pixel, image_endianess)
+            np.take(palette, indices[:pixel_count], axis=0, out=output)
+            return
+
+        # standard cases below
+        palette = GenericNumpyDecoder().decode_palette(palette_data, palette_format, palette_endianess, scale_value)
+        indices = self._get_palette_indices(image_data, pixel_count, img_bits_per_pixel, image_endianess)[:pixel_count]
+
+        if image_format is ImageFormats.PAL8_TZAR:
+            # transparent index is decoded as a raw colour value, not as a palette entry
+            transparent_mask = indices == 0x6F
+            np.take(palette, np.where(transparent_mask, 0, indices), axis=0, out=output)
+            output[transparent_mask] = GenericNumpyDecoder().decode_pixel_values(np.array([0x6F], dtype=np.uint32), palette_format)[0]
+        elif image_format is ImageFormats.PAL_I8A8:
+            alpha_bytes = self._get_image_bytes(image_data, pixel_count * 2).reshape(pixel_count, 2)
+            alpha = (alpha_bytes[:, 1] if image_endianess == "little" else alpha_bytes[:, 0]).astype(np.uint32)
+            np.take(palette, indices, axis=0, out=output)
+            premultiplied = output[:, :3].astype(np.uint32) * alpha[:, None] // 255
+            output[:, :3] = np.where((alpha < 255)[:, None], premultiplied, output[:, :3])
+            output[:, 3] = alpha
+        else:
+            np.take(palette, indices, axis=0, out=output)
+
+    def decode_indexed_image_into(self, output_buffer, image_data: bytes, palette_data: bytes, img_width: int, img_height: int,
+                                  image_format: ImageFormats, palette_format: ImageFormats,
+                                  image_endianess: str, palette_endianess: str, scale_value: int) -> int:
+        """
+        Decodes image into caller-supplied buffer (see "get_output_buffer_view"),
+        returns number of written bytes (img_width * img_height * 4)
+        """
+        pixel_count: int = img_width * img_height
+        output = get_output_buffer_view(output_buffer, pixel_count * 4).reshape(-1, 4)
+        self._decode_indexed_image_into(output, image_data, palette_data, pixel_count, image_format, palette_format,
+                                        image_endianess, palette_endianess, scale_value)
+        return pixel_count * 4
+
+    def decode_indexed_image_main(self, image_data: bytes, palette_data: bytes, img_width: int, img_height: int,
+                                  image_format: ImageFormats, palette_format: ImageFormats,
+                                  image_endianess: str, palette_endianess: str, scale_value: int) -> bytes:
+        texture_data = bytearray(img_width * img_height * 4)
+        self.decode_indexed_image_into(texture_data, image_data, palette_data, img_width, img_height, image_format, palette_format,
+                                       image_endianess, palette_endianess, scale_value)
+        return texture_data
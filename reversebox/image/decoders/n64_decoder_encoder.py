@@ -3,226 +3,238 @@ Copyright © 2024-2025  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
+import numpy as np
+
 from reversebox.common.logger import get_logger
-from reversebox.image.common import crop_image, get_storage_wh
+from reversebox.image.common import get_output_buffer_view, get_storage_wh
+from reversebox.image.decoders.bcn_numpy_encoder import (
+    BC1_FOUR_COLOUR_WEIGHTS,
+    BC1_THREE_COLOUR_WEIGHTS,
+    BC_ENCODER_PRESETS,
+    LEAST_SQUARES_ITERATIONS,
+    _get_bounding_box_endpoints,
+    _get_pca_endpoints,
+    _quantize_rgb565,
+    _solve_least_squares_endpoints,
+)
 from reversebox.image.image_formats import ImageFormats
-from reversebox.io_files.bytes_handler import BytesHandler
-from reversebox.io_files.bytes_helper_functions import get_uint8, get_uint16
 
 logger = get_logger(__name__)
 
 # fmt: off
 # mypy: ignore-errors
 
+# N64_CMPR (GameCube/Wii CMPR) is stored in 8x8 macro-tiles, every macro-tile holds four
+# 4x4 DXT1-like sub-blocks in row-major order. Sub-block: two big endian RGB565 colours
+# and four row bytes with 2-bit indices (first pixel in the highest bits).
+# RGB565 is expanded with "value * 255 // max" and interpolated colours are rounded down.
+#
+# CMPR encoder presets:
+# fast   - bounding box of opaque pixels (same as the original per pixel encoder)
+# normal - best of bounding box and PCA endpoints for every block
+# high   - normal + least squares endpoint refinement
+
+N64_CMPR_ALPHA_THRESHOLD: int = 128
+
+
+def _get_n64_tiles(image_data: bytes, tiles_count: int, tile_size: int) -> np.ndarray:
+    expected_size: int = tiles_count * tile_size
+    if len(image_data) < expected_size:
+        raise ValueError(f"Not enough image data! Expected {expected_size} bytes, got {len(image_data)} bytes.")
+    return np.frombuffer(image_data, dtype=np.uint8, count=expected_size).reshape(tiles_count, tile_size)
+
+
+def _quantize_rgb565_floor(colours: np.ndarray) -> np.ndarray:
+    colours = colours.astype(np.uint32)
+    return ((colours[:, 0] * 31 // 255) << 11) | ((colours[:, 1] * 63 // 255) << 5) | (colours[:, 2] * 31 // 255)
+
+
+def get_n64_cmpr_palette(colour_0: np.ndarray, colour_1: np.ndarray) -> np.ndarray:
+    """
+    RGB565 colours --> (N, 4, 4) RGBA palettes
+    """
+    colour_0 = colour_0.astype(np.int32)
+    colour_1 = colour_1.astype(np.int32)
+
+    def _rgb565_to_rgba8888(colours: np.ndarray) -> np.ndarray:
+        return np.stack((((colours >> 11) & 0x1F) * 0xFF // 0x1F,
+                         ((colours >> 5) & 0x3F) * 0xFF // 0x3F,
+                         (colours & 0x1F) * 0xFF // 0x1F,
+                         np.full_like(colours, 0xFF)), axis=-1)
+
+    p0 = _rgb565_to_rgba8888(colour_0)
+    p1 = _rgb565_to_rgba8888(colour_1)
+    four_colour_mode = (colour_0 > colour_1)[:, None]
+    p2 = np.where(four_colour_mode, (2 * p0 + p1) // 3, (p0 + p1) // 2)
+    p3 = np.where(four_colour_mode, (2 * p1 + p0) // 3, 0)  # transparent black
+    return np.stack((p0, p1, p2, p3), axis=1)
+
 
 class N64ImageDecoderEncoder:
 
     def __init__(self):
         pass
 
-    def _decode_n64_rgba32_image(self, image_data: bytes, img_width: int, img_height: int, block_width: int, block_height: int) -> bytes:
-        _width, _height = get_storage_wh(img_width, img_height, block_width, block_height)
-        output_data = bytearray(_width * _height * 4)
-        offset = 0
-
-        for y in range(0, _height, block_height):
-            for x in range(0, _width, block_width):
-                for y2 in range(block_height):
-                    for x2 in range(block_width):
-                        idx = (((y + y2) * _width) + (x + x2)) * 4
-                        output_data[idx + 0] = image_data[offset + 1]
-                        output_data[idx + 1] = image_data[offset + 32]
-                        output_data[idx + 2] = image_data[offset + 33]
-                        output_data[idx + 3] = image_data[offset + 0]
-                        offset += 2
-                offset += 32
-
-        output_data = crop_image(output_data, _width, _height, 32, img_width, img_height)
-        return output_data
-
-    def _decode_n64_cmpr_image(self, image_data: bytes, img_width: int, img_height: int, block_width: int, block_height: int) -> bytes:
+    def _decode_n64_rgba32_image_into(self, output: np.ndarray, image_data: bytes, img_width: int, img_height: int,
+                                      block_width: int, block_height: int) -> None:
+        # every tile stores AR pairs of all pixels followed by GB pairs
         _width, _height = get_storage_wh(img_width, img_height, block_width, block_height)
-        output_data = bytearray(_width * _height * 4)
-        image_data_handler = BytesHandler(image_data)
-
-        def _decode_rgb565_pixel(pixel_int: int) -> bytes:
-            p = bytearray(4)
-            p[0] = ((pixel_int >> 11) & 0x1F) * 0xFF // 0x1F
-            p[1] = ((pixel_int >> 5) & 0x3F) * 0xFF // 0x3F
-            p[2] = ((pixel_int >> 0) & 0x1F) * 0xFF // 0x1F
-            p[3] = 0xFF
-            return p
-
-        current_offset: int = 0
-        for y in range(0, _height, block_height):
-            for x in range(0, _width, block_width):
-                for y2 in range(0, block_height, 4):
-                    for x2 in range(0, block_width, 4):
-
-                        c0 = get_uint16(image_data_handler.get_bytes(current_offset, 2), ">")
-                        current_offset += 2
-                        c1 = get_uint16(image_data_handler.get_bytes(current_offset, 2), ">")
-                        current_offset += 2
-
-                        c = [
-                            _decode_rgb565_pixel(c0),
-                            _decode_rgb565_pixel(c1),
-                            bytearray(4),
-                            bytearray(4)
-                        ]
-
-                        if c0 > c1:
-                            for i in range(4):
-                                c[2][i] = int((2 * c[0][i] + c[1][i]) / 3)
-                                c[3][i] = int((2 * c[1][i] + c[0][i]) / 3)
-                        else:
-                            for i in range(4):
-                                c[2][i] = int((c[0][i] + c[1][i]) * .5)
-                                c[3][i] = 0
-
-                        for y3 in range(4):
-                            b = get_uint8(image_data_handler.get_bytes(current_offset, 1), ">")
-                            current_offset += 1
-                            for x3 in range(4):
-                                idx = (((y + y2 + y3) * _width) + (x + x2 + x3)) * 4
-                                output_data[idx: idx + 4] = c[(b >> (6 - (x3 * 2))) & 0x3]
-
-        return output_data
-
-    def _encode_n64_cmpr_image(self, rgba_data: bytes, img_width: int, img_height: int,
-                               block_width: int, block_height: int) -> bytes:
-
-        def encode_rgb565(r: int, g: int, b: int) -> int:
-            r5 = (r * 31) // 255
-            g6 = (g * 63) // 255
-            b5 = (b * 31) // 255
-            return (r5 << 11) | (g6 << 5) | b5
-
-        def decode565_to_rgba(c: int) -> tuple:
-            return (
-                ((c >> 11) & 0x1F) * 255 // 0x1F,
-                ((c >> 5) & 0x3F) * 255 // 0x3F,
-                (c & 0x1F) * 255 // 0x1F,
-                255
-            )
-
-        def get_pixel(x: int, y: int, w: int) -> tuple:
-            idx = (y * w + x) * 4
-            return rgba_data[idx], rgba_data[idx + 1], rgba_data[idx + 2], rgba_data[idx + 3]
+        tiles_x: int = _width // block_width
+        tiles_y: int = _height // block_height
+        tile_pixels: int = block_width * block_height
+        tiles = _get_n64_tiles(image_data, tiles_x * tiles_y, tile_pixels * 4).reshape(-1, 2, tile_pixels, 2)
 
-        _width, _height = get_storage_wh(img_width, img_height, block_width, block_height)
-        out = bytearray()
-
-        for y in range(0, _height, block_height):
-            for x in range(0, _width, block_width):
-                for y2 in range(0, block_height, 4):
-                    for x2 in range(0, block_width, 4):
-
-                        block: list = []
-                        for dy in range(4):
-                            for dx in range(4):
-                                px = x + x2 + dx
-                                py = y + y2 + dy
-                                if px < img_width and py < img_height:
-                                    block.append(get_pixel(px, py, img_width))
-                                else:
-                                    block.append((0, 0, 0, 0))
-
-                        opaque_pixels = [p for p in block if p[3] >= 128]
-                        alpha_mode = len(opaque_pixels) != len(block)
-
-                        if len(opaque_pixels) == 0:
-                            c0 = 0
-                            c1 = 0
-                            p0 = decode565_to_rgba(c0)
-                            p1 = decode565_to_rgba(c1)
-                        else:
-                            r_min = min(p[0] for p in opaque_pixels)
-                            g_min = min(p[1] for p in opaque_pixels)
-                            b_min = min(p[2] for p in opaque_pixels)
-
-                            r_max = max(p[0] for p in opaque_pixels)
-                            g_max = max(p[1] for p in opaque_pixels)
-                            b_max = max(p[2] for p in opaque_pixels)
-
-                            c0 = encode_rgb565(r_max, g_max, b_max)
-                            c1 = encode_rgb565(r_min, g_min, b_min)
-
-                            if alpha_mode and (c0 > c1):
-                                c0, c1 = c1, c0
-
-                            p0 = decode565_to_rgba(c0)
-                            p1 = decode565_to_rgba(c1)
-
-                        if c0 > c1:
-                            p2 = (
-                                (2 * p0[0] + p1[0]) // 3,
-                                (2 * p0[1] + p1[1]) // 3,
-                                (2 * p0[2] + p1[2]) // 3,
-                                255
-                            )
-                            p3 = (
-                                (2 * p1[0] + p0[0]) // 3,
-                                (2 * p1[1] + p0[1]) // 3,
-                                (2 * p1[2] + p0[2]) // 3,
-                                255
-                            )
-                        else:
-                            p2 = (
-                                (p0[0] + p1[0]) // 2,
-                                (p0[1] + p1[1]) // 2,
-                                (p0[2] + p1[2]) // 2,
-                                255
-                            )
-                            p3 = (0, 0, 0, 0)
-
-                        palette = [p0, p1, p2, p3]
-                        out += bytes([(c0 >> 8) & 0xFF, c0 & 0xFF])
-                        out += bytes([(c1 >> 8) & 0xFF, c1 & 0xFF])
-
-                        for row in range(4):
-                            i0 = row * 4 + 0
-                            i1 = row * 4 + 1
-                            i2 = row * 4 + 2
-                            i3 = row * 4 + 3
-
-                            def best_index_for_pixel(px):
-                                r, g, b, a = px
-                                if alpha_mode and a < 128:
-                                    return 3
-                                best = 0
-                                best_d = 10 ** 12
-                                max_index = 3 if (not (alpha_mode and palette[3][3] == 0)) else 2
-                                for pi in range(0, max_index + 1):
-                                    pr, pg, pb, pa = palette[pi]
-                                    d = (r - pr) ** 2 + (g - pg) ** 2 + (b - pb) ** 2
-                                    if d < best_d:
-                                        best_d = d
-                                        best = pi
-                                return best
-
-                            idx0 = best_index_for_pixel(block[i0])
-                            idx1 = best_index_for_pixel(block[i1])
-                            idx2 = best_index_for_pixel(block[i2])
-                            idx3 = best_index_for_pixel(block[i3])
-
-                            b = (idx0 << 6) | (idx1 << 4) | (idx2 << 2) | (idx3 << 0)
-                            out.append(b)
-
-        return bytes(out)
-
-    def decode_n64_image_main(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
+        pixels = np.stack((tiles[:, 0, :, 1], tiles[:, 1, :, 0], tiles[:, 1, :, 1], tiles[:, 0, :, 0]), axis=-1)
+        image = pixels.reshape(tiles_y, tiles_x, block_height, block_width, 4).transpose(0, 2, 1, 3, 4)
+        output[:] = image.reshape(_height, _width, 4)[:img_height, :img_width]
 
-        if image_format == ImageFormats.N64_RGBA32:
-            return self._decode_n64_rgba32_image(image_data, img_width, img_height, 4, 4)
-        elif image_format == ImageFormats.N64_CMPR:
-            return self._decode_n64_cmpr_image(image_data, img_width, img_height, 8, 8)
+    def _decode_n64_cmpr_image_into(self, output: np.ndarray, image_data: bytes, img_width: int, img_height: int,
+                                    block_width: int, block_height: int) -> None:
+        _width, _height = get_storage_wh(img_width, img_height, block_width, block_height)
+        sub_blocks_x: int = block_width // 4
+        sub_blocks_y: int = block_height // 4
+        blocks = _get_n64_tiles(image_data, _width * _height // 16, 8)
+
+        colour_0 = (blocks[:, 0].astype(np.int32) << 8) | blocks[:, 1]
+        colour_1 = (blocks[:, 2].astype(np.int32) << 8) | blocks[:, 3]
+        palette = get_n64_cmpr_palette(colour_0, colour_1)
+        indices = (blocks[:, 4:8, None] >> np.array([6, 4, 2, 0], dtype=np.uint8)) & 0x03
+        block_pixels = np.take_along_axis(palette, indices.reshape(-1, 16, 1).astype(np.intp), axis=1)
+
+        # (tiles_y, tiles_x, sub_blocks_y, sub_blocks_x, 4, 4) --> (height, width)
+        image = block_pixels.astype(np.uint8).reshape(_height // block_height, _width // block_width, sub_blocks_y, sub_blocks_x, 4, 4, 4)
+        image = image.transpose(0, 2, 4, 1, 3, 5, 6).reshape(_height, _width, 4)
+        output[:] = image[:img_height, :img_width]
+
+    def _evaluate_cmpr_endpoints(self, colours: np.ndarray, transparent: np.ndarray, alpha_mode: np.ndarray,
+                                 colour_0: np.ndarray, colour_1: np.ndarray) -> tuple:
+        # four colour mode needs colour_0 > colour_1, three colour mode (transparency) needs colour_0 <= colour_1
+        swap = alpha_mode & (colour_0 > colour_1)
+        colour_0, colour_1 = np.where(swap, colour_1, colour_0), np.where(swap, colour_0, colour_1)
+        four_colour_mode = colour_0 > colour_1
+
+        palette = get_n64_cmpr_palette(colour_0, colour_1)[:, :, :3]
+        distances = ((colours.astype(np.int32)[:, :, None, :] - palette[:, None, :, :]) ** 2).sum(axis=-1)
+        # transparent black is only used for transparent pixels
+        distances[:, :, 3] = np.where(four_colour_mode[:, None], distances[:, :, 3], np.iinfo(np.int32).max)
+        indices = distances.argmin(axis=-1)
+        indices[transparent] = 3
+
+        pixel_errors = np.take_along_axis(distances, indices[:, :, None], axis=-1)[:, :, 0]
+        errors = np.where(transparent, 0, pixel_errors).sum(axis=1, dtype=np.int64)
+        return colour_0, colour_1, four_colour_mode, indices, errors
+
+    def _select_better_candidate(self, best: tuple, candidate: tuple) -> tuple:
+        better = candidate[-1] < best[-1]
+        return tuple(np.where(better.reshape((-1,) + (1,) * (best_value.ndim - 1)), candidate_value, best_value)
+                     for best_value, candidate_value in zip(best, candidate))
+
+    def encode_cmpr_blocks(self, block_pixels: np.ndarray, inside_image: np.ndarray, encoder_preset: str = "fast") -> np.ndarray:
+        """
+        (blocks_count, 16, 4) RGBA blocks and (blocks_count, 16) mask of pixels inside image --> (blocks_count, 8) CMPR blocks
+        """
+        if encoder_preset not in BC_ENCODER_PRESETS:
+            raise ValueError(f"Encoder preset not supported! Preset: {encoder_preset}")
+
+        colours = block_pixels[:, :, :3].astype(np.float64)
+        opaque = block_pixels[:, :, 3] >= N64_CMPR_ALPHA_THRESHOLD
+        if encoder_preset == "fast":
+            # pixels outside of image are transparent
+            opaque &= inside_image
+            transparent = ~opaque
         else:
+            # pixels outside of image are ignored
+            transparent = ~opaque & inside_image
+            opaque &= inside_image
+        alpha_mode = transparent.any(axis=1)
+        weights = opaque.astype(np.float64)
+
+        used = opaque[:, :, None]
+        max_colour = np.where(used, block_pixels[:, :, :3], 0).max(axis=1)
+        min_colour = np.where(used, block_pixels[:, :, :3], 255).min(axis=1)
+        min_colour[~opaque.any(axis=1)] = 0
+        best = self._evaluate_cmpr_endpoints(colours, transparent, alpha_mode,
+                                             _quantize_rgb565_floor(max_colour), _quantize_rgb565_floor(min_colour))
+
+        if encoder_preset != "fast":
+            for endpoint_0, endpoint_1 in (_get_bounding_box_endpoints(colours, weights), _get_pca_endpoints(colours, weights)):
+                candidate = self._evaluate_cmpr_endpoints(colours, transparent, alpha_mode,
+                                                          _quantize_rgb565(endpoint_0), _quantize_rgb565(endpoint_1))
+                best = self._select_better_candidate(best, candidate)
+
+        if encoder_preset == "high":
+            for _ in range(LEAST_SQUARES_ITERATIONS):
+                colour_0, colour_1, four_colour_mode, indices, _ = best
+                endpoint_weights = np.where(four_colour_mode[:, None], BC1_FOUR_COLOUR_WEIGHTS[indices], BC1_THREE_COLOUR_WEIGHTS[indices])
+                pixel_weights = weights * np.where(four_colour_mode[:, None], 1.0, indices != 3)
+                endpoint_0, endpoint_1, valid = _solve_least_squares_endpoints(colours, pixel_weights, endpoint_weights)
+                candidate = self._evaluate_cmpr_endpoints(colours, transparent, alpha_mode,
+                                                          _quantize_rgb565(endpoint_0), _quantize_rgb565(endpoint_1))
+                candidate = candidate[:4] + (np.where(valid, candidate[4], np.iinfo(np.int64).max),)
+                best = self._select_better_candidate(best, candidate)
+
+        colour_0, colour_1, _, indices, _ = best
+        row_bytes = (indices.reshape(-1, 4, 4) << np.array([6, 4, 2, 0])).sum(axis=-1)
+        encoded_blocks = np.empty((len(block_pixels), 8), dtype=np.uint8)
+        encoded_blocks[:, 0] = colour_0 >> 8
+        encoded_blocks[:, 1] = colour_0 & 0xFF
+        encoded_blocks[:, 2] = colour_1 >> 8
+        encoded_blocks[:, 3] = colour_1 & 0xFF
+        encoded_blocks[:, 4:8] = row_bytes
+        return encoded_blocks
+
+    def _encode_n64_cmpr_image_into(self, output: np.ndarray, rgba_data: bytes, img_width: int, img_height: int,
+                                    block_width: int, block_height: int, encoder_preset: str = "fast") -> None:
+        pixel_count: int = img_width * img_height
+        if len(rgba_data) < pixel_count * 4:
+            raise ValueError(f"Not enough image data! Expected {pixel_count * 4} bytes, got {len(rgba_data)} bytes.")
+        _width, _height = get_storage_wh(img_width, img_height, block_width, block_height)
+        pixels = np.zeros((_height, _width, 4), dtype=np.uint8)
+        pixels[:img_height, :img_width] = np.frombuffer(rgba_data, dtype=np.uint8, count=pixel_count * 4).reshape(img_height, img_width, 4)
+        inside_image = np.zeros((_height, _width), dtype=bool)
+        inside_image[:img_height, :img_width] = True
+
+        # (height, width) --> (tiles_y, tiles_x, sub_blocks_y, sub_blocks_x, 4, 4)
+        shape = (_height // block_height, block_height // 4, 4, _width // block_width, block_width // 4, 4)
+        block_pixels = pixels.reshape(shape + (4,)).transpose(0, 3, 1, 4, 2, 5, 6).reshape(-1, 16, 4)
+        inside_image = inside_image.reshape(shape).transpose(0, 3, 1, 4, 2, 5).reshape(-1, 16)
+        output.reshape(-1, 8)[:] = self.encode_cmpr_blocks(block_pixels, inside_image, encoder_preset)
+
+    def decode_n64_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> int:
+        """
+        Decodes image into caller-supplied buffer (see "get_output_buffer_view"),
+        returns number of written bytes (img_width * img_height * 4)
+        """
+        if image_format not in (ImageFormats.N64_RGBA32, ImageFormats.N64_CMPR):
             raise Exception(f"Image format not supported by N64 decoder! Image_format: {image_format}")
-
-    def encode_n64_image_main(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
-
-        if image_format == ImageFormats.N64_CMPR:
-            return self._encode_n64_cmpr_image(image_data, img_width, img_height, 8, 8)
+        output = get_output_buffer_view(output_buffer, img_width * img_height * 4)
+        if image_format == ImageFormats.N64_RGBA32:
+            self._decode_n64_rgba32_image_into(output.reshape(img_height, img_width, 4), image_data, img_width, img_height, 4, 4)
         else:
+            self._decode_n64_cmpr_image_into(output.reshape(img_height, img_width, 4), image_data, img_width, img_height, 8, 8)
+        return len(output)
+
+    def decode_n64_image_main(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
+        texture_data = bytearray(img_width * img_height * 4)
+        self.decode_n64_image_into(texture_data, image_data, img_width, img_height, image_format)
+        return texture_data
+
+    def encode_n64_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                              encoder_preset: str = "fast") -> int:
+        """
+        Encodes image into caller-supplied buffer (see "get_output_buffer_view"),
+        returns number of written bytes
+        """
+        if image_format != ImageFormats.N64_CMPR:
             raise Exception(f"Image format not supported by N64 decoder! Image_format: {image_format}")
+        _width, _height = get_storage_wh(img_width, img_height, 8, 8)
+        output = get_output_buffer_view(output_buffer, _width * _height // 2)
+        self._encode_n64_cmpr_image_into(output, image_data, img_width, img_height, 8, 8, encoder_preset)
+        return len(output)
+
+    def encode_n64_image_main(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                              encoder_preset: str = "fast") -> bytes:
+        _width, _height = get_storage_wh(img_width, img_height, 8, 8)
+        texture_data = bytearray(_width * _height // 2)
+        self.encode_n64_image_into(texture_data, image_data, img_width, img_height, image_format, encoder_preset)
+        return texture_data
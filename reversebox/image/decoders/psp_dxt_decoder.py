@@ -1,16 +1,22 @@
 """
-Copyright © 2025  Bartłomiej Duda
+Copyright © 2025-2026  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
+import numpy as np
+
 from reversebox.common.logger import get_logger
-from reversebox.image.common import get_bpp_for_image_format
+from reversebox.image.common import get_bpp_for_image_format, get_output_buffer_view
 from reversebox.image.image_formats import ImageFormats
 
 logger = get_logger(__name__)
 
 # fmt: off
 
+# PSP DXT blocks store colour data before alpha data:
+# bytes 0-3 colour indices, bytes 4-7 two RGB565 colours, bytes 8-15 alpha block (DXT3/DXT5).
+# All blocks are gathered from the pitched buffer and decoded at once.
+
 
 class PSPDXTDecoder:
 
@@ -27,141 +33,104 @@ class PSPDXTDecoder:
         align: int = self._get_pitch_align(image_format)
         return (pitch + align - 1) // align * align
 
-    def _interpolation_50_50(self, c0: int, c1: int) -> int:
-        b0, g0, r0, a0 = (c0 >> 24) & 0xFF, (c0 >> 16) & 0xFF, (c0 >> 8) & 0xFF, c0 & 0xFF
-        b1, g1, r1, a1 = (c1 >> 24) & 0xFF, (c1 >> 16) & 0xFF, (c1 >> 8) & 0xFF, c1 & 0xFF
-        return (((b0 + b1) // 2) << 24) | (((g0 + g1) // 2) << 16) | (((r0 + r1) // 2) << 8) | ((a0 + a1) // 2)
-
-    def _interpolation_66_33(self, c0: int, c1: int) -> int:
-        b0, g0, r0, a0 = (c0 >> 24) & 0xFF, (c0 >> 16) & 0xFF, (c0 >> 8) & 0xFF, c0 & 0xFF
-        b1, g1, r1, a1 = (c1 >> 24) & 0xFF, (c1 >> 16) & 0xFF, (c1 >> 8) & 0xFF, c1 & 0xFF
-        return (((2 * b0 + b1) // 3) << 24) | (((2 * g0 + g1) // 3) << 16) | (((2 * r0 + r1) // 3) << 8) | ((2 * a0 + a1) // 3)
-
-    def _rgb565_to_bgra8888(self, pixel_int: int) -> int:
-        r = ((pixel_int >> 11) & 0x1F) * 0xFF // 0x1F
-        g = ((pixel_int >> 5) & 0x3F) * 0xFF // 0x3F
-        b = ((pixel_int >> 0) & 0x1F) * 0xFF // 0x1F
-        a = 0xFF
-        return (b << 24) | (g << 16) | (r << 8) | a
-
-    def _decode_psp_dxt1_block(self, image_data: bytes) -> bytearray:
-        # Read two 16-bit colors (little endian)
-        sp: list[int] = [int.from_bytes(image_data[0:2], 'little'),
-                         int.from_bytes(image_data[2:4], 'little'),
-                         int.from_bytes(image_data[4:6], 'little'),
-                         int.from_bytes(image_data[6:8], 'little')]
-
-        c0: int = sp[2]
-        c1: int = sp[3]
-        colors: list[int] = [0, 0, 0, 0]
-        decoded_dxt_block: bytearray = bytearray(16 * 4)  # 16 RGBA pixels
-
-        if c0 > c1:
-            colors[0] = c0 = self._rgb565_to_bgra8888(c0)
-            colors[1] = c1 = self._rgb565_to_bgra8888(c1)
-            colors[2] = self._interpolation_66_33(c0, c1)
-            colors[3] = self._interpolation_66_33(c1, c0)
-        else:
-            colors[0] = c0 = self._rgb565_to_bgra8888(c0)
-            colors[1] = c1 = self._rgb565_to_bgra8888(c1)
-            colors[2] = self._interpolation_50_50(c0, c1)
-            colors[3] = 0x00  # transparent
-
-        cp = image_data[:4]
-        dst_index = 0
-        for i in range(4):
-            bits = cp[i]
-            for _ in range(4):
-                color = colors[bits & 0x03]
-                decoded_dxt_block[dst_index:dst_index + 4] = [
-                    (color >> 8) & 0xFF,  # R
-                    (color >> 16) & 0xFF,  # G
-                    (color >> 24) & 0xFF,  # B
-                    color & 0xFF  # A
-                ]
-                dst_index += 4
-                bits >>= 2
-
-        return decoded_dxt_block
-
-    def _decode_psp_dxt3_block(self, decoded_dxt_block: bytearray, image_data: bytes) -> bytearray:
-        sp_offset = 4 * 2
-        sp = image_data[sp_offset:]
-        dp_index = 3
-
-        for i in range(4):
-            bits = int.from_bytes(sp[i * 2:i * 2 + 2], 'little')
-            for j in range(4):
-                decoded_dxt_block[dp_index] = (bits & 0xF) * 0x11
-                dp_index += 4
-                bits >>= 4
-
-        return decoded_dxt_block
-
-    def _decode_psp_dxt5_block(self, decoded_dxt_block: bytearray, image_data: bytes) -> bytearray:
-        sp_offset = 4 * 2
-        sp = image_data[sp_offset:]
-
-        alphas = [0] * 8
-        a0 = sp[6]
-        a1 = sp[7]
-        alphas[0] = a0
-        alphas[1] = a1
-
-        if a0 > a1:
-            alphas[2] = (a0 * 6 + a1 * 1 + 3) // 7
-            alphas[3] = (a0 * 5 + a1 * 2 + 3) // 7
-            alphas[4] = (a0 * 4 + a1 * 3 + 3) // 7
-            alphas[5] = (a0 * 3 + a1 * 4 + 3) // 7
-            alphas[6] = (a0 * 2 + a1 * 5 + 3) // 7
-            alphas[7] = (a0 * 1 + a1 * 6 + 3) // 7
-        else:
-            alphas[2] = (a0 * 4 + a1 * 1 + 2) // 5
-            alphas[3] = (a0 * 3 + a1 * 2 + 2) // 5
-            alphas[4] = (a0 * 2 + a1 * 3 + 2) // 5
-            alphas[5] = (a0 * 1 + a1 * 4 + 2) // 5
-            alphas[6] = 0
-            alphas[7] = 255
-
-        dp_index = 3
-
-        for i in range(4):
-            bits = int.from_bytes(sp[i:i + 4], 'little') >> (i * 4)
-            for j in range(4):
-                decoded_dxt_block[dp_index] = alphas[bits & 0x7]
-                dp_index += 4
-                bits >>= 3
-
-        return decoded_dxt_block
-
-    def decode_psp_dxt_image_main(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
+    def get_row_pitch(self, img_width: int, image_format: ImageFormats) -> int:
+        """
+        Returns size of one pixel row in bytes (rows are aligned to 4 bytes)
+        """
+        return self._get_pitch(get_bpp_for_image_format(image_format), img_width, image_format)
 
+    def _get_blocks(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> np.ndarray:
+        """
+        Gathers blocks from pitched buffer --> (blocks_y * blocks_x, block_size) array
+        """
         bpp: int = get_bpp_for_image_format(image_format)
         pitch: int = self._get_pitch(bpp, img_width, image_format)
-        decoded_data: bytearray = bytearray(img_width * img_height * 4)
-
-        for y in range(0, img_height, 4):
-            for x in range(0, img_width, 4):
-                src_offset = pitch * y + (bpp * x // 8) * 4
-                src_block = image_data[src_offset:src_offset + 16]  # DXT block
-
-                if image_format == ImageFormats.PSP_DXT1:
-                    decoded_block = self._decode_psp_dxt1_block(src_block)
-                elif image_format == ImageFormats.PSP_DXT3:
-                    decoded_block = self._decode_psp_dxt3_block(self._decode_psp_dxt1_block(src_block), src_block)
-                elif image_format == ImageFormats.PSP_DXT5:
-                    decoded_block = self._decode_psp_dxt5_block(self._decode_psp_dxt1_block(src_block), src_block)
-                    pass
-                else:
-                    raise Exception(f"Image format not supported by PSP DXT decoder! Image_format: {image_format}")
-
-                # Copy decoded block to output buffer
-                for i in range(16):
-                    dx = x + (i % 4)
-                    dy = y + (i // 4)
-                    if dx >= img_width or dy >= img_height:
-                        continue
-                    pix_index = (img_width * dy + dx) * 4
-                    decoded_data[pix_index:pix_index + 4] = decoded_block[i * 4:i * 4 + 4]
-
-        return bytes(decoded_data)
+        block_size: int = 8 if image_format == ImageFormats.PSP_DXT1 else 16
+        block_y, block_x = np.mgrid[0:(img_height + 3) // 4, 0:(img_width + 3) // 4]
+        block_offsets = (pitch * 4 * block_y + (bpp * 4 * block_x // 8) * 4).reshape(-1)
+
+        # missing data is read as zeros
+        required_size: int = int(block_offsets.max()) + block_size if block_offsets.size else 0
+        data = np.zeros(max(required_size, len(image_data)), dtype=np.uint8)
+        data[:len(image_data)] = np.frombuffer(image_data, dtype=np.uint8)
+        return data[block_offsets[:, None] + np.arange(block_size)]
+
+    def _rgb565_to_rgba8888(self, colours: np.ndarray) -> np.ndarray:
+        return np.stack((((colours >> 11) & 0x1F) * 0xFF // 0x1F,
+                         ((colours >> 5) & 0x3F) * 0xFF // 0x3F,
+                         (colours & 0x1F) * 0xFF // 0x1F,
+                         np.full_like(colours, 0xFF)), axis=-1)
+
+    def _decode_psp_dxt1_blocks(self, blocks: np.ndarray) -> np.ndarray:
+        """
+        Returns (N, 16, 4) RGBA pixels
+        """
+        c0 = blocks[:, 4].astype(np.int32) | (blocks[:, 5].astype(np.int32) << 8)
+        c1 = blocks[:, 6].astype(np.int32) | (blocks[:, 7].astype(np.int32) << 8)
+        colour_0 = self._rgb565_to_rgba8888(c0)
+        colour_1 = self._rgb565_to_rgba8888(c1)
+
+        four_colour_mode = (c0 > c1)[:, None]
+        colour_2 = np.where(four_colour_mode, (2 * colour_0 + colour_1) // 3, (colour_0 + colour_1) // 2)
+        colour_3 = np.where(four_colour_mode, (2 * colour_1 + colour_0) // 3, 0)  # transparent black
+        palette = np.stack((colour_0, colour_1, colour_2, colour_3), axis=1)
+
+        indices = (blocks[:, 0:4, None] >> (2 * np.arange(4, dtype=np.uint8))) & 0x03
+        return np.take_along_axis(palette, indices.reshape(-1, 16, 1).astype(np.intp), axis=1)
+
+    def _decode_psp_dxt3_alpha(self, blocks: np.ndarray) -> np.ndarray:
+        alpha_nibbles = np.stack((blocks[:, 8:16] & 0xF, blocks[:, 8:16] >> 4), axis=-1).reshape(-1, 16)
+        return alpha_nibbles.astype(np.int32) * 0x11
+
+    def _decode_psp_dxt5_alpha(self, blocks: np.ndarray) -> np.ndarray:
+        a0 = blocks[:, 14].astype(np.int32)[:, None]
+        a1 = blocks[:, 15].astype(np.int32)[:, None]
+        steps = np.arange(1, 7, dtype=np.int32)
+        eight_alpha_palette = (a0 * (7 - steps) + a1 * steps + 3) // 7
+        six_alpha_palette = np.concatenate(((a0 * (5 - steps[:4]) + a1 * steps[:4] + 2) // 5,
+                                            np.zeros_like(a0), np.full_like(a0, 0xFF)), axis=1)
+        palette = np.concatenate((a0, a1, np.where(a0 > a1, eight_alpha_palette, six_alpha_palette)), axis=1)
+
+        index_bits = np.zeros(len(blocks), dtype=np.uint64)
+        for i in range(6):
+            index_bits |= blocks[:, 8 + i].astype(np.uint64) << np.uint64(8 * i)
+        indices = (index_bits[:, None] >> (3 * np.arange(16, dtype=np.uint64))) & np.uint64(0x7)
+        return np.take_along_axis(palette, indices.astype(np.intp), axis=1)
+
+    def decode_psp_dxt_blocks(self, blocks: np.ndarray, image_format: ImageFormats) -> np.ndarray:
+        """
+        (N, block_size) blocks --> (N, 16, 4) RGBA pixels
+        """
+        if image_format not in (ImageFormats.PSP_DXT1, ImageFormats.PSP_DXT3, ImageFormats.PSP_DXT5):
+            raise Exception(f"Image format not supported by PSP DXT decoder! Image_format: {image_format}")
+
+        block_pixels = self._decode_psp_dxt1_blocks(blocks)
+        if image_format == ImageFormats.PSP_DXT3:
+            block_pixels[:, :, 3] = self._decode_psp_dxt3_alpha(blocks)
+        elif image_format == ImageFormats.PSP_DXT5:
+            block_pixels[:, :, 3] = self._decode_psp_dxt5_alpha(blocks)
+        return block_pixels
+
+    def decode_psp_dxt_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> int:
+        """
+        Decodes image into caller-supplied buffer (see "get_output_buffer_view"),
+        returns number of written bytes (img_width * img_height * 4)
+        """
+        if image_format not in (ImageFormats.PSP_DXT1, ImageFormats.PSP_DXT3, ImageFormats.PSP_DXT5):
+            raise Exception(f"Image format not supported by PSP DXT decoder! Image_format: {image_format}")
+
+        blocks = self._get_blocks(image_data, img_width, img_height, image_format)
+        block_pixels = self.decode_psp_dxt_blocks(blocks, image_format)
+
+        # Copy decoded blocks to output buffer
+        blocks_x: int = (img_width + 3) // 4
+        blocks_y: int = (img_height + 3) // 4
+        image = block_pixels.reshape(blocks_y, blocks_x, 4, 4, 4).transpose(0, 2, 1, 3, 4)
+        output = get_output_buffer_view(output_buffer, img_width * img_height * 4)
+        output.reshape(img_height, img_width, 4)[:] = image.reshape(blocks_y * 4, blocks_x * 4, 4)[:img_height, :img_width]
+        return len(output)
+
+    def decode_psp_dxt_image_main(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
+        texture_data = bytearray(img_width * img_height * 4)
+        self.decode_psp_dxt_image_into(texture_data, image_data, img_width, img_height, image_format)
+        return texture_data
@@ -0,0 +1,283 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from reversebox.common.logger import get_logger
+from reversebox.image.image_formats import ImageFormats
+
+logger = get_logger(__name__)
+
+# fmt: off
+
+# Vectorized PVRTC I and PVRTC II decoder (2bpp and 4bpp), PVRTC I results are the same as in PowerVR SDK decompressor.
+#
+# Every 64-bit word stores modulation data (low 32 bits) and two low resolution colours A and B
+# (high 32 bits). Words are stored in Morton order (y is bit 0, x is bit 1, remaining bits
+# of the larger dimension are appended). Colour images A and B are upscaled bilinearly,
+# with block centres as sample points and wrapping on texture edges, and blended with
+# per pixel modulation values. All steps are done on whole image arrays.
+#
+# PVRTC I textures are padded to power of two dimensions (at least 16x8 for 2bpp and 8x8 for 4bpp).
+#
+# PVRTC II uses the same word layout, with these differences:
+# - words are stored in linear order and texture is padded only to whole words
+# - bit 31 is opacity flag for both colours, bit 15 is hard transition flag
+# - alpha of translucent colour B has lowest bit set
+# - hard transition flag turns off bilinear upscaling, pixels use colours of their own word
+# - 4bpp words with both hard transition and mode flags set use local palette mode, modulation values
+#   of pixels select one of colours A and B of the word (P) and its right (Q), lower (R) and lower right (S)
+#   neighbours, depending on pixel position (see "get_local_palette_entries")
+
+PVRTC_WORD_HEIGHT: int = 4
+PVRTC_4BPP_MODULATION_VALUES = np.array([0, 3, 5, 8], dtype=np.int16)
+PVRTC_PUNCH_THROUGH_MODULATION_VALUES = np.array([0, 4, 4, 8], dtype=np.int16)
+
+
+def get_local_palette_entries() -> np.ndarray:
+    """
+    Returns (4, 4, 4) array, local palette entry for every pixel position (y, x) and modulation value.
+    Entry is "2 * word + colour", words P, Q, R, S are 0-3, colours A and B are 0 and 1.
+    Modulation values 0 and 3 select colours A and B of the nearest word, value 1 selects colour A
+    of its horizontal neighbour and value 2 selects colour B of its vertical neighbour.
+    """
+    entries = np.zeros((4, 4, 4), dtype=np.int64)
+    for y in range(4):
+        for x in range(4):
+            nearest_word: int = int(x >= 2) + 2 * int(y >= 2)
+            entries[y, x] = (2 * nearest_word, 2 * (nearest_word ^ 1), 2 * (nearest_word ^ 2) + 1, 2 * nearest_word + 1)
+    return entries
+
+
+PVRTC2_LOCAL_PALETTE_ENTRIES: np.ndarray = get_local_palette_entries()
+
+
+def _get_next_power_of_two(value: int) -> int:
+    return 1 << max(value - 1, 0).bit_length()
+
+
+def get_pvrtc_word_counts(img_width: int, img_height: int, is_2bpp: bool) -> Tuple[int, int]:
+    word_width: int = 8 if is_2bpp else 4
+    words_x: int = max(_get_next_power_of_two((img_width + word_width - 1) // word_width), 2)
+    words_y: int = max(_get_next_power_of_two((img_height + PVRTC_WORD_HEIGHT - 1) // PVRTC_WORD_HEIGHT), 2)
+    return words_x, words_y
+
+
+def get_morton_word_indices(words_x: int, words_y: int) -> np.ndarray:
+    """
+    Returns (words_y, words_x) array with position of every word in Morton ordered data
+    """
+    y, x = np.mgrid[0:words_y, 0:words_x].astype(np.int64)
+    min_dimension: int = min(words_x, words_y)
+    indices = np.zeros_like(x)
+    shift_count: int = 0
+    while (1 << shift_count) < min_dimension:
+        indices |= ((y >> shift_count) & 1) << (2 * shift_count)
+        indices |= ((x >> shift_count) & 1) << (2 * shift_count + 1)
+        shift_count += 1
+    larger_dimension = x if words_x > words_y else y
+    return indices | ((larger_dimension >> shift_count) << (2 * shift_count))
+
+
+def get_pvrtc2_word_counts(img_width: int, img_height: int, is_2bpp: bool) -> Tuple[int, int]:
+    word_width: int = 8 if is_2bpp else 4
+    return (img_width + word_width - 1) // word_width, (img_height + PVRTC_WORD_HEIGHT - 1) // PVRTC_WORD_HEIGHT
+
+
+def get_pvrtc_colours(colour_data: np.ndarray, is_pvrtc2: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Colour data words --> colours A and B, (4, ...) arrays with 5-bit RGB and 4-bit alpha
+    """
+    c = colour_data.astype(np.int64)
+    opaque_a = (c & (0x80000000 if is_pvrtc2 else 0x8000)) != 0
+    colour_a = np.stack((
+        np.where(opaque_a, (c & 0x7C00) >> 10, ((c & 0xF00) >> 7) | ((c & 0xF00) >> 11)),
+        np.where(opaque_a, (c & 0x3E0) >> 5, ((c & 0xF0) >> 3) | ((c & 0xF0) >> 7)),
+        np.where(opaque_a, (c & 0x1E) | ((c & 0x1E) >> 4), ((c & 0xE) << 1) | ((c & 0xE) >> 2)),
+        np.where(opaque_a, 0xF, (c & 0x7000) >> 11),
+    )).astype(np.int16)
+
+    opaque_b = (c & 0x80000000) != 0
+    colour_b = np.stack((
+        np.where(opaque_b, (c & 0x7C000000) >> 26, ((c & 0xF000000) >> 23) | ((c & 0xF000000) >> 27)),
+        np.where(opaque_b, (c & 0x3E00000) >> 21, ((c & 0xF00000) >> 19) | ((c & 0xF00000) >> 23)),
+        np.where(opaque_b, (c & 0x1F0000) >> 16, ((c & 0xF0000) >> 15) | ((c & 0xF0000) >> 19)),
+        np.where(opaque_b, 0xF, ((c & 0x70000000) >> 27) | int(is_pvrtc2)),
+    )).astype(np.int16)
+    return colour_a, colour_b
+
+
+def get_8bit_colours(colours: np.ndarray) -> np.ndarray:
+    """
+    (4, ...) array with 5-bit RGB and 4-bit alpha --> 8-bit colours
+    """
+    colours = colours.copy()
+    colours[:3] = (colours[:3] << 3) | (colours[:3] >> 2)
+    colours[3] = (colours[3] << 4) | colours[3]
+    return colours
+
+
+class PvrtcNumpyDecoder:
+    """
+    Vectorized decoder for PVRTC I and PVRTC II compressed images
+    """
+
+    supported_formats: tuple = (
+        ImageFormats.PVRTCI_2bpp_RGB,
+        ImageFormats.PVRTCI_2bpp_RGBA,
+        ImageFormats.PVRTCI_4bpp_RGB,
+        ImageFormats.PVRTCI_4bpp_RGBA,
+        ImageFormats.PVRTCII_2bpp,
+        ImageFormats.PVRTCII_4bpp,
+    )
+
+    def upscale_colours(self, colours: np.ndarray, word_width: int) -> np.ndarray:
+        """
+        Bilinear upscale of (4, words_y, words_x) colour image to full resolution 8-bit colours
+        """
+        words_y, words_x = colours.shape[1:]
+        # position relative to centre of top left word (P) of 2x2 words used for every pixel
+        x = np.arange(words_x * word_width) - word_width // 2
+        y = np.arange(words_y * PVRTC_WORD_HEIGHT) - PVRTC_WORD_HEIGHT // 2
+        p_x, f_x = (x // word_width) % words_x, (x % word_width).astype(np.int16)
+        p_y, f_y = (y // PVRTC_WORD_HEIGHT) % words_y, (y % PVRTC_WORD_HEIGHT)[:, None].astype(np.int16)
+
+        # bilinear interpolation is separable, vertical pass is done on word columns first
+        columns = colours.take(p_y, axis=1) * (PVRTC_WORD_HEIGHT - f_y) + colours.take((p_y + 1) % words_y, axis=1) * f_y
+        total = columns.take(p_x, axis=2) * (word_width - f_x) + columns.take((p_x + 1) % words_x, axis=2) * f_x
+
+        # total is colour multiplied by 16 (4bpp) or 32 (2bpp)
+        shift: int = (word_width * PVRTC_WORD_HEIGHT).bit_length() - 1
+        total[:3] = (total[:3] >> (shift - 3)) + (total[:3] >> (shift + 2))
+        total[3] = (total[3] >> shift) + (total[3] >> (shift - 4))
+        return total
+
+    def expand_colours(self, colours: np.ndarray, word_width: int) -> np.ndarray:
+        """
+        Non-interpolated upscale of (4, words_y, words_x) colour image to full resolution 8-bit colours
+        """
+        return get_8bit_colours(colours).repeat(PVRTC_WORD_HEIGHT, axis=1).repeat(word_width, axis=2)
+
+    def get_local_palette_colours(self, modulation_data: np.ndarray, colour_a: np.ndarray, colour_b: np.ndarray) -> np.ndarray:
+        """
+        Returns full resolution 8-bit colours of 4bpp words decoded in local palette mode
+        """
+        words_y, words_x = modulation_data.shape
+        colour_a, colour_b = get_8bit_colours(colour_a), get_8bit_colours(colour_b)
+        # words Q, R and S wrap on texture edges
+        palette_words = [(0, 0), (0, -1), (-1, 0), (-1, -1)]
+        palette = np.stack([np.roll(colour, shift, axis=(1, 2)) for shift in palette_words for colour in (colour_a, colour_b)])
+
+        shifts = (2 * np.arange(16, dtype=np.uint32)).reshape(4, 4)
+        values = (modulation_data[:, None, :, None] >> shifts[None, :, None, :]) & 3
+        entries = PVRTC2_LOCAL_PALETTE_ENTRIES[np.arange(4)[None, :, None, None], np.arange(4)[None, None, None, :], values]
+        word_y, word_x = np.arange(words_y)[:, None, None, None], np.arange(words_x)[None, None, :, None]
+        colours = palette[entries, :, word_y, word_x]
+        return colours.reshape(words_y * PVRTC_WORD_HEIGHT, words_x * 4, 4).transpose(2, 0, 1)
+
+    def get_4bpp_modulation(self, modulation_data: np.ndarray, colour_data: np.ndarray, is_hard: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns full resolution modulation values (0-8) and punch-through alpha mask
+        """
+        words_y, words_x = modulation_data.shape
+        shifts = (2 * np.arange(16, dtype=np.uint32)).reshape(4, 4)
+        values = (modulation_data[:, None, :, None] >> shifts[None, :, None, :]) & 3
+        # words in local palette mode (hard transition flag) are decoded in "get_local_palette_colours"
+        is_punch_through = ((colour_data & 1) != 0)[:, None, :, None] & ~is_hard[:, None, :, None]
+        modulation = np.where(is_punch_through, PVRTC_PUNCH_THROUGH_MODULATION_VALUES[values], PVRTC_4BPP_MODULATION_VALUES[values])
+        punch_through_alpha = is_punch_through & (values == 2)
+        shape = (words_y * PVRTC_WORD_HEIGHT, words_x * 4)
+        return modulation.reshape(shape), np.broadcast_to(punch_through_alpha, values.shape).reshape(shape)
+
+    def get_2bpp_modulation(self, modulation_data: np.ndarray, colour_data: np.ndarray) -> np.ndarray:
+        """
+        Returns full resolution modulation values (0-8)
+        """
+        words_y, words_x = modulation_data.shape
+        modulation_data = modulation_data.astype(np.int64)
+        pixel_y, pixel_x = np.mgrid[0:PVRTC_WORD_HEIGHT, 0:8]
+
+        # direct mode, one bit per pixel
+        direct_values = ((modulation_data[:, None, :, None] >> (pixel_y * 8 + pixel_x)[None, :, None, :]) & 1).astype(np.int16) * 8
+
+        # interpolated modes, two bits for every second pixel (checkerboard)
+        # 1 - horizontal and vertical interpolation, 2 - horizontal only, 3 - vertical only
+        has_mode_bit = (modulation_data & 1) != 0
+        interpolation_mode = np.where(has_mode_bit, np.where(modulation_data & (1 << 20), 3, 2), 1)
+        stored_data = np.where(has_mode_bit, (modulation_data & ~(1 << 20)) | (((modulation_data >> 21) & 1) << 20), modulation_data)
+        stored_data = (stored_data & ~1) | ((stored_data >> 1) & 1)
+        stored_values = (stored_data[:, None, :, None] >> (2 * ((pixel_y * 8 + pixel_x) // 2))[None, :, None, :]) & 3
+        stored_values = PVRTC_4BPP_MODULATION_VALUES[stored_values]
+
+        is_interpolated = (colour_data & 1).astype(bool)[:, None, :, None]
+        shape = (words_y * PVRTC_WORD_HEIGHT, words_x * 8)
+        values = np.where(is_interpolated, stored_values, direct_values).reshape(shape)
+
+        # values of pixels which are not stored are averaged from neighbours (with wrapping)
+        left, right = np.roll(values, 1, axis=1), np.roll(values, -1, axis=1)
+        up, down = np.roll(values, 1, axis=0), np.roll(values, -1, axis=0)
+        interpolated_values = np.select(
+            [interpolation_mode[:, None, :, None] == 1, interpolation_mode[:, None, :, None] == 2],
+            [((up + down + left + right + 2) // 4).reshape(words_y, PVRTC_WORD_HEIGHT, words_x, 8),
+             ((left + right + 1) // 2).reshape(words_y, PVRTC_WORD_HEIGHT, words_x, 8)],
+            ((up + down + 1) // 2).reshape(words_y, PVRTC_WORD_HEIGHT, words_x, 8)
+        ).reshape(shape)
+        is_not_stored = np.broadcast_to(is_interpolated & (((pixel_x ^ pixel_y) & 1) == 1)[None, :, None, :],
+                                        (words_y, PVRTC_WORD_HEIGHT, words_x, 8)).reshape(shape)
+        return np.where(is_not_stored, interpolated_values, values)
+
+    def decode_pvrtc_words(self, words: np.ndarray, is_2bpp: bool, is_pvrtc2: bool = False) -> np.ndarray:
+        """
+        (words_y, words_x, 2) array of modulation and colour words --> (height, width, 4) RGBA array
+        """
+        word_width: int = 8 if is_2bpp else 4
+        modulation_data, colour_data = words[..., 0], words[..., 1]
+        colour_a, colour_b = get_pvrtc_colours(colour_data, is_pvrtc2)
+        upscaled_colour_a = self.upscale_colours(colour_a, word_width)
+        upscaled_colour_b = self.upscale_colours(colour_b, word_width)
+
+        # PVRTC I words have no hard transition flag
+        is_hard: np.ndarray = is_pvrtc2 & ((colour_data & 0x8000) != 0)
+        if is_pvrtc2:
+            is_hard_pixel = is_hard.repeat(PVRTC_WORD_HEIGHT, axis=0).repeat(word_width, axis=1)
+            upscaled_colour_a = np.where(is_hard_pixel, self.expand_colours(colour_a, word_width), upscaled_colour_a)
+            upscaled_colour_b = np.where(is_hard_pixel, self.expand_colours(colour_b, word_width), upscaled_colour_b)
+
+        punch_through_alpha: Optional[np.ndarray] = None
+        if is_2bpp:
+            modulation = self.get_2bpp_modulation(modulation_data, colour_data)
+        else:
+            modulation, punch_through_alpha = self.get_4bpp_modulation(modulation_data, colour_data, is_hard)
+
+        image = (upscaled_colour_a * (8 - modulation) + upscaled_colour_b * modulation) >> 3
+        if punch_through_alpha is not None:
+            image[3][punch_through_alpha] = 0
+
+        is_local_palette = is_hard & ((colour_data & 1) != 0)
+        if not is_2bpp and np.any(is_local_palette):
+            is_local_palette_pixel = is_local_palette.repeat(PVRTC_WORD_HEIGHT, axis=0).repeat(word_width, axis=1)
+            image = np.where(is_local_palette_pixel, self.get_local_palette_colours(modulation_data, colour_a, colour_b), image)
+        return image.astype(np.uint8).transpose(1, 2, 0)
+
+    def decode_pvrtc_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
+        is_2bpp: bool = image_format in (ImageFormats.PVRTCI_2bpp_RGB, ImageFormats.PVRTCI_2bpp_RGBA, ImageFormats.PVRTCII_2bpp)
+        is_pvrtc2: bool = image_format in (ImageFormats.PVRTCII_2bpp, ImageFormats.PVRTCII_4bpp)
+        if is_pvrtc2:
+            words_x, words_y = get_pvrtc2_word_counts(img_width, img_height, is_2bpp)
+        else:
+            words_x, words_y = get_pvrtc_word_counts(img_width, img_height, is_2bpp)
+        expected_size: int = words_x * words_y * 8
+        if len(image_data) < expected_size:
+            raise ValueError(f"Not enough image data! Expected {expected_size} bytes, got {len(image_data)} bytes.")
+
+        data_words = np.frombuffer(image_data, dtype="<u4", count=expected_size // 4).reshape(-1, 2)
+        if is_pvrtc2:
+            words = data_words.reshape(words_y, words_x, 2)
+        else:
+            words = data_words[get_morton_word_indices(words_x, words_y)]
+        image = self.decode_pvrtc_words(words, is_2bpp, is_pvrtc2)[:img_height, :img_width]
+        return bytearray(image.tobytes())
@@ -1,17 +1,25 @@
 """
-Copyright © 2025  Bartłomiej Duda
+Copyright © 2025-2026  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
 import ctypes
 import faulthandler
 import os
+import platform
 import tempfile
 from ctypes import POINTER, c_int, c_uint, c_uint8, c_void_p, cast, create_string_buffer
+from typing import Optional
+
+import numpy as np
 
 from reversebox.common.common import get_dll_path
 from reversebox.common.constants import DLL_LOG_FILE_NAME
 from reversebox.common.logger import get_logger
+from reversebox.image.common import copy_to_output_buffer, get_output_buffer_view
+from reversebox.image.decoders.astc_numpy_decoder import AstcNumpyDecoder
+from reversebox.image.decoders.etc_numpy_decoder import EtcNumpyDecoder
+from reversebox.image.decoders.pvrtc_numpy_decoder import PvrtcNumpyDecoder
 from reversebox.image.image_formats import ImageFormats
 
 logger = get_logger(__name__)
@@ -85,6 +93,23 @@ pvrtexlib_format_mapping: dict[ImageFormats, int] = {
     }
 
 
+# formats which can be decoded without PVRTexLib --> native decode function
+native_decoders: dict = {
+    **{image_format: EtcNumpyDecoder().decode_etc_image for image_format in EtcNumpyDecoder.supported_formats},
+    **{image_format: AstcNumpyDecoder().decode_astc_image for image_format in AstcNumpyDecoder.supported_formats},
+    **{image_format: PvrtcNumpyDecoder().decode_pvrtc_image for image_format in PvrtcNumpyDecoder.supported_formats},
+}
+
+
+def get_pvrtexlib_decoder_backend_name(image_format: ImageFormats) -> str:
+    """
+    Native decoders are preferred on non-Windows hosts, where PVRTexLibWrapper.dll can't be loaded
+    """
+    if image_format in native_decoders and platform.system() != "Windows":
+        return "native"
+    return "pvrtexlib"
+
+
 class PvrTexlibImageDecoderEncoder:
     """
     Decoder/Encoder for any compressed images like ASTC, ETC1 etc.
@@ -104,9 +129,11 @@ class PvrTexlibImageDecoderEncoder:
         except KeyError:
             raise Exception(f"Not supported image format! Image_format: {image_format}")
 
-    def _convert_pvrtexlib_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats, encode_flag: bool) -> bytes:
+    def _convert_pvrtexlib_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats, encode_flag: bool,
+                                 output: Optional[np.ndarray] = None) -> bytes:
         """
-        Function used for decoding/encoding compressed PvrTexlib formats
+        Function used for decoding/encoding compressed PvrTexlib formats.
+        If output uint8 array is passed, converted data is copied straight from DLL memory to that array.
         """
         dll_path: str = get_dll_path("PVRTexLibWrapper.dll")
 
@@ -146,11 +173,47 @@ class PvrTexlibImageDecoderEncoder:
         if output_size == 0:
             raise Exception("Output texture is empty!")
 
-        converted_data = bytearray((c_uint8 * output_size).from_address(ctypes.addressof(c_output_buffer)))
+        dll_output_data = (c_uint8 * output_size).from_address(ctypes.addressof(c_output_buffer))
+        if output is not None:
+            output[:] = np.ctypeslib.as_array(dll_output_data)[:len(output)]
+            return output
+        converted_data = bytearray(dll_output_data)
         return converted_data
 
-    def decode_compressed_image_main(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
-        return self._convert_pvrtexlib_image(image_data, img_width, img_height, image_format, False)
+    def decode_compressed_image_main(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                                     backend_name: Optional[str] = None, workers: int = 1) -> bytes:
+        """
+        "workers" is used only by native ASTC decoder (unique blocks are split between worker processes)
+        """
+        if backend_name is None:
+            backend_name = get_pvrtexlib_decoder_backend_name(image_format)
+
+        if backend_name == "native":
+            if image_format not in native_decoders:
+                raise Exception(f"No native decoder for image format {image_format}!")
+            if workers > 1 and image_format in AstcNumpyDecoder.supported_formats:
+                return AstcNumpyDecoder(workers).decode_astc_image(image_data, img_width, img_height, image_format)
+            return native_decoders[image_format](image_data, img_width, img_height, image_format)
+        elif backend_name == "pvrtexlib":
+            return self._convert_pvrtexlib_image(image_data, img_width, img_height, image_format, False)
+        else:
+            raise Exception(f"Unknown decoder backend! Backend name: {backend_name}")
+
+    def decode_compressed_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                                     backend_name: Optional[str] = None, workers: int = 1) -> int:
+        """
+        Decodes image into caller-supplied buffer (see "get_output_buffer_view"),
+        returns number of written bytes (img_width * img_height * 4)
+        """
+        if backend_name is None:
+            backend_name = get_pvrtexlib_decoder_backend_name(image_format)
+
+        if backend_name == "pvrtexlib":
+            output = get_output_buffer_view(output_buffer, img_width * img_height * 4)
+            self._convert_pvrtexlib_image(image_data, img_width, img_height, image_format, False, output)
+            return len(output)
+        return copy_to_output_buffer(output_buffer, self.decode_compressed_image_main(image_data, img_width, img_height, image_format,
+                                                                                      backend_name, workers))
 
     def encode_compressed_image_main(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
         return self._convert_pvrtexlib_image(image_data, img_width, img_height, image_format, True)
@@ -0,0 +1,165 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from reversebox.common.logger import get_logger
+from reversebox.image.common import get_block_data_size
+from reversebox.image.decoders.bcn_decoder_backends import assemble_bc_blocks
+from reversebox.image.decoders.compressed_decoder_encoder import (
+    CompressedImageDecoderEncoder,
+    DirectXTexBCnDecoderBackend,
+)
+from reversebox.image.decoders.etc_numpy_decoder import EtcNumpyDecoder
+from reversebox.image.decoders.generic_numpy_decoder import GenericNumpyDecoder
+from reversebox.image.decoders.n64_decoder_encoder import N64ImageDecoderEncoder
+from reversebox.image.decoders.psp_dxt_decoder import PSPDXTDecoder
+from reversebox.image.decoders.pvrtexlib_decoder_encoder import (
+    PvrTexlibImageDecoderEncoder,
+)
+from reversebox.image.image_formats import ImageFormats
+from reversebox.image.swizzling.swizzle_gamecube import unswizzle_gamecube
+from reversebox.image.swizzling.swizzle_offsets import (
+    GAMECUBE_TILE_SIZES,
+    get_linear_offsets,
+    get_morton_offsets,
+    get_ps4_offsets,
+    get_ps5_offsets,
+    get_switch_offsets,
+    get_x360_offsets,
+)
+
+logger = get_logger(__name__)
+
+# fmt: off
+
+# Region of interest decoder for block compressed and swizzled images.
+# Image is split into units (compressed blocks, CMPR tiles, GameCube tiles or single pixels),
+# only units covering the region are read (swizzled offsets are calculated with closed-form
+# address functions from "swizzle_offsets.py"), decoded as small linear image and cropped.
+#
+# Swizzle types (the same parameters as in the swizzlers, unit grid is image size in units):
+# None       --> no swizzling (PSP DXT rows are padded to pitch, CMPR tiles are in native order)
+# "morton"   --> "swizzle_morton.py"
+# "ps4"      --> "swizzle_morton_ps4.py"
+# "ps5"      --> "swizzle_morton_ps5.py"
+# "switch"   --> "swizzle_switch.py" (bytes_per_block = unit size, block_height = "switch_block_height")
+# "x360"     --> "swizzle_x360.py" (texel_byte_pitch = unit size)
+# "gamecube" --> "swizzle_gamecube.py" (linear formats only)
+
+REGION_SWIZZLE_TYPES: tuple = (None, "morton", "ps4", "ps5", "switch", "x360", "gamecube")
+
+
+class RegionDecoder:
+
+    def __init__(self):
+        pass
+
+    bcn_formats: tuple = DirectXTexBCnDecoderBackend.supported_formats
+    etc_formats: tuple = EtcNumpyDecoder.supported_formats
+    psp_dxt_formats: tuple = (ImageFormats.PSP_DXT1, ImageFormats.PSP_DXT3, ImageFormats.PSP_DXT5)
+
+    def _get_unit_params(self, image_format: ImageFormats, swizzle_type: Optional[str]) -> tuple:
+        """
+        Returns (unit_width, unit_height, unit_data_size) for image format
+        """
+        if image_format in self.bcn_formats or image_format in self.etc_formats or image_format in self.psp_dxt_formats:
+            unit_params: tuple = (4, 4, get_block_data_size(image_format))
+        elif image_format == ImageFormats.N64_CMPR:
+            unit_params: tuple = (8, 8, 32)  # macro-tile of four 4x4 blocks
+        elif image_format in GenericNumpyDecoder.generic_data_formats:
+            _, bits_per_pixel = GenericNumpyDecoder.generic_data_formats[image_format]
+            if swizzle_type == "gamecube":
+                if bits_per_pixel not in GAMECUBE_TILE_SIZES:
+                    raise Exception(f"Bpp {bits_per_pixel} not supported by GameCube swizzle!")
+                return GAMECUBE_TILE_SIZES[bits_per_pixel]
+            if bits_per_pixel < 8:
+                raise Exception(f"Bpp {bits_per_pixel} not supported by region decoder!")
+            unit_params: tuple = (1, 1, bits_per_pixel // 8)
+        else:
+            raise Exception(f"Image format not supported by region decoder! Image_format: {image_format}")
+
+        if swizzle_type == "gamecube":
+            raise Exception(f"GameCube swizzle is supported only for linear formats! Image_format: {image_format}")
+        return unit_params
+
+    def _get_unit_offsets(self, unit_x: np.ndarray, unit_y: np.ndarray, img_width: int, img_height: int, image_format: ImageFormats,
+                          unit_width: int, unit_height: int, unit_data_size: int, swizzle_type: Optional[str], switch_block_height: int) -> np.ndarray:
+        grid_width: int = img_width // unit_width  # the same unit grid as in swizzlers
+        grid_height: int = img_height // unit_height
+        if swizzle_type is None or swizzle_type == "gamecube":
+            row_pitch: int = 0
+            if image_format in self.psp_dxt_formats:
+                row_pitch = PSPDXTDecoder().get_row_pitch(img_width, image_format) * 4
+            return get_linear_offsets(unit_x, unit_y, (img_width + unit_width - 1) // unit_width, unit_data_size, row_pitch)
+        elif swizzle_type == "morton":
+            return get_morton_offsets(unit_x, unit_y, grid_width, grid_height, unit_data_size)
+        elif swizzle_type == "ps4":
+            return get_ps4_offsets(unit_x, unit_y, grid_width, grid_height, unit_data_size)
+        elif swizzle_type == "ps5":
+            return get_ps5_offsets(unit_x, unit_y, grid_width, grid_height, unit_data_size, unit_width == 1 and unit_height == 1)
+        elif swizzle_type == "switch":
+            return get_switch_offsets(unit_x, unit_y, (img_width + unit_width - 1) // unit_width, unit_data_size, switch_block_height)
+        elif swizzle_type == "x360":
+            return get_x360_offsets(unit_x, unit_y, grid_width, unit_data_size)
+        raise Exception(f"Swizzle type not supported by region decoder! Swizzle_type: {swizzle_type}")
+
+    def _decode_units(self, unit_data: np.ndarray, units_x: int, units_y: int, image_format: ImageFormats, unit_width: int,
+                      unit_height: int, swizzle_type: Optional[str], image_endianess: str) -> np.ndarray:
+        """
+        (units_y, units_x, unit_data_size) array --> (units_y * unit_height, units_x * unit_width, 4) RGBA image
+        """
+        sub_width: int = units_x * unit_width
+        sub_height: int = units_y * unit_height
+        sub_data: bytes = unit_data.tobytes()
+
+        if image_format in self.bcn_formats:
+            decoded_data = CompressedImageDecoderEncoder().decode_compressed_image_main(sub_data, sub_width, sub_height, image_format)
+        elif image_format in self.etc_formats:
+            decoded_data = PvrTexlibImageDecoderEncoder().decode_compressed_image_main(sub_data, sub_width, sub_height, image_format)
+        elif image_format in self.psp_dxt_formats:
+            block_pixels = PSPDXTDecoder().decode_psp_dxt_blocks(unit_data.reshape(units_x * units_y, -1), image_format)
+            return assemble_bc_blocks(block_pixels.astype(np.uint8), sub_width, sub_height)
+        elif image_format == ImageFormats.N64_CMPR:
+            decoded_data = N64ImageDecoderEncoder().decode_n64_image_main(sub_data, sub_width, sub_height, image_format)
+        else:
+            if swizzle_type == "gamecube":
+                _, bits_per_pixel = GenericNumpyDecoder.generic_data_formats[image_format]
+                sub_data = unswizzle_gamecube(sub_data, sub_width, sub_height, bits_per_pixel)
+            decoded_data = GenericNumpyDecoder().decode_generic_image_main(sub_data, sub_width, sub_height, image_format, image_endianess)
+        return np.frombuffer(decoded_data, dtype=np.uint8, count=sub_width * sub_height * 4).reshape(sub_height, sub_width, 4)
+
+    def decode_region_main(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                           region_x: int, region_y: int, region_width: int, region_height: int,
+                           swizzle_type: Optional[str] = None, image_endianess: str = "little", switch_block_height: int = 8) -> bytes:
+        if swizzle_type not in REGION_SWIZZLE_TYPES:
+            raise Exception(f"Swizzle type not supported by region decoder! Swizzle_type: {swizzle_type}")
+        if region_x < 0 or region_y < 0 or region_width <= 0 or region_height <= 0 \
+                or region_x + region_width > img_width or region_y + region_height > img_height:
+            raise ValueError(f"Wrong region! Region: ({region_x}, {region_y}, {region_width}, {region_height}), image size: {img_width}x{img_height}")
+        unit_width, unit_height, unit_data_size = self._get_unit_params(image_format, swizzle_type)
+
+        # units covering the region
+        first_unit_x: int = region_x // unit_width
+        first_unit_y: int = region_y // unit_height
+        units_x: int = (region_x + region_width + unit_width - 1) // unit_width - first_unit_x
+        units_y: int = (region_y + region_height + unit_height - 1) // unit_height - first_unit_y
+        unit_x = np.arange(first_unit_x, first_unit_x + units_x, dtype=np.int64)[None, :]
+        unit_y = np.arange(first_unit_y, first_unit_y + units_y, dtype=np.int64)[:, None]
+        offsets = self._get_unit_offsets(unit_x, unit_y, img_width, img_height, image_format, unit_width, unit_height,
+                                         unit_data_size, swizzle_type, switch_block_height)
+
+        byte_offsets = offsets[:, :, None] + np.arange(unit_data_size)
+        data = np.frombuffer(image_data, dtype=np.uint8)
+        required_size: int = int(byte_offsets.max()) + 1
+        if required_size > len(data):
+            raise ValueError(f"Not enough image data! Expected at least {required_size} bytes, got {len(data)} bytes.")
+
+        image = self._decode_units(data[byte_offsets], units_x, units_y, image_format, unit_width, unit_height, swizzle_type, image_endianess)
+        crop_x: int = region_x - first_unit_x * unit_width
+        crop_y: int = region_y - first_unit_y * unit_height
+        return image[crop_y:crop_y + region_height, crop_x:crop_x + region_width].tobytes()
@@ -0,0 +1,102 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from reversebox.common.logger import get_logger
+from reversebox.image.common import get_output_buffer_view
+from reversebox.image.decoders.yuv_decoder import (
+    YUV_CHROMA_SUBSAMPLING,
+    YUV_PACKED_LAYOUTS,
+    get_yuv_chroma_size,
+    get_yuv_colour_matrix,
+    get_yuv_image_data_size,
+)
+from reversebox.image.image_formats import ImageFormats
+
+logger = get_logger(__name__)
+
+# fmt: off
+
+# RGBA8888 --> YUV encoder, reverse of "yuv_decoder.py".
+# Inverted colour matrix is applied to all pixels at once, chroma planes
+# are averaged over every (sx, sy) pixel block. Partial blocks on the right
+# and bottom edges are filled by repeating edge pixels.
+
+
+class YUVEncoder:
+
+    def __init__(self):
+        pass
+
+    def _get_yuv_values(self, pixels: np.ndarray, image_format: ImageFormats, colour_matrix: Optional[str]) -> tuple:
+        """
+        (padded_height, padded_width, 4) RGBA pixels --> full resolution Y plane and subsampled U, V planes (uint8)
+        """
+        matrix, y_offset = get_yuv_colour_matrix(image_format, colour_matrix)
+        yuv = pixels[:, :, :3].astype(np.float64) @ np.linalg.inv(matrix).T
+        yuv += (y_offset, 128.0, 128.0)
+
+        subsampling_x, subsampling_y = YUV_CHROMA_SUBSAMPLING[image_format]
+        padded_height, padded_width = pixels.shape[:2]
+        chroma = yuv[:, :, 1:].reshape(padded_height // subsampling_y, subsampling_y, padded_width // subsampling_x, subsampling_x, 2)
+        chroma = chroma.mean(axis=(1, 3))
+        y_plane = np.clip(np.rint(yuv[:, :, 0]), 0, 255).astype(np.uint8)
+        chroma = np.clip(np.rint(chroma), 0, 255).astype(np.uint8)
+        return y_plane, chroma[:, :, 0], chroma[:, :, 1]
+
+    def encode_yuv_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                              colour_matrix: Optional[str] = None) -> int:
+        """
+        Encodes image into caller-supplied buffer (see "get_output_buffer_view"),
+        returns number of written bytes
+        """
+        if image_format not in YUV_CHROMA_SUBSAMPLING:
+            raise Exception(f"Image format not supported by yuv encoder! Image_format: {image_format}")
+        pixel_count: int = img_width * img_height
+        if len(image_data) < pixel_count * 4:
+            raise ValueError(f"Not enough image data! Expected {pixel_count * 4} bytes, got {len(image_data)} bytes.")
+
+        subsampling_x, subsampling_y = YUV_CHROMA_SUBSAMPLING[image_format]
+        chroma_width, chroma_height = get_yuv_chroma_size(image_format, img_width, img_height)
+        pixels = np.frombuffer(image_data, dtype=np.uint8, count=pixel_count * 4).reshape(img_height, img_width, 4)
+        pixels = np.pad(pixels, ((0, chroma_height * subsampling_y - img_height), (0, chroma_width * subsampling_x - img_width), (0, 0)), mode="edge")
+        y_plane, u_plane, v_plane = self._get_yuv_values(pixels, image_format, colour_matrix)
+        a_plane = pixels[:, :, 3]
+        output = get_output_buffer_view(output_buffer, get_yuv_image_data_size(image_format, img_width, img_height))
+
+        if image_format in YUV_PACKED_LAYOUTS:
+            y_positions, u_position, v_position, a_position = YUV_PACKED_LAYOUTS[image_format]
+            groups = output.reshape(img_height, chroma_width, len(y_positions) + 2 + (a_position is not None))
+            groups[:, :, y_positions] = y_plane[:img_height].reshape(img_height, chroma_width, len(y_positions))
+            groups[:, :, u_position] = u_plane
+            groups[:, :, v_position] = v_plane
+            if a_position is not None:
+                groups[:, :, a_position] = a_plane[:img_height]
+            return len(output)
+
+        if image_format in (ImageFormats.YUV420_NV12, ImageFormats.YUV420_NV21):
+            uv_planes = (u_plane, v_plane) if image_format == ImageFormats.YUV420_NV12 else (v_plane, u_plane)
+            planes = [y_plane[:img_height, :img_width], np.stack(uv_planes, axis=-1)]
+        else:
+            planes = [y_plane[:img_height, :img_width], u_plane, v_plane]
+            if image_format == ImageFormats.YUVA420P:
+                planes.append(a_plane[:img_height, :img_width])
+
+        plane_offset: int = 0
+        for plane in planes:
+            output[plane_offset:plane_offset + plane.size].reshape(plane.shape)[:] = plane
+            plane_offset += plane.size
+        return len(output)
+
+    def encode_yuv_image_main(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                              colour_matrix: Optional[str] = None) -> bytes:
+        if image_format not in YUV_CHROMA_SUBSAMPLING:
+            raise Exception(f"Image format not supported by yuv encoder! Image_format: {image_format}")
+        texture_data = bytearray(get_yuv_image_data_size(image_format, img_width, img_height))
+        self.encode_yuv_image_into(texture_data, image_data, img_width, img_height, image_format, colour_matrix)
+        return texture_data
@@ -0,0 +1,100 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+
+from reversebox.common.logger import get_logger
+from reversebox.image.decoders.yuv_decoder import YUVDecoder, get_yuv_image_data_size
+from reversebox.image.image_formats import ImageFormats
+
+logger = get_logger(__name__)
+
+# fmt: off
+
+# Frame iterator for raw YUV streams (FMV dumps with frames stored back to back).
+# Files are memory mapped and every frame is decoded straight from the mapping into
+# one of the output buffers (ring buffer), so no data is copied or allocated per frame.
+#
+# Yielded arrays are reused: frame N is overwritten when frame N + len(output_buffers)
+# is decoded, copy it if it has to be kept. With "workers" > 1 frames are decoded
+# out of order by a thread pool (NumPy releases GIL for array operations) and yielded in order.
+
+
+@contextmanager
+def _open_frame_source(source):
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as frame_file, mmap.mmap(frame_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_data:
+            yield mapped_data
+    elif hasattr(source, "fileno"):
+        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped_data:
+            yield mapped_data
+    else:
+        yield source
+
+
+def get_yuv_frame_count(data_size: int, img_width: int, img_height: int, image_format: ImageFormats,
+                        frame_stride: Optional[int] = None, frame_offset: int = 0) -> int:
+    frame_size: int = get_yuv_image_data_size(image_format, img_width, img_height)
+    frame_stride = frame_size if frame_stride is None else frame_stride
+    if frame_stride < frame_size:
+        raise ValueError(f"Frame stride smaller than frame size! Stride: {frame_stride}, frame size: {frame_size}")
+    if data_size - frame_offset < frame_size:
+        return 0
+    return (data_size - frame_offset - frame_size) // frame_stride + 1
+
+
+def decode_yuv_frames(source, img_width: int, img_height: int, image_format: ImageFormats,
+                      frame_stride: Optional[int] = None, frame_offset: int = 0, colour_matrix: Optional[str] = None,
+                      fixed_point: bool = False, output_buffers: Optional[Sequence[np.ndarray]] = None,
+                      workers: int = 1) -> Iterator[np.ndarray]:
+    """
+    Yields decoded frames as (height, width, 4) RGBA arrays.
+    Source can be file path, opened binary file, mmap or bytes-like object.
+    """
+    if workers < 1:
+        raise ValueError(f"Wrong number of workers! Workers: {workers}")
+    required_buffers: int = workers + 1 if workers > 1 else 1
+    if output_buffers is None:
+        output_buffers = [np.empty((img_height, img_width, 4), dtype=np.uint8) for _ in range(required_buffers)]
+    elif len(output_buffers) < required_buffers:
+        raise ValueError(f"Not enough output buffers! Expected {required_buffers}, got {len(output_buffers)}.")
+
+    frame_size: int = get_yuv_image_data_size(image_format, img_width, img_height)
+    frame_stride = frame_size if frame_stride is None else frame_stride
+    decoder = YUVDecoder()
+
+    with _open_frame_source(source) as frame_data:
+        frame_count: int = get_yuv_frame_count(len(frame_data), img_width, img_height, image_format, frame_stride, frame_offset)
+
+        def _decode_frame(frame_number: int) -> np.ndarray:
+            frame_start: int = frame_offset + frame_number * frame_stride
+            output = output_buffers[frame_number % len(output_buffers)]
+            with memoryview(frame_data) as data_view, data_view[frame_start:frame_start + frame_size] as frame_view:
+                decoder.decode_yuv_image_into(output, frame_view, img_width, img_height, image_format, colour_matrix, fixed_point)
+            return output
+
+        if workers == 1:
+            for frame_number in range(frame_count):
+                yield _decode_frame(frame_number)
+            return
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending_frames = [executor.submit(_decode_frame, frame_number) for frame_number in range(min(workers, frame_count))]
+            try:
+                for frame_number in range(frame_count):
+                    output = pending_frames.pop(0).result()
+                    # buffer of the next submitted frame is not used by any pending or yielded frame
+                    if frame_number + workers < frame_count:
+                        pending_frames.append(executor.submit(_decode_frame, frame_number + workers))
+                    yield output
+            finally:
+                for pending_frame in pending_frames:
+                    pending_frame.cancel()
@@ -4,23 +4,34 @@ License: GPL-3.0 License
 """
 
 import struct
-from typing import List
+from typing import Iterator, List, Optional, Sequence
+
+import numpy as np
 
 from reversebox.common.logger import get_logger
-from reversebox.image.common import convert_bpp_to_bytes_per_pixel
+from reversebox.image.common import (
+    convert_bpp_to_bytes_per_pixel,
+    copy_to_output_buffer,
+    get_output_buffer_view,
+)
 from reversebox.image.decoders.bumpmap_decoder import BumpmapDecoder
 from reversebox.image.decoders.compressed_decoder_encoder import (
     CompressedImageDecoderEncoder,
 )
+from reversebox.image.decoders.generic_numpy_decoder import GenericNumpyDecoder
 from reversebox.image.decoders.gst_decoder_encoder import GSTImageDecoderEncoder
+from reversebox.image.decoders.indexed_numpy_decoder import IndexedNumpyDecoder
 from reversebox.image.decoders.n64_decoder_encoder import N64ImageDecoderEncoder
 from reversebox.image.decoders.psp_dxt_decoder import PSPDXTDecoder
 from reversebox.image.decoders.pvrtexlib_decoder_encoder import (
     PvrTexlibImageDecoderEncoder,
 )
+from reversebox.image.decoders.region_decoder import RegionDecoder
 from reversebox.image.decoders.yuv_decoder import YUVDecoder
+from reversebox.image.decoders.yuv_frame_decoder import decode_yuv_frames
 from reversebox.image.image_formats import ImageFormats
 from reversebox.image.pillow_wrapper import PillowWrapper
+from reversebox.image.pixel_layout import compile_pixel_layout
 from reversebox.io_files.bytes_handler import BytesHandler
 from reversebox.io_files.bytes_helper_functions import (
     get_uint8,
@@ -1022,25 +1033,44 @@ class ImageDecoder:
         return texture_data
 
     def decode_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats, image_endianess: str = "little") -> bytes:
+        if image_format in GenericNumpyDecoder.generic_data_formats:
+            return GenericNumpyDecoder().decode_generic_image_main(image_data, img_width, img_height, image_format, image_endianess)
         return self._decode_generic(image_data, img_width, img_height, self.generic_data_formats[image_format], image_endianess)
 
+    # decode image described by pixel layout, e.g. "A1R5G5B5" (see "pixel_layout.py" for more details)
+    def decode_image_with_layout(self, image_data: bytes, img_width: int, img_height: int, pixel_layout: str, image_endianess: str = "little",
+                                 expansion: str = "replicate", alpha_mode: str = "normal", transparent_value: Optional[int] = None) -> bytes:
+        compiled_layout = compile_pixel_layout(pixel_layout, expansion, alpha_mode, transparent_value)
+        return compiled_layout.decode_image(image_data, img_width, img_height, image_endianess)
+
     def decode_indexed_image(self, image_data: bytes, palette_data: bytes, img_width: int, img_height: int, image_format: ImageFormats, palette_format: ImageFormats, image_endianess: str = "little", palette_endianess: str = "little", scale_value: int = 1) -> bytes:
-        return self._decode_indexed(image_data, palette_data, img_width, img_height, image_format, palette_format, image_endianess, palette_endianess, scale_value)
+        return IndexedNumpyDecoder().decode_indexed_image_main(image_data, palette_data, img_width, img_height, image_format, palette_format, image_endianess, palette_endianess, scale_value)
 
-    def decode_compressed_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
-        return CompressedImageDecoderEncoder().decode_compressed_image_main(image_data, img_width, img_height, image_format)
+    def decode_compressed_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                                backend_name: Optional[str] = None) -> bytes:
+        return CompressedImageDecoderEncoder().decode_compressed_image_main(image_data, img_width, img_height, image_format, backend_name)
 
-    def decode_pvrtexlib_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
-        return PvrTexlibImageDecoderEncoder().decode_compressed_image_main(image_data, img_width, img_height, image_format)
+    def decode_pvrtexlib_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                               backend_name: Optional[str] = None, workers: int = 1) -> bytes:
+        return PvrTexlibImageDecoderEncoder().decode_compressed_image_main(image_data, img_width, img_height, image_format,
+                                                                           backend_name, workers)
 
     def decode_gst_image(self, image_data: bytes, palette_data: bytes, img_width: int, img_height: int, image_format: ImageFormats, convert_format: ImageFormats, convert_pal_format: ImageFormats, is_swizzled: bool = True) -> bytes:
         gst_decoder = GSTImageDecoderEncoder()
         decoded_gst_data: bytes = gst_decoder.decode_gst_image_main(image_data, img_width, img_height, image_format, is_swizzled)
         return self.decode_indexed_image(decoded_gst_data, palette_data, img_width, img_height, convert_format, convert_pal_format)
 
-    def decode_yuv_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
+    def decode_yuv_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                         colour_matrix: Optional[str] = None, fixed_point: bool = False) -> bytes:
         yuv_decoder = YUVDecoder()
-        return yuv_decoder.decode_yuv_image_main(image_data, img_width, img_height, image_format)
+        return yuv_decoder.decode_yuv_image_main(image_data, img_width, img_height, image_format, colour_matrix, fixed_point)
+
+    def decode_yuv_frames(self, source, img_width: int, img_height: int, image_format: ImageFormats,
+                          frame_stride: Optional[int] = None, frame_offset: int = 0, colour_matrix: Optional[str] = None,
+                          fixed_point: bool = False, output_buffers: Optional[Sequence[np.ndarray]] = None,
+                          workers: int = 1) -> Iterator[np.ndarray]:
+        return decode_yuv_frames(source, img_width, img_height, image_format, frame_stride, frame_offset,
+                                 colour_matrix, fixed_point, output_buffers, workers)
 
     def decode_bumpmap_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
         bumpmap_decoder = BumpmapDecoder()
@@ -1052,3 +1082,69 @@ class ImageDecoder:
 
     def decode_psp_dxt_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
         return PSPDXTDecoder().decode_psp_dxt_image_main(image_data, img_width, img_height, image_format)
+
+    def decode_region(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                      region_x: int, region_y: int, region_width: int, region_height: int,
+                      swizzle_type: Optional[str] = None, image_endianess: str = "little", switch_block_height: int = 8) -> bytes:
+        # decodes only "region_width" x "region_height" part of the image (see "region_decoder.py")
+        return RegionDecoder().decode_region_main(image_data, img_width, img_height, image_format, region_x, region_y, region_width,
+                                                  region_height, swizzle_type, image_endianess, switch_block_height)
+
+    # "*_into" variants below decode image into caller-supplied output buffer and return number of written bytes.
+    # Output buffer can be bytearray, writable memoryview (e.g. slice of bigger atlas), writable mmap,
+    # NumPy array or multiprocessing.shared_memory.SharedMemory block (see "get_output_buffer_view").
+    # Input data can be any bytes-like object, including read-only memoryview or mmap (it's not copied).
+    # NumPy decoders write straight to the output buffer, remaining decoders copy their result to it.
+
+    def decode_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                          image_endianess: str = "little") -> int:
+        if image_format in GenericNumpyDecoder.generic_data_formats:
+            return GenericNumpyDecoder().decode_generic_image_into(output_buffer, image_data, img_width, img_height, image_format, image_endianess)
+        decoded_image_data: bytes = self.decode_image(image_data, img_width, img_height, image_format, image_endianess)
+        return copy_to_output_buffer(output_buffer, decoded_image_data[:img_width * img_height * 4])
+
+    def decode_image_with_layout_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, pixel_layout: str,
+                                      image_endianess: str = "little", expansion: str = "replicate", alpha_mode: str = "normal",
+                                      transparent_value: Optional[int] = None) -> int:
+        compiled_layout = compile_pixel_layout(pixel_layout, expansion, alpha_mode, transparent_value)
+        output = get_output_buffer_view(output_buffer, img_width * img_height * 4)
+        compiled_layout.decode_image_into(output.reshape(-1, 4), image_data, img_width, img_height, image_endianess)
+        return len(output)
+
+    def decode_indexed_image_into(self, output_buffer, image_data: bytes, palette_data: bytes, img_width: int, img_height: int,
+                                  image_format: ImageFormats, palette_format: ImageFormats, image_endianess: str = "little",
+                                  palette_endianess: str = "little", scale_value: int = 1) -> int:
+        return IndexedNumpyDecoder().decode_indexed_image_into(output_buffer, image_data, palette_data, img_width, img_height, image_format,
+                                                               palette_format, image_endianess, palette_endianess, scale_value)
+
+    def decode_compressed_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                                     backend_name: Optional[str] = None) -> int:
+        return CompressedImageDecoderEncoder().decode_compressed_image_into(output_buffer, image_data, img_width, img_height, image_format, backend_name)
+
+    def decode_pvrtexlib_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                                    backend_name: Optional[str] = None, workers: int = 1) -> int:
+        return PvrTexlibImageDecoderEncoder().decode_compressed_image_into(output_buffer, image_data, img_width, img_height, image_format,
+                                                                           backend_name, workers)
+
+    def decode_gst_image_into(self, output_buffer, image_data: bytes, palette_data: bytes, img_width: int, img_height: int,
+                              image_format: ImageFormats, convert_format: ImageFormats, convert_pal_format: ImageFormats,
+                              is_swizzled: bool = True) -> int:
+        gst_decoder = GSTImageDecoderEncoder()
+        decoded_gst_data: bytes = gst_decoder.decode_gst_image_main(image_data, img_width, img_height, image_format, is_swizzled)
+        return self.decode_indexed_image_into(output_buffer, decoded_gst_data, palette_data, img_width, img_height, convert_format, convert_pal_format)
+
+    def decode_yuv_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                              colour_matrix: Optional[str] = None, fixed_point: bool = False) -> int:
+        output = get_output_buffer_view(output_buffer, img_width * img_height * 4)
+        YUVDecoder().decode_yuv_image_into(output.reshape(img_height, img_width, 4), image_data, img_width, img_height, image_format,
+                                           colour_matrix, fixed_point)
+        return len(output)
+
+    def decode_bumpmap_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> int:
+        return BumpmapDecoder().decode_bumpmap_image_into(output_buffer, image_data, img_width, img_height, image_format)
+
+    def decode_n64_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> int:
+        return N64ImageDecoderEncoder().decode_n64_image_into(output_buffer, image_data, img_width, img_height, image_format)
+
+    def decode_psp_dxt_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> int:
+        return PSPDXTDecoder().decode_psp_dxt_image_into(output_buffer, image_data, img_width, img_height, image_format)
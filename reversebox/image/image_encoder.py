@@ -13,18 +13,24 @@ from PIL import Image
 from reversebox.common.logger import get_logger
 from reversebox.image.common import (
     convert_bpp_to_bytes_per_pixel,
+    copy_to_output_buffer,
     get_bpp_for_image_format,
+    get_output_buffer_view,
 )
+from reversebox.image.decoders.bumpmap_encoder import BumpmapEncoder
 from reversebox.image.decoders.compressed_decoder_encoder import (
     CompressedImageDecoderEncoder,
 )
+from reversebox.image.decoders.generic_numpy_encoder import GenericNumpyEncoder
 from reversebox.image.decoders.gst_decoder_encoder import GSTImageDecoderEncoder
 from reversebox.image.decoders.n64_decoder_encoder import N64ImageDecoderEncoder
 from reversebox.image.decoders.pvrtexlib_decoder_encoder import (
     PvrTexlibImageDecoderEncoder,
 )
+from reversebox.image.decoders.yuv_encoder import YUVEncoder
 from reversebox.image.image_formats import ImageFormats
 from reversebox.image.pillow_wrapper import PillowWrapper
+from reversebox.image.pixel_layout import compile_pixel_layout
 from reversebox.io_files.bytes_handler import BytesHandler
 from reversebox.io_files.bytes_helper_functions import (
     get_uint8,
@@ -603,8 +609,17 @@ class ImageEncoder:
     def encode_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
                      image_endianess: str = "little", number_of_mipmaps: int = 0,
                      mipmaps_resampling_type: PIL.Image.Resampling = Image.Resampling.NEAREST) -> bytes:
+        if image_format in GenericNumpyEncoder.generic_data_formats:
+            return GenericNumpyEncoder().encode_generic_image_main(image_data, img_width, img_height, image_format, image_endianess,
+                                                                   number_of_mipmaps, mipmaps_resampling_type)
         return self._encode_generic(image_data, img_width, img_height, image_format, image_endianess, number_of_mipmaps, mipmaps_resampling_type)
 
+    # encode image to format described by pixel layout, e.g. "A1R5G5B5" (see "pixel_layout.py" for more details)
+    def encode_image_with_layout(self, image_data: bytes, img_width: int, img_height: int, pixel_layout: str, image_endianess: str = "little",
+                                 expansion: str = "replicate", alpha_mode: str = "normal", transparent_value: Optional[int] = None) -> bytes:
+        compiled_layout = compile_pixel_layout(pixel_layout, expansion, alpha_mode, transparent_value)
+        return compiled_layout.encode_image(image_data, img_width, img_height, image_endianess)
+
     # TODO - add support for "palette data" parameter (not none if palette should be the same for each mipmap)
     def encode_indexed_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
                              palette_format: ImageFormats, max_color_count: int, image_endianess: str = "little",
@@ -612,14 +627,82 @@ class ImageEncoder:
         return self._encode_indexed(image_data, None, img_width, img_height, image_format, palette_format,
                                     image_endianess, palette_endianess, max_color_count, number_of_mipmaps)
 
-    def encode_compressed_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
-        return CompressedImageDecoderEncoder().encode_compressed_image_main(image_data, img_width, img_height, image_format)
+    def encode_compressed_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                                encoder_preset: str = "normal", workers: int = 1, backend_name: Optional[str] = None) -> bytes:
+        return CompressedImageDecoderEncoder().encode_compressed_image_main(image_data, img_width, img_height, image_format,
+                                                                            encoder_preset, workers, backend_name)
 
     def encode_pvrtexlib_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
         return PvrTexlibImageDecoderEncoder().encode_compressed_image_main(image_data, img_width, img_height, image_format)
 
-    def encode_n64_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
-        return N64ImageDecoderEncoder().encode_n64_image_main(image_data, img_width, img_height, image_format)
-
-    def encode_gst_image(self, image_data: bytes, img_width: int, img_height: int, gst_format: ImageFormats, is_swizzled: bool = True) -> Tuple[bytes, bytes]:
-        return GSTImageDecoderEncoder().encode_gst_image_main(image_data, img_width, img_height, gst_format, is_swizzled)
+    def encode_n64_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                         encoder_preset: str = "fast") -> bytes:
+        return N64ImageDecoderEncoder().encode_n64_image_main(image_data, img_width, img_height, image_format, encoder_preset)
+
+    def encode_yuv_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                         colour_matrix: Optional[str] = None) -> bytes:
+        return YUVEncoder().encode_yuv_image_main(image_data, img_width, img_height, image_format, colour_matrix)
+
+    def encode_bumpmap_image(self, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> bytes:
+        return BumpmapEncoder().encode_bumpmap_image_main(image_data, img_width, img_height, image_format)
+
+    def encode_gst_image(self, image_data: bytes, img_width: int, img_height: int, gst_format: ImageFormats, is_swizzled: bool = True,
+                         palette_format: ImageFormats = ImageFormats.BGRA8888) -> Tuple[bytes, bytes]:
+        return GSTImageDecoderEncoder().encode_gst_image_main(image_data, img_width, img_height, gst_format, is_swizzled, palette_format)
+
+    # "*_into" variants below encode image into caller-supplied output buffer and return number of written bytes.
+    # Output buffer can be bytearray, writable memoryview, writable mmap, NumPy array
+    # or multiprocessing.shared_memory.SharedMemory block (see "get_output_buffer_view").
+    # NumPy encoders write straight to the output buffer, remaining encoders copy their result to it.
+
+    def encode_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                          image_endianess: str = "little", number_of_mipmaps: int = 0,
+                          mipmaps_resampling_type: PIL.Image.Resampling = Image.Resampling.NEAREST) -> int:
+        if image_format in GenericNumpyEncoder.generic_data_formats:
+            return GenericNumpyEncoder().encode_generic_image_into(output_buffer, image_data, img_width, img_height, image_format, image_endianess,
+                                                                   number_of_mipmaps, mipmaps_resampling_type)
+        return copy_to_output_buffer(output_buffer, self._encode_generic(image_data, img_width, img_height, image_format, image_endianess,
+                                                                         number_of_mipmaps, mipmaps_resampling_type))
+
+    def encode_image_with_layout_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, pixel_layout: str,
+                                      image_endianess: str = "little", expansion: str = "replicate", alpha_mode: str = "normal",
+                                      transparent_value: Optional[int] = None) -> int:
+        compiled_layout = compile_pixel_layout(pixel_layout, expansion, alpha_mode, transparent_value)
+        output = get_output_buffer_view(output_buffer, compiled_layout.get_encoded_image_size(img_width, img_height))
+        compiled_layout.encode_image_into(output, image_data, img_width, img_height, image_endianess)
+        return len(output)
+
+    # returns number of bytes written to both buffers
+    def encode_indexed_image_into(self, output_buffer, palette_output_buffer, image_data: bytes, img_width: int, img_height: int,
+                                  image_format: ImageFormats, palette_format: ImageFormats, max_color_count: int,
+                                  image_endianess: str = "little", palette_endianess: str = "little",
+                                  number_of_mipmaps: int = 0) -> Tuple[int, int]:
+        texture_data, palette_data = self.encode_indexed_image(image_data, img_width, img_height, image_format, palette_format, max_color_count,
+                                                               image_endianess, palette_endianess, number_of_mipmaps)
+        return copy_to_output_buffer(output_buffer, texture_data), copy_to_output_buffer(palette_output_buffer, palette_data)
+
+    def encode_compressed_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                                     encoder_preset: str = "normal", workers: int = 1, backend_name: Optional[str] = None) -> int:
+        return CompressedImageDecoderEncoder().encode_compressed_image_into(output_buffer, image_data, img_width, img_height, image_format,
+                                                                            encoder_preset, workers, backend_name)
+
+    def encode_pvrtexlib_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> int:
+        return copy_to_output_buffer(output_buffer, self.encode_pvrtexlib_image(image_data, img_width, img_height, image_format))
+
+    def encode_n64_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                              encoder_preset: str = "fast") -> int:
+        return N64ImageDecoderEncoder().encode_n64_image_into(output_buffer, image_data, img_width, img_height, image_format, encoder_preset)
+
+    def encode_yuv_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats,
+                              colour_matrix: Optional[str] = None) -> int:
+        return YUVEncoder().encode_yuv_image_into(output_buffer, image_data, img_width, img_height, image_format, colour_matrix)
+
+    def encode_bumpmap_image_into(self, output_buffer, image_data: bytes, img_width: int, img_height: int, image_format: ImageFormats) -> int:
+        return BumpmapEncoder().encode_bumpmap_image_into(output_buffer, image_data, img_width, img_height, image_format)
+
+    # returns number of bytes written to both buffers
+    def encode_gst_image_into(self, output_buffer, palette_output_buffer, image_data: bytes, img_width: int, img_height: int,
+                              gst_format: ImageFormats, is_swizzled: bool = True,
+                              palette_format: ImageFormats = ImageFormats.BGRA8888) -> Tuple[int, int]:
+        gst_image_data, palette_data = self.encode_gst_image(image_data, img_width, img_height, gst_format, is_swizzled, palette_format)
+        return copy_to_output_buffer(output_buffer, gst_image_data), copy_to_output_buffer(palette_output_buffer, palette_data)
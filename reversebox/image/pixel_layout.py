@@ -0,0 +1,259 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import functools
+import re
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from reversebox.common.logger import get_logger
+from reversebox.image.decoders.generic_numpy_decoder import read_pixel_values
+
+logger = get_logger(__name__)
+
+# fmt: off
+
+# Declarative pixel layouts. Layout descriptor lists channels from the most
+# significant bit to the least significant bit of the pixel value, e.g.
+# "A1R5G5B5"     --> 16-bit, alpha in bit 15, blue in bits 0-4
+# "X4B4G4R4"     --> 16-bit, 4 unused bits, red in bits 0-3
+# "R10G10B10A2"  --> 32-bit, red in bits 22-31, alpha in bits 0-1
+#
+# Supported channels:
+# R, G, B, A - colour and alpha channels
+# L - luminance (decoded to R, G and B, encoded from R)
+# X - unused bits (ignored while decoding, filled with ones while encoding)
+#
+# Expansion rules (for channels with less than 8 bits):
+# "replicate"   - bit replication, e.g. 5-bit x --> (x << 3) | (x >> 2)
+# "scale"       - x * 255 // max
+# "scale_round" - (x * 255 + (max + 1) // 2) // max
+# Channels with 8 bits or more are always truncated to their top 8 bits.
+# While encoding, "replicate" channels are truncated and "scale" channels are rounded.
+#
+# Alpha modes:
+# "normal"          - alpha decoded from A channel (255 if there is no A channel)
+# "opaque"          - A channel ignored, alpha is always 255
+# "transparent_key" - pixels equal to "transparent_value" are fully transparent
+# "translucent"     - PS1/PS2 style "T" bit: A bit set --> 0x80, zero pixel --> transparent, else opaque
+
+LAYOUT_CHANNEL_REGEX = re.compile(r"([RGBALX])(\d+)")
+EXPANSION_RULES: tuple = ("replicate", "scale", "scale_round")
+ALPHA_MODES: tuple = ("normal", "opaque", "transparent_key", "translucent")
+SUPPORTED_LAYOUT_BPP: tuple = (4, 8, 16, 24, 32, 48)
+
+
+def parse_pixel_layout(layout: str) -> List[Tuple[str, int, int]]:
+    """
+    Parses layout descriptor to list of (channel_name, bits, shift) tuples.
+    """
+    channels_list = LAYOUT_CHANNEL_REGEX.findall(layout.upper())
+    if not channels_list or "".join(name + bits for name, bits in channels_list) != layout.upper():
+        raise ValueError(f"Invalid pixel layout: {layout}")
+
+    bits_per_pixel: int = sum(int(bits) for _, bits in channels_list)
+    parsed_channels: list = []
+    shift: int = bits_per_pixel
+    for name, bits in channels_list:
+        bits = int(bits)
+        if bits == 0:
+            raise ValueError(f"Channel with zero bits in pixel layout: {layout}")
+        shift -= bits
+        if name != "X" and name in (channel[0] for channel in parsed_channels):
+            raise ValueError(f"Duplicated channel {name} in pixel layout: {layout}")
+        parsed_channels.append((name, bits, shift))
+    return parsed_channels
+
+
+def _expand_channel(x: np.ndarray, bits: int, expansion: str) -> np.ndarray:
+    if bits >= 8:
+        return x >> (bits - 8)
+    max_value: int = (1 << bits) - 1
+    if expansion == "scale":
+        return x * 255 // max_value
+    elif expansion == "scale_round":
+        return (x * 255 + (max_value + 1) // 2) // max_value
+
+    result = np.zeros_like(x)
+    position: int = 8 - bits
+    while position > -bits:
+        result |= (x << position) if position >= 0 else (x >> -position)
+        position -= bits
+    return result
+
+
+def _quantize_channel(c: np.ndarray, bits: int, expansion: str) -> np.ndarray:
+    if expansion == "replicate" and bits < 8:
+        return c >> (8 - bits)  # exact inverse of bit replication
+    max_value: int = (1 << bits) - 1
+    return (c * max_value + 127) // 255
+
+
+class CompiledPixelLayout:
+    """
+    Vectorized decode and encode kernels compiled from pixel layout descriptor.
+    Use "compile_pixel_layout" to get cached instances.
+    """
+
+    def __init__(self, layout: str, expansion: str = "replicate", alpha_mode: str = "normal", transparent_value: Optional[int] = None):
+        if expansion not in EXPANSION_RULES:
+            raise ValueError(f"Expansion rule not supported! Expansion: {expansion}")
+        if alpha_mode not in ALPHA_MODES:
+            raise ValueError(f"Alpha mode not supported! Alpha mode: {alpha_mode}")
+        if alpha_mode == "transparent_key" and transparent_value is None:
+            raise ValueError("Transparent value is required for \"transparent_key\" alpha mode!")
+
+        self.layout: str = layout.upper()
+        self.expansion: str = expansion
+        self.alpha_mode: str = alpha_mode
+        self.transparent_value: Optional[int] = transparent_value
+        self.channels: List[Tuple[str, int, int]] = parse_pixel_layout(layout)
+        self.bits_per_pixel: int = sum(bits for _, bits, _ in self.channels)
+        if self.bits_per_pixel not in SUPPORTED_LAYOUT_BPP:
+            raise ValueError(f"Not supported bpp {self.bits_per_pixel} for pixel layout {layout}!")
+        if alpha_mode == "translucent" and self._get_channel("A") is None:
+            raise ValueError("A channel is required for \"translucent\" alpha mode!")
+
+        self.value_dtype: type = np.uint64 if self.bits_per_pixel > 32 else np.uint32
+
+        # for small formats whole decode table is built only once
+        self._decode_table: Optional[np.ndarray] = None
+        if self.bits_per_pixel <= 16:
+            self._decode_table = self._decode_values(np.arange(1 << self.bits_per_pixel, dtype=np.uint32))
+
+    def _get_channel(self, name: str) -> Optional[Tuple[str, int, int]]:
+        for channel in self.channels:
+            if channel[0] == name:
+                return channel
+        return None
+
+    def _get_alpha_shift(self) -> int:
+        alpha_channel = self._get_channel("A")
+        if alpha_channel is None:
+            raise ValueError(f"No A channel in pixel layout {self.layout}!")
+        return alpha_channel[2]
+
+    def _get_channel_value(self, values: np.ndarray, name: str) -> Optional[np.ndarray]:
+        channel = self._get_channel(name)
+        if channel is None:
+            return None
+        _, bits, shift = channel
+        raw_value = (values >> shift) & ((1 << bits) - 1)
+        return _expand_channel(raw_value, bits, self.expansion)
+
+    def _decode_values(self, values: np.ndarray) -> np.ndarray:
+        rgba = np.zeros((len(values), 4), dtype=np.uint8)
+        luminance = self._get_channel_value(values, "L")
+        for i, name in enumerate(("R", "G", "B")):
+            channel_value = self._get_channel_value(values, name)
+            if channel_value is None:
+                channel_value = luminance
+            if channel_value is not None:
+                rgba[:, i] = channel_value
+
+        alpha = self._get_channel_value(values, "A")
+        if alpha is None or self.alpha_mode == "opaque":
+            rgba[:, 3] = 0xFF
+        elif self.alpha_mode == "translucent":
+            rgba[:, 3] = np.where((values >> self._get_alpha_shift()) & 1, 0x80, np.where(values == 0, 0x00, 0xFF))
+        else:
+            rgba[:, 3] = alpha
+
+        if self.alpha_mode == "transparent_key":
+            rgba[values == self.transparent_value, 3] = 0x00
+        return rgba
+
+    def decode(self, values: np.ndarray) -> np.ndarray:
+        """
+        Decodes array of raw pixel values to (N, 4) RGBA8888 array.
+        """
+        if self._decode_table is not None:
+            return np.take(self._decode_table, values & ((1 << self.bits_per_pixel) - 1), axis=0)
+        return self._decode_values(values.astype(self.value_dtype))
+
+    def encode(self, r: np.ndarray, g: np.ndarray, b: np.ndarray, a: np.ndarray) -> np.ndarray:
+        """
+        Encodes R, G, B, A channel arrays to array of raw pixel values.
+        """
+        source_channels = {"R": r, "G": g, "B": b, "A": a, "L": r}
+        values: np.ndarray = np.zeros(len(r), dtype=self.value_dtype)
+        for name, bits, shift in self.channels:
+            if name == "A" and self.alpha_mode == "translucent":
+                continue  # set below
+            if name == "X" or (name == "A" and self.alpha_mode == "opaque"):
+                channel_value: np.ndarray = np.full(len(r), (1 << bits) - 1, dtype=self.value_dtype)
+            else:
+                channel_value = _quantize_channel(source_channels[name].astype(self.value_dtype), bits, self.expansion)
+            values |= channel_value.astype(self.value_dtype) << self.value_dtype(shift)
+
+        if self.alpha_mode == "translucent":
+            alpha_shift: int = self._get_alpha_shift()
+            top_colour_channel = next(channel for channel in self.channels if channel[0] in ("R", "G", "B", "L"))
+            opaque_values = np.where(values == 0, self.value_dtype(1 << top_colour_channel[2]), values)
+            translucent_values = values | self.value_dtype(1 << alpha_shift)
+            values = np.where(a < 25 * 255 // 100, 0, np.where(a >= 75 * 255 // 100, opaque_values, translucent_values)).astype(self.value_dtype)
+        elif self.alpha_mode == "transparent_key" and self.transparent_value is not None:
+            values = np.where(a < 128, self.value_dtype(self.transparent_value), values).astype(self.value_dtype)
+        return values
+
+    def get_encoded_image_size(self, img_width: int, img_height: int) -> int:
+        pixel_count: int = img_width * img_height
+        if self.bits_per_pixel == 4:
+            return (pixel_count + 1) // 2
+        return pixel_count * self.bits_per_pixel // 8
+
+    def decode_image_into(self, output: np.ndarray, image_data: bytes, img_width: int, img_height: int, image_endianess: str = "little") -> None:
+        """
+        Decodes image into (img_width * img_height, 4) uint8 array.
+        Pixels missing in image data are set to zeros.
+        """
+        pixel_count: int = img_width * img_height
+        pixel_values = read_pixel_values(image_data, self.bits_per_pixel, image_endianess, pixel_count)[:pixel_count]
+        if self._decode_table is not None:
+            np.take(self._decode_table, pixel_values & ((1 << self.bits_per_pixel) - 1), axis=0, out=output[:len(pixel_values)])
+        else:
+            output[:len(pixel_values)] = self._decode_values(pixel_values.astype(self.value_dtype))
+        output[len(pixel_values):] = 0
+
+    def decode_image(self, image_data: bytes, img_width: int, img_height: int, image_endianess: str = "little") -> bytes:
+        texture_data = bytearray(img_width * img_height * 4)
+        self.decode_image_into(np.frombuffer(texture_data, dtype=np.uint8).reshape(-1, 4), image_data, img_width, img_height, image_endianess)
+        return texture_data
+
+    def encode_image_into(self, output: np.ndarray, image_data: bytes, img_width: int, img_height: int, image_endianess: str = "little") -> None:
+        """
+        Encodes image into uint8 array of "get_encoded_image_size" bytes
+        """
+        if image_endianess not in ("little", "big"):
+            raise Exception(f"Endianess not supported! Endianess: {image_endianess}")
+        pixel_count: int = img_width * img_height
+        pixels = np.frombuffer(image_data, dtype=np.uint8, count=pixel_count * 4).reshape(-1, 4).astype(np.uint32)
+        values = self.encode(pixels[:, 0], pixels[:, 1], pixels[:, 2], pixels[:, 3])
+
+        if self.bits_per_pixel == 4:
+            nibbles = np.concatenate((values, np.zeros(len(values) % 2, dtype=values.dtype))).reshape(-1, 2).astype(np.uint8)
+            if image_endianess == "little":
+                np.bitwise_or(nibbles[:, 1] << 4, nibbles[:, 0], out=output)
+            else:
+                np.bitwise_or(nibbles[:, 0] << 4, nibbles[:, 1], out=output)
+            return
+
+        bytes_per_pixel: int = self.bits_per_pixel // 8
+        encoded = output.reshape(-1, bytes_per_pixel)
+        for i in range(bytes_per_pixel):
+            byte_index: int = i if image_endianess == "little" else bytes_per_pixel - 1 - i
+            encoded[:, byte_index] = (values >> self.value_dtype(8 * i)) & 0xFF
+
+    def encode_image(self, image_data: bytes, img_width: int, img_height: int, image_endianess: str = "little") -> bytes:
+        texture_data = bytearray(self.get_encoded_image_size(img_width, img_height))
+        self.encode_image_into(np.frombuffer(texture_data, dtype=np.uint8), image_data, img_width, img_height, image_endianess)
+        return texture_data
+
+
+@functools.lru_cache(maxsize=64)
+def compile_pixel_layout(layout: str, expansion: str = "replicate", alpha_mode: str = "normal",
+                         transparent_value: Optional[int] = None) -> CompiledPixelLayout:
+    return CompiledPixelLayout(layout, expansion, alpha_mode, transparent_value)
@@ -1,8 +1,19 @@
 """
-Copyright © 2024-2025  Bartłomiej Duda
+Copyright © 2024-2026  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
+import numpy as np
+
+from reversebox.image.swizzling.swizzle_bit_permutation import (
+    N3DS_DESCRIPTOR,
+    compile_bit_permutation,
+)
+from reversebox.image.swizzling.swizzle_plan import (
+    SwizzlePlan,
+    convert_with_swizzle_plan,
+)
+
 # Nintendo 3DS Swizzling
 # Can occur in:
 # - some MT Framework games on 3DS
@@ -12,30 +23,20 @@ License: GPL-3.0 License
 # fmt: off
 
 
+def _get_3ds_plan(img_width: int, img_height: int, bpp: int) -> SwizzlePlan:
+    # 8x8 tiles in Morton order, every step copies one strip of 2 pixels (x0 bit)
+    strip_size: int = bpp * 2 // 8
+    n3ds_swizzle = compile_bit_permutation(N3DS_DESCRIPTOR)
+    tiles_per_row: int = (img_width + 7) // 8
+    number_of_pixels: int = tiles_per_row * ((img_height + 7) // 8) * n3ds_swizzle.tile_size
+    x, y = n3ds_swizzle.get_coordinates(np.arange(0, number_of_pixels, 2, dtype=np.int64), tiles_per_row)
+    linear_offsets = (y * img_width + x) * bpp // 8
+    swizzled_offsets = np.arange(len(linear_offsets), dtype=np.int64) * strip_size
+    return SwizzlePlan.from_byte_offsets(linear_offsets, swizzled_offsets, strip_size)
+
+
 def _convert_3ds(image_data: bytes, img_width: int, img_height: int, bpp: int, swizzle_flag: bool) -> bytes:
-    l: int = 8
-    m: int = 4
-    s: int = 2
-    strip_size: int = bpp * s // 8
-
-    converted_data = bytearray(img_width * img_height * bpp // 8)
-    ptr: int = 0
-
-    for y in range(0, img_height, l):
-        for x in range(0, img_width, l):
-            for y1 in range(0, l, m):
-                for x1 in range(0, l, m):
-                    for y2 in range(0, m, s):
-                        for x2 in range(0, m, s):
-                            for y3 in range(s):
-                                idx = (((y + y1 + y2 + y3) * img_width) + x + x1 + x2) * bpp // 8
-                                if not swizzle_flag:
-                                    converted_data[idx: idx+strip_size] = image_data[ptr: ptr + strip_size]
-                                else:
-                                    converted_data[ptr: ptr+strip_size] = image_data[idx: idx + strip_size]
-                                ptr += strip_size
-
-    return converted_data
+    return convert_with_swizzle_plan(image_data, img_width * img_height * bpp // 8, swizzle_flag, _get_3ds_plan, img_width, img_height, bpp)
 
 
 def unswizzle_3ds(image_data: bytes, img_width: int, img_height: int, bpp: int) -> bytes:
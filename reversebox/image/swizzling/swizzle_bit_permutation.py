@@ -0,0 +1,256 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import functools
+import re
+from typing import List, Tuple
+
+import numpy as np
+
+from reversebox.image.swizzling.swizzle_plan import (
+    SwizzlePlan,
+    convert_with_swizzle_plan,
+)
+
+# fmt: off
+
+# Bit-permutation swizzles.
+# Morton-family swizzles (Morton, PS Vita/Dreamcast twiddling, PS4/PS5 tiles, 3DS tiles, Switch GOBs)
+# only move bits of x and y coordinates to other positions of the address.
+# Such swizzle can be described as list of address bits (from the least significant bit), e.g.
+# "x0 y0 x1 y1 x2 y2" --> 8x8 tile in Morton order, "y0 x0 y1 x1" --> 4x4 tile in "N" order.
+#
+# Descriptor describes one tile (2^number_of_x_bits x 2^number_of_y_bits units),
+# tiles are stored row by row ("tiles_per_row" tiles in every row).
+# Descriptor is compiled once to list of shift/mask operations on uint32 arrays:
+# runs of bits moved together are copied with one shift and mask, runs of interleaved bits
+# (every second address bit) are spread/compacted with magic numbers.
+#
+# Example of new layout:
+# swizzled_data = swizzle_with_descriptor(image_data, 256, 256, "x0 x1 y0 y1 x2 y2 x3 y3", unit_data_size=4)
+
+BIT_PERMUTATION_DESCRIPTOR_PATTERN = re.compile(r"^([xy])(\d+)$")
+
+
+def _spread_bits_by_one(values: np.ndarray) -> np.ndarray:
+    # abcd --> 0a0b0c0d (16 bits --> 32 bits)
+    values = values & 0x0000FFFF
+    values = (values | (values << 8)) & 0x00FF00FF
+    values = (values | (values << 4)) & 0x0F0F0F0F
+    values = (values | (values << 2)) & 0x33333333
+    return (values | (values << 1)) & 0x55555555
+
+
+def _compact_bits_by_one(values: np.ndarray) -> np.ndarray:
+    # 0a0b0c0d --> abcd (inverse of "_spread_bits_by_one")
+    values = values & 0x55555555
+    values = (values | (values >> 1)) & 0x33333333
+    values = (values | (values >> 2)) & 0x0F0F0F0F
+    values = (values | (values >> 4)) & 0x00FF00FF
+    return (values | (values >> 8)) & 0x0000FFFF
+
+
+class BitPermutationSwizzle:
+    """
+    Compiled bit-permutation descriptor
+    """
+
+    def __init__(self, descriptor: str):
+        self.descriptor: str = descriptor
+        address_bits: List[Tuple[str, int]] = []
+        for token in descriptor.split():
+            match = BIT_PERMUTATION_DESCRIPTOR_PATTERN.match(token)
+            if not match:
+                raise ValueError(f"Wrong bit permutation descriptor! Token: {token}, descriptor: {descriptor}")
+            address_bits.append((match.group(1), int(match.group(2))))
+        if len(address_bits) > 32 or len(set(address_bits)) != len(address_bits):
+            raise ValueError(f"Wrong bit permutation descriptor! Descriptor: {descriptor}")
+
+        self.number_of_x_bits: int = sum(1 for coordinate, _ in address_bits if coordinate == "x")
+        self.number_of_y_bits: int = len(address_bits) - self.number_of_x_bits
+        for coordinate, number_of_bits in (("x", self.number_of_x_bits), ("y", self.number_of_y_bits)):
+            if sorted(bit for name, bit in address_bits if name == coordinate) != list(range(number_of_bits)):
+                raise ValueError(f"Missing {coordinate} bits in bit permutation descriptor! Descriptor: {descriptor}")
+        self.tile_width: int = 1 << self.number_of_x_bits
+        self.tile_height: int = 1 << self.number_of_y_bits
+        self.tile_size: int = 1 << len(address_bits)
+        self.operations: tuple = self._compile(address_bits)
+
+    @staticmethod
+    def _compile(address_bits: List[Tuple[str, int]]) -> tuple:
+        """
+        Returns tuple of operations (coordinate, coordinate_shift, address_shift, run_length, stride),
+        every operation moves "run_length" consecutive coordinate bits to address bits with given stride (1 or 2)
+        """
+        operations: list = []
+        for coordinate in ("x", "y"):
+            bit_positions: list = sorted((bit, address_bit) for address_bit, (name, bit) in enumerate(address_bits) if name == coordinate)
+            i: int = 0
+            while i < len(bit_positions):
+                coordinate_bit, address_bit = bit_positions[i]
+                run_length: int = 1
+                stride: int = 1
+                if i + 1 < len(bit_positions) and bit_positions[i + 1][1] - address_bit in (1, 2):
+                    stride = bit_positions[i + 1][1] - address_bit
+                    while (i + run_length < len(bit_positions)
+                           and bit_positions[i + run_length][0] == coordinate_bit + run_length
+                           and bit_positions[i + run_length][1] == address_bit + run_length * stride
+                           and run_length < 16):
+                        run_length += 1
+                operations.append((coordinate, coordinate_bit, address_bit, run_length, stride))
+                i += run_length
+        return tuple(operations)
+
+    def get_tile_offsets(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        (x, y) coordinates inside of the tile --> unit index inside of the tile
+        """
+        coordinates: dict = {"x": np.asarray(x).astype(np.uint32), "y": np.asarray(y).astype(np.uint32)}
+        offsets = np.zeros(np.broadcast(coordinates["x"], coordinates["y"]).shape, dtype=np.uint32)
+        for coordinate, coordinate_bit, address_bit, run_length, stride in self.operations:
+            values = (coordinates[coordinate] >> np.uint32(coordinate_bit)) & np.uint32((1 << run_length) - 1)
+            if stride == 2:
+                values = _spread_bits_by_one(values)
+            offsets |= values << np.uint32(address_bit)
+        return offsets
+
+    def get_tile_coordinates(self, offsets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Unit index inside of the tile --> (x, y) coordinates inside of the tile.
+        Address bits not used by descriptor are ignored.
+        """
+        offsets = np.asarray(offsets).astype(np.uint32)
+        coordinates: dict = {"x": np.zeros(offsets.shape, dtype=np.uint32), "y": np.zeros(offsets.shape, dtype=np.uint32)}
+        for coordinate, coordinate_bit, address_bit, run_length, stride in self.operations:
+            values = offsets >> np.uint32(address_bit)
+            if stride == 2:
+                values = _compact_bits_by_one(values)
+            coordinates[coordinate] |= (values & np.uint32((1 << run_length) - 1)) << np.uint32(coordinate_bit)
+        return coordinates["x"].astype(np.int64), coordinates["y"].astype(np.int64)
+
+    def get_offsets(self, x: np.ndarray, y: np.ndarray, tiles_per_row: int, unit_data_size: int = 1) -> np.ndarray:
+        """
+        (x, y) coordinates of units --> byte offsets of units in swizzled data (tiles stored row by row)
+        """
+        tile_x, local_x = np.divmod(np.asarray(x, dtype=np.int64), self.tile_width)
+        tile_y, local_y = np.divmod(np.asarray(y, dtype=np.int64), self.tile_height)
+        tile_index = tile_y * tiles_per_row + tile_x
+        return (tile_index * self.tile_size + self.get_tile_offsets(local_x, local_y).astype(np.int64)) * unit_data_size
+
+    def get_coordinates(self, unit_indices: np.ndarray, tiles_per_row: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Unit indices in swizzled data --> (x, y) coordinates of units (inverse of "get_offsets")
+        """
+        tile_index, local_offsets = np.divmod(np.asarray(unit_indices, dtype=np.int64), self.tile_size)
+        tile_y, tile_x = np.divmod(tile_index, tiles_per_row)
+        local_x, local_y = self.get_tile_coordinates(local_offsets)
+        return tile_x * self.tile_width + local_x, tile_y * self.tile_height + local_y
+
+
+@functools.lru_cache(maxsize=None)
+def compile_bit_permutation(descriptor: str) -> BitPermutationSwizzle:
+    return BitPermutationSwizzle(descriptor)
+
+
+# Descriptors of existing swizzles
+
+
+def get_morton_descriptor(width: int, height: int) -> str:
+    # the same bit order as "calculate_morton_index" (x first, while both dimensions are bigger than 1)
+    tokens: list = []
+    x_bit: int = 0
+    y_bit: int = 0
+    while width > 1 or height > 1:
+        if width > 1:
+            tokens.append(f"x{x_bit}")
+            x_bit += 1
+            width >>= 1
+        if height > 1:
+            tokens.append(f"y{y_bit}")
+            y_bit += 1
+            height >>= 1
+    return " ".join(tokens)
+
+
+def get_psvita_dreamcast_descriptor(width: int, height: int) -> str:
+    # the same bit order as "calculate_morton_index_psvita_dreamcast" (y first)
+    tokens: list = []
+    for i in range(16):
+        height >>= 1
+        if height:
+            tokens.append(f"y{i}")
+        if width >> 1:
+            tokens.append(f"x{i}")
+    return " ".join(tokens)
+
+
+def _shift_descriptor_bits(descriptor: str, coordinate: str, shift: int) -> str:
+    # e.g. shift of tile coordinates, when tile is made of smaller groups of units
+    return " ".join(f"{coordinate}{int(token[1:]) + shift}" if token[0] == coordinate else token
+                    for token in descriptor.split())
+
+
+def get_ps5_descriptor(block_value: int) -> str:
+    """
+    block_value = 0 --> linear formats (128x128 tiles, groups of 4x8 units)
+    otherwise       --> compressed formats (64x64 tiles, groups of (4 * block_value)x4 units)
+    """
+    if block_value == 0:
+        groups_descriptor: str = get_morton_descriptor(32, 16)
+        return "x0 x1 y0 y1 y2 " + _shift_descriptor_bits(_shift_descriptor_bits(groups_descriptor, "x", 2), "y", 3)
+
+    block_bits: int = block_value.bit_length() - 1
+    # Morton "x" (16 units) is y of the group and Morton "y" is x of the group
+    groups_descriptor = get_morton_descriptor(16, 16 // block_value).replace("x", "t").replace("y", "x").replace("t", "y")
+    groups_descriptor = _shift_descriptor_bits(_shift_descriptor_bits(groups_descriptor, "x", block_bits + 2), "y", 2)
+    block_descriptor: str = " ".join(f"x{i}" for i in range(block_bits))
+    return " ".join(filter(None, (block_descriptor, f"y0 y1 x{block_bits} x{block_bits + 1}", groups_descriptor)))
+
+
+# 8x8 tiles in Morton order
+PS4_DESCRIPTOR: str = "x0 y0 x1 y1 x2 y2"
+N3DS_DESCRIPTOR: str = "x0 y0 x1 y1 x2 y2"
+
+
+def get_switch_descriptor(block_height: int) -> str:
+    """
+    GOB is 64 bytes x 8 rows, "block_height" GOBs are stacked vertically (x is in bytes)
+    """
+    if block_height < 1 or block_height & (block_height - 1):
+        raise ValueError(f"Block height must be power of 2! Block_height: {block_height}")
+    block_height_descriptor: str = " ".join(f"y{3 + i}" for i in range(block_height.bit_length() - 1))
+    return ("x0 x1 x2 x3 y0 x4 y1 y2 x5 " + block_height_descriptor).strip()
+
+
+# Swizzling with any descriptor
+
+
+def _get_descriptor_plan(descriptor: str, width_in_units: int, height_in_units: int, unit_data_size: int) -> SwizzlePlan:
+    swizzle = compile_bit_permutation(descriptor)
+    tiles_per_row: int = -(-width_in_units // swizzle.tile_width)
+    y, x = np.mgrid[0:height_in_units, 0:width_in_units]
+    return SwizzlePlan(y * width_in_units + x, swizzle.get_offsets(x, y, tiles_per_row), unit_data_size)
+
+
+def get_descriptor_swizzled_data_size(img_width: int, img_height: int, descriptor: str, unit_data_size: int,
+                                      block_width: int = 1, block_height: int = 1) -> int:
+    # swizzled data is made of whole tiles
+    swizzle = compile_bit_permutation(descriptor)
+    tiles_per_row: int = -(-(img_width // block_width) // swizzle.tile_width)
+    tiles_per_column: int = -(-(img_height // block_height) // swizzle.tile_height)
+    return tiles_per_row * tiles_per_column * swizzle.tile_size * unit_data_size
+
+
+def unswizzle_with_descriptor(image_data: bytes, img_width: int, img_height: int, descriptor: str, unit_data_size: int,
+                              block_width: int = 1, block_height: int = 1) -> bytes:
+    return convert_with_swizzle_plan(image_data, (img_width // block_width) * (img_height // block_height) * unit_data_size, False,
+                                     _get_descriptor_plan, descriptor, img_width // block_width, img_height // block_height, unit_data_size)
+
+
+def swizzle_with_descriptor(image_data: bytes, img_width: int, img_height: int, descriptor: str, unit_data_size: int,
+                            block_width: int = 1, block_height: int = 1) -> bytes:
+    output_size: int = get_descriptor_swizzled_data_size(img_width, img_height, descriptor, unit_data_size, block_width, block_height)
+    return convert_with_swizzle_plan(image_data, output_size, True,
+                                     _get_descriptor_plan, descriptor, img_width // block_width, img_height // block_height, unit_data_size)
@@ -1,9 +1,17 @@
 """
-Copyright © 2024-2025  Bartłomiej Duda
+Copyright © 2024-2026  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
+from typing import Union
+
+import numpy as np
+
 from reversebox.image.common import convert_bpp_to_bytes_per_pixel
+from reversebox.image.swizzling.swizzle_plan import (
+    SwizzlePlan,
+    convert_with_swizzle_plan,
+)
 
 # Swizzling used in GameCube and WII games
 # e.g. GSH files from FIFA 09 (WII)
@@ -12,7 +20,7 @@ from reversebox.image.common import convert_bpp_to_bytes_per_pixel
 # fmt: off
 
 
-def get_pixel_offset_bpp32(x: int, y: int, img_width: int) -> int:
+def get_pixel_offset_bpp32(x: Union[int, np.ndarray], y: Union[int, np.ndarray], img_width: int) -> Union[int, np.ndarray]:
     number_of_blocks_x = (3 + img_width) >> 2
     x_block = x >> 2
     y_block = y >> 2
@@ -22,7 +30,7 @@ def get_pixel_offset_bpp32(x: int, y: int, img_width: int) -> int:
     return offset
 
 
-def get_pixel_offset_bpp16(x: int, y: int, img_width: int) -> int:
+def get_pixel_offset_bpp16(x: Union[int, np.ndarray], y: Union[int, np.ndarray], img_width: int) -> Union[int, np.ndarray]:
     number_of_blocks_x = (3 + img_width) >> 2
     x_block = x >> 2
     y_block = y >> 2
@@ -32,7 +40,7 @@ def get_pixel_offset_bpp16(x: int, y: int, img_width: int) -> int:
     return offset
 
 
-def get_pixel_offset_bpp8(x: int, y: int, img_width: int) -> int:
+def get_pixel_offset_bpp8(x: Union[int, np.ndarray], y: Union[int, np.ndarray], img_width: int) -> Union[int, np.ndarray]:
     number_of_blocks_x = (7 + img_width) >> 3
     x_block = x >> 3
     y_block = y >> 2
@@ -42,7 +50,7 @@ def get_pixel_offset_bpp8(x: int, y: int, img_width: int) -> int:
     return offset
 
 
-def get_pixel_offset_bpp4(x: int, y: int, img_width: int) -> int:
+def get_pixel_offset_bpp4(x: Union[int, np.ndarray], y: Union[int, np.ndarray], img_width: int) -> Union[int, np.ndarray]:
     number_of_blocks_x = (7 + img_width) >> 3
     x_block = x >> 3
     y_block = y >> 3
@@ -52,7 +60,7 @@ def get_pixel_offset_bpp4(x: int, y: int, img_width: int) -> int:
     return offset
 
 
-def get_pixel_offset(x: int, y: int, img_width: int, bpp: int) -> int:
+def get_pixel_offset(x: Union[int, np.ndarray], y: Union[int, np.ndarray], img_width: int, bpp: int) -> Union[int, np.ndarray]:
     if bpp == 32:
         return get_pixel_offset_bpp32(x, y, img_width)
     elif bpp in (15, 16):
@@ -65,53 +73,29 @@ def get_pixel_offset(x: int, y: int, img_width: int, bpp: int) -> int:
         raise Exception("Bpp not supported!")
 
 
+def _get_gamecube_plan(img_width: int, img_height: int, bpp: int) -> SwizzlePlan:
+    # pixel offset functions work also for NumPy arrays of coordinates
+    y, x = np.mgrid[0:img_height, 0:img_width]
+    index = np.asarray(get_pixel_offset(x, y, img_width, bpp)).reshape(-1)
+
+    if bpp == 4:
+        # two pixels per byte
+        return SwizzlePlan((y * (img_width // 2) + x // 2).reshape(-1), index, 1)
+    elif bpp == 32:
+        # AR and GB parts of the pixel are stored in two halves of the tile
+        pixel_offsets = np.arange(img_width * img_height, dtype=np.int64) * 4
+        linear_offsets = np.stack((pixel_offsets, pixel_offsets + 2), axis=-1)
+        swizzled_offsets = np.stack((index, index + 32), axis=-1)
+        return SwizzlePlan.from_byte_offsets(linear_offsets, swizzled_offsets, 2)
+
+    bytes_per_pixel: int = convert_bpp_to_bytes_per_pixel(bpp)
+    pixel_offsets = np.arange(img_width * img_height, dtype=np.int64) * bytes_per_pixel
+    return SwizzlePlan.from_byte_offsets(pixel_offsets, index, bytes_per_pixel)
+
+
 def unswizzle_gamecube(image_data: bytes, img_width: int, img_height: int, bpp: int) -> bytes:
-    unswizzled_data = bytearray(len(image_data))
-    destination_index: int = 0
-
-    for y in range(img_height):
-        for x in range(img_width):
-            index = get_pixel_offset(x, y, img_width, bpp)
-
-            if bpp == 4:
-                unswizzled_data[destination_index] = image_data[index]
-                if x & 1:
-                    destination_index += 1
-            elif bpp == 32:
-                unswizzled_data[destination_index] = image_data[index]
-                unswizzled_data[destination_index+1] = image_data[index+1]
-                unswizzled_data[destination_index+2] = image_data[index+32]
-                unswizzled_data[destination_index+3] = image_data[index+33]
-                destination_index += 4
-            else:
-                bytes_per_pixel: int = convert_bpp_to_bytes_per_pixel(bpp)
-                unswizzled_data[destination_index: destination_index + bytes_per_pixel] = image_data[index: index + bytes_per_pixel]
-                destination_index += bytes_per_pixel
-
-    return unswizzled_data
+    return convert_with_swizzle_plan(image_data, len(image_data), False, _get_gamecube_plan, img_width, img_height, bpp)
 
 
 def swizzle_gamecube(image_data: bytes, img_width: int, img_height: int, bpp: int) -> bytes:
-    swizzled_data = bytearray(len(image_data))
-    destination_index: int = 0
-
-    for y in range(img_height):
-        for x in range(img_width):
-            index = get_pixel_offset(x, y, img_width, bpp)
-
-            if bpp == 4:
-                swizzled_data[index] = image_data[destination_index]
-                if x & 1:
-                    destination_index += 1
-            elif bpp == 32:
-                swizzled_data[index] = image_data[destination_index]
-                swizzled_data[index+1] = image_data[destination_index+1]
-                swizzled_data[index+32] = image_data[destination_index+2]
-                swizzled_data[index+33] = image_data[destination_index+3]
-                destination_index += 4
-            else:
-                bytes_per_pixel: int = convert_bpp_to_bytes_per_pixel(bpp)
-                swizzled_data[index: index + bytes_per_pixel] = image_data[destination_index: destination_index + bytes_per_pixel]
-                destination_index += bytes_per_pixel
-
-    return swizzled_data
+    return convert_with_swizzle_plan(image_data, len(image_data), True, _get_gamecube_plan, img_width, img_height, bpp)
@@ -1,10 +1,19 @@
 """
-Copyright © 2024-2025  Bartłomiej Duda
+Copyright © 2024-2026  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
+import numpy as np
+
 from reversebox.image.common import convert_bpp_to_bytes_per_pixel
-from reversebox.image.swizzling.morton_index import calculate_morton_index
+from reversebox.image.swizzling.swizzle_bit_permutation import (
+    compile_bit_permutation,
+    get_morton_descriptor,
+)
+from reversebox.image.swizzling.swizzle_plan import (
+    SwizzlePlan,
+    convert_with_swizzle_plan,
+)
 
 # Morton Order Texture Swizzling
 # https://en.wikipedia.org/wiki/Z-order_curve
@@ -18,6 +27,13 @@ from reversebox.image.swizzling.morton_index import calculate_morton_index
 # fmt: off
 
 
+def _get_morton_plan(width_in_blocks: int, height_in_blocks: int, block_data_size: int) -> SwizzlePlan:
+    # block "t" of swizzled data is block "calculate_morton_index(t)" of linear data
+    swizzled_indices = np.arange(width_in_blocks * height_in_blocks, dtype=np.int64)
+    x, y = compile_bit_permutation(get_morton_descriptor(width_in_blocks, height_in_blocks)).get_tile_coordinates(swizzled_indices)
+    return SwizzlePlan(y * width_in_blocks + x, swizzled_indices, block_data_size)
+
+
 def _convert_morton(pixel_data: bytes, img_width: int, img_height: int, bpp: int, block_width: int, block_height: int, swizzle_flag: bool) -> bytes:
     if bpp == 1:
         block_data_size: int = (block_width * block_height) // 8
@@ -29,21 +45,8 @@ def _convert_morton(pixel_data: bytes, img_width: int, img_height: int, bpp: int
         bytes_per_pixel: int = convert_bpp_to_bytes_per_pixel(bpp)
         block_data_size: int = bytes_per_pixel * block_width * block_height
 
-    converted_data: bytearray = bytearray(len(pixel_data))
-    img_width //= block_width
-    img_height //= block_height
-    source_index: int = 0
-
-    for t in range(img_width * img_height):
-        index = calculate_morton_index(t, img_width, img_height)
-        destination_index = block_data_size * index
-        if not swizzle_flag:
-            converted_data[destination_index:destination_index + block_data_size] = pixel_data[source_index:source_index + block_data_size]
-        else:
-            converted_data[source_index:source_index + block_data_size] = pixel_data[destination_index:destination_index + block_data_size]
-        source_index += block_data_size
-
-    return converted_data
+    return convert_with_swizzle_plan(pixel_data, len(pixel_data), swizzle_flag, _get_morton_plan,
+                                     img_width // block_width, img_height // block_height, block_data_size)
 
 
 def unswizzle_morton(pixel_data: bytes, img_width: int, img_height: int, bpp: int, block_width: int = 1, block_height: int = 1) -> bytes:
@@ -1,9 +1,15 @@
 """
-Copyright © 2024-2025  Bartłomiej Duda
+Copyright © 2024-2026  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
-from reversebox.image.swizzling.morton_index import calculate_morton_index
+import numpy as np
+
+from reversebox.image.swizzling.swizzle_offsets import get_ps4_offsets
+from reversebox.image.swizzling.swizzle_plan import (
+    SwizzlePlan,
+    convert_with_swizzle_plan,
+)
 
 # fmt: off
 
@@ -12,28 +18,17 @@ from reversebox.image.swizzling.morton_index import calculate_morton_index
 # Swizzle used in PS4 games e.g. "Dragons Dogma Dark Arisen" (MT Framework TEX files)
 
 
+def _get_ps4_plan(width_in_blocks: int, height_in_blocks: int, block_data_size: int) -> SwizzlePlan:
+    # 8x8 tiles (Morton order inside of tile), blocks outside of the image are skipped
+    y, x = np.mgrid[0:height_in_blocks, 0:width_in_blocks]
+    swizzled_indices = get_ps4_offsets(x, y, width_in_blocks, height_in_blocks, 1)
+    return SwizzlePlan(y * width_in_blocks + x, swizzled_indices, block_data_size)
+
+
 def _convert_morton_ps4(image_data: bytes, img_width: int, img_height: int, block_width: int,
                         block_height: int, block_data_size: int, swizzle_flag: bool) -> bytes:
-    converted_data = bytearray(len(image_data))
-    source_index: int = 0
-    img_height //= block_height
-    img_width //= block_width
-
-    for y in range((img_height + 7) // 8):
-        for x in range((img_width + 7) // 8):
-            for t in range(64):
-                morton_index = calculate_morton_index(t, 8, 8)
-                data_y = morton_index // 8
-                data_x = morton_index % 8
-                if x * 8 + data_x < img_width and y * 8 + data_y < img_height:
-                    destination_index = block_data_size * ((y * 8 + data_y) * img_width + x * 8 + data_x)
-                    if not swizzle_flag:
-                        converted_data[destination_index: destination_index + block_data_size] = image_data[source_index: source_index + block_data_size]
-                    else:
-                        converted_data[source_index: source_index + block_data_size] = image_data[destination_index: destination_index + block_data_size]
-                    source_index += block_data_size
-
-    return converted_data
+    return convert_with_swizzle_plan(image_data, len(image_data), swizzle_flag, _get_ps4_plan,
+                                     img_width // block_width, img_height // block_height, block_data_size)
 
 
 def unswizzle_ps4(image_data: bytes, img_width: int, img_height: int, block_width: int = 4, block_height: int = 4, block_data_size: int = 16) -> bytes:
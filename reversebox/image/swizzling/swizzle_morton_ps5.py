@@ -1,9 +1,15 @@
 """
-Copyright © 2025  Bartłomiej Duda
+Copyright © 2025-2026  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
-from reversebox.image.swizzling.morton_index import calculate_morton_index
+import numpy as np
+
+from reversebox.image.swizzling.swizzle_offsets import get_ps5_offsets
+from reversebox.image.swizzling.swizzle_plan import (
+    SwizzlePlan,
+    convert_with_swizzle_plan,
+)
 
 # fmt: off
 
@@ -12,60 +18,18 @@ from reversebox.image.swizzling.morton_index import calculate_morton_index
 # Swizzle used in PS5 games
 
 
-def _get_block_value(block_data_size: int) -> int:
-    if block_data_size == 4:
-        return 4
-    elif block_data_size == 8:
-        return 2
-    else:
-        return 1
+def _get_ps5_plan(width_in_blocks: int, height_in_blocks: int, block_data_size: int, is_linear: bool) -> SwizzlePlan:
+    # linear formats --> 128x128 tiles, compressed formats --> 64x64 tiles
+    # blocks outside of the image are skipped
+    y, x = np.mgrid[0:height_in_blocks, 0:width_in_blocks]
+    swizzled_offsets = get_ps5_offsets(x, y, width_in_blocks, height_in_blocks, block_data_size, is_linear)
+    return SwizzlePlan(y * width_in_blocks + x, swizzled_offsets // block_data_size, block_data_size)
 
 
 def _convert_morton_ps5(image_data: bytes, img_width: int, img_height: int, block_width: int,
                         block_height: int, block_data_size: int, swizzle_flag: bool) -> bytes:
-    converted_data = bytearray(len(image_data))
-    source_index: int = 0
-    img_height //= block_height
-    img_width //= block_width
-
-    if block_width == 1 and block_height == 1:
-        for y in range((img_height + 127) // 128):
-            for x in range((img_width + 127) // 128):
-                for t in range(512):
-                    morton_index = calculate_morton_index(t, 32, 16)
-                    data_x: int = morton_index % 32
-                    data_y: int = morton_index // 32
-                    for i in range(32):
-                        local_x: int = x * 128 + data_x * 4 + i % 4
-                        local_y: int = y * 128 + (data_y * 8 + i // 4)
-                        if local_x < img_width and local_y < img_height:
-                            destination_index: int = block_data_size * (local_y * img_width + local_x)
-                            if not swizzle_flag:
-                                converted_data[destination_index: destination_index + block_data_size] = image_data[source_index: source_index + block_data_size]
-                            else:
-                                converted_data[source_index: source_index + block_data_size] = image_data[destination_index: destination_index + block_data_size]
-                            source_index += block_data_size
-    else:
-        block_value: int = _get_block_value(block_data_size)
-        for y in range((img_height + 63) // 64):
-            for x in range((img_width + 63) // 64):
-                for t in range(256 // block_value):
-                    morton_index = calculate_morton_index(t, 16, 16 // block_value)
-                    data_x: int = morton_index // 16
-                    data_y: int = morton_index % 16
-                    for i in range(16):
-                        for j in range(block_value):
-                            local_x: int = x * 64 + (data_x * 4 + i // 4) * block_value + j
-                            local_y: int = y * 64 + data_y * 4 + i % 4
-                            if local_x < img_width and local_y < img_height:
-                                destination_index: int = block_data_size * (local_y * img_width + local_x)
-                                if not swizzle_flag:
-                                    converted_data[destination_index: destination_index + block_data_size] = image_data[source_index: source_index + block_data_size]
-                                else:
-                                    converted_data[source_index: source_index + block_data_size] = image_data[destination_index: destination_index + block_data_size]
-                                source_index += block_data_size
-
-    return converted_data
+    return convert_with_swizzle_plan(image_data, len(image_data), swizzle_flag, _get_ps5_plan, img_width // block_width,
+                                     img_height // block_height, block_data_size, block_width == 1 and block_height == 1)
 
 
 def unswizzle_ps5(image_data: bytes, img_width: int, img_height: int, block_width: int = 4, block_height: int = 4, block_data_size: int = 16) -> bytes:
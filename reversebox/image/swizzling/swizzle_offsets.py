@@ -0,0 +1,132 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import functools
+
+import numpy as np
+
+from reversebox.image.swizzling.swizzle_bit_permutation import (
+    PS4_DESCRIPTOR,
+    compile_bit_permutation,
+    get_morton_descriptor,
+    get_ps5_descriptor,
+    get_switch_descriptor,
+)
+
+# fmt: off
+
+# Closed-form address functions of the swizzlers, vectorized with NumPy.
+# Every "get_*_offsets" function gets (x, y) coordinates of units (pixels or compressed blocks)
+# in unswizzled image and returns byte offsets of those units in swizzled data,
+# so any subset of units (e.g. blocks covering one sprite) can be read without unswizzling whole image.
+# Results are the same as addresses used by "swizzle_*.py" modules.
+# Morton-family layouts are described as bit permutations (see "swizzle_bit_permutation.py").
+
+
+def get_linear_offsets(x: np.ndarray, y: np.ndarray, width: int, unit_data_size: int, row_pitch: int = 0) -> np.ndarray:
+    # row_pitch = 0 --> rows are not padded
+    row_pitch = row_pitch or width * unit_data_size
+    return y * row_pitch + x * unit_data_size
+
+
+def get_morton_offsets(x: np.ndarray, y: np.ndarray, width: int, height: int, unit_data_size: int) -> np.ndarray:
+    """
+    Inverse of "calculate_morton_index", bits of x and y are interleaved (x first)
+    while both dimensions are bigger than 1
+    """
+    morton_swizzle = compile_bit_permutation(get_morton_descriptor(width, height))
+    return morton_swizzle.get_tile_offsets(x, y).astype(np.int64) * unit_data_size
+
+
+@functools.lru_cache(maxsize=None)
+def _get_ps4_tile_order() -> np.ndarray:
+    # storage order of units inside of 8x8 tile --> (dx, dy)
+    tile_x, tile_y = compile_bit_permutation(PS4_DESCRIPTOR).get_tile_coordinates(np.arange(64))
+    return np.stack((tile_x, tile_y), axis=-1)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_ps5_tile_order(block_value: int) -> np.ndarray:
+    # block_value = 0 --> linear formats (128x128 tiles), otherwise compressed formats (64x64 tiles)
+    ps5_swizzle = compile_bit_permutation(get_ps5_descriptor(block_value))
+    tile_x, tile_y = ps5_swizzle.get_tile_coordinates(np.arange(ps5_swizzle.tile_size))
+    return np.stack((tile_x, tile_y), axis=-1)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_tile_ranks(tile_order_key: tuple, tile_width: int, tile_height: int, used_width: int, used_height: int) -> np.ndarray:
+    """
+    (tile_height, tile_width) array with storage index of every unit inside of a tile.
+    Units outside of the image ("used_width" x "used_height" part of edge tiles) are skipped by the swizzlers,
+    so they're not counted.
+    """
+    tile_order = _get_ps4_tile_order() if tile_order_key[0] == "ps4" else _get_ps5_tile_order(tile_order_key[1])
+    used = (tile_order[:, 0] < used_width) & (tile_order[:, 1] < used_height)
+    ranks = np.full((tile_height, tile_width), -1, dtype=np.int64)
+    ranks[tile_order[used, 1], tile_order[used, 0]] = np.arange(int(used.sum()))
+    return ranks
+
+
+def _get_skipping_tiled_offsets(x: np.ndarray, y: np.ndarray, width: int, height: int, unit_data_size: int,
+                                tile_width: int, tile_height: int, tile_order_key: tuple) -> np.ndarray:
+    # tiles are stored row by row, units outside of the image are not stored at all
+    tile_x, local_x = np.divmod(x, tile_width)
+    tile_y, local_y = np.divmod(y, tile_height)
+    used_width = np.minimum(tile_width, width - tile_x * tile_width)
+    used_height = np.minimum(tile_height, height - tile_y * tile_height)
+    index = np.minimum(tile_y * tile_height, height) * width + np.minimum(tile_x * tile_width, width) * used_height
+
+    x, y, used_width, used_height, index, local_x, local_y = np.broadcast_arrays(x, y, used_width, used_height, index, local_x, local_y)
+    ranks = np.empty(x.shape, dtype=np.int64)
+    for shape in set(zip(used_width.reshape(-1).tolist(), used_height.reshape(-1).tolist())):
+        mask = (used_width == shape[0]) & (used_height == shape[1])
+        tile_ranks = _get_tile_ranks(tile_order_key, tile_width, tile_height, shape[0], shape[1])
+        ranks[mask] = tile_ranks[local_y[mask], local_x[mask]]
+    return (index + ranks) * unit_data_size
+
+
+def get_ps4_offsets(x: np.ndarray, y: np.ndarray, width: int, height: int, unit_data_size: int) -> np.ndarray:
+    return _get_skipping_tiled_offsets(x, y, width, height, unit_data_size, 8, 8, ("ps4", 0))
+
+
+def get_ps5_offsets(x: np.ndarray, y: np.ndarray, width: int, height: int, unit_data_size: int, is_linear: bool) -> np.ndarray:
+    if is_linear:
+        return _get_skipping_tiled_offsets(x, y, width, height, unit_data_size, 128, 128, ("ps5", 0))
+    block_value: int = {4: 4, 8: 2}.get(unit_data_size, 1)
+    return _get_skipping_tiled_offsets(x, y, width, height, unit_data_size, 64, 64, ("ps5", block_value))
+
+
+def get_switch_offsets(x: np.ndarray, y: np.ndarray, width: int, unit_data_size: int, block_height: int = 8, width_pad: int = 8) -> np.ndarray:
+    # GOB = 64 bytes x 8 rows, "block_height" GOBs are stacked vertically
+    width = (width + width_pad - 1) // width_pad * width_pad
+    image_width_in_gobs: int = width * unit_data_size // 64
+    switch_swizzle = compile_bit_permutation(get_switch_descriptor(block_height))
+    return switch_swizzle.get_offsets(np.asarray(x) * unit_data_size, y, image_width_in_gobs)
+
+
+def get_x360_offsets(x: np.ndarray, y: np.ndarray, width: int, texel_byte_pitch: int) -> np.ndarray:
+    """
+    XGAddress2DTiledOffset, inverse of "_xg_address_2d_tiled_x" and "_xg_address_2d_tiled_y"
+    (texel byte pitch 2, 4, 8 or 16)
+    """
+    if texel_byte_pitch not in (2, 4, 8, 16):
+        raise ValueError(f"Texel byte pitch not supported! Texel_byte_pitch: {texel_byte_pitch}")
+    aligned_width: int = (width + 31) & ~31
+    log_bpp: int = (texel_byte_pitch >> 2) + ((texel_byte_pitch >> 1) >> (texel_byte_pitch >> 2))
+    macro = ((x >> 5) + (y >> 5) * (aligned_width >> 5)) << (log_bpp + 7)
+    micro = ((x & 7) + ((y & 0xE) << 2)) << log_bpp
+    offset = macro + ((micro & ~0xF) << 1) + (micro & 0xF) + ((y & 1) << 4)
+    offset_byte = (((offset & ~0x1FF) << 3) + ((y & 16) << 7) + ((offset & 0x1C0) << 2)
+                   + (((((y & 8) >> 2) + (x >> 3)) & 3) << 6) + (offset & 0x3F))
+    return (offset_byte >> log_bpp) * texel_byte_pitch
+
+
+# GameCube tiles: bpp --> (tile_width, tile_height, tile_data_size), tiles are stored row by row
+GAMECUBE_TILE_SIZES: dict = {
+    4: (8, 8, 32),
+    8: (8, 4, 32),
+    16: (4, 4, 32),
+    32: (4, 4, 64),
+}
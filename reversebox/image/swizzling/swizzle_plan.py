@@ -0,0 +1,165 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import math
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional, TypeVar
+
+import numpy as np
+
+# fmt: off
+
+# Swizzle plans.
+# Swizzlers move units of data (pixels, compressed blocks or parts of them) between linear and swizzled order.
+# Plan stores this mapping for one set of parameters (algorithm, width, height, bpp or block size etc.)
+# as two index arrays: unit "i" of linear data <--> unit "i" of swizzled data.
+# Plan is built once with NumPy, kept in LRU cache and applied with one gather/scatter
+# on the data viewed as array of units, so swizzling the same dimensions again costs only a copy.
+#
+# Units are copied in plan order, so if the same destination unit is used more than once,
+# the last one is kept (the same as in the original per-unit loops).
+# Cache is guarded by lock, so one instance can be shared by swizzling threads.
+
+SWIZZLE_PLAN_CACHE_SIZE: int = 64
+
+# plan built by builder function (SwizzlePlan or tuple with plan and additional values)
+PlanType = TypeVar("PlanType")
+
+
+def _get_unit_dtype(unit_data_size: int) -> np.dtype:
+    if unit_data_size in (1, 2, 4, 8):
+        return np.dtype(f"<u{unit_data_size}")
+    return np.dtype(f"V{unit_data_size}")
+
+
+def _get_index_array(indices: np.ndarray) -> Optional[np.ndarray]:
+    # None --> identity mapping (0, 1, 2, ...), copied with slicing instead of fancy indexing
+    indices = np.ascontiguousarray(indices, dtype=np.int64).reshape(-1)
+    if len(indices) and indices[0] == 0 and (len(indices) == 1 or (np.diff(indices) == 1).all()):
+        return None
+    if len(indices) and indices.max() < 2 ** 31:
+        indices = indices.astype(np.int32)
+    indices.setflags(write=False)
+    return indices
+
+
+class SwizzlePlan:
+    """
+    Linear <--> swizzled unit mapping
+    """
+
+    def __init__(self, linear_indices: np.ndarray, swizzled_indices: np.ndarray, unit_data_size: int):
+        linear_indices = np.asarray(linear_indices).reshape(-1)
+        swizzled_indices = np.asarray(swizzled_indices).reshape(-1)
+        if linear_indices.shape != swizzled_indices.shape:
+            raise ValueError(f"Wrong swizzle plan! Linear indices: {linear_indices.shape}, swizzled indices: {swizzled_indices.shape}")
+        self.unit_data_size: int = unit_data_size
+        self.number_of_units: int = len(linear_indices)
+        # number of units which have to be present in linear and swizzled data
+        self.linear_size: int = int(linear_indices.max()) + 1 if self.number_of_units else 0
+        self.swizzled_size: int = int(swizzled_indices.max()) + 1 if self.number_of_units else 0
+        self.linear_indices: Optional[np.ndarray] = _get_index_array(linear_indices)
+        self.swizzled_indices: Optional[np.ndarray] = _get_index_array(swizzled_indices)
+
+    @classmethod
+    def from_byte_offsets(cls, linear_offsets: np.ndarray, swizzled_offsets: np.ndarray, unit_data_size: int) -> "SwizzlePlan":
+        """
+        Creates plan from byte offsets of units. If offsets are not aligned to unit size,
+        units are split into smaller parts (down to single bytes).
+        """
+        linear_offsets = np.asarray(linear_offsets, dtype=np.int64).reshape(-1)
+        swizzled_offsets = np.asarray(swizzled_offsets, dtype=np.int64).reshape(-1)
+        part_size: int = unit_data_size
+        if len(linear_offsets):
+            part_size = math.gcd(part_size, int(np.gcd.reduce(linear_offsets)), int(np.gcd.reduce(swizzled_offsets)))
+        if part_size != unit_data_size:
+            part_offsets = np.arange(0, unit_data_size, part_size, dtype=np.int64)
+            linear_offsets = (linear_offsets[:, None] + part_offsets).reshape(-1)
+            swizzled_offsets = (swizzled_offsets[:, None] + part_offsets).reshape(-1)
+        return cls(linear_offsets // part_size, swizzled_offsets // part_size, part_size)
+
+    def _get_units(self, data, number_of_units: int) -> np.ndarray:
+        data_array = np.frombuffer(data, dtype=np.uint8)
+        required_size: int = number_of_units * self.unit_data_size
+        if len(data_array) < required_size:
+            # missing data is treated as zeros
+            data_array = np.concatenate((data_array, np.zeros(required_size - len(data_array), dtype=np.uint8)))
+        return data_array[:required_size].view(_get_unit_dtype(self.unit_data_size))
+
+    def apply(self, data, output_size: int, swizzle_flag: bool) -> bytes:
+        """
+        swizzle_flag=False --> data is swizzled, returns linear data
+        swizzle_flag=True --> data is linear, returns swizzled data
+        Output is "output_size" bytes long, unused bytes are zeros and units written past it are dropped.
+        """
+        return self.apply_to_array(data, output_size, swizzle_flag).tobytes()
+
+    def apply_to_array(self, data, output_size: int, swizzle_flag: bool) -> np.ndarray:
+        """
+        The same as "apply", but returns writable uint8 array, so output can be post-processed in place
+        """
+        if self.unit_data_size == 0 or self.number_of_units == 0:
+            return np.zeros(output_size, dtype=np.uint8)
+        if swizzle_flag:
+            source_indices, source_size = self.linear_indices, self.linear_size
+            destination_indices, destination_size = self.swizzled_indices, self.swizzled_size
+        else:
+            source_indices, source_size = self.swizzled_indices, self.swizzled_size
+            destination_indices, destination_size = self.linear_indices, self.linear_size
+
+        source_units = self._get_units(data, source_size)
+        output = np.zeros(max(-(-output_size // self.unit_data_size), destination_size) * self.unit_data_size, dtype=np.uint8)
+        output_units = output[:destination_size * self.unit_data_size].view(source_units.dtype)
+
+        values = source_units[:self.number_of_units] if source_indices is None else source_units.take(source_indices)
+        if destination_indices is None:
+            output_units[:self.number_of_units] = values
+        else:
+            output_units[destination_indices] = values
+        return output[:output_size]
+
+
+class SwizzlePlanCache:
+
+    def __init__(self, max_plans: int = SWIZZLE_PLAN_CACHE_SIZE):
+        self.max_plans: int = max_plans
+        self._plans: OrderedDict = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self._lock = threading.Lock()
+
+    def get_swizzle_plan(self, build_plan_function: Callable[..., PlanType], *plan_params) -> PlanType:
+        """
+        Returns plan built by "build_plan_function(*plan_params)", plans are cached by function and parameters
+        """
+        plan_key: tuple = (build_plan_function, plan_params)
+        with self._lock:
+            if plan_key in self._plans:
+                self._plans.move_to_end(plan_key)
+                self.hits += 1
+                return self._plans[plan_key]
+
+            self.misses += 1
+            plan: PlanType = build_plan_function(*plan_params)
+            self._plans[plan_key] = plan
+            while len(self._plans) > self.max_plans:
+                self._plans.popitem(last=False)
+            return plan
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# shared cache used by swizzlers
+swizzle_plan_cache = SwizzlePlanCache()
+
+
+def convert_with_swizzle_plan(data, output_size: int, swizzle_flag: bool, build_plan_function: Callable[..., SwizzlePlan], *plan_params) -> bytes:
+    plan: SwizzlePlan = swizzle_plan_cache.get_swizzle_plan(build_plan_function, *plan_params)
+    return plan.apply(data, output_size, swizzle_flag)
@@ -0,0 +1,277 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import functools
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from reversebox.image.swizzling.swizzle_bit_permutation import compile_bit_permutation
+
+# fmt: off
+
+# PS2 GS local memory (VRAM) model.
+# GS has 4 MB of memory divided into pages (8 KB), pages are divided into blocks (256 bytes)
+# and blocks into columns (64 bytes). Every storage format (PSM) arranges pixels inside of the page differently,
+# so data written with one PSM and read with another one is "swizzled" (e.g. PSMT8 texture uploaded as PSMCT32).
+#
+# Pixel address inside of the page is a permutation of coordinate bits (see "swizzle_bit_permutation.py"),
+# 8-bit and 4-bit formats additionally swap halves of odd column pairs (one address bit xored with y1 ^ y2).
+# Pages of the buffer are stored row by row, "TBW" is the buffer width in 64 pixel units
+# and "TBP" is the buffer base pointer in 256 byte blocks.
+#
+# Example (8-bit texture stored as 32-bit data):
+# gs_memory = GSMemory()
+# gs_memory.upload(swizzled_data, PSMCT32, tbp=0, tbw=2, width=128, height=64)
+# image_data = gs_memory.download(PSMT8, tbp=0, tbw=4, width=256, height=128)
+
+PSMCT32 = 0x00
+PSMCT16 = 0x02
+PSMCT16S = 0x0A
+PSMT8 = 0x13
+PSMT4 = 0x14
+
+GS_MEMORY_SIZE: int = 4 * 1024 * 1024
+GS_PAGE_SIZE: int = 8192
+GS_BLOCK_SIZE: int = 256
+
+
+@dataclass(frozen=True)
+class GSStorageFormat:
+    page_width: int
+    page_height: int
+    bpp: int
+    page_descriptor: str  # pixel address inside of the page (from the least significant bit)
+    column_swap_bit: Optional[int] = None  # address bit xored with (y1 ^ y2)
+
+
+GS_STORAGE_FORMATS: Dict[int, GSStorageFormat] = {
+    PSMCT32: GSStorageFormat(64, 32, 32, "x0 y0 x1 x2 y1 y2 x3 y3 x4 y4 x5"),
+    PSMCT16: GSStorageFormat(64, 64, 16, "x3 x0 y0 x1 x2 y1 y2 y3 x4 y4 x5 y5"),
+    PSMCT16S: GSStorageFormat(64, 64, 16, "x3 x0 y0 x1 x2 y1 y2 y3 x4 y5 y4 x5"),
+    PSMT8: GSStorageFormat(128, 64, 8, "y1 x3 x0 y0 x1 x2 y2 y3 x4 y4 x5 y5 x6", 5),
+    PSMT4: GSStorageFormat(128, 128, 4, "y1 x3 x4 x0 y0 x1 x2 y2 y3 y4 x5 y5 x6 y6", 6),
+}
+
+
+def get_gs_storage_format(psm: int) -> GSStorageFormat:
+    storage_format: Optional[GSStorageFormat] = GS_STORAGE_FORMATS.get(psm)
+    if storage_format is None:
+        raise ValueError(f"Not supported PSM: {psm}!")
+    return storage_format
+
+
+@functools.lru_cache(maxsize=None)
+def get_gs_page_table(psm: int) -> np.ndarray:
+    """
+    Returns array (page_height, page_width) with pixel addresses inside of the page
+    (in pixel units, e.g. nibbles for PSMT4)
+    """
+    storage_format: GSStorageFormat = get_gs_storage_format(psm)
+    y, x = np.mgrid[0:storage_format.page_height, 0:storage_format.page_width]
+    page_table = compile_bit_permutation(storage_format.page_descriptor).get_tile_offsets(x, y).astype(np.int64)
+    if storage_format.column_swap_bit is not None:
+        page_table ^= (((y >> 1) ^ (y >> 2)) & 1) << storage_format.column_swap_bit
+    page_table.setflags(write=False)
+    return page_table
+
+
+@functools.lru_cache(maxsize=None)
+def _get_gs_page_coordinates(psm: int) -> Tuple[np.ndarray, np.ndarray]:
+    # inverse of page table, pixel address inside of the page --> (x, y)
+    page_table: np.ndarray = get_gs_page_table(psm)
+    y, x = np.divmod(np.argsort(page_table, axis=None), page_table.shape[1])
+    x.setflags(write=False)
+    y.setflags(write=False)
+    return x, y
+
+
+def _get_pages_per_row(storage_format: GSStorageFormat, tbw: int) -> int:
+    return max(1, tbw * 64 // storage_format.page_width)
+
+
+def get_gs_pixel_addresses(psm: int, tbp: int, tbw: int, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    (x, y) coordinates in buffer --> pixel addresses in GS memory (in pixel units, not wrapped)
+    """
+    storage_format: GSStorageFormat = get_gs_storage_format(psm)
+    x = np.asarray(x, dtype=np.int64)
+    y = np.asarray(y, dtype=np.int64)
+    page_y, local_y = np.divmod(y, storage_format.page_height)
+    page_x, local_x = np.divmod(x, storage_format.page_width)
+    page_index = page_y * _get_pages_per_row(storage_format, tbw) + page_x
+    return ((tbp * GS_BLOCK_SIZE + page_index * GS_PAGE_SIZE) * 8 // storage_format.bpp
+            + get_gs_page_table(psm)[local_y, local_x])
+
+
+def get_gs_pixel_coordinates(psm: int, tbp: int, tbw: int, addresses: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pixel addresses in GS memory --> (x, y) coordinates in buffer (inverse of "get_gs_pixel_addresses")
+    """
+    storage_format: GSStorageFormat = get_gs_storage_format(psm)
+    addresses = np.asarray(addresses, dtype=np.int64) - tbp * GS_BLOCK_SIZE * 8 // storage_format.bpp
+    page_index, local_addresses = np.divmod(addresses, GS_PAGE_SIZE * 8 // storage_format.bpp)
+    page_y, page_x = np.divmod(page_index, _get_pages_per_row(storage_format, tbw))
+    local_x, local_y = _get_gs_page_coordinates(psm)
+    return (page_x * storage_format.page_width + local_x[local_addresses],
+            page_y * storage_format.page_height + local_y[local_addresses])
+
+
+def get_gs_transfer_indices(source_psm: int, source_tbw: int, source_width: int, source_height: int,
+                            destination_psm: int, destination_tbw: int, destination_width: int, destination_height: int,
+                            tbp: int = 0) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Image written to GS memory with source PSM and read back with destination PSM (both at the same TBP).
+    Returns (destination_indices, source_indices, unit_bits), where unit "destination_indices[i]"
+    of destination image is unit "source_indices[i]" of source image.
+    Units are "unit_bits" long (bpp of the smaller format). Units not covered by source image are skipped.
+    """
+    source_format: GSStorageFormat = get_gs_storage_format(source_psm)
+    destination_format: GSStorageFormat = get_gs_storage_format(destination_psm)
+    unit_bits: int = min(source_format.bpp, destination_format.bpp)
+    source_units_per_pixel: int = source_format.bpp // unit_bits
+    destination_units_per_pixel: int = destination_format.bpp // unit_bits
+
+    y, x = np.mgrid[0:destination_height, 0:destination_width]
+    pixel_addresses = get_gs_pixel_addresses(destination_psm, tbp, destination_tbw, x, y).reshape(-1)
+    unit_addresses = (pixel_addresses[:, None] * destination_units_per_pixel + np.arange(destination_units_per_pixel)).reshape(-1)
+
+    source_x, source_y = get_gs_pixel_coordinates(source_psm, tbp, source_tbw, unit_addresses // source_units_per_pixel)
+    valid = (source_x >= 0) & (source_x < source_width) & (source_y >= 0) & (source_y < source_height)
+    source_indices = (source_y * source_width + source_x) * source_units_per_pixel + unit_addresses % source_units_per_pixel
+    destination_indices = np.arange(len(unit_addresses), dtype=np.int64)
+    return destination_indices[valid], source_indices[valid], unit_bits
+
+
+def get_gs_packed_page_indices(psm: int, img_width: int, img_height: int,
+                               crop_width: int, crop_height: int) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Texture stored as PSMCT32 data, where every page of the texture is cropped to "crop_width x crop_height"
+    words (part of the page used by smaller textures) and cropped pages are packed next to each other.
+    For textures covering whole pages it is the same as upload with PSMCT32 and download with texture PSM.
+    Returns (linear_indices, swizzled_indices, unit_bits), units are pixels of the texture.
+    """
+    storage_format: GSStorageFormat = get_gs_storage_format(psm)
+    units_per_word: int = 32 // storage_format.bpp
+    pages_per_row: int = -(-img_width // storage_format.page_width)
+
+    y, x = np.mgrid[0:img_height, 0:img_width]
+    page_y, local_y = np.divmod(y.reshape(-1), storage_format.page_height)
+    page_x, local_x = np.divmod(x.reshape(-1), storage_format.page_width)
+    addresses = get_gs_page_table(psm)[local_y, local_x]
+    word_x, word_y = _get_gs_page_coordinates(PSMCT32)
+    word_x, word_y = word_x[addresses // units_per_word], word_y[addresses // units_per_word]
+
+    valid = (word_x < crop_width) & (word_y < crop_height)
+    swizzled_indices = (((page_y * crop_height + word_y) * pages_per_row * crop_width + page_x * crop_width + word_x)
+                        * units_per_word + addresses % units_per_word)
+    linear_indices = np.arange(img_width * img_height, dtype=np.int64)
+    return linear_indices[valid], swizzled_indices[valid], storage_format.bpp
+
+
+def get_csm1_entry_order(number_of_colors: int) -> np.ndarray:
+    """
+    CSM1 CLUT stores 8-color stripes swapped (bits 3 and 4 of the color index are exchanged),
+    returns indices of stored entries in logical color order (the same mapping in both directions)
+    """
+    indices = np.arange(-(-number_of_colors // 32) * 32, dtype=np.int64)
+    indices = (indices & ~0x18) | ((indices & 0x08) << 1) | ((indices & 0x10) >> 1)
+    return indices[indices < number_of_colors]
+
+
+def _unpack_nibbles(data) -> np.ndarray:
+    packed_data = np.frombuffer(data, dtype=np.uint8)
+    nibbles = np.empty(len(packed_data) * 2, dtype=np.uint8)
+    nibbles[0::2] = packed_data & 0x0F
+    nibbles[1::2] = packed_data >> 4
+    return nibbles
+
+
+def _pack_nibbles(nibbles: np.ndarray) -> bytes:
+    if len(nibbles) % 2:
+        nibbles = np.append(nibbles, np.uint8(0))
+    return (nibbles[0::2] | (nibbles[1::2] << 4)).astype(np.uint8).tobytes()
+
+
+class GSMemory:
+    """
+    GS local memory, e.g. for decoding textures directly from VRAM dumps
+    """
+
+    def __init__(self, memory_data: Optional[bytes] = None, memory_size: int = GS_MEMORY_SIZE):
+        self.memory: np.ndarray = np.zeros(memory_size, dtype=np.uint8)
+        if memory_data is not None:
+            memory_array = np.frombuffer(memory_data, dtype=np.uint8)[:memory_size]
+            self.memory[:len(memory_array)] = memory_array
+
+    def _get_addresses(self, psm: int, tbp: int, tbw: int, width: int, height: int, x: int, y: int) -> np.ndarray:
+        storage_format: GSStorageFormat = get_gs_storage_format(psm)
+        pixel_y, pixel_x = np.mgrid[y:y + height, x:x + width]
+        addresses = get_gs_pixel_addresses(psm, tbp, tbw, pixel_x, pixel_y).reshape(-1)
+        return addresses % (len(self.memory) * 8 // storage_format.bpp)  # addresses wrap around like on real hardware
+
+    def _write_pixels(self, psm: int, addresses: np.ndarray, pixels) -> None:
+        bpp: int = get_gs_storage_format(psm).bpp
+        if bpp == 4:
+            nibbles = _unpack_nibbles(pixels)[:len(addresses)]
+            addresses = addresses[:len(nibbles)]
+            # two passes, so both nibbles of one byte can be written
+            for nibble_number in (0, 1):
+                selected = (addresses & 1) == nibble_number
+                byte_addresses = addresses[selected] >> 1
+                shift: int = nibble_number * 4
+                self.memory[byte_addresses] = (self.memory[byte_addresses] & (0xF0 >> shift)) | (nibbles[selected] << shift)
+        else:
+            memory_units = self.memory.view(f"<u{bpp // 8}")
+            pixel_array = np.frombuffer(pixels, dtype=f"<u{bpp // 8}", count=min(len(addresses), len(pixels) // (bpp // 8)))
+            memory_units[addresses[:len(pixel_array)]] = pixel_array
+
+    def _read_pixels(self, psm: int, addresses: np.ndarray) -> bytes:
+        bpp: int = get_gs_storage_format(psm).bpp
+        if bpp == 4:
+            return _pack_nibbles((self.memory[addresses >> 1] >> ((addresses & 1) * 4).astype(np.uint8)) & 0x0F)
+        return self.memory.view(f"<u{bpp // 8}")[addresses].tobytes()
+
+    def upload(self, image_data: bytes, psm: int, tbp: int, tbw: int, width: int, height: int, x: int = 0, y: int = 0) -> None:
+        """
+        Host --> local transfer of "width x height" rectangle at (x, y) of the buffer
+        """
+        self._write_pixels(psm, self._get_addresses(psm, tbp, tbw, width, height, x, y), image_data)
+
+    def download(self, psm: int, tbp: int, tbw: int, width: int, height: int, x: int = 0, y: int = 0) -> bytes:
+        """
+        Local --> host transfer of "width x height" rectangle at (x, y) of the buffer
+        """
+        return self._read_pixels(psm, self._get_addresses(psm, tbp, tbw, width, height, x, y))
+
+    def download_clut(self, cbp: int, cpsm: int, number_of_colors: int, csm: int = 1,
+                      cbw: int = 1, cou: int = 0, cov: int = 0) -> bytes:
+        """
+        Returns CLUT stored at "cbp" in logical color order.
+        CSM1 --> 8x2 (16 colors) or 16x16 (256 colors, stripes swapped) rectangle, PSMCT32/PSMCT16/PSMCT16S
+        CSM2 --> one line of colors at (cou * 16, cov) of buffer with "cbw" width, PSMCT16 only
+        """
+        if number_of_colors not in (16, 256):
+            raise ValueError(f"Wrong number of CLUT colors: {number_of_colors}!")
+        if csm == 1:
+            if cpsm not in (PSMCT32, PSMCT16, PSMCT16S):
+                raise ValueError(f"Not supported CLUT PSM: {cpsm}!")
+            if number_of_colors == 256:
+                stored_positions = np.argsort(get_csm1_entry_order(256))
+                clut_x, clut_y = stored_positions & 0x0F, stored_positions >> 4
+            else:
+                clut_y, clut_x = np.divmod(np.arange(16), 8)
+            addresses = get_gs_pixel_addresses(cpsm, cbp, 1, clut_x, clut_y)
+        elif csm == 2:
+            if cpsm != PSMCT16:
+                raise ValueError(f"Not supported CLUT PSM for CSM2: {cpsm}!")
+            addresses = get_gs_pixel_addresses(cpsm, cbp, cbw, cou * 16 + np.arange(number_of_colors), np.full(number_of_colors, cov))
+        else:
+            raise ValueError(f"Not supported CLUT storage mode: {csm}!")
+        return self._read_pixels(cpsm, addresses % (len(self.memory) * 8 // get_gs_storage_format(cpsm).bpp))
+
+    def get_memory_data(self) -> bytes:
+        return self.memory.tobytes()
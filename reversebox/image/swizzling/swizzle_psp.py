@@ -1,9 +1,17 @@
 """
-Copyright © 2024-2025  Bartłomiej Duda
+Copyright © 2024-2026  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
+import math
+
+import numpy as np
+
 from reversebox.image.common import get_stride_value, get_stride_value_psp
+from reversebox.image.swizzling.swizzle_plan import (
+    SwizzlePlan,
+    convert_with_swizzle_plan,
+)
 
 # fmt: off
 
@@ -13,40 +21,23 @@ from reversebox.image.common import get_stride_value, get_stride_value_psp
 # Use "psp_image_padding" function to adjust image data.
 
 
-def unswizzle_psp(image_data: bytes, img_width: int, img_height: int, bpp: int) -> bytes:
-    stride: int = get_stride_value_psp(img_width, bpp)
-    unswizzled_data = bytearray(len(image_data))
-    unswizzled_data_offset: int = 0
-    row_blocks: int = stride // 16
+def _get_psp_plan(linear_stride: int, padded_stride: int, img_height: int) -> SwizzlePlan:
+    # swizzled data is made of 16x8 byte blocks, rows of blocks are "padded_stride" bytes wide
+    chunk_size: int = math.gcd(linear_stride, 16)
+    y, x = np.mgrid[0:img_height, 0:linear_stride:chunk_size]
+    row_blocks: int = padded_stride // 16
+    block_address = ((x // 16) + (y // 8) * row_blocks) * 16 * 8
+    swizzled_offsets = block_address + (y % 8) * 16 + x % 16
+    return SwizzlePlan.from_byte_offsets(y * linear_stride + x, swizzled_offsets, chunk_size)
 
-    for y in range(img_height):
-        for x in range(stride):
-            block_x = x // 16
-            block_y = y // 8
-            block_index = block_x + (block_y * row_blocks)
-            block_address = block_index * 16 * 8
-            local_position: int = (x % 16) + (y % 8) * 16
-            unswizzled_data[unswizzled_data_offset] = image_data[block_address + local_position]
-            unswizzled_data_offset += 1
 
-    return bytes(unswizzled_data)
+def unswizzle_psp(image_data: bytes, img_width: int, img_height: int, bpp: int) -> bytes:
+    stride: int = get_stride_value_psp(img_width, bpp)
+    return convert_with_swizzle_plan(image_data, len(image_data), False, _get_psp_plan, stride, stride, img_height)
 
 
 def swizzle_psp(image_data: bytes, img_width: int, img_height: int, bpp: int) -> bytes:
     stride: int = get_stride_value(img_width, bpp)
     padded_stride: int = get_stride_value_psp(img_width, bpp)
     padded_height: int = (img_height + 7) & ~7
-    swizzled_data: bytearray = bytearray(padded_stride * padded_height)
-    row_blocks: int = padded_stride // 16
-
-    for y in range(img_height):
-        for x in range(stride):
-            block_x = x // 16
-            block_y = y // 8
-            block_index = block_x + block_y * row_blocks
-            block_address = block_index * 16 * 8
-            local_x = x % 16
-            local_y = y % 8
-            swizzled_data[block_address + local_y * 16 + local_x] = image_data[y * stride + x]
-
-    return bytes(swizzled_data)
+    return convert_with_swizzle_plan(image_data, padded_stride * padded_height, True, _get_psp_plan, stride, padded_stride, img_height)
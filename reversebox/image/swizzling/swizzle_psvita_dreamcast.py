@@ -1,9 +1,19 @@
 """
-Copyright © 2024-2025  Bartłomiej Duda
+Copyright © 2024-2026  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
+import numpy as np
+
 from reversebox.image.common import convert_bpp_to_bytes_per_pixel
+from reversebox.image.swizzling.swizzle_bit_permutation import (
+    compile_bit_permutation,
+    get_psvita_dreamcast_descriptor,
+)
+from reversebox.image.swizzling.swizzle_plan import (
+    SwizzlePlan,
+    convert_with_swizzle_plan,
+)
 
 # fmt: off
 
@@ -27,6 +37,7 @@ from reversebox.image.common import convert_bpp_to_bytes_per_pixel
 
 
 def calculate_morton_index_psvita_dreamcast(p: int, width: int, height: int) -> int:
+    # works also for NumPy arrays of indices
     ddx = 1
     ddy = width
     q = 0
@@ -34,19 +45,27 @@ def calculate_morton_index_psvita_dreamcast(p: int, width: int, height: int) ->
     for i in range(16):
         height >>= 1
         if height:
-            if p & 1:
-                q |= ddy
+            q |= ddy * (p & 1)
             p >>= 1
         ddy <<= 1
         if width >> 1:
-            if p & 1:
-                q |= ddx
+            q |= ddx * (p & 1)
             p >>= 1
         ddx <<= 1
 
     return q
 
 
+def _get_morton_psvita_dreamcast_plan(width_in_blocks: int, height_in_blocks: int, block_data_size: int) -> SwizzlePlan:
+    swizzled_indices = np.arange(width_in_blocks * height_in_blocks, dtype=np.int64)
+    x, y = compile_bit_permutation(get_psvita_dreamcast_descriptor(width_in_blocks, height_in_blocks)).get_tile_coordinates(swizzled_indices)
+    # rows are combined with OR, the same as in "calculate_morton_index_psvita_dreamcast"
+    linear_indices = x
+    for i in range(16):
+        linear_indices |= ((y >> i) & 1) * (width_in_blocks << i)
+    return SwizzlePlan(linear_indices, swizzled_indices, block_data_size)
+
+
 def _convert_morton_psvita_dreamcast(pixel_data: bytes, img_width: int, img_height: int, bpp: int, block_width: int, block_height: int, swizzle_flag: bool) -> bytes:
     if bpp == 1:
         block_data_size: int = (block_width * block_height) // 8
@@ -58,21 +77,8 @@ def _convert_morton_psvita_dreamcast(pixel_data: bytes, img_width: int, img_heig
         bytes_per_pixel: int = convert_bpp_to_bytes_per_pixel(bpp)
         block_data_size: int = bytes_per_pixel * block_width * block_height
 
-    converted_data: bytearray = bytearray(len(pixel_data))
-    img_width //= block_width
-    img_height //= block_height
-    source_index: int = 0
-
-    for t in range(img_width * img_height):
-        index = calculate_morton_index_psvita_dreamcast(t, img_width, img_height)
-        destination_index = block_data_size * index
-        if not swizzle_flag:
-            converted_data[destination_index:destination_index + block_data_size] = pixel_data[source_index:source_index + block_data_size]
-        else:
-            converted_data[source_index:source_index + block_data_size] = pixel_data[destination_index:destination_index + block_data_size]
-        source_index += block_data_size
-
-    return converted_data
+    return convert_with_swizzle_plan(pixel_data, len(pixel_data), swizzle_flag, _get_morton_psvita_dreamcast_plan,
+                                     img_width // block_width, img_height // block_height, block_data_size)
 
 
 def unswizzle_psvita_dreamcast(pixel_data: bytes, img_width: int, img_height: int, bpp: int, block_width: int = 1, block_height: int = 1) -> bytes:
@@ -1,52 +1,43 @@
 """
-Copyright © 2025  Bartłomiej Duda
+Copyright © 2025-2026  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from reversebox.image.swizzling.swizzle_bit_permutation import (
+    compile_bit_permutation,
+    get_switch_descriptor,
+)
+from reversebox.image.swizzling.swizzle_offsets import get_switch_offsets
+from reversebox.image.swizzling.swizzle_plan import (
+    SwizzlePlan,
+    convert_with_swizzle_plan,
+    swizzle_plan_cache,
+)
+
 # Nintendo Switch Swizzling
 
 # fmt: off
 
 
+def _get_switch_plan(img_width: int, img_height: int, bytes_per_block: int, block_height: int, width_pad: int) -> SwizzlePlan:
+    # blocks of padded image are swizzled, linear data has only "img_width" x "img_height" blocks
+    y, x = np.mgrid[0:img_height, 0:img_width]
+    swizzled_offsets = get_switch_offsets(x, y, img_width, bytes_per_block, block_height, width_pad)
+    return SwizzlePlan.from_byte_offsets((y * img_width + x) * bytes_per_block, swizzled_offsets, bytes_per_block)
+
+
 def _convert_switch(input_image_data: bytes, img_width: int, img_height: int,
                     bytes_per_block: int = 4, block_height: int = 8, width_pad: int = 8, height_pad: int = 8, swizzle_flag: bool = False):
-    # set parameters
-    converted_data = bytearray(len(input_image_data))
-    if img_width % width_pad or img_height % height_pad:
-        width_show = img_width
-        height_show = img_height
-        img_width = width_real = ((img_width + width_pad - 1) // width_pad) * width_pad
-        img_height = height_real = ((img_height + height_pad - 1) // height_pad) * height_pad
+    if not swizzle_flag and (img_width % width_pad or img_height % height_pad):
+        output_size: int = img_width * img_height * bytes_per_block  # cropped image
     else:
-        width_show = width_real = img_width
-        height_show = height_real = img_height
-    image_width_in_gobs = img_width * bytes_per_block // 64
-
-    # unswizzling logic
-    for Y in range(img_height):
-        for X in range(img_width):
-            Z = Y * img_width + X
-            gob_address = 0 + (Y // (8 * block_height)) * 512 * block_height * image_width_in_gobs + (X * bytes_per_block // 64) * 512 * block_height + (Y % (8 * block_height) // 8) * 512
-            X *= bytes_per_block
-            address = gob_address + ((X % 64) // 32) * 256 + ((Y % 8) // 2) * 64 + ((X % 32) // 16) * 32 + (Y % 2) * 16 + (X % 16)
-            if not swizzle_flag:
-                converted_data[Z * bytes_per_block:(Z + 1) * bytes_per_block] = input_image_data[address:address + bytes_per_block]
-            else:
-                converted_data[address:address + bytes_per_block] = input_image_data[Z * bytes_per_block:(Z + 1) * bytes_per_block]
-
-    # crop logic
-    if width_show != width_real or height_show != height_real:
-        crop = bytearray(width_show * height_show * bytes_per_block)
-        for Y in range(height_show):
-            offset_in = Y * width_real * bytes_per_block
-            offset_out = Y * width_show * bytes_per_block
-            if not swizzle_flag:
-                crop[offset_out:offset_out + width_show * bytes_per_block] = converted_data[offset_in:offset_in + width_show * bytes_per_block]
-            else:
-                crop[offset_in:offset_in + width_show * bytes_per_block] = converted_data[offset_out:offset_out + width_show * bytes_per_block]
-        converted_data = crop
-
-    return converted_data
+        output_size: int = len(input_image_data)
+    return convert_with_swizzle_plan(input_image_data, output_size, swizzle_flag, _get_switch_plan,
+                                     img_width, img_height, bytes_per_block, block_height, width_pad)
 
 
 def unswizzle_switch(input_image_data: bytes, img_width: int, img_height: int,
@@ -57,3 +48,138 @@ def unswizzle_switch(input_image_data: bytes, img_width: int, img_height: int,
 def swizzle_switch(input_image_data: bytes, img_width: int, img_height: int,
                    bytes_per_block: int = 4, block_height: int = 8, width_pad: int = 8, height_pad: int = 8) -> bytes:
     return _convert_switch(input_image_data, img_width, img_height, bytes_per_block, block_height, width_pad, height_pad, True)
+
+
+# Block-linear surfaces (all mip levels and array layers)
+# Block height (number of GOBs stacked vertically) of the first level is chosen from the texture height
+# the same way as in the GPU driver, smaller mip levels use smaller block heights.
+# Every array layer starts at address aligned to the size of one block of GOBs.
+
+GOB_WIDTH_IN_BYTES = 64
+GOB_HEIGHT = 8
+GOB_SIZE_IN_BYTES = 512
+
+
+def _div_round_up(value: int, divisor: int) -> int:
+    return (value + divisor - 1) // divisor
+
+
+def get_switch_block_height(height_in_blocks: int) -> int:
+    """
+    Block height (in GOBs) of the first mip level
+    """
+    height_and_half: int = height_in_blocks + height_in_blocks // 2
+    for block_height in (16, 8, 4, 2):
+        if height_and_half >= block_height * GOB_HEIGHT:
+            return block_height
+    return 1
+
+
+def get_switch_mip_block_height(mip_height_in_blocks: int, block_height_mip0: int) -> int:
+    block_height: int = block_height_mip0
+    while block_height > 1 and mip_height_in_blocks <= (block_height // 2) * GOB_HEIGHT:
+        block_height //= 2
+    return block_height
+
+
+def get_switch_swizzled_mip_size(width_in_blocks: int, height_in_blocks: int, bytes_per_block: int, block_height: int) -> int:
+    width_in_gobs: int = _div_round_up(width_in_blocks * bytes_per_block, GOB_WIDTH_IN_BYTES)
+    height_in_gobs: int = _div_round_up(height_in_blocks, block_height * GOB_HEIGHT) * block_height
+    return width_in_gobs * height_in_gobs * GOB_SIZE_IN_BYTES
+
+
+def _get_switch_mip_dimensions(img_width: int, img_height: int, block_width: int, block_height: int, mip_level: int) -> Tuple[int, int]:
+    return (_div_round_up(max(1, img_width >> mip_level), block_width),
+            _div_round_up(max(1, img_height >> mip_level), block_height))
+
+
+def _get_switch_surface_layout(img_width: int, img_height: int, bytes_per_block: int, block_width: int, block_height: int,
+                               number_of_mips: int, number_of_layers: int, block_height_mip0: int) -> Tuple[List[int], List[int], int]:
+    # returns (offsets of mip levels inside of layer, block heights of mip levels, aligned layer size)
+    mip_offsets: List[int] = []
+    mip_block_heights: List[int] = []
+    layer_size: int = 0
+    for mip_level in range(number_of_mips):
+        width_in_blocks, height_in_blocks = _get_switch_mip_dimensions(img_width, img_height, block_width, block_height, mip_level)
+        mip_block_height: int = get_switch_mip_block_height(height_in_blocks, block_height_mip0)
+        mip_offsets.append(layer_size)
+        mip_block_heights.append(mip_block_height)
+        layer_size += get_switch_swizzled_mip_size(width_in_blocks, height_in_blocks, bytes_per_block, mip_block_height)
+
+    if number_of_layers > 1:
+        height_in_blocks: int = _div_round_up(img_height, block_height)
+        layer_alignment: int = get_switch_mip_block_height(height_in_blocks, block_height_mip0) * GOB_SIZE_IN_BYTES
+        layer_size = _div_round_up(layer_size, layer_alignment) * layer_alignment
+    return mip_offsets, mip_block_heights, layer_size
+
+
+def get_switch_surface_size(img_width: int, img_height: int, bytes_per_block: int, block_width: int = 1, block_height: int = 1,
+                            number_of_mips: int = 1, number_of_layers: int = 1, block_height_in_gobs: Optional[int] = None) -> int:
+    if block_height_in_gobs is None:
+        block_height_in_gobs = get_switch_block_height(_div_round_up(img_height, block_height))
+    layer_size: int = _get_switch_surface_layout(img_width, img_height, bytes_per_block, block_width, block_height,
+                                                 number_of_mips, number_of_layers, block_height_in_gobs)[2]
+    return layer_size * number_of_layers
+
+
+def _get_switch_surface_plan(img_width: int, img_height: int, bytes_per_block: int, block_width: int, block_height: int,
+                             number_of_mips: int, number_of_layers: int, block_height_mip0: int) -> Tuple[SwizzlePlan, List[int], int]:
+    # linear data --> mip levels one after another, layers of every level one after another
+    # swizzled data --> layers one after another, mip levels of every layer one after another
+    mip_offsets, mip_block_heights, layer_size = _get_switch_surface_layout(img_width, img_height, bytes_per_block, block_width, block_height,
+                                                                            number_of_mips, number_of_layers, block_height_mip0)
+    linear_mip_sizes: List[int] = []
+    swizzled_offsets: List[np.ndarray] = []
+    for mip_level in range(number_of_mips):
+        width_in_blocks, height_in_blocks = _get_switch_mip_dimensions(img_width, img_height, block_width, block_height, mip_level)
+        switch_swizzle = compile_bit_permutation(get_switch_descriptor(mip_block_heights[mip_level]))
+        y, x = np.mgrid[0:height_in_blocks, 0:width_in_blocks]
+        mip_offsets_in_layer = switch_swizzle.get_offsets(x * bytes_per_block, y,
+                                                          _div_round_up(width_in_blocks * bytes_per_block, GOB_WIDTH_IN_BYTES))
+        layer_offsets = np.arange(number_of_layers, dtype=np.int64) * layer_size + mip_offsets[mip_level]
+        swizzled_offsets.append((layer_offsets[:, None] + mip_offsets_in_layer.reshape(1, -1)).reshape(-1))
+        linear_mip_sizes.append(width_in_blocks * height_in_blocks * bytes_per_block * number_of_layers)
+
+    swizzled_offsets_array = np.concatenate(swizzled_offsets)
+    linear_offsets = np.arange(swizzled_offsets_array.size, dtype=np.int64) * bytes_per_block
+    plan: SwizzlePlan = SwizzlePlan.from_byte_offsets(linear_offsets, swizzled_offsets_array, bytes_per_block)
+    return plan, linear_mip_sizes, layer_size * number_of_layers
+
+
+def unswizzle_switch_surface(input_image_data: bytes, img_width: int, img_height: int, bytes_per_block: int,
+                             block_width: int = 1, block_height: int = 1, number_of_mips: int = 1, number_of_layers: int = 1,
+                             block_height_in_gobs: Optional[int] = None) -> List[bytes]:
+    """
+    Unswizzles every mip level and array layer of block-linear surface (BNTX/XTX textures) in one pass.
+    bytes_per_block --> size of pixel or compressed block (block_width x block_height pixels)
+    block_height_in_gobs --> block height of the first level (from texture header),
+                             computed from the texture height if not provided
+    Returns list of linear mip levels, layers of every level are stored one after another (cube faces are layers).
+    """
+    if block_height_in_gobs is None:
+        block_height_in_gobs = get_switch_block_height(_div_round_up(img_height, block_height))
+    plan, linear_mip_sizes, _ = swizzle_plan_cache.get_swizzle_plan(_get_switch_surface_plan, img_width, img_height, bytes_per_block,
+                                                                    block_width, block_height, number_of_mips, number_of_layers,
+                                                                    block_height_in_gobs)
+    linear_data: bytes = plan.apply(input_image_data, sum(linear_mip_sizes), False)
+
+    mip_levels: List[bytes] = []
+    mip_offset: int = 0
+    for linear_mip_size in linear_mip_sizes:
+        mip_levels.append(linear_data[mip_offset:mip_offset + linear_mip_size])
+        mip_offset += linear_mip_size
+    return mip_levels
+
+
+def swizzle_switch_surface(mip_levels: List[bytes], img_width: int, img_height: int, bytes_per_block: int,
+                           block_width: int = 1, block_height: int = 1, number_of_layers: int = 1,
+                           block_height_in_gobs: Optional[int] = None) -> bytes:
+    """
+    Inverse of "unswizzle_switch_surface"
+    """
+    if block_height_in_gobs is None:
+        block_height_in_gobs = get_switch_block_height(_div_round_up(img_height, block_height))
+    plan, _, swizzled_size = swizzle_plan_cache.get_swizzle_plan(_get_switch_surface_plan, img_width, img_height, bytes_per_block,
+                                                                 block_width, block_height, len(mip_levels), number_of_layers,
+                                                                 block_height_in_gobs)
+    return plan.apply(b"".join(mip_levels), swizzled_size, True)
@@ -1,15 +1,24 @@
 """
-Copyright © 2025  Bartłomiej Duda
+Copyright © 2025-2026  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
-from typing import List
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from reversebox.image.swizzling.swizzle_plan import SwizzlePlan, swizzle_plan_cache
 
 # WII U Texture Swizzling
 
 # Used in:
 # - Mario Kart 8 (WII U)(*.GTX)
 
+# Port of R600 AddrLib (GX2) address functions.
+# Address functions work with Python ints and with NumPy arrays of coordinates,
+# so addresses of the whole surface are computed with a few array operations and kept in swizzle plan cache.
+
 
 # fmt: off
 
@@ -73,10 +82,10 @@ def computeSurfaceThickness(tileMode: int) -> int:
     return thickness
 
 
-def computePixelIndexWithinMicroTile(x: int, y: int, bpp: int, tileMode: int, z=0) -> int:
-    pixelBit6 = 0
-    pixelBit7 = 0
-    pixelBit8 = 0
+def computePixelIndexWithinMicroTile(x: Union[int, np.ndarray], y: Union[int, np.ndarray], bpp: int, tileMode: int, z: Union[int, np.ndarray] = 0) -> Union[int, np.ndarray]:
+    pixelBit6: Union[int, np.ndarray] = 0
+    pixelBit7: Union[int, np.ndarray] = 0
+    pixelBit8: Union[int, np.ndarray] = 0
     thickness = computeSurfaceThickness(tileMode)
 
     if bpp == 0x08:
@@ -139,15 +148,15 @@ def computePixelIndexWithinMicroTile(x: int, y: int, bpp: int, tileMode: int, z=
             4 * pixelBit2 | pixelBit0 | 2 * pixelBit1)
 
 
-def computePipeFromCoordWoRotation(x: int, y: int) -> int:
+def computePipeFromCoordWoRotation(x: Union[int, np.ndarray], y: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
     # hardcoded to assume 2 pipes
     return ((y >> 3) ^ (x >> 3)) & 1
 
 
-def computeBankFromCoordWoRotation(x: int, y: int) -> int:
+def computeBankFromCoordWoRotation(x: Union[int, np.ndarray], y: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
     numPipes = m_pipes
     numBanks = m_banks
-    bank = 0
+    bank: Union[int, np.ndarray] = 0
 
     if numBanks == 4:
         bankBit0 = ((y // (16 * numPipes)) ^ (x >> 3)) & 1
@@ -192,6 +201,20 @@ def computeMacroTileAspectRatio(tileMode: int) -> int:
     return ratio
 
 
+BANK_SWAP_ORDER: np.ndarray = np.array([0, 1, 3, 2, 6, 7, 5, 4, 0, 0], dtype=np.int64)
+
+
+def computeSurfaceRotationFromTileMode(tileMode: int) -> int:
+    rotation: int = 0
+
+    if tileMode in (4, 5, 6, 7, 8, 9, 10, 11):
+        rotation = m_pipes * ((m_banks >> 1) - 1)
+    elif tileMode in (12, 13, 14, 15):
+        rotation = (m_pipes >> 1) - 1 if m_pipes >= 4 else 1
+
+    return rotation
+
+
 def computeSurfaceBankSwappedWidth(tileMode: int, bpp: int, pitch: int, numSamples: int = 1) -> int:
     if isBankSwappedTileMode(tileMode) == 0:
         return 0
@@ -231,15 +254,18 @@ def computeSurfaceBankSwappedWidth(tileMode: int, bpp: int, pitch: int, numSampl
     return bankSwapWidth
 
 
-def AddrLib_computeSurfaceAddrFromCoordLinear(x: int, y: int, bpp: int, pitch: int) -> int:
+def AddrLib_computeSurfaceAddrFromCoordLinear(x: Union[int, np.ndarray], y: Union[int, np.ndarray], bpp: int, pitch: int, height: int = 0,
+                                              sliceIndex: Union[int, np.ndarray] = 0) -> Union[int, np.ndarray]:
     rowOffset = y * pitch
     pixOffset = x
-    addr = (rowOffset + pixOffset) * bpp
+    sliceOffset = sliceIndex * height * pitch
+    addr = (sliceOffset + rowOffset + pixOffset) * bpp
     addr //= 8
     return addr
 
 
-def AddrLib_computeSurfaceAddrFromCoordMicroTiled(x: int, y: int, bpp: int, pitch: int, tileMode: int) -> int:
+def AddrLib_computeSurfaceAddrFromCoordMicroTiled(x: Union[int, np.ndarray], y: Union[int, np.ndarray], bpp: int, pitch: int, tileMode: int, height: int = 0,
+                                                  sliceIndex: Union[int, np.ndarray] = 0) -> Union[int, np.ndarray]:
     microTileThickness = 1
 
     if tileMode == 3:
@@ -249,15 +275,19 @@ def AddrLib_computeSurfaceAddrFromCoordMicroTiled(x: int, y: int, bpp: int, pitc
     microTilesPerRow = pitch >> 3
     microTileIndexX = x >> 3
     microTileIndexY = y >> 3
+    microTileIndexZ = sliceIndex // microTileThickness
 
     microTileOffset = microTileBytes * (microTileIndexX + microTileIndexY * microTilesPerRow)
-    pixelIndex = computePixelIndexWithinMicroTile(x, y, bpp, tileMode)
+    sliceBytes = (pitch * height * microTileThickness * bpp + 7) // 8
+    sliceOffset = microTileIndexZ * sliceBytes
+    pixelIndex = computePixelIndexWithinMicroTile(x, y, bpp, tileMode, sliceIndex)
     pixelOffset = bpp * pixelIndex
     pixelOffset >>= 3
-    return pixelOffset + microTileOffset
+    return pixelOffset + microTileOffset + sliceOffset
 
 
-def AddrLib_computeSurfaceAddrFromCoordMacroTiled(x: int, y: int, bpp: int, pitch: int, height: int, tileMode: int, pipeSwizzle: int, bankSwizzle: int) -> int:
+def AddrLib_computeSurfaceAddrFromCoordMacroTiled(x: Union[int, np.ndarray], y: Union[int, np.ndarray], bpp: int, pitch: int, height: int, tileMode: int, pipeSwizzle: int, bankSwizzle: int,
+                                                  sliceIndex: Union[int, np.ndarray] = 0) -> Union[int, np.ndarray]:
     numPipes = m_pipes
     numBanks = m_banks
     numGroupBits = m_pipe_interleave_bytes_bitcount
@@ -269,7 +299,7 @@ def AddrLib_computeSurfaceAddrFromCoordMacroTiled(x: int, y: int, bpp: int, pitc
     microTileBits = bpp * (microTileThickness * m_micro_tile_pixels)
     microTileBytes = (microTileBits + 7) // 8
 
-    pixelIndex = computePixelIndexWithinMicroTile(x, y, bpp, tileMode)
+    pixelIndex = computePixelIndexWithinMicroTile(x, y, bpp, tileMode, sliceIndex)
 
     pixelOffset = bpp * pixelIndex
 
@@ -278,7 +308,7 @@ def AddrLib_computeSurfaceAddrFromCoordMacroTiled(x: int, y: int, bpp: int, pitc
     bytesPerSample = microTileBytes
     if microTileBytes <= m_split_size:
         numSamples = 1
-        sampleSlice = 0
+        sampleSlice: Union[int, np.ndarray] = 0
     else:
         samplesPerSlice = m_split_size // bytesPerSample
         numSampleSplits = max(1, 1 // samplesPerSlice)
@@ -293,15 +323,19 @@ def AddrLib_computeSurfaceAddrFromCoordMacroTiled(x: int, y: int, bpp: int, pitc
 
     bankPipe = pipe + numPipes * bank
 
+    rotation = computeSurfaceRotationFromTileMode(tileMode)
     swizzle_ = pipeSwizzle + numPipes * bankSwizzle
+    sliceIn = sliceIndex
+    if isThickMacroTiled(tileMode):
+        sliceIn = sliceIn >> 2
 
-    bankPipe ^= numPipes * sampleSlice * ((numBanks >> 1) + 1) ^ swizzle_
+    bankPipe ^= numPipes * sampleSlice * ((numBanks >> 1) + 1) ^ (swizzle_ + sliceIn * rotation)
     bankPipe %= numPipes * numBanks
     pipe = bankPipe % numPipes
     bank = bankPipe // numPipes
 
     sliceBytes = (height * pitch * microTileThickness * bpp * numSamples + 7) // 8
-    sliceOffset = sliceBytes * (sampleSlice // microTileThickness)
+    sliceOffset = sliceBytes * ((sampleSlice + numSamples * sliceIndex) // microTileThickness)
 
     macroTilePitch = 8 * m_banks
     macroTileHeight = 8 * m_pipes
@@ -321,10 +355,9 @@ def AddrLib_computeSurfaceAddrFromCoordMacroTiled(x: int, y: int, bpp: int, pitc
     macroTileOffset = (macroTileIndexX + macroTilesPerRow * macroTileIndexY) * macroTileBytes
 
     if tileMode == 8 or tileMode == 9 or tileMode == 10 or tileMode == 11 or tileMode == 14 or tileMode == 15:
-        bankSwapOrder = [0, 1, 3, 2, 6, 7, 5, 4, 0, 0]
         bankSwapWidth = computeSurfaceBankSwappedWidth(tileMode, bpp, pitch)
         swapIndex = macroTilePitch * macroTileIndexX // bankSwapWidth
-        bank ^= bankSwapOrder[swapIndex & (m_banks - 1)]
+        bank ^= BANK_SWAP_ORDER[swapIndex & (m_banks - 1)]
 
     groupMask = ((1 << numGroupBits) - 1)
 
@@ -341,37 +374,221 @@ def AddrLib_computeSurfaceAddrFromCoordMacroTiled(x: int, y: int, bpp: int, pitc
     return bankBits | pipeBits | offsetLow | offsetHigh
 
 
-def _convert_wii_u(img_width: int, img_height: int, image_format: int, tile_mode: int, swizzle_type: int, pitch: int, input_data: bytes, swizzle_flag: bool) -> bytes:
-    converted_data: bytearray = bytearray(input_data)
+def _next_pow2(value: int) -> int:
+    return 1 << max(0, value - 1).bit_length()
+
+
+def _align(value: int, alignment: int) -> int:
+    return (value + alignment - 1) // alignment * alignment
+
+
+def _is_bcn_format(image_format: int) -> bool:
+    return 0x31 <= (image_format & 0x3F) <= 0x35
+
+
+def convertToNonBankSwappedMode(tileMode: int) -> int:
+    return {8: 4, 9: 5, 10: 6, 11: 7, 14: 12, 15: 13}.get(tileMode, tileMode)
+
+
+def computeSurfaceTileSlices(tileMode: int, bpp: int, numSamples: int = 1) -> int:
+    bytePerSample = ((bpp << 6) + 7) >> 3
+    tileSlices = 1
+
+    if computeSurfaceThickness(tileMode) > 1:
+        numSamples = 4
+
+    if bytePerSample != 0:
+        samplePerTile = m_split_size // bytePerSample
+        if samplePerTile != 0:
+            tileSlices = max(1, numSamples // samplePerTile)
+
+    return tileSlices
+
+
+def computeSurfaceMipLevelTileMode(baseTileMode: int, bpp: int, level: int, width: int, height: int, numSlices: int,
+                                   numSamples: int = 1, isDepth: bool = False, noRecursive: bool = False) -> int:
+    """
+    Tile mode of the mip level. Small mip levels are degraded from macro tiling (2D/3D) to micro tiling (1D)
+    """
+    widthAlignFactor = 1
+    macroTileWidth = 8 * m_banks
+    macroTileHeight = 8 * m_pipes
+    tileSlices = computeSurfaceTileSlices(baseTileMode, bpp, numSamples)
+    expTileMode = baseTileMode
+
+    if numSamples > 1 or tileSlices > 1 or isDepth:
+        expTileMode = {7: 4, 13: 12, 11: 8, 15: 14}.get(baseTileMode, baseTileMode)
+
+    if baseTileMode == 2 and numSamples > 1:
+        expTileMode = 4
+    elif baseTileMode == 3:
+        if numSamples > 1 or isDepth:
+            expTileMode = 2
+        if numSamples in (2, 4):
+            expTileMode = 7
+
+    if noRecursive or level == 0:
+        return expTileMode
+
+    if bpp in (24, 48, 96):
+        bpp //= 3
+
+    width = _next_pow2(width)
+    height = _next_pow2(height)
+    numSlices = _next_pow2(numSlices)
+
+    expTileMode = convertToNonBankSwappedMode(expTileMode)
+    thickness = computeSurfaceThickness(expTileMode)
+    microTileBytes = (numSamples * bpp * (thickness << 6) + 7) >> 3
+
+    if microTileBytes < m_pipe_interleave_bytes:
+        widthAlignFactor = m_pipe_interleave_bytes // microTileBytes
+
+    if expTileMode in (5, 6):
+        aspectRatio = computeMacroTileAspectRatio(expTileMode)
+        macroTileWidth //= aspectRatio
+        macroTileHeight *= aspectRatio
+
+    if expTileMode in (4, 5, 6):
+        if width < widthAlignFactor * macroTileWidth or height < macroTileHeight:
+            expTileMode = 2
+    elif expTileMode in (7, 13):
+        if width < widthAlignFactor * macroTileWidth or height < macroTileHeight:
+            expTileMode = 3
+
+    if numSlices < 4:
+        expTileMode = {3: 2, 7: 4, 13: 12}.get(expTileMode, expTileMode)
+
+    return computeSurfaceMipLevelTileMode(expTileMode, bpp, level, width, height, numSlices, numSamples, isDepth, True)
+
+
+def computeSurfaceAlignments(tileMode: int, bpp: int, pitch: int, numSamples: int = 1) -> Tuple[int, int, int]:
+    """
+    Returns (base alignment in bytes, pitch alignment, height alignment) of the surface
+    """
+    if bpp in (24, 48, 96):
+        bpp //= 3
+    thickness = computeSurfaceThickness(tileMode)
+
+    if tileMode == 0:  # GX2_TILE_MODE_LINEAR_SPECIAL
+        return 1, 8 if bpp == 1 else 1, 1
+
+    if tileMode == 1:  # GX2_TILE_MODE_LINEAR_ALIGNED
+        return m_pipe_interleave_bytes, max(64, (m_pipe_interleave_bytes * 8) // bpp), 1
+
+    if tileMode in (2, 3):  # GX2_TILE_MODE_1D_TILED_THIN1 and GX2_TILE_MODE_1D_TILED_THICK
+        return m_pipe_interleave_bytes, max(8, m_pipe_interleave_bytes // bpp // numSamples // thickness), 8
+
+    aspectRatio = computeMacroTileAspectRatio(tileMode)
+    macroTileWidth = 8 * m_banks // aspectRatio
+    macroTileHeight = 8 * m_pipes * aspectRatio
+    pitchAlign = max(macroTileWidth, macroTileWidth * (m_pipe_interleave_bytes // bpp // (8 * thickness) // numSamples))
+    pitchAlign = max(pitchAlign, computeSurfaceBankSwappedWidth(tileMode, bpp, pitch, numSamples))
+    heightAlign = macroTileHeight
+    macroTileBytes = numSamples * ((bpp * macroTileHeight * macroTileWidth + 7) >> 3)
+
+    if thickness == 1:
+        baseAlign = max(macroTileBytes, (numSamples * heightAlign * bpp * pitchAlign + 7) >> 3)
+    else:
+        baseAlign = max(m_pipe_interleave_bytes, (4 * heightAlign * bpp * pitchAlign + 7) >> 3)
+
+    microTileBytes = (thickness * numSamples * (bpp << 6) + 7) >> 3
+    numSlicesPerMicroTile = 1 if microTileBytes < m_split_size else microTileBytes // m_split_size
+    return baseAlign // numSlicesPerMicroTile, pitchAlign, heightAlign
+
+
+@dataclass
+class WiiUSurfaceInfo:
+    tile_mode: int
+    bpp: int  # bits per element (4x4 block for BCn formats)
+    element_width: int  # size of the mip level in elements
+    element_height: int
+    pitch: int  # aligned size of the mip level in elements
+    height: int
+    number_of_slices: int
+    surface_size: int  # size of all slices in bytes
+    base_alignment: int
+
+
+def compute_wii_u_surface_info(img_width: int, img_height: int, image_format: int, tile_mode: int,
+                               mip_level: int = 0, number_of_slices: int = 1) -> WiiUSurfaceInfo:
+    bpp: int = surfaceGetBitsPerPixel(image_format)
+    if bpp == 0:
+        raise ValueError(f"Not supported GX2 surface format: {image_format}!")
+
+    width: int = max(1, img_width >> mip_level)
+    height: int = max(1, img_height >> mip_level)
+    if _is_bcn_format(image_format):
+        element_width, element_height = (width + 3) // 4, (height + 3) // 4
+        if mip_level:
+            width, height = _next_pow2(width), _next_pow2(height)
+        width, height = (width + 3) // 4, (height + 3) // 4
+    else:
+        element_width, element_height = width, height
+
+    level_tile_mode: int = computeSurfaceMipLevelTileMode(tile_mode, bpp, mip_level, width, height, number_of_slices)
+    if number_of_slices < 4:
+        # thick tiles need at least 4 slices
+        level_tile_mode = {3: 2, 7: 4}.get(level_tile_mode, level_tile_mode)
+    thickness: int = computeSurfaceThickness(level_tile_mode)
+    if mip_level:
+        width, height = _next_pow2(width), _next_pow2(height)
+
+    base_alignment, pitch_alignment, height_alignment = computeSurfaceAlignments(level_tile_mode, bpp, width)
+    pitch: int = _align(width, pitch_alignment)
+    aligned_height: int = _align(height, height_alignment)
+    aligned_number_of_slices: int = _align(number_of_slices, thickness)
+    surface_size: int = (pitch * aligned_height * aligned_number_of_slices * bpp + 7) // 8
+    return WiiUSurfaceInfo(level_tile_mode, bpp, element_width, element_height, pitch, aligned_height,
+                           aligned_number_of_slices, surface_size, base_alignment)
+
+
+def get_wii_u_mip_offsets(img_width: int, img_height: int, image_format: int, tile_mode: int,
+                          number_of_mips: int, number_of_slices: int = 1) -> List[int]:
+    """
+    Offsets of mip levels in mip data (like GX2Surface.mipOffset, level 1 starts at the beginning of mip data)
+    """
+    mip_offsets: List[int] = [0] * max(1, number_of_mips - 1)
+    mip_size: int = 0
+    for mip_level in range(1, number_of_mips):
+        surface_info: WiiUSurfaceInfo = compute_wii_u_surface_info(img_width, img_height, image_format, tile_mode, mip_level, number_of_slices)
+        mip_size = _align(mip_size, surface_info.base_alignment)
+        mip_offsets[mip_level - 1] = mip_size
+        mip_size += surface_info.surface_size
+    return mip_offsets
+
+
+def _get_wii_u_element_offsets(x: np.ndarray, y: np.ndarray, slice_index: Union[int, np.ndarray], bpp: int, pitch: int, height: int,
+                               tile_mode: int, swizzle_type: int) -> np.ndarray:
+    pipe_swizzle: int = (swizzle_type >> 8) & 1
+    bank_swizzle: int = (swizzle_type >> 9) & 3
+
+    if tile_mode == 0 or tile_mode == 1:
+        return np.asarray(AddrLib_computeSurfaceAddrFromCoordLinear(x, y, bpp, pitch, height, slice_index))
+    if tile_mode == 2 or tile_mode == 3:
+        return np.asarray(AddrLib_computeSurfaceAddrFromCoordMicroTiled(x, y, bpp, pitch, tile_mode, height, slice_index))
+    return np.asarray(AddrLib_computeSurfaceAddrFromCoordMacroTiled(x, y, bpp, pitch, height, tile_mode, pipe_swizzle, bank_swizzle, slice_index))
+
+
+def _get_wii_u_plan(img_width: int, img_height: int, image_format: int, tile_mode: int, swizzle_type: int, pitch: int, data_size: int) -> SwizzlePlan:
+    bpp: int = surfaceGetBitsPerPixel(image_format)
+    bytes_per_element: int = bpp // 8
 
     if image_format in BCn_formats:
         img_width = (img_width + 3) // 4
         img_height = (img_height + 3) // 4
 
-    for y in range(img_height):
-        for x in range(img_width):
-            bpp = surfaceGetBitsPerPixel(image_format)
-            pipe_swizzle = (swizzle_type >> 8) & 1
-            bank_swizzle = (swizzle_type >> 9) & 3
-
-            if tile_mode == 0 or tile_mode == 1:
-                pos = AddrLib_computeSurfaceAddrFromCoordLinear(x, y, bpp, pitch)
-            elif tile_mode == 2 or tile_mode == 3:
-                pos = AddrLib_computeSurfaceAddrFromCoordMicroTiled(x, y, bpp, pitch, tile_mode)
-            else:
-                pos = AddrLib_computeSurfaceAddrFromCoordMacroTiled(x, y, bpp, pitch, img_height, tile_mode, pipe_swizzle, bank_swizzle)
-
-            bpp //= 8
-            pos_ = (y * img_width + x) * bpp
+    y, x = np.mgrid[0:img_height, 0:img_width]
+    swizzled_offsets = np.asarray(_get_wii_u_element_offsets(x, y, 0, bpp, pitch, img_height, tile_mode, swizzle_type), dtype=np.int64).reshape(-1)
+    linear_offsets = np.arange(img_width * img_height, dtype=np.int64) * bytes_per_element
+    valid = (swizzled_offsets + bytes_per_element <= data_size) & (linear_offsets + bytes_per_element <= data_size)
+    return SwizzlePlan.from_byte_offsets(linear_offsets[valid], swizzled_offsets[valid], bytes_per_element)
 
-            if swizzle_flag:
-                if (pos < len(input_data)) and (pos_ < len(input_data)):
-                    converted_data[pos:pos + bpp] = input_data[pos_:pos_ + bpp]
-            else:
-                if (pos_ < len(input_data)) and (pos < len(input_data)):
-                    converted_data[pos_:pos_ + bpp] = input_data[pos:pos + bpp]
 
-    return converted_data
+def _convert_wii_u(img_width: int, img_height: int, image_format: int, tile_mode: int, swizzle_type: int, pitch: int, input_data: bytes, swizzle_flag: bool) -> bytes:
+    plan: SwizzlePlan = swizzle_plan_cache.get_swizzle_plan(_get_wii_u_plan, img_width, img_height, image_format, tile_mode,
+                                                            swizzle_type, pitch, len(input_data))
+    return plan.apply(input_data, len(input_data), swizzle_flag)
 
 
 def swizzle_wii_u(img_width: int, img_height: int, image_format: int, tile_mode: int, swizzle_type: int, pitch: int, input_data: bytes) -> bytes:
@@ -380,3 +597,76 @@ def swizzle_wii_u(img_width: int, img_height: int, image_format: int, tile_mode:
 
 def unswizzle_wii_u(img_width: int, img_height: int, image_format: int, tile_mode: int, swizzle_type: int, pitch: int, input_data: bytes) -> bytes:
     return _convert_wii_u(img_width, img_height, image_format, tile_mode, swizzle_type, pitch, input_data, False)
+
+
+# GX2 surfaces (all mip levels and array slices)
+
+
+def _get_wii_u_surface_level_plan(img_width: int, img_height: int, image_format: int, tile_mode: int, swizzle_type: int,
+                                  mip_level: int, number_of_slices: int, pitch: Optional[int]) -> Tuple[SwizzlePlan, WiiUSurfaceInfo]:
+    surface_info: WiiUSurfaceInfo = compute_wii_u_surface_info(img_width, img_height, image_format, tile_mode, mip_level, number_of_slices)
+    if pitch is not None:
+        surface_info.pitch = pitch
+
+    bytes_per_element: int = surface_info.bpp // 8
+    slice_index, y, x = np.mgrid[0:number_of_slices, 0:surface_info.element_height, 0:surface_info.element_width]
+    swizzled_offsets = np.asarray(_get_wii_u_element_offsets(x, y, slice_index, surface_info.bpp, surface_info.pitch, surface_info.height,
+                                                             surface_info.tile_mode, swizzle_type), dtype=np.int64).reshape(-1)
+    linear_offsets = np.arange(swizzled_offsets.size, dtype=np.int64) * bytes_per_element
+    return SwizzlePlan.from_byte_offsets(linear_offsets, swizzled_offsets, bytes_per_element), surface_info
+
+
+def _get_wii_u_level_data_size(surface_info: WiiUSurfaceInfo, number_of_slices: int) -> int:
+    return surface_info.element_width * surface_info.element_height * number_of_slices * surface_info.bpp // 8
+
+
+def unswizzle_wii_u_surface(image_data: bytes, mip_data: bytes, img_width: int, img_height: int, image_format: int, tile_mode: int,
+                            swizzle_type: int, number_of_mips: int = 1, number_of_slices: int = 1, pitch: Optional[int] = None,
+                            mip_offsets: Optional[List[int]] = None) -> List[bytes]:
+    """
+    Untiles every mip level and array slice of GX2 surface (2D, 2D array and cube map surfaces).
+    image_data --> data of level 0, mip_data --> data of levels 1+
+    pitch      --> pitch of level 0 (GX2Surface.pitch), computed if not provided
+    mip_offsets --> GX2Surface.mipOffset values, computed if not provided
+    Returns list of linear mip levels, slices of every level are stored one after another.
+    """
+    if mip_offsets is None:
+        mip_offsets = get_wii_u_mip_offsets(img_width, img_height, image_format, tile_mode, number_of_mips, number_of_slices)
+
+    mip_levels: List[bytes] = []
+    for mip_level in range(number_of_mips):
+        plan, surface_info = swizzle_plan_cache.get_swizzle_plan(_get_wii_u_surface_level_plan, img_width, img_height, image_format, tile_mode,
+                                                                 swizzle_type, mip_level, number_of_slices, pitch if mip_level == 0 else None)
+        if mip_level == 0:
+            level_data = image_data
+        else:
+            level_offset: int = 0 if mip_level == 1 else mip_offsets[mip_level - 1]
+            level_data = memoryview(mip_data)[level_offset:level_offset + surface_info.surface_size]
+        mip_levels.append(plan.apply(level_data, _get_wii_u_level_data_size(surface_info, number_of_slices), False))
+    return mip_levels
+
+
+def swizzle_wii_u_surface(mip_levels: List[bytes], img_width: int, img_height: int, image_format: int, tile_mode: int,
+                          swizzle_type: int, number_of_slices: int = 1, pitch: Optional[int] = None,
+                          mip_offsets: Optional[List[int]] = None) -> Tuple[bytes, bytes]:
+    """
+    Inverse of "unswizzle_wii_u_surface", returns (image_data, mip_data)
+    """
+    number_of_mips: int = len(mip_levels)
+    if mip_offsets is None:
+        mip_offsets = get_wii_u_mip_offsets(img_width, img_height, image_format, tile_mode, number_of_mips, number_of_slices)
+
+    image_data: bytes = b""
+    mip_data: bytearray = bytearray()
+    for mip_level in range(number_of_mips):
+        plan, surface_info = swizzle_plan_cache.get_swizzle_plan(_get_wii_u_surface_level_plan, img_width, img_height, image_format, tile_mode,
+                                                                 swizzle_type, mip_level, number_of_slices, pitch if mip_level == 0 else None)
+        level_data: bytes = plan.apply(mip_levels[mip_level], surface_info.surface_size, True)
+        if mip_level == 0:
+            image_data = level_data
+        else:
+            level_offset: int = 0 if mip_level == 1 else mip_offsets[mip_level - 1]
+            if len(mip_data) < level_offset + len(level_data):
+                mip_data.extend(bytes(level_offset + len(level_data) - len(mip_data)))
+            mip_data[level_offset:level_offset + len(level_data)] = level_data
+    return image_data, bytes(mip_data)
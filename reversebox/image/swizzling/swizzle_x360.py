@@ -3,71 +3,72 @@ Copyright © 2024-2026  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
+from typing import Union
+
+import numpy as np
+
+from reversebox.image.swizzling.swizzle_plan import (
+    SwizzlePlan,
+    convert_with_swizzle_plan,
+    swizzle_plan_cache,
+)
+
 # Xbox 360 Texture Swizzling
 
 # fmt: off
 
 
-def _xg_address_2d_tiled_x(block_offset: int, width_in_blocks: int, texel_byte_pitch: int) -> int:
+def _xg_address_2d_tiled_x(block_offset: Union[int, np.ndarray], width_in_blocks: int, texel_byte_pitch: int) -> Union[int, np.ndarray]:
     aligned_width: int = (width_in_blocks + 31) & ~31
     log_bpp: int = (texel_byte_pitch >> 2) + ((texel_byte_pitch >> 1) >> (texel_byte_pitch >> 2))
-    offset_byte: int = block_offset << log_bpp
-    offset_tile: int = (((offset_byte & ~0xFFF) >> 3) + ((offset_byte & 0x700) >> 2) + (offset_byte & 0x3F))
-    offset_macro: int = offset_tile >> (7 + log_bpp)
+    offset_byte: Union[int, np.ndarray] = block_offset << log_bpp
+    offset_tile: Union[int, np.ndarray] = (((offset_byte & ~0xFFF) >> 3) + ((offset_byte & 0x700) >> 2) + (offset_byte & 0x3F))
+    offset_macro: Union[int, np.ndarray] = offset_tile >> (7 + log_bpp)
 
-    macro_x: int = (offset_macro % (aligned_width >> 5)) << 2
-    tile: int = (((offset_tile >> (5 + log_bpp)) & 2) + (offset_byte >> 6)) & 3
-    macro: int = (macro_x + tile) << 3
-    micro: int = ((((offset_tile >> 1) & ~0xF) + (offset_tile & 0xF)) & ((texel_byte_pitch << 3) - 1)) >> log_bpp
+    macro_x: Union[int, np.ndarray] = (offset_macro % (aligned_width >> 5)) << 2
+    tile: Union[int, np.ndarray] = (((offset_tile >> (5 + log_bpp)) & 2) + (offset_byte >> 6)) & 3
+    macro: Union[int, np.ndarray] = (macro_x + tile) << 3
+    micro: Union[int, np.ndarray] = ((((offset_tile >> 1) & ~0xF) + (offset_tile & 0xF)) & ((texel_byte_pitch << 3) - 1)) >> log_bpp
 
     return macro + micro
 
 
-def _xg_address_2d_tiled_y(block_offset: int, width_in_blocks: int, texel_byte_pitch: int) -> int:
+def _xg_address_2d_tiled_y(block_offset: Union[int, np.ndarray], width_in_blocks: int, texel_byte_pitch: int) -> Union[int, np.ndarray]:
     aligned_width: int = (width_in_blocks + 31) & ~31
     log_bpp: int = (texel_byte_pitch >> 2) + ((texel_byte_pitch >> 1) >> (texel_byte_pitch >> 2))
-    offset_byte: int = block_offset << log_bpp
-    offset_tile: int = (((offset_byte & ~0xFFF) >> 3) + ((offset_byte & 0x700) >> 2) + (offset_byte & 0x3F))
-    offset_macro: int = offset_tile >> (7 + log_bpp)
+    offset_byte: Union[int, np.ndarray] = block_offset << log_bpp
+    offset_tile: Union[int, np.ndarray] = (((offset_byte & ~0xFFF) >> 3) + ((offset_byte & 0x700) >> 2) + (offset_byte & 0x3F))
+    offset_macro: Union[int, np.ndarray] = offset_tile >> (7 + log_bpp)
 
-    macro_y: int = (offset_macro // (aligned_width >> 5)) << 2
-    tile: int = ((offset_tile >> (6 + log_bpp)) & 1) + ((offset_byte & 0x800) >> 10)
-    macro: int = (macro_y + tile) << 3
-    micro: int = (((offset_tile & ((texel_byte_pitch << 6) - 1 & ~0x1F)) + ((offset_tile & 0xF) << 1)) >> (3 + log_bpp)) & ~1
+    macro_y: Union[int, np.ndarray] = (offset_macro // (aligned_width >> 5)) << 2
+    tile: Union[int, np.ndarray] = ((offset_tile >> (6 + log_bpp)) & 1) + ((offset_byte & 0x800) >> 10)
+    macro: Union[int, np.ndarray] = (macro_y + tile) << 3
+    micro: Union[int, np.ndarray] = (((offset_tile & ((texel_byte_pitch << 6) - 1 & ~0x1F)) + ((offset_tile & 0xF) << 1)) >> (3 + log_bpp)) & ~1
 
     return macro + micro + ((offset_tile & 0x10) >> 4)
 
 
+def _get_x360_plan(width_in_blocks: int, height_in_blocks: int, texel_byte_pitch: int) -> SwizzlePlan:
+    # address functions work also for NumPy arrays of block offsets
+    padded_width_in_blocks: int = (width_in_blocks + 31) & ~31
+    padded_height_in_blocks: int = (height_in_blocks + 31) & ~31
+    block_offsets = np.arange(padded_width_in_blocks * padded_height_in_blocks, dtype=np.int64)
+    x = np.asarray(_xg_address_2d_tiled_x(block_offsets, padded_width_in_blocks, texel_byte_pitch))
+    y = np.asarray(_xg_address_2d_tiled_y(block_offsets, padded_width_in_blocks, texel_byte_pitch))
+    used = (x < width_in_blocks) & (y < height_in_blocks)
+    return SwizzlePlan(y[used] * width_in_blocks + x[used], block_offsets[used], texel_byte_pitch)
+
+
 def _convert_x360_image_data(image_data: bytes, image_width: int, image_height: int, block_pixel_size: int, texel_byte_pitch: int, swizzle_flag: bool) -> bytes:
     width_in_blocks: int = image_width // block_pixel_size
     height_in_blocks: int = image_height // block_pixel_size
 
-    padded_width_in_blocks: int = (width_in_blocks + 31) & ~31
-    padded_height_in_blocks: int = (height_in_blocks + 31) & ~31
-    total_padded_blocks = padded_width_in_blocks * padded_height_in_blocks
-
     if not swizzle_flag:
-        converted_data: bytearray = bytearray(width_in_blocks * height_in_blocks * texel_byte_pitch)
+        output_size: int = width_in_blocks * height_in_blocks * texel_byte_pitch
     else:
-        converted_data: bytearray = bytearray(total_padded_blocks * texel_byte_pitch)  # type: ignore
-
-    for block_offset in range(total_padded_blocks):
-        x = _xg_address_2d_tiled_x(block_offset, padded_width_in_blocks, texel_byte_pitch)
-        y = _xg_address_2d_tiled_y(block_offset, padded_width_in_blocks, texel_byte_pitch)
+        output_size: int = ((width_in_blocks + 31) & ~31) * ((height_in_blocks + 31) & ~31) * texel_byte_pitch
 
-        if x < width_in_blocks and y < height_in_blocks:
-            if not swizzle_flag:
-                src_byte_offset = block_offset * texel_byte_pitch
-                dest_byte_offset = (y * width_in_blocks + x) * texel_byte_pitch
-                if src_byte_offset + texel_byte_pitch <= len(image_data):
-                    converted_data[dest_byte_offset: dest_byte_offset + texel_byte_pitch] = image_data[src_byte_offset: src_byte_offset + texel_byte_pitch]
-            else:
-                src_byte_offset = (y * width_in_blocks + x) * texel_byte_pitch
-                dest_byte_offset = block_offset * texel_byte_pitch
-                if src_byte_offset + texel_byte_pitch <= len(image_data):
-                    converted_data[dest_byte_offset: dest_byte_offset + texel_byte_pitch] = image_data[src_byte_offset: src_byte_offset + texel_byte_pitch]
-
-    return bytes(converted_data)
+    return convert_with_swizzle_plan(image_data, output_size, swizzle_flag, _get_x360_plan, width_in_blocks, height_in_blocks, texel_byte_pitch)
 
 
 def unswizzle_x360(image_data: bytes, img_width: int, img_height: int, block_pixel_size: int = 4, texel_byte_pitch: int = 8) -> bytes:
@@ -78,3 +79,23 @@ def unswizzle_x360(image_data: bytes, img_width: int, img_height: int, block_pix
 def swizzle_x360(image_data: bytes, img_width: int, img_height: int, block_pixel_size: int = 4, texel_byte_pitch: int = 8) -> bytes:
     swizzled_data: bytes = _convert_x360_image_data(image_data, img_width, img_height, block_pixel_size, texel_byte_pitch, True)
     return swizzled_data
+
+
+def decode_x360_surface(image_data: bytes, img_width: int, img_height: int, block_pixel_size: int = 4,
+                        texel_byte_pitch: int = 8, endian_swap_size: int = 2) -> bytes:
+    """
+    Untiles Xbox 360 texture, swaps its byte order and drops padding of 32x32 block tiles in one pass.
+    endian_swap_size --> 2 (16-bit swap, e.g. DXT textures), 4 (32-bit swap, e.g. ARGB8888 textures), 1 (no swap)
+    Returns linear data ready for decoding, partial blocks at right and bottom edge are kept.
+    """
+    if endian_swap_size not in (1, 2, 4) or texel_byte_pitch % endian_swap_size:
+        raise ValueError(f"Endian swap size not supported! Endian_swap_size: {endian_swap_size}, texel_byte_pitch: {texel_byte_pitch}")
+    width_in_blocks: int = (img_width + block_pixel_size - 1) // block_pixel_size
+    height_in_blocks: int = (img_height + block_pixel_size - 1) // block_pixel_size
+
+    plan: SwizzlePlan = swizzle_plan_cache.get_swizzle_plan(_get_x360_plan, width_in_blocks, height_in_blocks, texel_byte_pitch)
+    linear_data = plan.apply_to_array(image_data, width_in_blocks * height_in_blocks * texel_byte_pitch, False)
+    if endian_swap_size > 1:
+        # byte swap is done in place on gathered blocks, so it doesn't depend on their position
+        linear_data.view(f">u{endian_swap_size}").byteswap(inplace=True)
+    return linear_data.tobytes()
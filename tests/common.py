@@ -1,8 +1,9 @@
 """
-Copyright © 2022-2024  Bartłomiej Duda
+Copyright © 2022-2026  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
+import hashlib
 from dataclasses import dataclass
 from typing import Optional
 
@@ -152,3 +153,13 @@ class MortonIndexTestEntry:
     width: int
     height: int
     expected_result: int
+
+
+def get_test_data(data_size: int) -> bytes:
+    """
+    Deterministic pseudo random test data (concatenated SHA-256 digests)
+    """
+    return b"".join(
+        hashlib.sha256(i.to_bytes(4, "little")).digest()
+        for i in range((data_size + 31) // 32)
+    )[:data_size]
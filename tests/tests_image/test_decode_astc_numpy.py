@@ -0,0 +1,64 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import hashlib
+import os
+
+import numpy as np
+import pytest
+
+from reversebox.image.decoders.astc_numpy_decoder import AstcNumpyDecoder
+from reversebox.image.image_decoder import ImageDecoder
+from reversebox.image.image_formats import ImageFormats
+
+# fmt: off
+
+
+def _get_test_image_path(file_name: str) -> str:
+    return os.path.join(os.path.dirname(__file__), f"image_files/{file_name}")
+
+
+@pytest.mark.imagetest
+def test_astc_numpy_decoder_handcrafted_blocks():
+    decoder = AstcNumpyDecoder()
+
+    # void extent block with constant colour
+    void_extent_block = b"\xFC\xFD\xFF\xFF\xFF\xFF\xFF\xFF" + b"\x34\x12\x78\x56\xBC\x9A\xF0\xDE"
+    pixels = np.frombuffer(decoder.decode_astc_image(void_extent_block, 4, 4, ImageFormats.ASTC_4x4), dtype=np.uint8).reshape(-1, 4)
+    assert (pixels == [0x12, 0x56, 0x9A, 0xDE]).all()
+
+    # reserved block mode is decoded to error colour
+    pixels = np.frombuffer(decoder.decode_astc_image(bytes(16), 6, 6, ImageFormats.ASTC_6x6), dtype=np.uint8).reshape(-1, 4)
+    assert (pixels == [0xFF, 0x00, 0xFF, 0xFF]).all()
+
+
+@pytest.mark.imagetest
+def test_astc_numpy_decoder_monkey_images():
+    expected_digests = {
+        ImageFormats.ASTC_4x4: "e7473cc3c95e17c181de2106d58cf7c6",
+        ImageFormats.ASTC_6x5: "b2ae629dbf20efb5f473055d588997b5",
+        ImageFormats.ASTC_8x8: "b33a42d5f019c102d8b87d2115691e54",
+        ImageFormats.ASTC_12x12: "c00d7a887dfcb463f0e58336b7f4e04b",
+    }
+    for image_format, expected_digest in expected_digests.items():
+        with open(_get_test_image_path(f"monkey_{image_format.value}.bin"), "rb") as test_file:
+            image_data = test_file.read()
+        decoded_data = ImageDecoder().decode_pvrtexlib_image(image_data, 256, 128, image_format, "native")
+        assert hashlib.md5(decoded_data).hexdigest() == expected_digest
+        assert AstcNumpyDecoder(workers=2).decode_astc_image(image_data, 256, 128, image_format) == decoded_data
+
+        # worker processes are available through image decoder too
+        assert ImageDecoder().decode_pvrtexlib_image(image_data, 256, 128, image_format, "native", workers=2) == decoded_data
+        output = bytearray(256 * 128 * 4)
+        ImageDecoder().decode_pvrtexlib_image_into(output, image_data, 256, 128, image_format, "native", workers=2)
+        assert output == decoded_data
+
+    # partial blocks are cropped
+    with open(_get_test_image_path("monkey_ASTC_12x12.bin"), "rb") as test_file:
+        decoded_data = AstcNumpyDecoder().decode_astc_image(test_file.read(), 250, 120, ImageFormats.ASTC_12x12)
+    assert len(decoded_data) == 250 * 120 * 4
+
+    with pytest.raises(ValueError):
+        AstcNumpyDecoder().decode_astc_image(bytes(15), 4, 4, ImageFormats.ASTC_4x4)
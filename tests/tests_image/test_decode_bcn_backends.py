@@ -0,0 +1,74 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import os
+
+import pytest
+
+from reversebox.image.common import get_bc_image_data_size
+from reversebox.image.decoders.bcn_decoder_backends import (
+    NumpyBCnDecoderBackend,
+    PillowBCnDecoderBackend,
+)
+from reversebox.image.decoders.compressed_decoder_encoder import (
+    clear_bcn_decoder_backend_selection,
+    get_bcn_decoder_backend,
+)
+from reversebox.image.image_decoder import ImageDecoder
+from reversebox.image.image_formats import ImageFormats
+
+# fmt: off
+
+
+def _get_test_image_path(file_name: str) -> str:
+    return os.path.join(os.path.dirname(__file__), f"image_files/{file_name}")
+
+
+@pytest.mark.imagetest
+def test_numpy_backend_matches_pillow_backend():
+    pillow_backend = PillowBCnDecoderBackend()
+    numpy_backend = NumpyBCnDecoderBackend()
+
+    for file_name, image_format in (("monkey_dxt1.bin", ImageFormats.BC1_DXT1),
+                                    ("monkey_dxt3.bin", ImageFormats.BC2_DXT3),
+                                    ("monkey_dxt5.bin", ImageFormats.BC3_DXT5)):
+        with open(_get_test_image_path(file_name), "rb") as test_file:
+            image_data = test_file.read()
+        expected_data = pillow_backend.decode(image_data, 256, 128, image_format)
+        assert len(expected_data) == 256 * 128 * 4
+        assert numpy_backend.decode(image_data, 256, 128, image_format) == expected_data
+
+    # random blocks cover all interpolation modes, odd sizes cover partial blocks
+    for image_format in numpy_backend.supported_formats:
+        for img_width, img_height in ((64, 32), (13, 7)):
+            image_data = os.urandom(get_bc_image_data_size(img_width, img_height, image_format))
+            assert numpy_backend.decode(image_data, img_width, img_height, image_format) == \
+                pillow_backend.decode(image_data, img_width, img_height, image_format)
+
+
+@pytest.mark.imagetest
+def test_bc4_and_bc5_missing_channels():
+    # endpoints 255 and 0, all indices 0
+    block = b"\xFF\x00" + bytes(6)
+    bc4_data = ImageDecoder().decode_compressed_image(block, 4, 4, ImageFormats.BC4_UNORM)
+    assert bc4_data[:4] == b"\xFF\x00\x00\xFF"
+    bc5_data = ImageDecoder().decode_compressed_image(block + block, 4, 4, ImageFormats.BC5_UNORM)
+    assert bc5_data[:4] == b"\xFF\xFF\x00\xFF"
+
+
+@pytest.mark.imagetest
+def test_bcn_backend_selection():
+    clear_bcn_decoder_backend_selection()
+    backend = get_bcn_decoder_backend(ImageFormats.BC7_UNORM)
+    assert backend.name == "pillow"
+    assert get_bcn_decoder_backend(ImageFormats.BC7_UNORM) is backend
+    assert get_bcn_decoder_backend(ImageFormats.BC1_DXT1, "numpy").name == "numpy"
+
+    with pytest.raises(Exception):
+        get_bcn_decoder_backend(ImageFormats.BC7_UNORM, "numpy")
+    with pytest.raises(Exception):
+        get_bcn_decoder_backend(ImageFormats.BC1_DXT1, "unknown")
+    with pytest.raises(ValueError):
+        ImageDecoder().decode_compressed_image(bytes(8), 8, 8, ImageFormats.BC1_DXT1)
@@ -0,0 +1,42 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import hashlib
+
+import numpy as np
+import pytest
+
+from reversebox.image.image_decoder import ImageDecoder
+from reversebox.image.image_encoder import ImageEncoder
+from reversebox.image.image_formats import ImageFormats
+
+# fmt: off
+
+
+@pytest.mark.imagetest
+def test_decode_and_encode_bumpmap_sr():
+    image_decoder = ImageDecoder()
+    image_encoder = ImageEncoder()
+
+    # all possible S and R pairs, same output as the original per texel decoder
+    all_values = np.arange(65536, dtype="<u2").tobytes()
+    decoded_image_data = image_decoder.decode_bumpmap_image(all_values, 256, 256, ImageFormats.BUMPMAP_SR)
+    assert hashlib.md5(decoded_image_data).hexdigest() == "4235990faa48a2a4023fa9ace3224732"
+
+    re_encoded_image_data = image_encoder.encode_bumpmap_image(decoded_image_data, 256, 256, ImageFormats.BUMPMAP_SR)
+    assert len(re_encoded_image_data) == len(all_values)
+    re_decoded_image_data = image_decoder.decode_bumpmap_image(re_encoded_image_data, 256, 256, ImageFormats.BUMPMAP_SR)
+    differences = np.frombuffer(re_decoded_image_data, dtype=np.uint8).astype(np.int32) - np.frombuffer(decoded_image_data, dtype=np.uint8)
+    assert np.abs(differences).max() <= 2
+
+    # flat normal, normal pointing into the surface and zero length normal
+    flat_normals = bytes([128, 128, 255, 255, 128, 128, 0, 255, 127, 127, 127, 255, 128, 128, 255, 255])
+    encoded_image_data = image_encoder.encode_bumpmap_image(flat_normals, 2, 2, ImageFormats.BUMPMAP_SR)
+    assert encoded_image_data[0] <= 1  # (128, 128, 255) is tilted by 0.3 degrees
+    assert encoded_image_data[2] == 255
+    assert encoded_image_data[4] == 0
+
+    with pytest.raises(ValueError):
+        image_decoder.decode_bumpmap_image(bytes(7), 2, 2, ImageFormats.BUMPMAP_SR)
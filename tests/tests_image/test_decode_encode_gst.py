@@ -3,10 +3,16 @@ Copyright © 2026 Bartłomiej Duda
 License: GPL-3.0 License
 """
 
+import hashlib
 import os
 
+import numpy as np
 import pytest
 
+from reversebox.compression.compression_gst import (
+    compress_gst_image,
+    decompress_gst_image,
+)
 from reversebox.image.image_decoder import ImageDecoder
 from reversebox.image.image_encoder import ImageEncoder
 from reversebox.image.image_formats import ImageFormats
@@ -58,10 +64,15 @@ def test_decode_and_encode_all_gst_images():
                                                                                         gst_format=test_entry.img_format,
                                                                                         is_swizzled=test_entry.is_swizzled
                                                                                         )
-        # TODO - adjust asserts
-        assert re_encoded_image_data is not None
-        assert re_encoded_palette_data is not None
-
+        re_decoded_image_data: bytes = image_decoder.decode_gst_image(image_data=re_encoded_image_data,
+                                                                      palette_data=re_encoded_palette_data,
+                                                                      img_width=test_entry.img_width,
+                                                                      img_height=test_entry.img_height,
+                                                                      image_format=test_entry.img_format,
+                                                                      convert_format=test_entry.conv_format,
+                                                                      convert_pal_format=test_entry.conv_pal_format,
+                                                                      is_swizzled=test_entry.is_swizzled
+                                                                      )
 
         # debug start ###############################################################################################
         if test_entry.debug_flag:
@@ -69,10 +80,42 @@ def test_decode_and_encode_all_gst_images():
             pil_image.show()
         # debug end #################################################################################################
 
-        # TODO - add asserts for encoding
         assert len(encoded_image_data) > 0
         assert len(decoded_image_data) > 0
-        # assert len(re_encoded_image_data) > 0
-        # assert len(re_decoded_image_data) > 0
-        # assert len(decoded_image_data) == len(re_decoded_image_data)
-        # assert len(encoded_image_data) == len(re_encoded_image_data)
+        assert len(re_encoded_image_data) > 0
+        assert len(re_decoded_image_data) > 0
+        assert len(decoded_image_data) == len(re_decoded_image_data)
+        assert len(encoded_image_data) == len(re_encoded_image_data)
+        assert len(encoded_palette_data) == len(re_encoded_palette_data)
+
+
+@pytest.mark.imagetest
+def test_gst_decoder_expected_output():
+    with open(_get_test_image_path("monkey_GST422.bin"), "rb") as image_file, open(_get_test_image_path("monkey_GST422.pal"), "rb") as palette_file:
+        decoded_image_data = ImageDecoder().decode_gst_image(image_file.read(), palette_file.read(), 256, 128, ImageFormats.GST422,
+                                                             ImageFormats.PAL8, ImageFormats.BGRA8888, False)
+    assert hashlib.md5(decoded_image_data).hexdigest() == "3667019d8a023bdb4f413a573bec7b47"
+
+
+@pytest.mark.imagetest
+def test_gst_encoder_all_formats():
+    with open(_get_test_image_path("monkey_GST422.bin"), "rb") as image_file, open(_get_test_image_path("monkey_GST422.pal"), "rb") as palette_file:
+        image_data = image_file.read()
+        palette_data = palette_file.read()
+    decoded_image_data = ImageDecoder().decode_gst_image(image_data, palette_data, 256, 128, ImageFormats.GST422,
+                                                         ImageFormats.PAL8, ImageFormats.BGRA8888, False)
+    original_pixels = np.frombuffer(decoded_image_data, dtype=np.uint8).astype(np.float64)
+
+    # base search is exhaustive, original palette reproduces original image
+    palette = np.frombuffer(palette_data, dtype=np.uint8).reshape(256, 4)[:, [2, 1, 0, 3]]
+    base_data, detail_data = compress_gst_image(decoded_image_data, palette, 256, 128, 4, 2, 2)
+    indices = np.frombuffer(decompress_gst_image(base_data, detail_data, 256, 128, 4, 2, 2), dtype=np.uint8)
+    assert palette[indices].tobytes() == decoded_image_data
+
+    for image_format, max_error in ((ImageFormats.GST121, 5), (ImageFormats.GST821, 12), (ImageFormats.GST222, 8), (ImageFormats.GST822, 8)):
+        for is_swizzled in (False, True):
+            encoded_image_data, encoded_palette_data = ImageEncoder().encode_gst_image(decoded_image_data, 256, 128, image_format, is_swizzled)
+            re_decoded_image_data = ImageDecoder().decode_gst_image(encoded_image_data, encoded_palette_data, 256, 128, image_format,
+                                                                    ImageFormats.PAL8, ImageFormats.BGRA8888, is_swizzled)
+            error = np.sqrt(((np.frombuffer(re_decoded_image_data, dtype=np.uint8) - original_pixels) ** 2).mean())
+            assert error <= max_error
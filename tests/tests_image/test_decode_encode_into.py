@@ -0,0 +1,159 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import mmap
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from reversebox.image.image_decoder import ImageDecoder
+from reversebox.image.image_encoder import ImageEncoder
+from reversebox.image.image_formats import ImageFormats
+from tests.common import get_test_data
+
+# fmt: off
+
+
+def _get_test_image_path(file_name: str) -> str:
+    return os.path.join(os.path.dirname(__file__), f"image_files/{file_name}")
+
+
+@pytest.mark.imagetest
+def test_decode_into_output_buffers():
+    image_decoder = ImageDecoder()
+    image_data: bytes = get_test_data(16 * 8 * 2)
+    expected_image_data: bytes = image_decoder.decode_image(image_data, 16, 8, ImageFormats.RGB565)
+
+    # bytearray, NumPy array and read-only memoryview input
+    output_bytearray = bytearray(16 * 8 * 4)
+    assert image_decoder.decode_image_into(output_bytearray, memoryview(image_data), 16, 8, ImageFormats.RGB565) == 16 * 8 * 4
+    assert output_bytearray == expected_image_data
+    output_array = np.zeros((8, 16, 4), dtype=np.uint8)
+    image_decoder.decode_image_into(output_array, image_data, 16, 8, ImageFormats.RGB565)
+    assert output_array.tobytes() == expected_image_data
+
+    # memoryview slice of bigger atlas, bytes around it are not touched
+    atlas = bytearray(b"\xAA" * (16 * 8 * 4 + 64))
+    image_decoder.decode_image_into(memoryview(atlas)[32:-32], image_data, 16, 8, ImageFormats.RGB565)
+    assert atlas[32:-32] == expected_image_data
+    assert atlas[:32] == atlas[-32:] == b"\xAA" * 32
+
+    # shared memory block
+    shared_block = shared_memory.SharedMemory(create=True, size=16 * 8 * 4)
+    try:
+        image_decoder.decode_image_into(shared_block, image_data, 16, 8, ImageFormats.RGB565)
+        assert bytes(shared_block.buf) == expected_image_data
+    finally:
+        shared_block.close()
+        shared_block.unlink()
+
+    with pytest.raises(ValueError):
+        image_decoder.decode_image_into(bytearray(16 * 8 * 4 - 1), image_data, 16, 8, ImageFormats.RGB565)
+    with pytest.raises(ValueError):
+        image_decoder.decode_image_into(memoryview(bytes(16 * 8 * 4)), image_data, 16, 8, ImageFormats.RGB565)
+
+
+@pytest.mark.imagetest
+def test_decode_into_all_decoders():
+    image_decoder = ImageDecoder()
+
+    # odd number of 4-bit pixels, missing pixels are set to zeros
+    for image_format, image_data in ((ImageFormats.GRAY4, get_test_data(8)), (ImageFormats.RGBA8888, get_test_data(20))):
+        output = bytearray(b"\xFF" * 5 * 3 * 4)
+        image_decoder.decode_image_into(output, image_data, 5, 3, image_format)
+        assert output == image_decoder.decode_image(image_data, 5, 3, image_format)[:5 * 3 * 4].ljust(5 * 3 * 4, b"\x00")
+
+    palette_data: bytes = get_test_data(1024)
+    for image_format in (ImageFormats.PAL4, ImageFormats.PAL8, ImageFormats.PAL8_TZAR, ImageFormats.PAL_I8A8):
+        image_data = get_test_data(256)
+        output = bytearray(8 * 8 * 4)
+        image_decoder.decode_indexed_image_into(output, image_data, palette_data, 8, 8, image_format, ImageFormats.BGRA5551)
+        assert output == image_decoder.decode_indexed_image(image_data, palette_data, 8, 8, image_format, ImageFormats.BGRA5551)
+
+    with open(_get_test_image_path("monkey_PSP_DXT1.bin"), "rb") as test_file, mmap.mmap(test_file.fileno(), 0, access=mmap.ACCESS_READ) as image_data:
+        output = np.empty(256 * 128 * 4, dtype=np.uint8)
+        image_decoder.decode_psp_dxt_image_into(output, image_data, 256, 128, ImageFormats.PSP_DXT1)
+        assert output.tobytes() == image_decoder.decode_psp_dxt_image(image_data, 256, 128, ImageFormats.PSP_DXT1)
+
+    image_data = get_test_data(16 * 8 * 2)
+    output = bytearray(16 * 8 * 4)
+    image_decoder.decode_yuv_image_into(output, image_data, 16, 8, ImageFormats.YUV422P)
+    assert output == image_decoder.decode_yuv_image(image_data, 16, 8, ImageFormats.YUV422P)
+    image_decoder.decode_compressed_image_into(output, image_data, 16, 8, ImageFormats.BC3_DXT5, "numpy")
+    assert output == image_decoder.decode_compressed_image(image_data, 16, 8, ImageFormats.BC3_DXT5, "numpy")
+
+
+@pytest.mark.imagetest
+def test_encode_into_output_buffers():
+    image_encoder = ImageEncoder()
+    image_data: bytes = get_test_data(16 * 8 * 4)
+
+    for image_format, number_of_mipmaps in ((ImageFormats.RGB565, 0), (ImageFormats.GRAY4, 0), (ImageFormats.BGRA8888, 2)):
+        expected_image_data: bytes = image_encoder.encode_image(image_data, 16, 8, image_format, number_of_mipmaps=number_of_mipmaps)
+        output = bytearray(b"\xFF" * (len(expected_image_data) + 8))
+        written_size: int = image_encoder.encode_image_into(output, memoryview(image_data), 16, 8, image_format, number_of_mipmaps=number_of_mipmaps)
+        assert written_size == len(expected_image_data)
+        assert output[:written_size] == expected_image_data
+        assert output[written_size:] == b"\xFF" * 8
+
+    output = np.zeros(16 * 8, dtype=np.uint8)
+    assert image_encoder.encode_compressed_image_into(output, image_data, 16, 8, ImageFormats.BC3_DXT5) == 16 * 8
+    assert output.tobytes() == image_encoder.encode_compressed_image(image_data, 16, 8, ImageFormats.BC3_DXT5)
+
+    with pytest.raises(ValueError):
+        image_encoder.encode_image_into(bytearray(16 * 8 * 2 - 1), image_data, 16, 8, ImageFormats.RGB565)
+
+
+@pytest.mark.imagetest
+def test_decode_encode_into_direct_writes():
+    image_decoder = ImageDecoder()
+    image_encoder = ImageEncoder()
+    rgba_data: bytes = get_test_data(16 * 8 * 4)
+
+    # decoded images, odd sizes and bytes around output are not touched
+    decode_entries = (
+        (lambda output, data: image_decoder.decode_image_with_layout_into(output, data, 7, 5, "A1R5G5B5"),
+         lambda data: image_decoder.decode_image_with_layout(data, 7, 5, "A1R5G5B5"), 7 * 5 * 4),
+        (lambda output, data: image_decoder.decode_image_with_layout_into(output, data, 5, 3, "A4L4", "big", "scale"),
+         lambda data: image_decoder.decode_image_with_layout(data, 5, 3, "A4L4", "big", "scale"), 5 * 3 * 4),
+        (lambda output, data: image_decoder.decode_bumpmap_image_into(output, data, 7, 5, ImageFormats.BUMPMAP_SR),
+         lambda data: image_decoder.decode_bumpmap_image(data, 7, 5, ImageFormats.BUMPMAP_SR), 7 * 5 * 4),
+        (lambda output, data: image_decoder.decode_n64_image_into(output, data, 12, 6, ImageFormats.N64_RGBA32),
+         lambda data: image_decoder.decode_n64_image(data, 12, 6, ImageFormats.N64_RGBA32), 12 * 6 * 4),
+        (lambda output, data: image_decoder.decode_n64_image_into(output, data, 12, 6, ImageFormats.N64_CMPR),
+         lambda data: image_decoder.decode_n64_image(data, 12, 6, ImageFormats.N64_CMPR), 12 * 6 * 4),
+        (lambda output, data: image_decoder.decode_psp_dxt_image_into(output, data, 7, 5, ImageFormats.PSP_DXT5),
+         lambda data: image_decoder.decode_psp_dxt_image(data, 7, 5, ImageFormats.PSP_DXT5), 7 * 5 * 4),
+    )
+    for decode_into_function, decode_function, expected_size in decode_entries:
+        image_data = get_test_data(2048)
+        atlas = bytearray(b"\xAA" * (expected_size + 64))
+        assert decode_into_function(memoryview(atlas)[32:-32], image_data) == expected_size
+        assert atlas[32:-32] == decode_function(image_data)
+        assert atlas[:32] == atlas[-32:] == b"\xAA" * 32
+
+    # encoded images
+    encode_entries = (
+        (lambda output: image_encoder.encode_image_with_layout_into(output, rgba_data, 16, 8, "R5G6B5", "big"),
+         lambda: image_encoder.encode_image_with_layout(rgba_data, 16, 8, "R5G6B5", "big")),
+        (lambda output: image_encoder.encode_image_with_layout_into(output, rgba_data, 5, 3, "A4L4"),
+         lambda: image_encoder.encode_image_with_layout(rgba_data, 5, 3, "A4L4")),
+        (lambda output: image_encoder.encode_n64_image_into(output, rgba_data, 16, 8, ImageFormats.N64_CMPR),
+         lambda: image_encoder.encode_n64_image(rgba_data, 16, 8, ImageFormats.N64_CMPR)),
+        (lambda output: image_encoder.encode_yuv_image_into(output, rgba_data, 7, 5, ImageFormats.YUV422_YUY2),
+         lambda: image_encoder.encode_yuv_image(rgba_data, 7, 5, ImageFormats.YUV422_YUY2)),
+        (lambda output: image_encoder.encode_yuv_image_into(output, rgba_data, 7, 5, ImageFormats.YUV420_NV21),
+         lambda: image_encoder.encode_yuv_image(rgba_data, 7, 5, ImageFormats.YUV420_NV21)),
+        (lambda output: image_encoder.encode_bumpmap_image_into(output, rgba_data, 16, 8, ImageFormats.BUMPMAP_SR),
+         lambda: image_encoder.encode_bumpmap_image(rgba_data, 16, 8, ImageFormats.BUMPMAP_SR)),
+    )
+    for encode_into_function, encode_function in encode_entries:
+        expected_image_data = encode_function()
+        output = bytearray(b"\xFF" * (len(expected_image_data) + 8))
+        assert encode_into_function(output) == len(expected_image_data)
+        assert output[:len(expected_image_data)] == expected_image_data
+        assert output[len(expected_image_data):] == b"\xFF" * 8
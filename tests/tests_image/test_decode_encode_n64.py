@@ -3,16 +3,19 @@ Copyright © 2025  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
+import hashlib
 import os
 
+import numpy as np
 import pytest
 
 from reversebox.image.common import get_bc_image_data_size
+from reversebox.image.decoders.n64_decoder_encoder import N64ImageDecoderEncoder
 from reversebox.image.image_decoder import ImageDecoder
 from reversebox.image.image_encoder import ImageEncoder
 from reversebox.image.image_formats import ImageFormats
 from reversebox.image.pillow_wrapper import PillowWrapper
-from tests.common import ImageDecodeEncodeTestEntry
+from tests.common import ImageDecodeEncodeTestEntry, get_test_data
 
 # fmt: off
 
@@ -56,3 +59,44 @@ def test_decode_and_encode_all_n64_images():
         assert len(re_decoded_image_data) > 0
         assert len(decoded_image_data) == len(re_decoded_image_data)
         assert len(encoded_image_data) == len(re_encoded_image_data)
+
+
+@pytest.mark.imagetest
+def test_n64_decoder_encoder_expected_output():
+    n64_decoder_encoder = N64ImageDecoderEncoder()
+    with open(_get_test_image_path("monkey_N64_CMPR.bin"), "rb") as test_file:
+        decoded_image_data = n64_decoder_encoder.decode_n64_image_main(test_file.read(), 256, 128, ImageFormats.N64_CMPR)
+    assert hashlib.md5(decoded_image_data).hexdigest() == "faa81f1e50582e6dd4d137434f580c46"
+
+    # default "fast" preset gives the same output as the original per pixel encoder
+    encoded_image_data = n64_decoder_encoder.encode_n64_image_main(decoded_image_data, 256, 128, ImageFormats.N64_CMPR)
+    assert hashlib.md5(encoded_image_data).hexdigest() == "a7d99ef5f4c38d1024d313a3fe59bb0f"
+    encoded_image_data = ImageEncoder().encode_n64_image(decoded_image_data, 256, 128, ImageFormats.N64_CMPR)
+    assert hashlib.md5(encoded_image_data).hexdigest() == "a7d99ef5f4c38d1024d313a3fe59bb0f"
+
+    # partial tiles are cropped
+    decoded_image_data = n64_decoder_encoder.decode_n64_image_main(get_test_data(2048), 12, 6, ImageFormats.N64_RGBA32)
+    assert hashlib.md5(decoded_image_data).hexdigest() == "b7b9c28db17f609196910ac7a106be05"
+    assert len(n64_decoder_encoder.decode_n64_image_main(get_test_data(2048), 12, 6, ImageFormats.N64_CMPR)) == 12 * 6 * 4
+
+    with pytest.raises(ValueError):
+        n64_decoder_encoder.decode_n64_image_main(bytes(31), 8, 8, ImageFormats.N64_CMPR)
+
+
+@pytest.mark.imagetest
+def test_n64_cmpr_encoder_presets():
+    n64_decoder_encoder = N64ImageDecoderEncoder()
+    with open(_get_test_image_path("monkey_N64_CMPR.bin"), "rb") as test_file:
+        decoded_image_data = n64_decoder_encoder.decode_n64_image_main(test_file.read(), 256, 128, ImageFormats.N64_CMPR)
+    original_pixels = np.frombuffer(decoded_image_data, dtype=np.uint8).astype(np.float64)
+
+    errors = []
+    for encoder_preset in ("fast", "normal", "high"):
+        encoded_image_data = n64_decoder_encoder.encode_n64_image_main(decoded_image_data, 256, 128, ImageFormats.N64_CMPR, encoder_preset)
+        re_decoded_pixels = np.frombuffer(n64_decoder_encoder.decode_n64_image_main(encoded_image_data, 256, 128, ImageFormats.N64_CMPR), dtype=np.uint8)
+        errors.append(np.sqrt(((re_decoded_pixels - original_pixels) ** 2).mean()))
+    assert errors[0] >= errors[1] >= errors[2]
+    assert errors[2] <= 1.0
+
+    with pytest.raises(ValueError):
+        n64_decoder_encoder.encode_n64_image_main(decoded_image_data, 256, 128, ImageFormats.N64_CMPR, "best")
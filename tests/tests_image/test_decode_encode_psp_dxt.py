@@ -3,11 +3,13 @@ Copyright © 2025  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
+import hashlib
 import os
 
 import pytest
 
 from reversebox.image.common import get_bc_image_data_size
+from reversebox.image.decoders.psp_dxt_decoder import PSPDXTDecoder
 from reversebox.image.image_decoder import ImageDecoder
 from reversebox.image.image_formats import ImageFormats
 from reversebox.image.pillow_wrapper import PillowWrapper
@@ -55,3 +57,20 @@ def test_decode_and_encode_all_psp_dxt_images():
         # assert len(re_decoded_image_data) > 0
         # assert len(decoded_image_data) == len(re_decoded_image_data)
         # assert len(encoded_image_data) == len(re_encoded_image_data)
+
+
+@pytest.mark.imagetest
+def test_psp_dxt_decoder_expected_output():
+    expected_digests = {
+        ImageFormats.PSP_DXT1: ("1ce40ef09b5cf14db588bb480bed53dd", "de8c8ccbf927693205732714d59ad04a"),
+        ImageFormats.PSP_DXT3: ("aac20ef24f8d397f7b4e4325ccc13db2", "e67a4b12be7477dbfc222e569b75c2d0"),
+        ImageFormats.PSP_DXT5: ("aac20ef24f8d397f7b4e4325ccc13db2", "fc18e8bba0a18ad65170781e419b5a67"),
+    }
+    for image_format, (monkey_digest, pitched_digest) in expected_digests.items():
+        with open(_get_test_image_path(f"monkey_{image_format.name}.bin"), "rb") as test_file:
+            decoded_image_data = PSPDXTDecoder().decode_psp_dxt_image_main(test_file.read(), 256, 128, image_format)
+        assert hashlib.md5(decoded_image_data).hexdigest() == monkey_digest
+
+        # width not aligned to blocks, rows of blocks are padded to pitch
+        decoded_image_data = PSPDXTDecoder().decode_psp_dxt_image_main(bytes(range(256)) * 2, 10, 6, image_format)
+        assert hashlib.md5(decoded_image_data).hexdigest() == pitched_digest
@@ -0,0 +1,109 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import hashlib
+
+import numpy as np
+import pytest
+
+from reversebox.image.decoders.yuv_decoder import (
+    YUV_CHROMA_SUBSAMPLING,
+    get_yuv_image_data_size,
+)
+from reversebox.image.decoders.yuv_frame_decoder import get_yuv_frame_count
+from reversebox.image.image_decoder import ImageDecoder
+from reversebox.image.image_encoder import ImageEncoder
+from reversebox.image.image_formats import ImageFormats
+from tests.common import get_test_data
+
+# fmt: off
+
+
+@pytest.mark.imagetest
+def test_yuv_decoder_expected_output():
+    # same output as the original per pixel decoder
+    expected_digests = {
+        ImageFormats.YUV422_YUY2: "031ffa647b72a4eeee5ee70b8ba127e2",
+        ImageFormats.YUV422_UYVY: "47493090a2c755623abfc45f26014809",
+        ImageFormats.YUV420_NV12: "8dd9b27961db2fc9491730d90833a02c",
+        ImageFormats.YUV420_NV21: "380e333ac14f22f0d786891dd766c148",
+        ImageFormats.YUV410P: "f8ad4f135e249ecca778a378c98810c2",
+        ImageFormats.YUV411P: "423feb4caa1f8b05b4b0dbf12cfcaa01",
+        ImageFormats.YUV411_UYYVYY411: "a17ec9eb4da4f4f073caa4c6600a6368",
+        ImageFormats.YUV420P: "60eae7a31d309f360f6bd2db0acba395",
+        ImageFormats.YUVA420P: "69f42fa2573d45457cdcb4fd9f082faf",
+        ImageFormats.YUV422P: "bbe7588a03cfc9fb4dbb764b66b3e558",
+        ImageFormats.YUV440P: "54ad4f595e15692f795070998dfc86b7",
+        ImageFormats.YUV444P: "291b826efb8d2024beaefffe0dc2610f",
+        ImageFormats.AYUV: "1184186ada2d5974495cca4350505444",
+    }
+    image_decoder = ImageDecoder()
+    for image_format, expected_digest in expected_digests.items():
+        image_data = get_test_data(get_yuv_image_data_size(image_format, 16, 8))
+        decoded_image_data = image_decoder.decode_yuv_image(image_data, 16, 8, image_format)
+        assert hashlib.md5(decoded_image_data).hexdigest() == expected_digest
+
+        # fixed point results differ by 1 at most
+        fixed_point_data = image_decoder.decode_yuv_image(image_data, 16, 8, image_format, fixed_point=True)
+        differences = np.frombuffer(fixed_point_data, dtype=np.uint8).astype(np.int32) - np.frombuffer(decoded_image_data, dtype=np.uint8)
+        assert np.abs(differences).max() <= 1
+
+    with pytest.raises(ValueError):
+        image_decoder.decode_yuv_image(bytes(10), 16, 8, ImageFormats.YUV420P)
+    with pytest.raises(Exception):
+        image_decoder.decode_yuv_image(bytes(1000), 16, 8, ImageFormats.YUV420P, colour_matrix="rec2020")
+
+
+@pytest.mark.imagetest
+def test_yuv_encoder_round_trip():
+    image_decoder = ImageDecoder()
+    image_encoder = ImageEncoder()
+    img_width, img_height = 37, 21  # partial chroma blocks on edges
+    y, x = np.mgrid[0:img_height, 0:img_width]
+    pixels = np.stack((x * 2 + 40, y * 3 + 60, (x + y) * 2, np.full_like(x, 0x80)), axis=-1).astype(np.uint8)
+
+    for image_format in YUV_CHROMA_SUBSAMPLING:
+        for colour_matrix in (None, "jpeg", "rec601", "rec709"):
+            encoded_image_data = image_encoder.encode_yuv_image(pixels.tobytes(), img_width, img_height, image_format, colour_matrix)
+            assert len(encoded_image_data) == get_yuv_image_data_size(image_format, img_width, img_height)
+            decoded_image_data = image_decoder.decode_yuv_image(encoded_image_data, img_width, img_height, image_format, colour_matrix)
+            decoded_pixels = np.frombuffer(decoded_image_data, dtype=np.uint8).reshape(img_height, img_width, 4)
+            error = np.sqrt(((decoded_pixels[:, :, :3].astype(np.float64) - pixels[:, :, :3]) ** 2).mean())
+            assert error <= 3.0
+
+            expected_alpha = 0x80 if image_format in (ImageFormats.YUVA420P, ImageFormats.AYUV) else 0xFF
+            assert (decoded_pixels[:, :, 3] == expected_alpha).all()
+
+
+@pytest.mark.imagetest
+def test_yuv_frame_iterator(tmp_path):
+    image_decoder = ImageDecoder()
+    img_width, img_height = 32, 16
+    for image_format in (ImageFormats.YUV420_NV12, ImageFormats.YUV422_YUY2):
+        frame_size: int = get_yuv_image_data_size(image_format, img_width, img_height)
+        frame_stride: int = frame_size + 16  # padding after every frame
+        stream_data = get_test_data(64 + frame_stride * 9 + frame_size)
+        stream_path = tmp_path / f"{image_format.value}.yuv"
+        stream_path.write_bytes(stream_data)
+        assert get_yuv_frame_count(len(stream_data), img_width, img_height, image_format, frame_stride, 64) == 10
+
+        expected_frames = [image_decoder.decode_yuv_image(stream_data[64 + i * frame_stride:], img_width, img_height, image_format) for i in range(10)]
+        for source in (str(stream_path), stream_data):
+            for workers in (1, 3):
+                frames = [frame.tobytes() for frame in image_decoder.decode_yuv_frames(source, img_width, img_height, image_format, frame_stride, 64, workers=workers)]
+                assert frames == expected_frames
+
+        # frames are decoded into caller buffers
+        output_buffers = [np.empty((img_height, img_width, 4), dtype=np.uint8) for _ in range(2)]
+        with open(stream_path, "rb") as stream_file:
+            for frame_number, frame in enumerate(image_decoder.decode_yuv_frames(stream_file, img_width, img_height, image_format, frame_stride, 64,
+                                                                                 output_buffers=output_buffers)):
+                assert frame is output_buffers[frame_number % 2]
+                assert frame.tobytes() == expected_frames[frame_number]
+                if frame_number == 4:
+                    break
+
+    with pytest.raises(ValueError):
+        next(image_decoder.decode_yuv_frames(bytes(4096), img_width, img_height, ImageFormats.YUV420P, workers=2, output_buffers=output_buffers[:1]))
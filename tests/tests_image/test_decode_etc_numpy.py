@@ -0,0 +1,76 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import hashlib
+import os
+
+import numpy as np
+import pytest
+
+from reversebox.image.common import get_bc_image_data_size
+from reversebox.image.decoders.etc_numpy_decoder import EtcNumpyDecoder
+from reversebox.image.image_decoder import ImageDecoder
+from reversebox.image.image_formats import ImageFormats
+from tests.common import get_test_data
+
+# fmt: off
+
+
+def _get_test_image_path(file_name: str) -> str:
+    return os.path.join(os.path.dirname(__file__), f"image_files/{file_name}")
+
+
+@pytest.mark.imagetest
+def test_etc_numpy_decoder_handcrafted_blocks():
+    decoder = EtcNumpyDecoder()
+
+    # individual mode, base colours 0x88 and 0x00, table 0, all indices 0 (+2)
+    pixels = np.frombuffer(decoder.decode_etc_image(b"\x80\x80\x80\x00" + bytes(4), 4, 4, ImageFormats.ETC1), dtype=np.uint8).reshape(4, 4, 4)
+    assert (pixels[:, :2] == [138, 138, 138, 255]).all()
+    assert (pixels[:, 2:] == [2, 2, 2, 255]).all()
+
+    # T mode (red overflow), first paint colour is white, second is (3, 3, 3)
+    t_mode_block = b"\xFB\xFF\x00\x02\x00\x00\x00\x00"
+    pixels = np.frombuffer(decoder.decode_etc_image(t_mode_block, 4, 4, ImageFormats.ETC2_RGB), dtype=np.uint8).reshape(-1, 4)
+    assert (pixels == [255, 255, 255, 255]).all()
+    pixels = np.frombuffer(decoder.decode_etc_image(t_mode_block[:4] + b"\x00\x00\xFF\xFF", 4, 4, ImageFormats.ETC2_RGB), dtype=np.uint8).reshape(-1, 4)
+    assert (pixels == [3, 3, 3, 255]).all()
+
+    # EAC, base 128, multiplier 1, table 0, all indices 0 (-3)
+    eac_block = b"\x80\x10" + bytes(6)
+    assert decoder.decode_etc_image(eac_block, 4, 4, ImageFormats.EAC_R11)[:4] == bytes([(1028 - 24) >> 3, 0, 0, 255])
+    assert decoder.decode_etc_image(eac_block + t_mode_block, 4, 4, ImageFormats.ETC2_RGBA)[:4] == b"\xFF\xFF\xFF\x7D"
+
+
+@pytest.mark.imagetest
+def test_etc_numpy_decoder_all_formats():
+    expected_digests = {
+        ImageFormats.ETC1: "35e17ba3e1115821c45fc1e2218fb75b",
+        ImageFormats.ETC2_RGB: "35254fdbad95a41e68877f264d32e489",
+        ImageFormats.ETC2_RGBA: "659bebb7be257a735d434e8dc3b65694",
+        ImageFormats.ETC2_RGB_A1: "05e421d6888e437d2c78056aec7d4b30",
+        ImageFormats.EAC_R11: "d2ceaaebd9b7a122a27888884f38b444",
+        ImageFormats.EAC_RG11: "024143914227be01baa24e326e9a08f0",
+    }
+    for image_format, expected_digest in expected_digests.items():
+        image_data = get_test_data(get_bc_image_data_size(32, 32, image_format))
+        decoded_data = ImageDecoder().decode_pvrtexlib_image(image_data, 32, 32, image_format, "native")
+        assert hashlib.md5(decoded_data).hexdigest() == expected_digest
+
+        # partial blocks are cropped
+        decoded_data = EtcNumpyDecoder().decode_etc_image(image_data, 30, 31, image_format)
+        assert len(decoded_data) == 30 * 31 * 4
+
+
+@pytest.mark.imagetest
+def test_etc_numpy_decoder_monkey_etc1():
+    with open(_get_test_image_path("monkey_ETC1.bin"), "rb") as test_file:
+        decoded_data = EtcNumpyDecoder().decode_etc_image(test_file.read(), 256, 128, ImageFormats.ETC1)
+    with open(_get_test_image_path("monkey_RGBA8888.bin"), "rb") as test_file:
+        original_data = test_file.read()[:256 * 128 * 4]
+
+    decoded_pixels = np.frombuffer(decoded_data, dtype=np.uint8).reshape(-1, 4)[:, :3].astype(np.float64)
+    original_pixels = np.frombuffer(original_data, dtype=np.uint8).reshape(-1, 4)[:, :3].astype(np.float64)
+    assert np.sqrt(((decoded_pixels - original_pixels) ** 2).mean()) < 10
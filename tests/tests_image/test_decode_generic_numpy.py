@@ -0,0 +1,76 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import os
+
+import pytest
+
+from reversebox.image.decoders.generic_numpy_decoder import GenericNumpyDecoder
+from reversebox.image.decoders.indexed_numpy_decoder import IndexedNumpyDecoder
+from reversebox.image.image_decoder import ImageDecoder
+from reversebox.image.image_formats import ImageFormats
+
+# fmt: off
+
+
+@pytest.mark.imagetest
+def test_numpy_decoder_matches_per_pixel_decoder_for_all_generic_formats():
+    image_decoder = ImageDecoder()
+    img_width: int = 16
+    img_height: int = 8
+
+    for image_format, (_, bits_per_pixel) in GenericNumpyDecoder.generic_data_formats.items():
+        image_data: bytes = os.urandom(img_width * img_height * bits_per_pixel // 8)
+        image_data += b"\x00\x00\xFF\xFF\x6F\x00\x00\x00\xF0\x00\x00\x80"  # special alpha values
+        if image_format == ImageFormats.RGB121_BYTE:
+            image_data = bytes(value & 0x0F for value in image_data)  # 4-bit values stored in bytes
+
+        for image_endianess in ("little", "big"):
+            expected_data: bytes = image_decoder._decode_generic(image_data, img_width, img_height,
+                                                                 image_decoder.generic_data_formats[image_format], image_endianess)
+            decoded_data: bytes = image_decoder.decode_image(image_data, img_width, img_height, image_format, image_endianess)
+            assert decoded_data == expected_data, f"Mismatch for {image_format} ({image_endianess})"
+
+
+@pytest.mark.imagetest
+def test_numpy_decoder_pads_short_image_data():
+    image_decoder = ImageDecoder()
+    image_data: bytes = b"\x1F\x00" * 10
+
+    decoded_data: bytes = image_decoder.decode_image(image_data, 4, 4, ImageFormats.RGB565)
+    expected_data: bytes = image_decoder._decode_generic(image_data, 4, 4, image_decoder.generic_data_formats[ImageFormats.RGB565], "little")
+
+    assert len(decoded_data) == 4 * 4 * 4
+    assert decoded_data == expected_data
+
+
+@pytest.mark.imagetest
+def test_numpy_decoder_matches_per_pixel_decoder_for_indexed_formats():
+    image_decoder = ImageDecoder()
+    img_width: int = 16
+    img_height: int = 8
+    palette_formats = [ImageFormats.RGBA8888, ImageFormats.BGRA8888, ImageFormats.RGB565, ImageFormats.N64_RGB5A3,
+                       ImageFormats.BGRA5551_TZAR, ImageFormats.RGB888, ImageFormats.GRAY8, ImageFormats.GRAY4]
+
+    for image_format, bits_per_pixel in IndexedNumpyDecoder.indexed_data_formats.items():
+        image_data: bytes = b"\x6F\xFF\x00\x80" + os.urandom(img_width * img_height * bits_per_pixel // 8 - 4)
+        for palette_format in palette_formats:
+            palette_bits_per_pixel: int = GenericNumpyDecoder.generic_data_formats[palette_format][1]
+            palette_data: bytes = os.urandom(256 * max(8, palette_bits_per_pixel) // 8)
+            for image_endianess in ("little", "big"):
+                for scale_value in (1, 2):
+                    expected_data: bytes = image_decoder._decode_indexed(image_data, palette_data, img_width, img_height, image_format,
+                                                                         palette_format, image_endianess, "big", scale_value)
+                    decoded_data: bytes = image_decoder.decode_indexed_image(image_data, palette_data, img_width, img_height, image_format,
+                                                                             palette_format, image_endianess, "big", scale_value)
+                    assert decoded_data == expected_data, f"Mismatch for {image_format}/{palette_format} ({image_endianess})"
+
+    for palette_format in (ImageFormats.IA_X2_ARGB, ImageFormats.IA_X2_GRAB):
+        image_data: bytes = os.urandom(img_width * img_height)
+        palette_data: bytes = os.urandom(1024)
+        expected_data: bytes = image_decoder._decode_indexed(image_data, palette_data, img_width, img_height, ImageFormats.PAL8,
+                                                             palette_format, "little", "little", 1)
+        decoded_data: bytes = image_decoder.decode_indexed_image(image_data, palette_data, img_width, img_height, ImageFormats.PAL8, palette_format)
+        assert decoded_data == expected_data
@@ -0,0 +1,101 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import hashlib
+import struct
+
+import numpy as np
+import pytest
+
+from reversebox.image.decoders.pvrtc_numpy_decoder import (
+    PvrtcNumpyDecoder,
+    get_morton_word_indices,
+)
+from reversebox.image.image_decoder import ImageDecoder
+from reversebox.image.image_formats import ImageFormats
+from tests.common import get_test_data
+
+# fmt: off
+
+
+@pytest.mark.imagetest
+def test_pvrtc_numpy_decoder_handcrafted_words():
+    decoder = PvrtcNumpyDecoder()
+
+    # opaque white colours A and B, any modulation gives white pixels
+    white_words = struct.pack("<II", 0x1B6C2D4E, 0xFFFFFFFE) * 16
+    for image_format in PvrtcNumpyDecoder.supported_formats:
+        pixels = np.frombuffer(decoder.decode_pvrtc_image(white_words, 8, 8, image_format), dtype=np.uint8)
+        assert (pixels == 0xFF).all()
+
+    # punch-through mode, modulation value 2 makes pixels transparent
+    punch_through_words = struct.pack("<II", 0xAAAAAAAA, 0xFFFFFFFF) * 4
+    pixels = np.frombuffer(decoder.decode_pvrtc_image(punch_through_words, 8, 8, ImageFormats.PVRTCI_4bpp_RGBA), dtype=np.uint8).reshape(-1, 4)
+    assert (pixels[:, 3] == 0).all()
+    assert (pixels[:, :3] == 0xFF).all()
+
+    # y is the lowest bit of Morton index, larger dimension bits are appended
+    assert get_morton_word_indices(4, 2).tolist() == [[0, 2, 4, 6], [1, 3, 5, 7]]
+    assert get_morton_word_indices(2, 4).tolist() == [[0, 2], [1, 3], [4, 6], [5, 7]]
+
+
+@pytest.mark.imagetest
+def test_pvrtc_numpy_decoder_all_formats():
+    expected_digests = {
+        ImageFormats.PVRTCI_4bpp_RGBA: "042915401ea6006aa131f34ae905d913",
+        ImageFormats.PVRTCI_2bpp_RGB: "a8899f8bfdfd49a74efd8a0bcb382f0a",
+    }
+    for image_format, expected_digest in expected_digests.items():
+        image_data = get_test_data(64 * 32 // (4 if image_format == ImageFormats.PVRTCI_2bpp_RGB else 2))
+        decoded_data = ImageDecoder().decode_pvrtexlib_image(image_data, 64, 32, image_format, "native")
+        assert hashlib.md5(decoded_data).hexdigest() == expected_digest
+
+        # non power of two images are cropped from padded texture
+        decoded_data = PvrtcNumpyDecoder().decode_pvrtc_image(image_data, 50, 30, image_format)
+        assert len(decoded_data) == 50 * 30 * 4
+
+    with pytest.raises(ValueError):
+        PvrtcNumpyDecoder().decode_pvrtc_image(bytes(31), 8, 8, ImageFormats.PVRTCI_4bpp_RGB)
+
+
+@pytest.mark.imagetest
+def test_pvrtc2_numpy_decoder_handcrafted_words():
+    decoder = PvrtcNumpyDecoder()
+    words = np.frombuffer(get_test_data(32), dtype="<u4").reshape(2, 2, 2).copy()
+
+    # without hard transition flag, opaque PVRTC II words are decoded like PVRTC I words
+    # (PVRTC I keeps opacity of colour A in bit 15, PVRTC II words are stored in linear order)
+    words[..., 1] = (words[..., 1] | 0x80000000) & ~np.uint32(0x8001)
+    pvrtc1_words = words.copy()
+    pvrtc1_words[..., 1] |= 0x8000
+    pvrtc1_data = pvrtc1_words.transpose(1, 0, 2).tobytes()
+    for pvrtc1_format, pvrtc2_format in ((ImageFormats.PVRTCI_4bpp_RGBA, ImageFormats.PVRTCII_4bpp),
+                                         (ImageFormats.PVRTCI_2bpp_RGBA, ImageFormats.PVRTCII_2bpp)):
+        img_width: int = 16 if pvrtc2_format == ImageFormats.PVRTCII_2bpp else 8
+        assert decoder.decode_pvrtc_image(words.tobytes(), img_width, 8, pvrtc2_format) == \
+            decoder.decode_pvrtc_image(pvrtc1_data, img_width, 8, pvrtc1_format)
+
+    # hard transition flag, opaque red colour A and blue colour B are not interpolated with next word
+    colour_word: int = 0x80000000 | 0x1F0000 | 0x8000 | 0x7C00
+    image_data = struct.pack("<IIII", 0x00000000, colour_word, 0x55555555, colour_word)
+    pixels = np.frombuffer(decoder.decode_pvrtc_image(image_data, 6, 4, ImageFormats.PVRTCII_4bpp), dtype=np.uint8).reshape(4, 6, 4)
+    assert (pixels[:, :4] == (255, 0, 0, 255)).all()
+    assert (pixels[:, 4:] == (159, 0, 95, 255)).all()
+
+    # translucent colour B has lowest alpha bit set, so it is never fully transparent
+    image_data = struct.pack("<II", 0xFFFFFFFF, 0x8000) * 4
+    pixels = np.frombuffer(decoder.decode_pvrtc_image(image_data, 8, 8, ImageFormats.PVRTCII_4bpp), dtype=np.uint8).reshape(-1, 4)
+    assert (pixels == (0, 0, 0, 0x11)).all()
+
+    # local palette mode (hard transition and mode flags), word "i" has red colour A and green colour B,
+    # pixels of every row use modulation values 0, 1, 2, 3
+    image_data = b"".join(struct.pack("<II", 0xE4E4E4E4, 0x80000000 | ((8 + i) << 21) | 0x8000 | ((4 + i) << 10) | 1) for i in range(4))
+    pixels = np.frombuffer(decoder.decode_pvrtc_image(image_data, 8, 8, ImageFormats.PVRTCII_4bpp), dtype=np.uint8).reshape(8, 8, 4)
+    colour_a = [(33, 0, 0, 255), (41, 0, 0, 255), (49, 0, 0, 255), (57, 0, 0, 255)]
+    colour_b = [(0, 66, 0, 255), (0, 74, 0, 255), (0, 82, 0, 255), (0, 90, 0, 255)]
+    assert pixels[0, :4].tolist() == [list(colour_a[0]), list(colour_a[1]), list(colour_b[3]), list(colour_b[1])]
+    assert pixels[2, :4].tolist() == [list(colour_a[2]), list(colour_a[3]), list(colour_b[1]), list(colour_b[3])]
+    # palette words wrap on texture edges
+    assert pixels[6, 4:].tolist() == [list(colour_a[1]), list(colour_a[0]), list(colour_b[2]), list(colour_b[0])]
@@ -0,0 +1,104 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from reversebox.image.common import get_block_data_size
+from reversebox.image.image_decoder import ImageDecoder
+from reversebox.image.image_formats import ImageFormats
+from reversebox.image.swizzling.swizzle_gamecube import swizzle_gamecube
+from reversebox.image.swizzling.swizzle_morton import swizzle_morton
+from reversebox.image.swizzling.swizzle_morton_ps4 import swizzle_ps4
+from reversebox.image.swizzling.swizzle_morton_ps5 import swizzle_ps5
+from reversebox.image.swizzling.swizzle_switch import swizzle_switch
+from reversebox.image.swizzling.swizzle_x360 import swizzle_x360
+from tests.common import get_test_data
+
+# fmt: off
+
+REGIONS: tuple = ((0, 0, 4, 4), (5, 3, 17, 9), (13, 22, 50, 41), (60, 0, 4, 64))
+
+
+def _get_test_image_path(file_name: str) -> str:
+    return os.path.join(os.path.dirname(__file__), f"image_files/{file_name}")
+
+
+def _crop(decoded_image_data: bytes, img_width: int, region: tuple) -> bytes:
+    region_x, region_y, region_width, region_height = region
+    image = np.frombuffer(decoded_image_data, dtype=np.uint8).reshape(-1, img_width, 4)
+    return image[region_y:region_y + region_height, region_x:region_x + region_width].tobytes()
+
+
+@pytest.mark.imagetest
+def test_decode_region_swizzled_bcn():
+    image_decoder = ImageDecoder()
+    img_width, img_height = 64, 64
+
+    for image_format in (ImageFormats.BC1_DXT1, ImageFormats.BC3_DXT5, ImageFormats.BC7_UNORM):
+        block_data_size: int = get_block_data_size(image_format)
+        image_data: bytes = get_test_data(img_width * img_height // 16 * block_data_size)
+        decoded_image_data: bytes = image_decoder.decode_compressed_image(image_data, img_width, img_height, image_format)
+        swizzled_data: dict = {
+            None: image_data,
+            "morton": swizzle_morton(image_data, img_width, img_height, block_data_size * 8 // 16, 4, 4),
+            "ps4": swizzle_ps4(image_data, img_width, img_height, 4, 4, block_data_size),
+            "ps5": swizzle_ps5(image_data, img_width, img_height, 4, 4, block_data_size),
+            "switch": swizzle_switch(image_data, img_width // 4, img_height // 4, block_data_size, 2),
+            "x360": swizzle_x360(image_data, img_width, img_height, 4, block_data_size),
+        }
+        for swizzle_type, data in swizzled_data.items():
+            for region in REGIONS:
+                region_image_data: bytes = image_decoder.decode_region(data, img_width, img_height, image_format, *region,
+                                                                       swizzle_type=swizzle_type, switch_block_height=2)
+                assert region_image_data == _crop(decoded_image_data, img_width, region), (image_format, swizzle_type, region)
+
+
+@pytest.mark.imagetest
+def test_decode_region_other_formats():
+    image_decoder = ImageDecoder()
+
+    # PSP DXT and N64 CMPR
+    for file_name, image_format, decode_function in (("monkey_PSP_DXT1.bin", ImageFormats.PSP_DXT1, image_decoder.decode_psp_dxt_image),
+                                                     ("monkey_PSP_DXT5.bin", ImageFormats.PSP_DXT5, image_decoder.decode_psp_dxt_image),
+                                                     ("monkey_N64_CMPR.bin", ImageFormats.N64_CMPR, image_decoder.decode_n64_image)):
+        with open(_get_test_image_path(file_name), "rb") as test_file:
+            image_data = test_file.read()
+        decoded_image_data: bytes = decode_function(image_data, 256, 128, image_format)
+        for region in REGIONS + ((100, 70, 156, 58),):
+            assert image_decoder.decode_region(image_data, 256, 128, image_format, *region) == _crop(decoded_image_data, 256, region)
+
+    # ETC
+    image_data = get_test_data(64 * 64)
+    decoded_image_data = image_decoder.decode_pvrtexlib_image(image_data, 64, 64, ImageFormats.ETC2_RGBA)
+    swizzled_image_data: bytes = swizzle_morton(image_data, 64, 64, 8, 4, 4)
+    for region in REGIONS:
+        expected_image_data: bytes = _crop(decoded_image_data, 64, region)
+        assert image_decoder.decode_region(image_data, 64, 64, ImageFormats.ETC2_RGBA, *region) == expected_image_data
+        assert image_decoder.decode_region(swizzled_image_data, 64, 64, ImageFormats.ETC2_RGBA, *region, swizzle_type="morton") == expected_image_data
+
+    # linear formats, GameCube tiles and swizzled pixels
+    for image_format, bpp in ((ImageFormats.RGBA8888, 32), (ImageFormats.RGB565, 16), (ImageFormats.GRAY8, 8), (ImageFormats.GRAY4, 4)):
+        image_data = get_test_data(64 * 64 * bpp // 8)
+        decoded_image_data = image_decoder.decode_image(image_data, 64, 64, image_format)
+        for region in REGIONS:
+            expected_image_data: bytes = _crop(decoded_image_data, 64, region)
+            assert image_decoder.decode_region(swizzle_gamecube(image_data, 64, 64, bpp), 64, 64, image_format, *region,
+                                               swizzle_type="gamecube") == expected_image_data
+            if bpp >= 16:
+                assert image_decoder.decode_region(swizzle_ps5(image_data, 64, 64, 1, 1, bpp // 8), 64, 64, image_format, *region,
+                                                   swizzle_type="ps5") == expected_image_data
+                assert image_decoder.decode_region(swizzle_morton(image_data, 64, 64, bpp), 64, 64, image_format, *region,
+                                                   swizzle_type="morton") == expected_image_data
+
+    with pytest.raises(ValueError):
+        image_decoder.decode_region(bytes(64 * 64 * 4), 64, 64, ImageFormats.RGBA8888, 60, 0, 8, 8)
+    # truncated image data
+    with pytest.raises(ValueError):
+        image_decoder.decode_region(bytes(64 * 32 * 4), 64, 64, ImageFormats.RGBA8888, 0, 48, 8, 8)
+    with pytest.raises(Exception):
+        image_decoder.decode_region(bytes(64 * 64), 64, 64, ImageFormats.GRAY4, 0, 0, 8, 8)
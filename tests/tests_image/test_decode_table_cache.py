@@ -0,0 +1,80 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from reversebox.image.decoders.decode_table_cache import DecodeTableCache
+from reversebox.image.decoders.generic_numpy_decoder import GenericNumpyDecoder
+from reversebox.image.image_formats import ImageFormats
+
+# fmt: off
+
+
+def _get_decode_table(cache: DecodeTableCache, image_format: ImageFormats, image_endianess: str) -> np.ndarray:
+    decode_kernel, bits_per_pixel = GenericNumpyDecoder.generic_data_formats[image_format]
+    return cache.get_decode_table(image_format, image_endianess, decode_kernel, bits_per_pixel)
+
+
+@pytest.mark.imagetest
+def test_decode_table_values():
+    cache = DecodeTableCache()
+    decoder = GenericNumpyDecoder()
+
+    table = _get_decode_table(cache, ImageFormats.RGB565, "big")
+    assert table.shape == (65536, 4)
+    assert bytes(table[0x3412]) == bytes(decoder.decode_pixel_values(np.array([0x1234], dtype=np.uint32), ImageFormats.RGB565)[0])
+
+    table = _get_decode_table(cache, ImageFormats.GRAY4, "little")
+    assert table.shape == (256, 8)
+    assert bytes(table[0xF1]) == b"\x11\x11\x11\xFF\xFF\xFF\xFF\xFF"
+
+
+@pytest.mark.imagetest
+def test_decode_table_lru_eviction():
+    cache = DecodeTableCache(max_tables=2)
+    first_table = _get_decode_table(cache, ImageFormats.RGB565, "little")
+    _get_decode_table(cache, ImageFormats.BGR565, "little")
+    assert _get_decode_table(cache, ImageFormats.RGB565, "little") is first_table
+
+    _get_decode_table(cache, ImageFormats.LA44, "little")  # evicts BGR565
+    assert (ImageFormats.BGR565, "little") not in cache._tables
+    assert (ImageFormats.RGB565, "little") in cache._tables
+
+
+@pytest.mark.imagetest
+def test_decode_table_disk_cache(tmp_path):
+    cache = DecodeTableCache(cache_directory=str(tmp_path))
+    built_table = _get_decode_table(cache, ImageFormats.N64_RGB5A3, "big")
+    assert len(os.listdir(tmp_path)) == 1
+
+    loaded_table = _get_decode_table(DecodeTableCache(cache_directory=str(tmp_path)), ImageFormats.N64_RGB5A3, "big")
+    assert isinstance(loaded_table, np.memmap)
+    assert np.array_equal(built_table, loaded_table)
+
+
+@pytest.mark.imagetest
+def test_decode_table_disk_cache_save_error(tmp_path, monkeypatch):
+    def _failing_save(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(np, "save", _failing_save)
+    cache = DecodeTableCache(cache_directory=str(tmp_path))
+    assert _get_decode_table(cache, ImageFormats.RGB565, "little").shape == (65536, 4)
+    assert os.listdir(tmp_path) == []  # temporary file is removed
+
+
+@pytest.mark.imagetest
+def test_decode_table_shared_between_threads():
+    cache = DecodeTableCache(max_tables=2)
+    image_formats: tuple = (ImageFormats.RGB565, ImageFormats.BGR565, ImageFormats.LA44, ImageFormats.GRAY8, ImageFormats.N64_RGB5A3)
+    table_keys: list = [(image_format, image_endianess) for image_format in image_formats for image_endianess in ("little", "big")] * 20
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        tables: list = list(executor.map(lambda table_key: _get_decode_table(cache, *table_key), table_keys))
+    assert len(cache._tables) == 2
+    assert all(table.shape[0] in (256, 65536) for table in tables)
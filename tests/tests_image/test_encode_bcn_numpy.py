@@ -0,0 +1,119 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from reversebox.image.decoders.bcn_decoder_backends import PillowBCnDecoderBackend
+from reversebox.image.decoders.bcn_numpy_encoder import BCnNumpyEncoder
+from reversebox.image.decoders.compressed_decoder_encoder import (
+    DirectXTexBCnDecoderBackend,
+    clear_bcn_encoder_backend_selection,
+    get_bcn_encoder_backend_name,
+)
+from reversebox.image.image_encoder import ImageEncoder
+from reversebox.image.image_formats import ImageFormats
+
+# fmt: off
+
+
+def _get_test_image_path(file_name: str) -> str:
+    return os.path.join(os.path.dirname(__file__), f"image_files/{file_name}")
+
+
+def _get_rmse(first_data: bytes, second_data: bytes, channels: list) -> float:
+    first_pixels = np.frombuffer(first_data, dtype=np.uint8).reshape(-1, 4)[:, channels].astype(np.float64)
+    second_pixels = np.frombuffer(second_data, dtype=np.uint8).reshape(-1, 4)[:, channels].astype(np.float64)
+    return float(np.sqrt(((first_pixels - second_pixels) ** 2).mean()))
+
+
+@pytest.mark.imagetest
+def test_bcn_numpy_encoder_quality():
+    decoder = PillowBCnDecoderBackend()
+    with open(_get_test_image_path("monkey_dxt5.bin"), "rb") as test_file:
+        rgba_data = decoder.decode(test_file.read(), 256, 128, ImageFormats.BC3_DXT5)
+
+    for image_format, channels, max_rmse in ((ImageFormats.BC1_DXT1, [0, 1, 2], 6.0),
+                                             (ImageFormats.BC2_DXT3, [0, 1, 2, 3], 6.0),
+                                             (ImageFormats.BC3_DXT5, [0, 1, 2, 3], 6.0),
+                                             (ImageFormats.BC4_UNORM, [0], 3.0),
+                                             (ImageFormats.BC5_UNORM, [0, 1], 3.0)):
+        errors = []
+        for preset in ("fast", "normal", "high"):
+            encoded_data = BCnNumpyEncoder(preset).encode_image(rgba_data, 256, 128, image_format)
+            assert len(encoded_data) == 256 * 128 // 16 * (8 if image_format in (ImageFormats.BC1_DXT1, ImageFormats.BC4_UNORM) else 16)
+            errors.append(_get_rmse(decoder.decode(encoded_data, 256, 128, image_format), rgba_data, channels))
+        assert errors[0] < max_rmse
+        assert errors[2] <= errors[1]
+
+
+@pytest.mark.imagetest
+def test_bcn_numpy_encoder_bc1_transparency():
+    rgba_data = bytearray(os.urandom(8 * 8 * 4))
+    for i in range(0, len(rgba_data), 4):
+        rgba_data[i + 3] = 0 if rgba_data[i + 3] < 128 else 0xFF
+
+    encoded_data = BCnNumpyEncoder("high").encode_image(rgba_data, 8, 8, ImageFormats.BC1_DXT1)
+    decoded_pixels = np.frombuffer(PillowBCnDecoderBackend().decode(encoded_data, 8, 8, ImageFormats.BC1_DXT1), dtype=np.uint8).reshape(-1, 4)
+    assert (decoded_pixels[:, 3] == np.frombuffer(bytes(rgba_data), dtype=np.uint8).reshape(-1, 4)[:, 3]).all()
+
+
+@pytest.mark.imagetest
+def test_bcn_numpy_encoder_partial_blocks_and_workers():
+    rgba_data = os.urandom(13 * 23 * 4)
+    for image_format in BCnNumpyEncoder.supported_formats:
+        encoded_data = BCnNumpyEncoder("normal").encode_image(rgba_data, 13, 23, image_format)
+        assert len(PillowBCnDecoderBackend().decode(encoded_data, 13, 23, image_format)) == 13 * 23 * 4
+        assert BCnNumpyEncoder("normal", workers=2).encode_image(rgba_data, 13, 23, image_format) == encoded_data
+
+    with pytest.raises(ValueError):
+        BCnNumpyEncoder("best")
+
+
+@pytest.mark.imagetest
+def test_bc7_and_bc6h_numpy_encoder_error_bound():
+    decoder = PillowBCnDecoderBackend()
+    with open(_get_test_image_path("monkey_dxt5.bin"), "rb") as test_file:
+        texture_data = decoder.decode(test_file.read(), 256, 128, ImageFormats.BC3_DXT5)
+    y, x = np.mgrid[0:128, 0:256]
+    gradient_data = np.stack((x, y * 2, (x + y) // 2, 255 - x), axis=-1).astype(np.uint8).tobytes()
+
+    for rgba_data in (texture_data, gradient_data):
+        for image_format, channels, max_rmse in ((ImageFormats.BC7_UNORM, [0, 1, 2, 3], 1.0),
+                                                 (ImageFormats.BC6H_UF16, [0, 1, 2], 3.0),
+                                                 (ImageFormats.BC6H_SF16, [0, 1, 2], 3.0)):
+            encoded_data = BCnNumpyEncoder("normal").encode_image(rgba_data, 256, 128, image_format)
+            assert len(encoded_data) == 256 * 128
+            assert _get_rmse(decoder.decode(encoded_data, 256, 128, image_format), rgba_data, channels) <= max_rmse
+
+    # mode 6 only
+    encoded_data = BCnNumpyEncoder("normal", use_bc7_mode_5=False).encode_image(gradient_data, 256, 128, ImageFormats.BC7_UNORM)
+    assert all(block_byte & 0x7F == 0x40 for block_byte in encoded_data[::16])
+    assert _get_rmse(decoder.decode(encoded_data, 256, 128, ImageFormats.BC7_UNORM), gradient_data, [0, 1, 2, 3]) <= 1.0
+
+
+@pytest.mark.imagetest
+def test_bcn_encoder_backend_selection(monkeypatch):
+    rgba_data = os.urandom(16 * 16 * 4)
+    directxtex_available: bool = DirectXTexBCnDecoderBackend().is_available(ImageFormats.BC1_DXT1)
+    clear_bcn_encoder_backend_selection()
+    assert get_bcn_encoder_backend_name(ImageFormats.BC1_DXT1) == ("directxtex" if directxtex_available else "numpy")
+    assert get_bcn_encoder_backend_name(ImageFormats.BC3_DXT5, "numpy") == "numpy"
+    assert ImageEncoder().encode_compressed_image(rgba_data, 16, 16, ImageFormats.BC3_DXT5, "fast", backend_name="numpy") \
+           == BCnNumpyEncoder("fast").encode_image(rgba_data, 16, 16, ImageFormats.BC3_DXT5)
+
+    # DirectXTex is preferred when its library can be loaded
+    clear_bcn_encoder_backend_selection()
+    monkeypatch.setattr(DirectXTexBCnDecoderBackend, "is_available", lambda backend, image_format: True)
+    for image_format in (ImageFormats.BC1_DXT1, ImageFormats.BC2_DXT3, ImageFormats.BC3_DXT5, ImageFormats.BC4_UNORM, ImageFormats.BC5_UNORM,
+                         ImageFormats.BC6H_UF16, ImageFormats.BC6H_SF16, ImageFormats.BC7_UNORM):
+        assert get_bcn_encoder_backend_name(image_format) == "directxtex"
+        assert get_bcn_encoder_backend_name(image_format, "numpy") == "numpy"
+    clear_bcn_encoder_backend_selection()
+
+    with pytest.raises(Exception):
+        get_bcn_encoder_backend_name(ImageFormats.BC1_DXT1, "unknown")
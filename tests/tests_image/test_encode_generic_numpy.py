@@ -0,0 +1,32 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import os
+
+import pytest
+
+from reversebox.image.decoders.generic_numpy_encoder import GenericNumpyEncoder
+from reversebox.image.image_encoder import ImageEncoder
+
+# fmt: off
+
+
+@pytest.mark.imagetest
+def test_numpy_encoder_matches_per_pixel_encoder_for_all_generic_formats():
+    image_encoder = ImageEncoder()
+    img_width: int = 32
+    img_height: int = 16
+    rgba_data: bytes = os.urandom(img_width * img_height * 4)
+
+    for image_format in GenericNumpyEncoder.generic_data_formats.keys():
+        if image_format not in image_encoder.generic_data_formats:
+            continue  # no per-pixel encoder to compare with
+        for image_endianess in ("little", "big"):
+            for number_of_mipmaps in (0, 3):
+                expected_data: bytes = image_encoder._encode_generic(rgba_data, img_width, img_height, image_format,
+                                                                     image_endianess, number_of_mipmaps, 0)
+                encoded_data: bytes = image_encoder.encode_image(rgba_data, img_width, img_height, image_format,
+                                                                 image_endianess, number_of_mipmaps, 0)
+                assert encoded_data == expected_data, f"Mismatch for {image_format} ({image_endianess}, mipmaps={number_of_mipmaps})"
@@ -0,0 +1,81 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import pytest
+
+from reversebox.image.image_decoder import ImageDecoder
+from reversebox.image.image_encoder import ImageEncoder
+from reversebox.image.image_formats import ImageFormats
+from reversebox.image.pixel_layout import compile_pixel_layout, parse_pixel_layout
+from tests.common import get_test_data
+
+# fmt: off
+
+
+@pytest.mark.imagetest
+def test_parse_pixel_layout():
+    assert parse_pixel_layout("A1R5G5B5") == [("A", 1, 15), ("R", 5, 10), ("G", 5, 5), ("B", 5, 0)]
+    assert parse_pixel_layout("r10g10b10a2") == [("R", 10, 22), ("G", 10, 12), ("B", 10, 2), ("A", 2, 0)]
+
+    for wrong_layout in ("", "A1R5G5B", "Q8", "R8R8", "R0G8"):
+        with pytest.raises(ValueError):
+            parse_pixel_layout(wrong_layout)
+
+    with pytest.raises(ValueError):
+        compile_pixel_layout("R5G5B5")  # 15 bits per pixel
+
+
+@pytest.mark.imagetest
+def test_pixel_layout_matches_existing_formats():
+    image_decoder = ImageDecoder()
+    image_data: bytes = get_test_data(16 * 8 * 4) + b"\x00\x00\x00\x00"
+
+    test_entries = [
+        # (layout, expansion, alpha_mode, image_format)
+        ("A1R5G5B5", "replicate", "normal", ImageFormats.BGRA5551),
+        ("X4B4G4R4", "replicate", "normal", ImageFormats.RGBX4444),
+        ("R5G6B5", "scale", "normal", ImageFormats.BGR565),
+        ("A1B5G5R5", "replicate", "translucent", ImageFormats.RGBT5551),
+        ("X2B6X2G6X2R6", "scale_round", "normal", ImageFormats.RGBX6666),
+        ("A8B8G8R8", "replicate", "normal", ImageFormats.RGBA8888),
+        ("L4", "replicate", "normal", ImageFormats.GRAY4),
+    ]
+
+    for layout, expansion, alpha_mode, image_format in test_entries:
+        for image_endianess in ("little", "big"):
+            expected_data: bytes = image_decoder.decode_image(image_data, 16, 9, image_format, image_endianess)
+            decoded_data: bytes = image_decoder.decode_image_with_layout(image_data, 16, 9, layout, image_endianess, expansion, alpha_mode)
+            assert decoded_data == expected_data[:16 * 9 * 4], f"Mismatch for {layout} ({image_endianess})"
+
+
+@pytest.mark.imagetest
+def test_pixel_layout_encode_matches_existing_encoders():
+    image_encoder = ImageEncoder()
+    rgba_data: bytes = get_test_data(16 * 8 * 4)
+
+    assert image_encoder.encode_image_with_layout(rgba_data, 16, 8, "A1B5G5R5", alpha_mode="translucent") == \
+        image_encoder.encode_image(rgba_data, 16, 8, ImageFormats.RGBT5551)
+    assert image_encoder.encode_image_with_layout(rgba_data, 16, 8, "A8R8G8B8", "big") == \
+        image_encoder.encode_image(rgba_data, 16, 8, ImageFormats.BGRA8888, "big")
+
+
+@pytest.mark.imagetest
+def test_pixel_layout_round_trip():
+    image_decoder = ImageDecoder()
+    image_encoder = ImageEncoder()
+    image_data: bytes = get_test_data(16 * 8 * 6)
+
+    for layout in ("R10G10B10A2", "A2B10G10R10", "R16G16B16", "A4L4", "R3G3B2"):
+        for image_endianess in ("little", "big"):
+            decoded_data: bytes = image_decoder.decode_image_with_layout(image_data, 16, 8, layout, image_endianess)
+            re_encoded_data: bytes = image_encoder.encode_image_with_layout(decoded_data, 16, 8, layout, image_endianess)
+            re_decoded_data: bytes = image_decoder.decode_image_with_layout(re_encoded_data, 16, 8, layout, image_endianess)
+            assert decoded_data == re_decoded_data, f"Mismatch for {layout} ({image_endianess})"
+
+    rgba_data: bytes = b"\x10\x20\x30\x00" + b"\x10\x20\x30\xFF"
+    encoded_data: bytes = image_encoder.encode_image_with_layout(rgba_data, 2, 1, "R8G8B8", alpha_mode="transparent_key", transparent_value=0xFF00FF)
+    assert encoded_data == b"\xFF\x00\xFF\x30\x20\x10"
+    decoded_data: bytes = image_decoder.decode_image_with_layout(encoded_data, 2, 1, "R8G8B8", alpha_mode="transparent_key", transparent_value=0xFF00FF)
+    assert decoded_data == b"\xFF\x00\xFF\x00\x10\x20\x30\xFF"
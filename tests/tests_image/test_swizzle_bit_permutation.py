@@ -0,0 +1,76 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import numpy as np
+import pytest
+
+from reversebox.image.swizzling.swizzle_3ds import swizzle_3ds
+from reversebox.image.swizzling.swizzle_bit_permutation import (
+    N3DS_DESCRIPTOR,
+    PS4_DESCRIPTOR,
+    compile_bit_permutation,
+    get_morton_descriptor,
+    get_ps5_descriptor,
+    get_switch_descriptor,
+    swizzle_with_descriptor,
+    unswizzle_with_descriptor,
+)
+from reversebox.image.swizzling.swizzle_morton import swizzle_morton
+from reversebox.image.swizzling.swizzle_morton_ps4 import swizzle_ps4
+from reversebox.image.swizzling.swizzle_morton_ps5 import swizzle_ps5
+from tests.common import get_test_data
+
+# fmt: off
+
+
+@pytest.mark.imagetest
+def test_bit_permutation_compile():
+    morton_swizzle = compile_bit_permutation("x0 y0 x1 y1 x2 y2")
+    assert (morton_swizzle.tile_width, morton_swizzle.tile_height, morton_swizzle.tile_size) == (8, 8, 64)
+    # interleaved bits are moved with one spread/compact operation per coordinate
+    assert morton_swizzle.operations == (("x", 0, 0, 3, 2), ("y", 0, 1, 3, 2))
+    assert morton_swizzle.get_tile_offsets(np.array([5]), np.array([3])).tolist() == [0b011011]
+    assert [coordinates.tolist() for coordinates in morton_swizzle.get_tile_coordinates(np.array([0b011011]))] == [[5], [3]]
+
+    assert get_morton_descriptor(8, 2) == "x0 y0 x1 x2"
+    assert get_switch_descriptor(2) == "x0 x1 x2 x3 y0 x4 y1 y2 x5 y3"
+    assert compile_bit_permutation(get_ps5_descriptor(0)).tile_width == 128
+    assert compile_bit_permutation(get_ps5_descriptor(4)).tile_height == 64
+
+    # offsets <--> coordinates for whole image
+    switch_swizzle = compile_bit_permutation(get_switch_descriptor(4))
+    y, x = np.mgrid[0:96, 0:128]
+    offsets = switch_swizzle.get_offsets(x, y, 2)
+    assert sorted(offsets.reshape(-1).tolist()) == list(range(128 * 96))
+    assert all((coordinates == expected).all() for coordinates, expected in zip(switch_swizzle.get_coordinates(offsets, 2), (x, y)))
+
+    for wrong_descriptor in ("x0 y0 x2", "x0 x0", "x0 z1", "x0 y0 x1 y1 " * 9):
+        with pytest.raises(ValueError):
+            compile_bit_permutation(wrong_descriptor)
+    with pytest.raises(ValueError):
+        get_switch_descriptor(3)
+
+
+@pytest.mark.imagetest
+def test_bit_permutation_matches_swizzlers():
+    image_data: bytes = get_test_data(128 * 128 * 4)
+
+    assert swizzle_with_descriptor(image_data, 128, 128, get_morton_descriptor(128, 128), 4) == swizzle_morton(image_data, 128, 128, 32)
+    assert swizzle_with_descriptor(image_data, 128, 64, PS4_DESCRIPTOR, 16, 4, 4) == swizzle_ps4(image_data[:32 * 16 * 16], 128, 64, 4, 4, 16)
+    assert swizzle_with_descriptor(image_data, 256, 256, get_ps5_descriptor(2), 8, 4, 4) == swizzle_ps5(image_data[:64 * 64 * 8], 256, 256, 4, 4, 8)
+    assert swizzle_with_descriptor(image_data, 64, 64, N3DS_DESCRIPTOR, 2) == swizzle_3ds(image_data[:64 * 64 * 2], 64, 64, 16)
+
+
+@pytest.mark.imagetest
+def test_bit_permutation_custom_layout():
+    # 4x4 blocks in "N" order inside of 16x16 tiles, image is not multiple of tile size
+    descriptor: str = "y0 y1 x0 x1 x2 y2 x3 y3"
+    image_data: bytes = get_test_data(40 * 24 * 2)
+    swizzled_data: bytes = swizzle_with_descriptor(image_data, 40, 24, descriptor, 2)
+    assert len(swizzled_data) == 3 * 2 * 256 * 2
+    assert unswizzle_with_descriptor(swizzled_data, 40, 24, descriptor, 2) == image_data
+
+    # pixel (x=5, y=2) is unit 0b00010110 of the first tile
+    assert swizzled_data[0b00010110 * 2:0b00010110 * 2 + 2] == image_data[(2 * 40 + 5) * 2:(2 * 40 + 6) * 2]
@@ -0,0 +1,127 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from reversebox.image.swizzling.swizzle_3ds import swizzle_3ds, unswizzle_3ds
+from reversebox.image.swizzling.swizzle_gamecube import (
+    get_pixel_offset,
+    swizzle_gamecube,
+    unswizzle_gamecube,
+)
+from reversebox.image.swizzling.swizzle_morton import swizzle_morton, unswizzle_morton
+from reversebox.image.swizzling.swizzle_morton_ps4 import swizzle_ps4, unswizzle_ps4
+from reversebox.image.swizzling.swizzle_morton_ps5 import swizzle_ps5, unswizzle_ps5
+from reversebox.image.swizzling.swizzle_plan import (
+    SwizzlePlan,
+    SwizzlePlanCache,
+    swizzle_plan_cache,
+)
+from reversebox.image.swizzling.swizzle_psp import swizzle_psp, unswizzle_psp
+from reversebox.image.swizzling.swizzle_psvita_dreamcast import (
+    swizzle_psvita_dreamcast,
+    unswizzle_psvita_dreamcast,
+)
+from reversebox.image.swizzling.swizzle_switch import swizzle_switch, unswizzle_switch
+from reversebox.image.swizzling.swizzle_x360 import swizzle_x360, unswizzle_x360
+from tests.common import get_test_data
+
+# fmt: off
+
+
+@pytest.mark.imagetest
+def test_swizzle_plan_apply():
+    # 4 units of 2 bytes, linear unit "i" <--> swizzled unit "3 - i"
+    plan = SwizzlePlan(np.arange(4), np.arange(4)[::-1], 2)
+    assert plan.apply(b"AABBCCDD", 8, True) == b"DDCCBBAA"
+    assert plan.apply(b"AABBCCDD", 10, False) == b"DDCCBBAA\x00\x00"
+    assert plan.apply(b"AABB", 8, False) == b"\x00\x00\x00\x00BBAA"  # missing data --> zeros
+    assert plan.linear_indices is None  # identity is copied with slicing
+
+    # duplicated destination, the last unit is kept
+    plan = SwizzlePlan(np.array([0, 0, 1]), np.array([0, 1, 2]), 1)
+    assert plan.apply(b"abc", 2, False) == b"bc"
+
+    # offsets not aligned to unit size --> units are split
+    plan = SwizzlePlan.from_byte_offsets(np.array([0, 6]), np.array([6, 0]), 4)
+    assert plan.unit_data_size == 2
+    assert plan.apply(b"abcdefghij", 10, True) == b"ghij\x00\x00abcd"
+
+
+@pytest.mark.imagetest
+def test_swizzle_plan_cache():
+    build_calls: list = []
+
+    def _build_plan(size: int) -> SwizzlePlan:
+        build_calls.append(size)
+        return SwizzlePlan(np.arange(size), np.arange(size), 1)
+
+    cache = SwizzlePlanCache(max_plans=2)
+    first_plan = cache.get_swizzle_plan(_build_plan, 4)
+    assert cache.get_swizzle_plan(_build_plan, 4) is first_plan
+    cache.get_swizzle_plan(_build_plan, 8)
+    cache.get_swizzle_plan(_build_plan, 4)   # 4 is the most recently used now
+    cache.get_swizzle_plan(_build_plan, 16)  # evicts 8
+    cache.get_swizzle_plan(_build_plan, 4)
+    cache.get_swizzle_plan(_build_plan, 8)
+    assert build_calls == [4, 8, 16, 8]
+    assert (cache.hits, cache.misses) == (3, 4)
+
+    # swizzlers share one cache
+    swizzle_plan_cache.clear()
+    image_data: bytes = get_test_data(64 * 64 * 4)
+    unswizzle_morton(image_data, 64, 64, 32)
+    swizzle_morton(image_data, 64, 64, 32)
+    assert (swizzle_plan_cache.hits, swizzle_plan_cache.misses) == (1, 1)
+
+
+@pytest.mark.imagetest
+def test_swizzle_plan_cache_shared_between_threads():
+    def _build_plan(size: int) -> SwizzlePlan:
+        return SwizzlePlan(np.arange(size), np.arange(size)[::-1], 1)
+
+    cache = SwizzlePlanCache(max_plans=2)
+    plan_sizes: list = [4, 8, 16, 32, 64] * 40
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        plans: list = list(executor.map(lambda size: cache.get_swizzle_plan(_build_plan, size), plan_sizes))
+    assert len(cache._plans) == 2
+    assert cache.hits + cache.misses == len(plan_sizes)
+    assert [plan.number_of_units for plan in plans] == plan_sizes
+
+
+@pytest.mark.imagetest
+def test_swizzle_plan_round_trip():
+    image_data: bytes = get_test_data(128 * 64 * 4)
+    swizzle_functions: list = [
+        (lambda data: swizzle_morton(data, 128, 64, 32), lambda data: unswizzle_morton(data, 128, 64, 32), 128 * 64 * 4),
+        (lambda data: swizzle_psvita_dreamcast(data, 128, 64, 4, 4, 4), lambda data: unswizzle_psvita_dreamcast(data, 128, 64, 4, 4, 4), 128 * 64 // 2),
+        (lambda data: swizzle_ps4(data, 100, 60, 4, 4, 16), lambda data: unswizzle_ps4(data, 100, 60, 4, 4, 16), 25 * 15 * 16),
+        (lambda data: swizzle_ps5(data, 100, 60, 1, 1, 4), lambda data: unswizzle_ps5(data, 100, 60, 1, 1, 4), 100 * 60 * 4),
+        (lambda data: swizzle_switch(data, 32, 64, 8, 4), lambda data: unswizzle_switch(data, 32, 64, 8, 4), 32 * 64 * 8),
+        (lambda data: swizzle_3ds(data, 64, 32, 16), lambda data: unswizzle_3ds(data, 64, 32, 16), 64 * 32 * 2),
+        (lambda data: swizzle_gamecube(data, 64, 32, 32), lambda data: unswizzle_gamecube(data, 64, 32, 32), 64 * 32 * 4),
+        (lambda data: swizzle_gamecube(data, 64, 32, 4), lambda data: unswizzle_gamecube(data, 64, 32, 4), 64 * 32 // 2),
+        (lambda data: swizzle_psp(data, 128, 16, 8), lambda data: unswizzle_psp(data, 128, 16, 8), 128 * 16),
+    ]
+    for swizzle_function, unswizzle_function, data_size in swizzle_functions:
+        linear_data: bytes = image_data[:data_size]
+        swizzled_data: bytes = swizzle_function(linear_data)
+        assert swizzled_data != linear_data
+        assert unswizzle_function(swizzled_data)[:data_size] == linear_data
+
+    # X360 pads swizzled data to 32x32 blocks
+    linear_data = image_data[:20 * 12 * 8]
+    swizzled_data = swizzle_x360(linear_data, 80, 48, 4, 8)
+    assert len(swizzled_data) == 32 * 32 * 8
+    assert unswizzle_x360(swizzled_data, 80, 48, 4, 8) == linear_data
+
+    # GameCube 32-bit pixels are split into AR and GB parts
+    swizzled_data = swizzle_gamecube(image_data[:8 * 8 * 4], 8, 8, 32)
+    pixel_offset: int = get_pixel_offset(5, 6, 8, 32)
+    assert swizzled_data[pixel_offset:pixel_offset + 2] + swizzled_data[pixel_offset + 32:pixel_offset + 34] \
+           == image_data[(6 * 8 + 5) * 4:(6 * 8 + 6) * 4]
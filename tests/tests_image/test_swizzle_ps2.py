@@ -1,5 +1,5 @@
 """
-Copyright © 2024-2025  Bartłomiej Duda
+Copyright © 2024-2026  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
@@ -12,6 +12,7 @@ from reversebox.image.image_formats import ImageFormats
 from reversebox.image.pillow_wrapper import PillowWrapper
 from reversebox.image.swizzling.swizzle_ps2 import (
     swizzle_ps2,
+    swizzle_ps2_palette,
     unswizzle_ps2,
     unswizzle_ps2_palette,
 )
@@ -229,7 +230,6 @@ def test_ps2_unswizzle_and_swizzle_4bit_busted_sample_type2():
     assert swizzled_file_data[-100:] == reswizzled_file_data[-100:]
 
 
-# TODO - fix this, unswizzling not working for 16-bit
 @pytest.mark.imagetest
 def test_ps2_unswizzle_and_swizzle_bratz_aly_and_aj_poster_sample():
     swizzled_file_path = os.path.join(os.path.dirname(__file__), "image_files/swizzle_ps2_aly_and_aj_poster.bin")
@@ -257,6 +257,7 @@ def test_ps2_unswizzle_and_swizzle_bratz_aly_and_aj_poster_sample():
     unswizzled_palette_data = unswizzle_ps2(
         palette_data, 16, 16, 16, swizzle_type=1
     )
+    unswizzled_palette_data = unswizzle_ps2_palette(unswizzled_palette_data, bpp=16)
 
     # debug start ###############################################################################################
     is_debug = False
@@ -271,14 +272,16 @@ def test_ps2_unswizzle_and_swizzle_bratz_aly_and_aj_poster_sample():
     # debug end #################################################################################################
 
     assert len(correct_palette_data) == len(unswizzled_palette_data)
-    # assert correct_palette_data == unswizzled_palette_data  # TODO - fix 16-bpp palette unswizzle
-
-    # reswizzled_file_data = swizzle_ps2(
-    #     unswizzled_file_data, img_width, img_height, bpp, swizzle_type=1
-    # )
-    #
-    # assert len(swizzled_file_data) == len(reswizzled_file_data)
-    # assert swizzled_file_data[:100] == reswizzled_file_data[:100]
-    # assert swizzled_file_data[1000:1100] == reswizzled_file_data[1000:1100]
-    # assert swizzled_file_data[3000:3100] == reswizzled_file_data[3000:3100]
-    # assert swizzled_file_data[-100:] == reswizzled_file_data[-100:]
+    assert correct_palette_data == unswizzled_palette_data
+
+    reswizzled_palette_data = swizzle_ps2(
+        swizzle_ps2_palette(unswizzled_palette_data, bpp=16), 16, 16, 16, swizzle_type=1
+    )
+    assert palette_data == reswizzled_palette_data
+
+    reswizzled_file_data = swizzle_ps2(
+        unswizzled_file_data, img_width, img_height, bpp, swizzle_type=1
+    )
+
+    assert len(swizzled_file_data) == len(reswizzled_file_data)
+    assert swizzled_file_data == reswizzled_file_data
@@ -0,0 +1,94 @@
+"""
+Copyright © 2026  Bartłomiej Duda
+License: GPL-3.0 License
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from reversebox.image.swizzling.swizzle_ps2 import unswizzle_ps2
+from reversebox.image.swizzling.swizzle_ps2_gs import (
+    GS_STORAGE_FORMATS,
+    PSMCT16,
+    PSMCT16S,
+    PSMCT32,
+    PSMT4,
+    PSMT8,
+    GSMemory,
+    get_gs_page_table,
+    get_gs_transfer_indices,
+)
+from tests.common import get_test_data
+
+# fmt: off
+
+
+@pytest.mark.imagetest
+def test_gs_page_tables():
+    for psm, storage_format in GS_STORAGE_FORMATS.items():
+        page_table: np.ndarray = get_gs_page_table(psm)
+        assert page_table.shape == (storage_format.page_height, storage_format.page_width)
+        assert sorted(page_table.reshape(-1).tolist()) == list(range(8192 * 8 // storage_format.bpp))
+
+    # first rows of column tables from GS manual
+    assert get_gs_page_table(PSMCT32)[0, :8].tolist() == [0, 1, 4, 5, 8, 9, 12, 13]
+    assert get_gs_page_table(PSMCT16)[1, :16].tolist() == [4, 6, 12, 14, 20, 22, 28, 30, 5, 7, 13, 15, 21, 23, 29, 31]
+    assert get_gs_page_table(PSMT8)[2, :16].tolist() == [33, 37, 49, 53, 1, 5, 17, 21, 35, 39, 51, 55, 3, 7, 19, 23]
+    assert get_gs_page_table(PSMT4)[2, :8].tolist() == [65, 73, 97, 105, 1, 9, 33, 41]
+    # block tables
+    assert (get_gs_page_table(PSMCT16)[::8, 0] // 128).tolist() == [0, 1, 4, 5, 16, 17, 20, 21]
+    assert (get_gs_page_table(PSMCT16S)[::8, 0] // 128).tolist() == [0, 1, 8, 9, 4, 5, 12, 13]
+    assert (get_gs_page_table(PSMT8)[0, ::16] // 256).tolist() == [0, 1, 4, 5, 16, 17, 20, 21]
+
+
+@pytest.mark.imagetest
+def test_gs_memory_upload_and_download():
+    for psm, bpp in ((PSMCT32, 32), (PSMCT16, 16), (PSMCT16S, 16), (PSMT8, 8), (PSMT4, 4)):
+        image_data: bytes = get_test_data(300 * 200 * bpp // 8)
+        gs_memory = GSMemory()
+        gs_memory.upload(image_data, psm, 37, 6, 300, 200, 3, 5)
+        assert gs_memory.download(psm, 37, 6, 300, 200, 3, 5) == image_data
+        assert gs_memory.download(psm, 37, 6, 300, 200, 4, 5) != image_data
+
+    # 8-bit texture uploaded as PSMCT32 data
+    swizzled_data: bytes = get_test_data(256 * 128)
+    gs_memory = GSMemory()
+    gs_memory.upload(swizzled_data, PSMCT32, 0, 2, 128, 64)
+    assert gs_memory.download(PSMT8, 0, 4, 256, 128) == unswizzle_ps2(swizzled_data, 256, 128, 8)
+    destination_indices, source_indices, unit_bits = get_gs_transfer_indices(PSMCT32, 2, 128, 64, PSMT8, 4, 256, 128)
+    assert unit_bits == 8
+    assert np.frombuffer(swizzled_data, dtype=np.uint8)[source_indices][np.argsort(destination_indices)].tobytes() \
+           == unswizzle_ps2(swizzled_data, 256, 128, 8)
+
+    # VRAM dump
+    gs_memory = GSMemory(gs_memory.get_memory_data())
+    assert gs_memory.download(PSMCT32, 0, 2, 128, 64) == swizzled_data
+
+
+@pytest.mark.imagetest
+def test_gs_memory_clut():
+    swizzled_file_path = os.path.join(os.path.dirname(__file__), "image_files/swizzle_ps2_aly_and_aj_poster.bin")
+    correct_palette_path = os.path.join(os.path.dirname(__file__), "image_files/swizzle_ps2_aly_and_aj_poster_correct_palette.bin")
+    with open(swizzled_file_path, "rb") as swizzled_file:
+        swizzled_file.seek(16704)
+        palette_data: bytes = swizzled_file.read(0x200)
+    with open(correct_palette_path, "rb") as correct_palette_file:
+        correct_palette_data: bytes = correct_palette_file.read()
+
+    # CSM1 (palette uploaded as PSMCT32 data)
+    gs_memory = GSMemory()
+    gs_memory.upload(palette_data, PSMCT32, 100, 1, 16, 8)
+    assert gs_memory.download_clut(100, PSMCT16, 256) == correct_palette_data
+
+    # CSM2
+    gs_memory.upload(correct_palette_data, PSMCT16, 200, 4, 256, 1, 0, 3)
+    assert gs_memory.download_clut(200, PSMCT16, 256, csm=2, cbw=4, cov=3) == correct_palette_data
+    gs_memory.upload(correct_palette_data[:32], PSMCT16, 200, 4, 16, 1, 32, 0)
+    assert gs_memory.download_clut(200, PSMCT16, 16, csm=2, cbw=4, cou=2) == correct_palette_data[:32]
+
+    with pytest.raises(ValueError):
+        gs_memory.download_clut(200, PSMCT32, 256, csm=2)
+    with pytest.raises(ValueError):
+        gs_memory.download_clut(200, PSMT8, 256)
@@ -1,5 +1,5 @@
 """
-Copyright © 2025  Bartłomiej Duda
+Copyright © 2025-2026  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
@@ -12,7 +12,16 @@ from reversebox.image.common import get_bc_image_data_size
 from reversebox.image.image_decoder import ImageDecoder
 from reversebox.image.image_formats import ImageFormats
 from reversebox.image.pillow_wrapper import PillowWrapper
-from reversebox.image.swizzling.swizzle_switch import swizzle_switch, unswizzle_switch
+from reversebox.image.swizzling.swizzle_switch import (
+    get_switch_block_height,
+    get_switch_mip_block_height,
+    get_switch_surface_size,
+    swizzle_switch,
+    swizzle_switch_surface,
+    unswizzle_switch,
+    unswizzle_switch_surface,
+)
+from tests.common import get_test_data
 
 # fmt: off
 
@@ -168,3 +177,43 @@ def test_nintendo_switch_unswizzle_and_swizzle_dxt5_font_file2():
     assert swizzled_file_data[1000:1100] == reswizzled_file_data[1000:1100]
     assert swizzled_file_data[3000:3100] == reswizzled_file_data[3000:3100]
     assert swizzled_file_data[-100:] == reswizzled_file_data[-100:]
+
+
+@pytest.mark.imagetest
+def test_nintendo_switch_surface_with_automatic_block_height():
+    swizzled_file_path = os.path.join(
+        os.path.dirname(__file__), "image_files/swizzle_switch_offset283_512x512_DXT5.bin"
+    )
+
+    bin_file = open(swizzled_file_path, "rb")
+    bin_file.seek(283)
+    swizzled_file_data = bin_file.read()
+    bin_file.close()
+
+    assert get_switch_block_height(128) == 16
+    assert get_switch_surface_size(512, 512, 16, 4, 4) == len(swizzled_file_data)
+    mip_levels = unswizzle_switch_surface(swizzled_file_data, 512, 512, 16, 4, 4)
+    assert len(mip_levels) == 1
+    assert mip_levels[0] == unswizzle_switch(swizzled_file_data, 512, 512, bytes_per_block=4, block_height=16)[:len(mip_levels[0])]
+    assert swizzle_switch_surface(mip_levels, 512, 512, 16, 4, 4) == swizzled_file_data
+
+
+@pytest.mark.imagetest
+def test_nintendo_switch_surface_mips_and_layers():
+    assert [get_switch_block_height(height) for height in (1, 10, 11, 22, 43, 86, 1024)] == [1, 1, 2, 4, 8, 16, 16]
+    assert [get_switch_mip_block_height(height, 16) for height in (256, 65, 64, 32, 16, 8, 1)] == [16, 16, 8, 4, 2, 1, 1]
+
+    # 200x100 DXT1 cube map with 4 mip levels
+    # layer: 14336 + 4096 + 1024 + 512 (block heights 4, 2, 1, 1) --> aligned to 4 GOBs
+    assert get_switch_surface_size(200, 100, 8, 4, 4, 4, 1) == 19968
+    assert get_switch_surface_size(200, 100, 8, 4, 4, 4, 6) == 20480 * 6
+
+    mip_levels = [get_test_data(50 * 25 * 8 * 6), get_test_data(25 * 13 * 8 * 6),
+                  get_test_data(13 * 7 * 8 * 6), get_test_data(7 * 3 * 8 * 6)]
+    swizzled_data: bytes = swizzle_switch_surface(mip_levels, 200, 100, 8, 4, 4, 6)
+    assert len(swizzled_data) == 20480 * 6
+    assert unswizzle_switch_surface(swizzled_data, 200, 100, 8, 4, 4, 4, 6) == mip_levels
+
+    # GOB starts with 16 bytes of row 0 and 16 bytes of row 1 (mip level 1 of layer 2)
+    layer_2_mip_1_data: bytes = mip_levels[1][25 * 13 * 8 * 2:]
+    assert swizzled_data[20480 * 2 + 14336:20480 * 2 + 14336 + 32] == layer_2_mip_1_data[:16] + layer_2_mip_1_data[25 * 8:25 * 8 + 16]
@@ -1,5 +1,5 @@
 """
-Copyright © 2025  Bartłomiej Duda
+Copyright © 2025-2026  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
@@ -10,7 +10,16 @@ import pytest
 from reversebox.image.image_decoder import ImageDecoder
 from reversebox.image.image_formats import ImageFormats
 from reversebox.image.pillow_wrapper import PillowWrapper
-from reversebox.image.swizzling.swizzle_wii_u import swizzle_wii_u, unswizzle_wii_u
+from reversebox.image.swizzling.swizzle_wii_u import (
+    AddrLib_computeSurfaceAddrFromCoordMacroTiled,
+    compute_wii_u_surface_info,
+    get_wii_u_mip_offsets,
+    swizzle_wii_u,
+    swizzle_wii_u_surface,
+    unswizzle_wii_u,
+    unswizzle_wii_u_surface,
+)
+from tests.common import get_test_data
 
 # fmt: off
 
@@ -45,10 +54,41 @@ def test_wii_u_unswizzle_and_swizzle_monkey_sample_type0():
     # debug end #################################################################################################
 
     reswizzled_file_data = swizzle_wii_u(img_width, img_height, image_format=0x00000031, tile_mode=4, swizzle_type=851968, pitch=64,
-                                         input_data=swizzled_file_data)
+                                         input_data=unswizzled_file_data)
 
     assert len(swizzled_file_data) == len(reswizzled_file_data)
-    # assert swizzled_file_data[:100] == reswizzled_file_data[:100]
-    # assert swizzled_file_data[1000:1100] == reswizzled_file_data[1000:1100]
-    # assert swizzled_file_data[3000:3100] == reswizzled_file_data[3000:3100]
-    # assert swizzled_file_data[-100:] == reswizzled_file_data[-100:]
+    assert swizzled_file_data == reswizzled_file_data
+
+    # addresses are the same as computed for single elements
+    for x, y in ((0, 0), (5, 3), (17, 9), (63, 31)):
+        element_offset: int = AddrLib_computeSurfaceAddrFromCoordMacroTiled(x, y, 64, 64, 32, 4, 0, 0)
+        assert unswizzled_file_data[(y * 64 + x) * 8:(y * 64 + x + 1) * 8] == swizzled_file_data[element_offset:element_offset + 8]
+
+    # surface API
+    assert compute_wii_u_surface_info(img_width, img_height, 0x00000031, 4).surface_size == len(swizzled_file_data)
+    mip_levels = unswizzle_wii_u_surface(swizzled_file_data, b"", img_width, img_height, image_format=0x00000031, tile_mode=4,
+                                         swizzle_type=851968, pitch=64)
+    assert mip_levels == [unswizzled_file_data]
+
+
+@pytest.mark.imagetest
+def test_wii_u_surface_mips_and_slices():
+    img_width, img_height, number_of_mips = 200, 120, 8
+
+    # small mip levels are degraded to 1D tiling
+    assert [compute_wii_u_surface_info(img_width, img_height, 0x1A, 4, mip_level).tile_mode for mip_level in range(number_of_mips)] \
+           == [4, 4, 4, 4, 2, 2, 2, 2]
+    assert [compute_wii_u_surface_info(img_width, img_height, 0x31, 4, mip_level).tile_mode for mip_level in range(3)] == [4, 4, 2]
+    assert get_wii_u_mip_offsets(256, 128, 0x31, 4, 4) == [0, 4096, 5120]
+
+    for image_format, tile_mode, number_of_slices in ((0x1A, 4, 1), (0x31, 4, 6), (0x33, 9, 2), (0x1A, 2, 3), (0x1A, 1, 2), (0x07, 10, 5)):
+        mip_levels: list = []
+        for mip_level in range(number_of_mips):
+            surface_info = compute_wii_u_surface_info(img_width, img_height, image_format, tile_mode, mip_level, number_of_slices)
+            level_size: int = surface_info.element_width * surface_info.element_height * number_of_slices * surface_info.bpp // 8
+            mip_levels.append(get_test_data(level_size + mip_level)[mip_level:])
+
+        image_data, mip_data = swizzle_wii_u_surface(mip_levels, img_width, img_height, image_format, tile_mode, 0x300, number_of_slices)
+        assert len(image_data) == compute_wii_u_surface_info(img_width, img_height, image_format, tile_mode, 0, number_of_slices).surface_size
+        assert unswizzle_wii_u_surface(image_data, mip_data, img_width, img_height, image_format, tile_mode, 0x300,
+                                       number_of_mips, number_of_slices) == mip_levels
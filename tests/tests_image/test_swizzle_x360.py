@@ -1,5 +1,5 @@
 """
-Copyright © 2024-2025  Bartłomiej Duda
+Copyright © 2024-2026  Bartłomiej Duda
 License: GPL-3.0 License
 """
 
@@ -7,10 +7,15 @@ import os
 
 import pytest
 
+from reversebox.image.byte_swap import swap_byte_order_x360
 from reversebox.image.image_decoder import ImageDecoder
 from reversebox.image.image_formats import ImageFormats
 from reversebox.image.pillow_wrapper import PillowWrapper
-from reversebox.image.swizzling.swizzle_x360 import swizzle_x360, unswizzle_x360
+from reversebox.image.swizzling.swizzle_x360 import (
+    decode_x360_surface,
+    swizzle_x360,
+    unswizzle_x360,
+)
 
 # fmt: off
 
@@ -157,3 +162,32 @@ def test_x360_unswizzle_and_swizzle_fairy_with_big_boobs():
     assert swizzled_file_data[1000:1100] == reswizzled_file_data[1000:1100]
     assert swizzled_file_data[3000:3100] == reswizzled_file_data[3000:3100]
     # assert swizzled_file_data[-100:] == reswizzled_file_data[-100:]
+
+
+@pytest.mark.imagetest
+def test_x360_decode_surface():
+    swizzled_file_path = os.path.join(
+        os.path.dirname(__file__), "image_files/swizzle_xbox360_mt_framework.tex"
+    )
+
+    bin_file = open(swizzled_file_path, "rb")
+    bin_file.seek(44)
+    swizzled_file_data = bin_file.read(2304 * 1152)
+    bin_file.close()
+
+    # untile + 16-bit endian swap + crop
+    assert decode_x360_surface(swizzled_file_data, 2304, 1152, 4, 16) \
+           == unswizzle_x360(swap_byte_order_x360(swizzled_file_data), 2304, 1152, 4, 16)
+
+    # image with partial blocks (30x30 DXT1 --> 8x8 blocks)
+    assert decode_x360_surface(swizzled_file_data, 30, 30, 4, 8) \
+           == unswizzle_x360(swap_byte_order_x360(swizzled_file_data), 32, 32, 4, 8)
+
+    # 32-bit endian swap
+    swizzled_data: bytes = bytes(range(256)) * 64
+    swapped_data: bytes = bytes(swizzled_data[i ^ 3] for i in range(len(swizzled_data)))
+    assert decode_x360_surface(swizzled_data, 64, 64, 1, 4, 4) == unswizzle_x360(swapped_data, 64, 64, 1, 4)
+    assert decode_x360_surface(swizzled_data, 64, 64, 1, 4, 1) == unswizzle_x360(swizzled_data, 64, 64, 1, 4)
+
+    with pytest.raises(ValueError):
+        decode_x360_surface(swizzled_data, 64, 64, 1, 2, 4)